@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du moteur asyncio : coût par minuterie active.
+========================================================
+
+Lance N minuteries concurrentes de quelques secondes dans une seule boucle
+d'événements et rapporte, par minuterie:
+- La mémoire occupée pendant que les minuteries sont actives (tracemalloc)
+- Le temps CPU consommé sur toute la durée des sessions
+
+Deux scénarios sont mesurés : des minuteries sans affichage (un seul
+réveil, à l'échéance) et des minuteries qui produisent un tick par seconde.
+
+Utilisation:
+    python benchmarks/bench_async.py [N ...]
+"""
+
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pomodoro  # noqa: E402
+from pomodoro_async import compte_a_rebours_async  # noqa: E402
+
+
+DUREE_SECONDES = 3
+
+
+class SortieComptage(pomodoro.SortieNulle):
+    """Sortie sans affichage qui veut un tick par seconde et les compte."""
+
+    ticks = 0
+
+    def periode_ticks(self, duree_totale_secondes):
+        return 1.0
+
+    def trame(self, secondes_restantes):
+        SortieComptage.ticks += 1
+
+
+async def lancer(nombre, fabrique_sortie):
+    """Lance `nombre` minuteries et mesure mémoire et CPU."""
+    tracemalloc.start()
+    cpu_debut = time.process_time()
+    mur_debut = time.perf_counter()
+
+    taches = [
+        asyncio.ensure_future(compte_a_rebours_async(
+            DUREE_SECONDES / 60, "TRAVAIL", True, fabrique_sortie()))
+        for _ in range(nombre)
+    ]
+    # Mesure de la mémoire une fois toutes les minuteries démarrées
+    await asyncio.sleep(DUREE_SECONDES / 2)
+    memoire, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    await asyncio.gather(*taches)
+    cpu = time.process_time() - cpu_debut
+    mur = time.perf_counter() - mur_debut
+    return memoire / nombre, cpu / nombre, mur
+
+
+def main():
+    tailles = [int(n) for n in sys.argv[1:]] or [1_000, 10_000]
+    scenarios = [
+        ("sans affichage", pomodoro.SortieNulle),
+        ("tick 1 Hz", SortieComptage),
+    ]
+
+    print(f"Sessions de {DUREE_SECONDES} s, une seule boucle asyncio\n")
+    print(f"{'scénario':<16} {'minuteries':>10} {'mémoire/min.':>14} "
+          f"{'CPU/min.':>12} {'durée':>8}")
+    for nom, fabrique in scenarios:
+        for nombre in tailles:
+            memoire, cpu, mur = asyncio.run(lancer(nombre, fabrique))
+            print(f"{nom:<16} {nombre:>10} {memoire:>12.0f} o "
+                  f"{cpu * 1e6:>9.1f} µs {mur:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du client léger face à pymodoro autonome.
+===================================================
+
+Compare, dans des processus neufs, le temps de réponse des commandes:
+- `status` : pymodoro autonome (lecture du statut partagé) contre
+  pymodoroc transmettant la commande au démon
+- `start` : pymodoro autonome jusqu'à sa première trame contre pymodoroc
+  démarrant une minuterie dans le démon
+- Le client lancé avec `python -S` (sans le module site), plancher du
+  démarrage de l'interpréteur
+- L'aller-retour sur la socket du démon seul, dans un même processus
+
+Les fichiers .pyc sont compilés au préalable, comme pour un paquet installé.
+Le démon tourne dans un processus à part, avec un dossier d'exécution
+temporaire.
+
+Utilisation:
+    python benchmarks/bench_client.py [REPETITIONS]
+"""
+
+import compileall
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+from pomodoro_client import transmettre  # noqa: E402
+
+# Points d'entrée, comme les scripts `pymodoro` et `pymodoroc` installés
+AUTONOME = "import sys; sys.path.insert(0, {racine!r}); from pomodoro import main; main()"
+CLIENT = "import sys; sys.path.insert(0, {racine!r}); from pomodoro_client import main; main()"
+
+
+def commande(script, arguments, environnement, options=()):
+    """Construit la ligne de commande d'un point d'entrée."""
+    return [sys.executable, *options, "-c", script.format(racine=RACINE), *arguments]
+
+
+def duree_processus(ligne, environnement):
+    """
+    Lance un processus jusqu'à sa fin.
+
+    Returns:
+        float: Sa durée, en millisecondes.
+    """
+    debut = time.perf_counter()
+    subprocess.run(ligne, env=environnement, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - debut) * 1e3
+
+
+def premiere_trame(environnement):
+    """
+    Lance pymodoro autonome et attend sa première trame JSON.
+
+    Returns:
+        float: Le temps jusqu'à la trame, en millisecondes.
+    """
+    ligne = commande(AUTONOME, ["-w", "1", "-s", "--json", "--no-history"], environnement)
+    debut = time.perf_counter()
+    processus = subprocess.Popen(ligne, env=environnement, stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL)
+    try:
+        processus.stdout.readline()
+        return (time.perf_counter() - debut) * 1e3
+    finally:
+        processus.kill()
+        processus.wait()
+
+
+def mesurer(fonction, repetitions):
+    """Retourne le meilleur et le médian de `repetitions` mesures."""
+    mesures = sorted(fonction() for _ in range(repetitions))
+    return mesures[0], mesures[len(mesures) // 2]
+
+
+def afficher(nom, mesure):
+    meilleur, median = mesure
+    print(f"  {nom:<36}: {meilleur:7.2f} / {median:7.2f} ms")
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    compileall.compile_dir(RACINE, maxlevels=0, quiet=1)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        environnement = dict(os.environ, XDG_RUNTIME_DIR=dossier, XDG_DATA_HOME=dossier,
+                             APPDATA=dossier)
+        os.environ["XDG_RUNTIME_DIR"] = dossier
+        demon = subprocess.Popen(commande(AUTONOME, ["daemon", "-s"], environnement),
+                                 env=environnement, stdout=subprocess.PIPE,
+                                 stderr=subprocess.DEVNULL)
+        try:
+            demon.stdout.readline()
+
+            print(f"Commandes ({repetitions} lancements, meilleur / médian)")
+            afficher("status, pymodoro autonome", mesurer(
+                lambda: duree_processus(commande(AUTONOME, ["status"], environnement),
+                                        environnement), repetitions))
+            afficher("status, pymodoroc + démon", mesurer(
+                lambda: duree_processus(commande(CLIENT, ["status"], environnement),
+                                        environnement), repetitions))
+            afficher("status, python -S pymodoroc + démon", mesurer(
+                lambda: duree_processus(commande(CLIENT, ["status"], environnement, ["-S"]),
+                                        environnement), repetitions))
+            afficher("start, pymodoro jusqu'à la trame", mesurer(
+                lambda: premiere_trame(environnement), repetitions))
+            afficher("start, pymodoroc + démon", mesurer(
+                lambda: duree_processus(commande(CLIENT, ["start", "-w", "1"], environnement),
+                                        environnement), repetitions))
+            afficher("interpréteur seul (python -c pass)", mesurer(
+                lambda: duree_processus([sys.executable, "-c", "pass"], environnement),
+                repetitions))
+
+            class Puits:
+                def write(self, donnees):
+                    pass
+
+                def flush(self):
+                    pass
+
+            puits = Puits()
+            nombre = 1000
+            debut = time.perf_counter()
+            for _ in range(nombre):
+                transmettre(["status"], sortie=puits)
+            aller_retour = (time.perf_counter() - debut) / nombre * 1e6
+            print()
+            print(f"Aller-retour sur la socket du démon : {aller_retour:.0f} µs par commande")
+        finally:
+            transmettre(["shutdown"], sortie=open(os.devnull, "wb"))
+            demon.wait(5)
+
+
+if __name__ == "__main__":
+    main()
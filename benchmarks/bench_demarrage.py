@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark du démarrage à froid de pymodoro.
+===========================================
+
+pymodoro est lancé depuis des invites de shell et des scripts plusieurs fois
+par jour : le temps jusqu'à la première trame compte. Ce benchmark mesure,
+dans des processus neufs:
+- Le temps entre le début de l'exécution de Python (interpréteur prêt) et le
+  premier événement "session_start", comme le point d'entrée `pymodoro`
+- Le même temps, démarrage de l'interpréteur compris
+- Le coût de `import pomodoro` et de ses imports, selon `python -X importtime`
+
+Budget: moins de BUDGET_PREMIERE_TRAME_MS entre l'interpréteur prêt et la
+première trame (tests/test_demarrage.py le vérifie).
+
+Les fichiers .pyc sont compilés au préalable, comme pour un paquet installé.
+
+Utilisation:
+    python benchmarks/bench_demarrage.py [REPETITIONS]
+"""
+
+import compileall
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget du temps jusqu'à la première trame, interpréteur prêt (en ms)
+BUDGET_PREMIERE_TRAME_MS = 30
+
+# Processus lancé comme le point d'entrée `pymodoro` : il écrit son instant
+# de départ puis exécute main(), dont le premier événement JSON est la trame
+SCRIPT = (
+    "import sys, time\n"
+    "debut = time.monotonic()\n"
+    "sys.path.insert(0, sys.argv[1])\n"
+    "sys.argv[1:] = ['-w', '1', '-s', '--json']\n"
+    "sys.stdout.write('%r\\n' % debut)\n"
+    "from pomodoro import main\n"
+    "main()\n"
+)
+
+
+def premiere_trame(dossier_donnees):
+    """
+    Lance pymodoro dans un processus neuf et attend sa première trame.
+
+    Args:
+        dossier_donnees (str): Le dossier de données du processus, pour ne
+                               pas laisser de point de reprise ni de socket chez
+                               l'utilisateur.
+
+    Returns:
+        tuple: (ms depuis l'interpréteur prêt, ms depuis le lancement).
+    """
+    environnement = dict(os.environ, XDG_DATA_HOME=dossier_donnees, APPDATA=dossier_donnees,
+                         XDG_RUNTIME_DIR=dossier_donnees)
+    lancement = time.perf_counter()
+    processus = subprocess.Popen([sys.executable, "-c", SCRIPT, RACINE], env=environnement,
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        debut = float(processus.stdout.readline())
+        evenement = json.loads(processus.stdout.readline())
+        total = time.perf_counter() - lancement
+    finally:
+        processus.kill()
+        processus.wait()
+    return (evenement["mono"] - debut) * 1e3, total * 1e3
+
+
+def imports_pomodoro():
+    """
+    Retourne le détail de `import pomodoro` selon python -X importtime.
+
+    Returns:
+        list: Les couples (module, µs cumulées) : pomodoro lui-même, puis
+        ses imports directs du plus coûteux au moins coûteux.
+    """
+    resultat = subprocess.run([sys.executable, "-X", "importtime", "-c", "import pomodoro"],
+                              cwd=RACINE, capture_output=True, text=True, check=True)
+    enfants = []
+    for ligne in resultat.stderr.splitlines():
+        colonnes = ligne.split("|")
+        if len(colonnes) != 3 or not colonnes[1].strip().isdigit():
+            continue
+        cumule, nom = int(colonnes[1]), colonnes[2]
+        # importtime indente de deux espaces par niveau d'import
+        niveau = (len(nom) - len(nom.lstrip(" ")) - 1) // 2
+        if niveau == 1:
+            enfants.append((nom.strip(), cumule))
+        elif niveau == 0:
+            if nom.strip() == "pomodoro":
+                return [("pomodoro", cumule)] + sorted(enfants, key=lambda e: -e[1])
+            enfants = []
+    return []
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    compileall.compile_dir(RACINE, maxlevels=0, quiet=1)
+
+    with tempfile.TemporaryDirectory() as dossier:
+        mesures = [premiere_trame(dossier) for _ in range(repetitions)]
+    interne = sorted(m[0] for m in mesures)
+    total = sorted(m[1] for m in mesures)
+
+    print(f"Première trame ({repetitions} lancements, meilleur / médian)")
+    print(f"  interpréteur prêt → trame : {interne[0]:6.1f} / {interne[len(interne) // 2]:6.1f} ms"
+          f"   (budget {BUDGET_PREMIERE_TRAME_MS} ms)")
+    print(f"  lancement → trame         : {total[0]:6.1f} / {total[len(total) // 2]:6.1f} ms")
+    print()
+    print("import pomodoro (python -X importtime)")
+    for nom, cumule in imports_pomodoro()[:10]:
+        print(f"  {nom:<24}: {cumule / 1e3:6.2f} ms")
+
+    if interne[0] > BUDGET_PREMIERE_TRAME_MS:
+        print(f"\nBudget dépassé : {interne[0]:.1f} ms > {BUDGET_PREMIERE_TRAME_MS} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de charge du démon : retard d'ordonnancement à grande échelle.
+========================================================================
+
+Héberge N minuteries dans un seul OrdonnanceurMinuteries et laisse tourner
+la boucle réelle du démon. Chaque minuterie fait deux cycles (travail,
+pause, travail), avec des débuts répartis sur une fenêtre. La fenêtre et
+les durées grandissent avec N pour garder un débit d'environ
+TAUX_TRANSITIONS transitions par seconde : on mesure l'effet de la taille
+du tas sur le retard, pas la saturation du processeur.
+
+Le premier travail commence après une marge calibrée sur le coût d'ajout :
+la boucle démarre avant la première échéance, quelle que soit la taille.
+
+Rapporte, pour chaque taille:
+- Le temps d'ajout des minuteries et la mémoire par minuterie (tracemalloc,
+  mesurée sur un échantillon pour ne pas ralentir l'ajout)
+- Les percentiles p50/p90/p99/p99.9 et le maximum du retard entre
+  l'échéance d'une transition et son traitement
+
+Utilisation:
+    python benchmarks/bench_demon.py [N ...]   (défaut: 10000 100000 1000000)
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pomodoro import HorlogeSysteme  # noqa: E402
+from pomodoro_demon import OrdonnanceurMinuteries  # noqa: E402
+
+
+TAUX_TRANSITIONS = 50_000
+FENETRE_MINIMALE = 2.0
+PERCENTILES = (50, 90, 99, 99.9)
+ECHANTILLON = 10_000
+
+
+def remplir(ordonnanceur, nombre, origine, alea, fenetre=FENETRE_MINIMALE):
+    """
+    Ajoute `nombre` minuteries dont le début est tiré dans la fenêtre.
+
+    Le travail dure une fenêtre et la pause une demi-fenêtre (en secondes).
+    """
+    travail = fenetre / 60
+    for _ in range(nombre):
+        ordonnanceur.ajouter(duree_travail=travail, duree_pause=travail / 2,
+                             total_cycles=2, debut=origine + alea.random() * fenetre)
+
+
+def calibrer():
+    """Mesure le coût d'ajout et la mémoire d'une minuterie sur un échantillon."""
+    alea = random.Random(0)
+    ordonnanceur = OrdonnanceurMinuteries(horloge=HorlogeSysteme())
+    debut = time.perf_counter()
+    remplir(ordonnanceur, ECHANTILLON, 0.0, alea)
+    cout_ajout = (time.perf_counter() - debut) / ECHANTILLON
+
+    ordonnanceur = OrdonnanceurMinuteries(horloge=HorlogeSysteme())
+    tracemalloc.start()
+    remplir(ordonnanceur, ECHANTILLON, 0.0, alea)
+    memoire, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cout_ajout, memoire / ECHANTILLON
+
+
+def mesurer(nombre, cout_ajout, graine=1):
+    """Héberge `nombre` minuteries et mesure le retard de leurs transitions."""
+    alea = random.Random(graine)
+    ordonnanceur = OrdonnanceurMinuteries(horloge=HorlogeSysteme(),
+                                          capacite_retards=3 * nombre)
+
+    fenetre = max(FENETRE_MINIMALE, 3 * nombre / (3.5 * TAUX_TRANSITIONS))
+    debut_ajout = time.perf_counter()
+    marge = 0.5 + 2 * cout_ajout * nombre
+    remplir(ordonnanceur, nombre, ordonnanceur.horloge.maintenant() + marge, alea, fenetre)
+    duree_ajout = time.perf_counter() - debut_ajout
+
+    cpu_debut = time.process_time()
+    thread = ordonnanceur.demarrer()
+    while len(ordonnanceur):
+        time.sleep(0.05)
+    ordonnanceur.arreter()
+    thread.join()
+    cpu = time.process_time() - cpu_debut
+
+    return duree_ajout, cpu, ordonnanceur
+
+
+def main():
+    tailles = [int(n) for n in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    cout_ajout, memoire = calibrer()
+
+    entete = "".join(f"{'p' + format(p, 'g'):>9}" for p in PERCENTILES)
+    print(f"{'minuteries':>11} {'ajout':>8} {'mémoire/min':>12} {'transitions':>12} "
+          f"{'CPU':>7}{entete}{'max':>9}   (retards en ms)")
+    for nombre in tailles:
+        duree_ajout, cpu, ordonnanceur = mesurer(nombre, cout_ajout)
+        valeurs = ordonnanceur.retards.percentiles(*PERCENTILES)
+        colonnes = "".join(f"{valeurs[p] * 1000:>9.2f}" for p in PERCENTILES)
+        print(f"{nombre:>11,} {duree_ajout:>7.2f}s {memoire:>10.0f} o "
+              f"{ordonnanceur.transitions:>12,} {cpu:>6.2f}s{colonnes}"
+              f"{ordonnanceur.retards.maximum * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark du bus d'événements sur la boucle des trames.
+=============================================================
+
+Déroule des sessions de 25 minutes (1501 trames) en temps virtuel, sortie
+nulle, et rapporte le coût CPU par trame:
+- Sans abonné (le moteur ne construit aucun événement)
+- Avec un abonné au cycle de vie seul (aucun événement par trame)
+- Avec un abonné synchrone aux ticks
+- Avec un abonné différé aux ticks, qui dort 1 ms par événement : son
+  retard s'accumule dans le thread de fond, jamais dans les trames
+
+Utilisation:
+    python benchmarks/bench_evenements.py
+"""
+
+import io
+import os
+import sys
+import time
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pomodoro  # noqa: E402
+
+
+REPETITIONS = 20
+TRAMES = 25 * 60 + 1
+
+
+class SortieMuette(pomodoro.SortieNulle):
+    """Sortie nulle cadencée à une trame par seconde, comme le terminal."""
+
+    def periode_ticks(self, duree_totale_secondes):
+        return 1.0
+
+
+def mesurer(nom, abonner):
+    """Mesure le coût CPU par trame avec les abonnés installés par `abonner`."""
+    with pomodoro.BusEvenements() as bus:
+        abonner(bus)
+        with pomodoro.contexte_temporaire(evenements=bus, sortie=SortieMuette(),
+                                          horloge=pomodoro.HorlogeVirtuelle()), \
+                contextlib.redirect_stdout(io.StringIO()):
+            pomodoro.compte_a_rebours(25, mode_silencieux=True)
+            debut = time.perf_counter()
+            for _ in range(REPETITIONS):
+                pomodoro.compte_a_rebours(25, mode_silencieux=True)
+            par_trame = (time.perf_counter() - debut) / (REPETITIONS * TRAMES)
+    print(f"{nom:<30} {par_trame * 1e9:8.0f} ns/trame   perdus {bus.perdus}")
+
+
+def main():
+    def ignorer(nom, donnees):
+        pass
+
+    def lent(nom, donnees):
+        time.sleep(0.001)
+
+    mesurer("sans abonné", lambda bus: None)
+    mesurer("cycle de vie seul", lambda bus: bus.abonner(ignorer))
+    mesurer("ticks, synchrone", lambda bus: bus.abonner(ignorer, ticks=True))
+    mesurer("ticks, différé (1 ms chacun)",
+            lambda bus: bus.abonner(lent, ticks=True, differe=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de l'historique des sessions : ajout et lecture.
+==========================================================
+
+Mesure, pour un historique d'une année (environ 50 000 sessions):
+- Le coût d'un ajout (ouverture O_APPEND, un os.write, fermeture)
+- L'ouverture de la projection mémoire et l'accès au dernier enregistrement
+- La lecture complète de l'historique
+
+Utilisation:
+    python benchmarks/bench_historique.py [NOMBRE_SESSIONS]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pomodoro_historique import (  # noqa: E402
+    EnregistrementSession,
+    Historique,
+    JournalHistorique,
+    encoder_enregistrement,
+    lire_historique,
+)
+
+
+REPETITIONS = 20
+
+
+def meilleur_temps(fonction):
+    """Retourne le meilleur temps d'exécution sur REPETITIONS essais."""
+    meilleur = float('inf')
+    for _ in range(REPETITIONS):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return meilleur
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "historique.bin")
+        journal = JournalHistorique(chemin)
+        session = EnregistrementSession("TRAVAIL", 1500.0, 1500.0, 1.7e9, 1.7e9 + 1500, False, 1)
+        journal.ajouter(encoder_enregistrement(session) * nombre)
+
+        ajout = meilleur_temps(lambda: journal.consigner("PAUSE", 300, 300, 0.0, 300.0))
+
+        def dernier():
+            with Historique(chemin) as historique:
+                return historique[-1]
+
+        acces = meilleur_temps(dernier)
+        lecture = meilleur_temps(lambda: lire_historique(chemin))
+        taille = os.path.getsize(chemin)
+
+    print(f"Historique : {nombre:,} sessions, {taille / 1024:.0f} Kio")
+    print(f"  ajout d'une session       : {ajout * 1e6:8.1f} µs")
+    print(f"  ouverture + dernière      : {acces * 1e6:8.1f} µs")
+    print(f"  lecture complète          : {lecture * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
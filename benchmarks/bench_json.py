@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la sérialisation des événements JSON.
+==================================================
+
+Mesure le coût CPU d'un événement "tick" du mode --json, comparé à une
+sérialisation naïve par json.dumps, ainsi que la part de CPU consommée
+par un flux de ticks à 10 Hz.
+
+Utilisation:
+    python benchmarks/bench_json.py
+"""
+
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pomodoro  # noqa: E402
+
+
+NOMBRE_TICKS = 100_000
+
+
+class TamponNul(io.RawIOBase):
+    """Tampon binaire qui jette les données écrites."""
+
+    def writable(self):
+        return True
+
+    def write(self, donnees):
+        return len(donnees)
+
+
+class FluxNul:
+    """Flux texte dont le tampon binaire jette les données."""
+
+    buffer = TamponNul()
+
+    def write(self, texte):
+        return len(texte)
+
+    def flush(self):
+        pass
+
+
+def mesurer(nom, fonction):
+    """Mesure le temps CPU moyen d'un appel."""
+    debut = time.process_time()
+    for _ in range(NOMBRE_TICKS):
+        fonction()
+    cout = (time.process_time() - debut) / NOMBRE_TICKS
+    print(f"{nom:<24} {cout * 1e9:8.0f} ns/événement   "
+          f"CPU à 10 Hz : {cout * 10 * 100:.5f} %")
+    return cout
+
+
+def main():
+    flux = FluxNul()
+    horloge = pomodoro.contexte.horloge
+
+    def tick_naif():
+        mono = horloge.maintenant()
+        flux.buffer.write((json.dumps({
+            "event": "tick", "session": "work", "remaining": 1234.5,
+            "mono": mono, "wall": horloge.heure_murale(),
+        }, separators=(",", ":")) + "\n").encode("utf-8"))
+
+    sortie = pomodoro.SortieJSON(10, flux=flux)
+    with pomodoro.contexte_temporaire(sortie=sortie):
+        sortie.debut_session("TRAVAIL", 25, "🍅", "")
+
+        print(f"Sérialisation de {NOMBRE_TICKS} ticks\n")
+        naif = mesurer("json.dumps", tick_naif)
+        rapide = mesurer("SortieJSON.trame", lambda: sortie.trame(1234))
+        print(f"\nGain par événement : x{naif / rapide:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark du rendu des trames de progression.
+===================================================
+
+Compare, pour une session de 25 minutes (1501 trames), le rendu historique
+(f-string reconstruite puis encodée à chaque tick) au rendu précalculé de
+RenduProgression (bytearray réutilisé, un seul os.write par trame).
+
+Mesures rapportées pour chaque méthode:
+- Temps CPU moyen par trame (time.process_time)
+- Pic de mémoire allouée pendant le rendu (tracemalloc)
+
+Mesure ensuite le coût par trame de la barre au huitième de case (--fps)
+à 1, 10 et 30 trames par seconde : il doit rester le même quelle que soit
+la fréquence.
+
+Utilisation:
+    python benchmarks/bench_rendu.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pomodoro  # noqa: E402
+
+
+DUREE_SECONDES = 25 * 60
+REPETITIONS = 50
+FREQUENCES = (1, 10, 30)
+
+
+def rendu_historique(descripteur, secondes_restantes):
+    """Reproduit le rendu d'une trame avant RenduProgression."""
+    progression = 1 - (secondes_restantes / DUREE_SECONDES)
+    rempli = int(30 * progression)
+    barre = "█" * rempli + "░" * (30 - rempli)
+    temps_formate = pomodoro.formater_temps(secondes_restantes)
+    message = f"    🍅 [{barre}] \033[91m{temps_formate}\033[0m restant"
+    os.write(descripteur, ('\r' + message).encode("utf-8"))
+
+
+def mesurer(nom, fonction, valeurs):
+    """Mesure le coût CPU par trame et le pic d'allocation d'une méthode."""
+    # Échauffement
+    for secondes in valeurs:
+        fonction(secondes)
+
+    debut = time.process_time()
+    for _ in range(REPETITIONS):
+        for secondes in valeurs:
+            fonction(secondes)
+    cpu_par_trame = (time.process_time() - debut) / (REPETITIONS * len(valeurs))
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    for secondes in valeurs:
+        fonction(secondes)
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{nom:<22} {cpu_par_trame * 1e9:10.0f} ns/trame   pic alloc {pic:6d} o")
+    return cpu_par_trame
+
+
+def mesurer_frequences(descripteur):
+    """Mesure le coût CPU par trame de la barre au huitième selon la fréquence."""
+    print("\nBarre au huitième de case (--fps), une session de 25 minutes\n")
+    for fps in FREQUENCES:
+        rendu = pomodoro.RenduProgression("🍅", "\033[91m", DUREE_SECONDES, huitiemes=True)
+        rendu.descripteur = descripteur
+        trames = [(DUREE_SECONDES - indice // fps, DUREE_SECONDES - indice / fps)
+                  for indice in range(DUREE_SECONDES * fps + 1)]
+        for secondes, restant in trames:
+            rendu.afficher(secondes, restant)
+        repetitions = max(REPETITIONS // fps, 1)
+        debut = time.process_time()
+        for _ in range(repetitions):
+            for secondes, restant in trames:
+                rendu.afficher(secondes, restant)
+        cpu_par_trame = (time.process_time() - debut) / (repetitions * len(trames))
+        print(f"{fps:>3} trame(s)/s  {len(trames):>6} trames  {cpu_par_trame * 1e9:8.0f} ns/trame")
+
+
+def main():
+    descripteur = os.open(os.devnull, os.O_WRONLY)
+    valeurs = list(range(DUREE_SECONDES, -1, -1))
+    try:
+        rendu = pomodoro.RenduProgression("🍅", "\033[91m", DUREE_SECONDES)
+        rendu.descripteur = descripteur
+
+        print(f"Rendu de {len(valeurs)} trames x {REPETITIONS} répétitions\n")
+        ancien = mesurer("historique (f-string)",
+                         lambda s: rendu_historique(descripteur, s), valeurs)
+        nouveau = mesurer("RenduProgression", rendu.afficher, valeurs)
+        print(f"\nGain CPU par trame : x{ancien / nouveau:.2f}")
+        mesurer_frequences(descripteur)
+    finally:
+        os.close(descripteur)
+
+
+if __name__ == "__main__":
+    main()
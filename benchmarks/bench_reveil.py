@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark des réveils des ticks : gigue et temps CPU.
+=====================================================
+
+Compare plusieurs façons d'attendre les ticks d'une session, sur N ticks
+de période P:
+
+- La boucle historique time.sleep(P) : chaque attente est relative, le
+  retard de chaque réveil s'ajoute aux suivants (dérive)
+- HorlogeSysteme.dormir_jusqua : time.sleep() jusqu'à l'échéance absolue
+- HorlogeReveil (pomodoro_reveil) : select() relancé jusqu'à l'échéance
+  absolue, avec la marge des minuteries par défaut, minimale (--precise)
+  et large (50 ms, regroupement des réveils)
+- HorlogeReveil avec une minuterie timerfd, si os.timerfd_create existe
+
+Rapporte, pour chaque méthode:
+- Les percentiles p50/p99 et le maximum du retard de chaque réveil sur son
+  échéance (debut + i * P)
+- Le temps CPU consommé par tick (time.process_time)
+
+Utilisation:
+    python benchmarks/bench_reveil.py [N] [P]   (défaut: 200 ticks de 0.02 s)
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pomodoro  # noqa: E402
+from pomodoro_reveil import MARGE_PRECISE, HorlogeReveil, lire_marge_timer  # noqa: E402
+
+
+# Marge large : le noyau peut retarder chaque réveil de 50 ms
+MARGE_LARGE = 50_000_000
+
+
+def boucle_sleep(periode, nombre):
+    """Reproduit la boucle historique : time.sleep(période) entre deux ticks."""
+    debut = time.monotonic()
+    retards = []
+    for tick in range(1, nombre + 1):
+        time.sleep(periode)
+        retards.append(time.monotonic() - (debut + tick * periode))
+    return retards
+
+
+def boucle_echeances(horloge, periode, nombre):
+    """Attend chaque échéance absolue avec l'horloge fournie."""
+    debut = time.monotonic()
+    retards = []
+    for tick in range(1, nombre + 1):
+        echeance = debut + tick * periode
+        horloge.dormir_jusqua(echeance)
+        retards.append(time.monotonic() - echeance)
+    return retards
+
+
+def percentile(valeurs, rang):
+    """Percentile au rang le plus proche d'une liste triée."""
+    return valeurs[min(int(rang * len(valeurs)), len(valeurs) - 1)]
+
+
+def mesurer(nom, boucle, nombre):
+    """Exécute une boucle de ticks et affiche sa gigue et son coût CPU."""
+    cpu = time.process_time()
+    retards = sorted(boucle())
+    cpu_par_tick = (time.process_time() - cpu) / nombre
+    print(f"{nom:<30} {percentile(retards, 0.50) * 1e6:9.0f} {percentile(retards, 0.99) * 1e6:9.0f}"
+          f" {retards[-1] * 1e6:9.0f} µs   {cpu_par_tick * 1e6:7.1f} µs CPU/tick")
+
+
+def main():
+    nombre = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    periode = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+
+    print(f"{nombre} ticks de {periode * 1000:g} ms, marge des minuteries par défaut : "
+          f"{lire_marge_timer()} ns\n")
+    print(f"{'':<30} {'p50':>9} {'p99':>9} {'max':>9}")
+    mesurer("time.sleep(période)", lambda: boucle_sleep(periode, nombre), nombre)
+    mesurer("HorlogeSysteme (sleep absolu)",
+            lambda: boucle_echeances(pomodoro.HorlogeSysteme(), periode, nombre), nombre)
+
+    variantes = [
+        ("select(), marge par défaut", HorlogeReveil(minuterie=False)),
+        ("select(), marge 1 µs", HorlogeReveil(MARGE_PRECISE, minuterie=False)),
+        ("select(), marge 50 ms", HorlogeReveil(MARGE_LARGE, minuterie=False)),
+    ]
+    if hasattr(os, "timerfd_create"):
+        variantes.append(("timerfd (--precise)", HorlogeReveil(MARGE_PRECISE)))
+    for nom, horloge in variantes:
+        with horloge:
+            mesurer(nom, lambda: boucle_echeances(horloge, periode, nombre), nombre)
+    if not hasattr(os, "timerfd_create"):
+        print("\n(timerfd non mesuré : os.timerfd_create requiert Python 3.13+)")
+
+
+if __name__ == "__main__":
+    main()
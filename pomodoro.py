@@ -11,11 +11,18 @@ Auteur: Lukrlier (Lurlier Inc)
 Licence: MIT
 """
 
-import argparse
 import sys
 import time
-import platform
 import os
+import math
+import contextlib
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Chaque invocation de pymodoro paie ses imports avant la première trame :
+# les modules peu utilisés (argparse, json, platform, winsound, historique,
+# reprise, pilotage) sont importés là où ils servent. Budget et mesure :
+# benchmarks/bench_demarrage.py.
 
 
 # =============================================================================
@@ -30,7 +37,8 @@ def configurer_terminal():
     pas tous les caractères Unicode (comme les emojis). Cette fonction configure
     le terminal pour utiliser UTF-8.
     """
-    if platform.system() == "Windows":
+    # sys.platform évite d'importer le module platform hors de Windows
+    if sys.platform == "win32":
         # Active le mode UTF-8 pour la console Windows
         os.system('chcp 65001 >nul 2>&1')
         # Reconfigure stdout pour utiliser UTF-8
@@ -50,6 +58,22 @@ DUREE_PAUSE_DEFAUT = 5
 # Durée par défaut d'une pause longue (en minutes)
 DUREE_PAUSE_LONGUE_DEFAUT = 15
 
+# Délai entre la fin du travail et la pause en mode automatique (en secondes)
+DELAI_ENCHAINEMENT_AUTO = 2
+
+# La pause qui suit chaque N-ième cycle est une pause longue
+CYCLES_PAUSE_LONGUE = 4
+
+# Écart entre les deux BEL du son de fin, sans lecteur audio (en secondes)
+ECART_BEL = 0.3
+
+# Valeurs par défaut de --beep-freq, --beep-ms et --hook-timeout. Ce sont
+# celles de pomodoro_son et pomodoro_crochets, reprises ici pour que le
+# parseur n'importe pas ces modules à chaque démarrage
+FREQUENCE_SON_DEFAUT = 1000
+DUREE_SON_DEFAUT_MS = 500
+DELAI_CROCHET_DEFAUT = 30.0
+
 
 # =============================================================================
 # FONCTIONS UTILITAIRES
@@ -91,29 +115,38 @@ def emettre_son():
 
     - Windows: Utilise le beep système via winsound
     - macOS: Utilise la commande 'afplay' avec un son système
-    - Linux: Utilise le caractère BEL (\\a) pour le terminal
+    - Linux: Joue la tonalité synthétisée par le lecteur audio du contexte
+      (paplay ou aplay), à défaut le caractère BEL (\\a) pour le terminal ;
+      le second BEL est émis par un minuteur, sans attendre
 
     En cas d'échec, affiche simplement "BEEP!" dans le terminal.
     """
+    import platform
     systeme = platform.system()
+    lecteur = contexte.lecteur_audio
 
     try:
         if systeme == "Windows":
             # Sous Windows, on utilise le module winsound
             import winsound
-            # Fréquence: 1000 Hz, Durée: 500 ms
-            winsound.Beep(1000, 500)
-            time.sleep(0.1)
-            winsound.Beep(1000, 500)
+            # Fréquence: 1000 Hz, Durée: 500 ms (ou celles du lecteur audio)
+            frequence, duree_ms = (1000, 500) if lecteur is None else (
+                int(lecteur.frequence), lecteur.duree_ms)
+            winsound.Beep(frequence, duree_ms)
+            contexte.horloge.dormir(0.1)
+            winsound.Beep(frequence, duree_ms)
         elif systeme == "Darwin":  # macOS
             # Sous macOS, on utilise le son système "Glass"
-            import os
             os.system('afplay /System/Library/Sounds/Glass.aiff')
         else:  # Linux et autres systèmes Unix
-            # Utilise le caractère BEL pour émettre un bip terminal
-            print('\a', end='', flush=True)
-            time.sleep(0.3)
-            print('\a', end='', flush=True)
+            # Tonalité en cache, écrite au lecteur audio déjà lancé ; sans
+            # lecteur, utilise le caractère BEL pour émettre un bip terminal.
+            # Le second BEL part d'un minuteur : la file de notifications
+            # n'attend pas, et la sortie du programme l'attend au besoin
+            if lecteur is None or not lecteur.jouer():
+                import threading
+                print('\a', end='', flush=True)
+                threading.Timer(ECART_BEL, print, ('\a',), {'end': '', 'flush': True}).start()
     except Exception:
         # Si tout échoue, on affiche un message textuel
         print("\n🔔 BEEP! BEEP!")
@@ -151,79 +184,1549 @@ def afficher_fin_session(type_session, message_emoji):
     print("\n")
 
 
+# =============================================================================
+# HORLOGES
+# =============================================================================
+
+class Horloge:
+    """
+    Interface commune des horloges utilisées par le moteur de minuterie.
+
+    Le moteur ne lit jamais l'heure et ne dort jamais directement : il passe
+    par l'horloge du contexte d'exécution. Cela permet de remplacer le temps
+    réel par un temps virtuel (tests, simulations) sans toucher au moteur.
+
+    Attributs:
+        temps_reel (bool): True si dormir() attend réellement : une attente
+                           peut alors être remplacée par un select() borné.
+        minuterie: Si fournie, un objet sélectionnable (fileno()) armé par
+                   armer(echeance), lisible à l'échéance et vidé par lire() :
+                   la boucle des ticks l'attend au lieu d'un select() borné
+                   (voir pomodoro_reveil).
+    """
+
+    temps_reel = False
+    minuterie = None
+
+    def maintenant(self):
+        """
+        Returns:
+            float: L'instant courant sur une échelle monotone, en secondes.
+        """
+        raise NotImplementedError
+
+    def heure_murale(self):
+        """
+        Returns:
+            float: L'heure murale courante (timestamp Unix), en secondes.
+        """
+        raise NotImplementedError
+
+    def dormir(self, secondes):
+        """
+        Suspend l'exécution pendant une durée relative.
+
+        Args:
+            secondes (float): La durée d'attente en secondes.
+        """
+        raise NotImplementedError
+
+    def dormir_jusqua(self, echeance):
+        """
+        Suspend l'exécution jusqu'à une échéance absolue.
+
+        Args:
+            echeance (float): L'instant de réveil, sur l'échelle de maintenant().
+        """
+        attente = echeance - self.maintenant()
+        if attente > 0:
+            self.dormir(attente)
+
+    def temps_suspendu(self):
+        """
+        Mesure le temps passé en veille par le système, qui échappe à maintenant().
+
+        Returns:
+            float: Le cumul des mises en veille sur une échelle propre à
+            l'horloge, en secondes : seules les différences ont un sens.
+            Toujours 0.0 si l'horloge ne sait pas le mesurer.
+        """
+        return 0.0
+
+
+# Horloge qui continue d'avancer pendant la mise en veille (Linux) : son
+# écart avec CLOCK_MONOTONIC, figée pendant la veille, en mesure la durée
+_HORLOGE_DEMARRAGE = getattr(time, "CLOCK_BOOTTIME", None)
+
+# Sort d'une mise en veille ou d'un arrêt (Ctrl+Z) pendant une session :
+# en pause pendant l'interruption, ou interruption comptée comme écoulée
+VEILLE_PAUSE = "pause"
+VEILLE_COMPTEE = "count"
+POLITIQUES_VEILLE = (VEILLE_PAUSE, VEILLE_COMPTEE)
+
+# Écart minimal entre les deux horloges pour conclure à une mise en veille
+# (en secondes)
+SEUIL_VEILLE = 0.5
+
+
+class HorlogeSysteme(Horloge):
+    """
+    Horloge réelle basée sur time.monotonic(), time.time() et time.sleep().
+
+    Sous Linux, la mise en veille est mesurée par l'écart entre
+    CLOCK_BOOTTIME et CLOCK_MONOTONIC.
+    """
+
+    temps_reel = True
+
+    def maintenant(self):
+        return time.monotonic()
+
+    def temps_suspendu(self):
+        if _HORLOGE_DEMARRAGE is None:
+            return 0.0
+        return time.clock_gettime(_HORLOGE_DEMARRAGE) - time.monotonic()
+
+    def heure_murale(self):
+        return time.time()
+
+    def dormir(self, secondes):
+        time.sleep(secondes)
+
+
+class HorlogeVirtuelle(Horloge):
+    """
+    Horloge simulée dont le temps n'avance que lorsqu'on dort.
+
+    Chaque appel à dormir() fait avancer le temps instantanément : une session
+    de 25 minutes s'exécute alors aussi vite que le rendu de ses trames.
+    mettre_en_veille() simule une mise en veille du système, comme sous
+    Linux : l'heure murale avance, pas le temps monotone.
+
+    Args:
+        depart (float): L'instant monotone initial.
+        heure_murale_depart (float): Le timestamp Unix correspondant au départ.
+
+    Exemple:
+        >>> horloge = HorlogeVirtuelle()
+        >>> horloge.dormir(1500)
+        >>> horloge.maintenant()
+        1500.0
+    """
+
+    def __init__(self, depart=0.0, heure_murale_depart=1_700_000_000.0):
+        self.depart = float(depart)
+        self.instant = float(depart)
+        self.heure_murale_depart = heure_murale_depart
+        self.nombre_attentes = 0
+        self.suspendu = 0.0
+
+    def maintenant(self):
+        return self.instant
+
+    def heure_murale(self):
+        return self.heure_murale_depart + (self.instant - self.depart) + self.suspendu
+
+    def temps_suspendu(self):
+        return self.suspendu
+
+    def mettre_en_veille(self, secondes):
+        """
+        Simule une mise en veille du système.
+
+        Args:
+            secondes (float): La durée de la veille.
+        """
+        self.suspendu += secondes
+
+    def dormir(self, secondes):
+        self.nombre_attentes += 1
+        if secondes > 0:
+            self.instant += secondes
+
+    def avancer(self, secondes):
+        """
+        Fait avancer le temps sans compter d'attente (retard simulé).
+
+        Args:
+            secondes (float): La durée dont le temps avance.
+        """
+        self.instant += secondes
+
+
+# =============================================================================
+# BUS D'ÉVÉNEMENTS
+# =============================================================================
+
+# Événements du cycle de vie, publiés aux changements d'état
+EVENEMENTS_CYCLE_DE_VIE = ("session_debut", "session_fin", "session_annulee",
+                           "cycle_debut", "cycle_fin", "plan_fin")
+
+# Événement publié à chaque trame (abonnement explicite)
+EVENEMENT_TICK = "session_tick"
+
+# Nombre d'événements en attente des abonnés différés ; au-delà, les plus
+# anciens sont perdus plutôt que de retenir le moteur
+CAPACITE_EVENEMENTS_DIFFERES = 1024
+
+
+class BusEvenements:
+    """
+    Publie les événements du moteur à des abonnés, sans coût s'il n'y en a pas.
+
+    Le moteur ne construit le dictionnaire d'un événement qu'après avoir
+    vérifié qu'il est écouté (`ecoute()`), et relève les abonnés aux ticks
+    une fois par session (`abonnes()`) : sans abonné, une trame ne paie que
+    le test d'un tuple vide.
+
+    Un abonné est appelé avec (nom de l'événement, données). Il reçoit par
+    défaut les seuls événements du cycle de vie ; les ticks sont sur demande.
+    Un abonné différé est appelé depuis un thread de fond, lancé au premier
+    événement : un abonné lent ne retarde jamais une trame. Les exceptions
+    des abonnés sont comptées, jamais propagées au moteur.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc distribue
+    les événements différés encore en attente.
+
+    Attributs:
+        echecs (int): Les appels d'abonnés qui ont levé une exception.
+        perdus (int): Les événements différés écartés, file pleine.
+
+    Exemple:
+        >>> bus = BusEvenements()
+        >>> bus.abonner(lambda nom, donnees: print(nom, donnees["cycle"]),
+        ...             ["cycle_fin"])
+        >>> bus.publier("cycle_fin", {"cycle": 1, "total_cycles": 4})
+        cycle_fin 1
+    """
+
+    def __init__(self, capacite_differee=CAPACITE_EVENEMENTS_DIFFERES):
+        self.capacite_differee = capacite_differee
+        self.echecs = 0
+        self.perdus = 0
+        self._abonnes = {}
+        self._file = None
+        self._condition = None
+        self._thread = None
+        self._arret = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    # -------------------------------------------------------------------------
+    # Abonnements
+    # -------------------------------------------------------------------------
+
+    def abonner(self, abonne, evenements=None, ticks=False, differe=False):
+        """
+        Abonne une fonction à des événements.
+
+        Args:
+            abonne (callable): Appelé avec (nom de l'événement, données).
+            evenements (list): Les événements du cycle de vie écoutés
+                               (tous si None).
+            ticks (bool): Si True, reçoit aussi EVENEMENT_TICK à chaque trame.
+            differe (bool): Si True, est appelé depuis le thread de fond.
+
+        Raises:
+            ValueError: Si un événement est inconnu.
+        """
+        noms = list(EVENEMENTS_CYCLE_DE_VIE if evenements is None else evenements)
+        if ticks:
+            noms.append(EVENEMENT_TICK)
+        inconnus = set(noms) - set(EVENEMENTS_CYCLE_DE_VIE) - {EVENEMENT_TICK}
+        if inconnus:
+            raise ValueError(f"événement(s) inconnu(s) : {', '.join(sorted(inconnus))}")
+
+        # Les tuples sont remplacés, jamais modifiés : une publication en
+        # cours parcourt toujours un instantané cohérent
+        for nom in dict.fromkeys(noms):
+            self._abonnes[nom] = self._abonnes.get(nom, ()) + ((abonne, differe),)
+
+    def desabonner(self, abonne):
+        """
+        Retire une fonction de tous ses abonnements.
+
+        Args:
+            abonne (callable): La fonction passée à abonner().
+        """
+        for nom, abonnes in list(self._abonnes.items()):
+            restants = tuple(a for a in abonnes if a[0] != abonne)
+            if restants:
+                self._abonnes[nom] = restants
+            else:
+                del self._abonnes[nom]
+
+    def ecoute(self, evenement):
+        """Retourne True si au moins un abonné écoute l'événement."""
+        return evenement in self._abonnes
+
+    def abonnes(self, evenement):
+        """
+        Retourne les abonnés d'un événement, à relever hors de la boucle chaude.
+
+        Returns:
+            tuple: Les abonnés (tuple vide sans abonné).
+        """
+        return self._abonnes.get(evenement, ())
+
+    # -------------------------------------------------------------------------
+    # Publication
+    # -------------------------------------------------------------------------
+
+    def publier(self, evenement, donnees, abonnes=None):
+        """
+        Transmet un événement à ses abonnés.
+
+        Args:
+            evenement (str): Le nom de l'événement.
+            donnees (dict): Les données de l'événement.
+            abonnes (tuple): Les abonnés relevés par abonnes() (ceux du
+                             moment si None).
+        """
+        if abonnes is None:
+            abonnes = self._abonnes.get(evenement, ())
+        for abonne, differe in abonnes:
+            if differe:
+                self._deposer(abonne, evenement, donnees)
+            else:
+                self._appeler(abonne, evenement, donnees)
+
+    def _appeler(self, abonne, evenement, donnees):
+        try:
+            abonne(evenement, donnees)
+        except Exception:
+            self.echecs += 1
+
+    def _deposer(self, abonne, evenement, donnees):
+        """Dépose un événement pour le thread de fond, lancé au premier dépôt."""
+        import threading
+        if self._condition is None:
+            import collections
+            self._file = collections.deque()
+            self._condition = threading.Condition()
+        with self._condition:
+            if len(self._file) >= self.capacite_differee:
+                self._file.popleft()
+                self.perdus += 1
+            self._file.append((abonne, evenement, donnees))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._distribuer,
+                                                name="pymodoro-evenements", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _distribuer(self):
+        """Boucle du thread de fond : vide la file jusqu'à fermer()."""
+        while True:
+            with self._condition:
+                while not self._file and not self._arret:
+                    self._condition.wait()
+                if not self._file:
+                    return
+                abonne, evenement, donnees = self._file.popleft()
+            self._appeler(abonne, evenement, donnees)
+
+    def fermer(self):
+        """
+        Distribue les événements différés en attente et arrête le thread de fond.
+
+        Le bus reste utilisable : un nouvel événement différé relance le thread.
+        """
+        if self._thread is None:
+            return
+        with self._condition:
+            self._arret = True
+            self._condition.notify()
+        self._thread.join()
+        self._thread = None
+        self._arret = False
+
+
+# =============================================================================
+# CONTEXTE D'EXÉCUTION
+# =============================================================================
+
+class ContexteExecution:
+    """
+    Regroupe les services partagés par le moteur de minuterie.
+
+    Les fonctions du moteur gardent leur signature historique et consultent
+    ce contexte pour tout ce qui est remplaçable (horloge, résolution des
+    ticks, mode de sortie). main() le configure à partir des arguments ; les tests et les
+    simulations le modifient, par exemple avec `unittest.mock.patch.object`.
+
+    Attributs:
+        horloge (Horloge): L'horloge utilisée pour lire l'heure et dormir.
+        periode_tick (float): L'intervalle entre deux trames, en secondes.
+        sortie: Le mode de sortie des sessions (SortieTerminal,
+                SortieJournal ou SortieJSON ; mode terminal si None).
+        historique (JournalHistorique): Le journal où chaque session est
+                                        consignée (aucun si None).
+        numero_cycle (int): Le cycle en cours, 0 hors d'un cycle.
+        point_reprise (PointDeReprise): Sauvegarde la position du plan de
+                                        cycles à chaque session (aucune si None).
+        notifications (FileNotifications): La file où sont déposées les
+                                           notifications (appel direct et
+                                           bloquant si None).
+        lecteur_audio (LecteurAudio): Joue la tonalité synthétisée sous
+                                      Linux (caractère BEL si None).
+        controle (ServeurControle): Sert la socket de pilotage pendant
+                                    l'attente des ticks (aucune si None).
+        statut (PublicationStatut): Publie l'état des sessions pour les
+                                    invites et barres d'état (aucun si None).
+        evenements (BusEvenements): Le bus où le moteur publie le cycle de
+                                    vie des sessions, des cycles et du plan.
+        metriques (Metriques): Les métriques où le moteur observe le retard
+                               des ticks et le temps de rendu (aucune si None).
+        profil (ProfilTicks): Enregistre le réveil et le coût de la trame de
+                              chaque tick, pour --profile (aucun si None).
+        clavier (Clavier): Sert les touches du terminal et l'invite entre
+                           deux sessions (input() si None).
+        politique_veille (str): Le sort d'une mise en veille ou d'un arrêt
+                                (Ctrl+Z) pendant une session : VEILLE_PAUSE
+                                ou VEILLE_COMPTEE.
+        suspension (GestionSuspension): Met la session suivie en pause
+                                        autour de Ctrl+Z (aucune si None).
+    """
+
+    def __init__(self):
+        self.horloge = HorlogeSysteme()
+        self.periode_tick = 1.0
+        self.sortie = None
+        self.historique = None
+        self.numero_cycle = 0
+        self.point_reprise = None
+        self.notifications = None
+        self.lecteur_audio = None
+        self.controle = None
+        self.statut = None
+        self.evenements = BusEvenements()
+        self.metriques = None
+        self.profil = None
+        self.clavier = None
+        self.politique_veille = VEILLE_PAUSE
+        self.suspension = None
+
+
+# Contexte global utilisé par compte_a_rebours() et executer_cycle_pomodoro()
+contexte = ContexteExecution()
+
+
+@contextlib.contextmanager
+def contexte_temporaire(**attributs):
+    """
+    Modifie temporairement des attributs du contexte d'exécution.
+
+    Args:
+        **attributs: Les attributs à remplacer (horloge, sortie...).
+
+    Yields:
+        ContexteExecution: Le contexte modifié, restauré en sortie de bloc.
+
+    Exemple:
+        >>> with contexte_temporaire(periode_tick=60):
+        ...     contexte.periode_tick
+        60
+    """
+    anciens = {nom: getattr(contexte, nom) for nom in attributs}
+    for nom, valeur in attributs.items():
+        setattr(contexte, nom, valeur)
+    try:
+        yield contexte
+    finally:
+        for nom, valeur in anciens.items():
+            setattr(contexte, nom, valeur)
+
+
+# =============================================================================
+# RENDU DES TRAMES DE PROGRESSION
+# =============================================================================
+
+# Largeur de la barre de progression (en caractères)
+LARGEUR_BARRE = 30
+
+# Blocs partiels d'une case de la barre, d'un à sept huitièmes (même taille
+# en octets que █ et ░)
+BLOCS_HUITIEMES = "▏▎▍▌▋▊▉"
+
+# Fréquences d'affichage admises par --fps (en trames par seconde)
+FPS_MIN = 1
+FPS_MAX = 30
+
+
+def _descripteur_terminal(flux):
+    """
+    Retourne le descripteur de fichier d'un flux s'il s'agit d'un terminal.
+
+    Args:
+        flux: Le flux de sortie à examiner (typiquement sys.stdout).
+
+    Returns:
+        int | None: Le descripteur du terminal, ou None si le flux n'est pas
+        un vrai terminal (fichier, tube, StringIO, mock...).
+    """
+    try:
+        if flux.isatty() is not True:
+            return None
+        descripteur = flux.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+    return descripteur if isinstance(descripteur, int) else None
+
+
+class RenduProgression:
+    """
+    Construit les trames de la ligne de progression sans allocation par tick.
+
+    Toutes les parties variables d'une trame sont précalculées sous forme
+    d'octets UTF-8 à la création : les états de la barre (largeur + 1, soit
+    31 pour LARGEUR_BARRE ; 8 * largeur + 1, soit 241, au huitième de case),
+    les minutes et les secondes. Comme chaque état de barre a la même taille
+    en octets, la trame a une disposition fixe : un tick se résume à recopier
+    trois fragments dans un `bytearray` réutilisé, puis à l'émettre en un
+    seul `os.write` lorsque la sortie est un terminal.
+
+    À la minute près (--low-power), le temps restant est affiché en minutes
+    entamées : la trame ne change plus qu'à chaque minute et à chaque pas de
+    la barre, instants que donne prochain_changement().
+
+    Au huitième de case (--fps), la barre a 8 * largeur pas, dessinés avec
+    les blocs partiels BLOCS_HUITIEMES, et suit le temps restant exact
+    plutôt que la seconde entière : elle avance entre deux secondes.
+
+    Args:
+        emoji (str): L'emoji affiché en tête de ligne.
+        couleur_debut (str): La séquence ANSI colorant le temps restant.
+        duree_totale_secondes (int): La durée de la session, en secondes.
+        largeur (int): La largeur de la barre, en caractères.
+        flux: Le flux de sortie (sys.stdout si None).
+        a_la_minute (bool): True pour afficher "MM min" au lieu de "MM:SS".
+        huitiemes (bool): True pour une barre au huitième de case.
+    """
+
+    def __init__(self, emoji, couleur_debut, duree_totale_secondes,
+                 largeur=LARGEUR_BARRE, flux=None, a_la_minute=False, huitiemes=False):
+        self.flux = flux if flux is not None else sys.stdout
+        self.descripteur = _descripteur_terminal(self.flux)
+        self.a_la_minute = a_la_minute
+        self.total = duree_totale_secondes
+
+        # Les largeur + 1 états de la barre à la case près (31 pour
+        # LARGEUR_BARRE), déjà encodés
+        self.barres = [
+            ("█" * rempli + "░" * (largeur - rempli)).encode("utf-8")
+            for rempli in range(largeur + 1)
+        ]
+
+        # État de la barre pour chaque seconde restante (même arrondi que
+        # l'affichage historique : int(largeur * progression))
+        total = duree_totale_secondes
+        self.barre_par_restant = [
+            self.barres[int(largeur * (1 - restant / total)) if total else largeur]
+            for restant in range(total + 1)
+        ]
+
+        # Au huitième de case : les 8 * largeur + 1 états (241 pour
+        # LARGEUR_BARRE), indexés par la progression exacte
+        self.barres_fines = None
+        if huitiemes:
+            self.barres_fines = [
+                ("█" * (pas // 8) + BLOCS_HUITIEMES[pas % 8 - 1] * (pas % 8 > 0)
+                 + "░" * (largeur - pas // 8 - (pas % 8 > 0))).encode("utf-8")
+                for pas in range(8 * largeur + 1)
+            ]
+
+        # Minutes et secondes déjà formatées (au moins deux chiffres) ; à la
+        # minute près, les minutes entamées
+        minutes_max = -(-total // 60) if a_la_minute else total // 60
+        largeur_minutes = max(2, len(str(minutes_max)))
+        self.minutes = [f"{m:02d}".rjust(largeur_minutes).encode("ascii")
+                        for m in range(minutes_max + 1)]
+        self.secondes = [f"{s:02d}".encode("ascii") for s in range(60)]
+
+        # Disposition fixe de la trame : préfixe, barre, couleur, MM:SS (ou
+        # MM min), suffixe
+        prefixe = f"\r    {emoji} [".encode("utf-8")
+        milieu = f"] {couleur_debut}".encode("utf-8")
+        suffixe = "\033[0m restant".encode("utf-8")
+        if a_la_minute:
+            suffixe = "\033[0m min restant".encode("utf-8")
+
+        self.debut_barre = len(prefixe)
+        self.fin_barre = self.debut_barre + len(self.barres[0])
+        self.debut_minutes = self.fin_barre + len(milieu)
+        self.fin_minutes = self.debut_minutes + largeur_minutes
+        self.debut_secondes = self.fin_minutes + 1
+        self.fin_secondes = self.debut_secondes + 2
+
+        if a_la_minute:
+            self.trame = bytearray(prefixe + self.barres[0] + milieu + self.minutes[0] + suffixe)
+        else:
+            self.trame = bytearray(prefixe + self.barres[0] + milieu
+                                   + self.minutes[0] + b":" + self.secondes[0] + suffixe)
+
+        # À la minute près, temps restants (croissants) où la trame diffère
+        # de celle de la seconde précédente
+        self.changements = None
+        if a_la_minute:
+            barres = self.barre_par_restant
+            self.changements = [restant for restant in range(total)
+                                if restant % 60 == 0 or barres[restant] is not barres[restant + 1]]
+
+    def composer(self, secondes_restantes, restant=None):
+        """
+        Met à jour la trame réutilisable pour un temps restant donné.
+
+        Args:
+            secondes_restantes (int): Le temps restant, en secondes.
+            restant (float): Le temps restant exact, qui place la barre au
+                             huitième de case (la seconde entière si None).
+
+        Returns:
+            bytearray: La trame (le même objet à chaque appel).
+        """
+        trame = self.trame
+        if self.barres_fines is None or restant is None:
+            trame[self.debut_barre:self.fin_barre] = self.barre_par_restant[secondes_restantes]
+        else:
+            fines = self.barres_fines
+            pas = len(fines) - 1
+            if self.total > 0 and restant > 0:
+                pas = min(int(pas * (1 - restant / self.total)), pas)
+            trame[self.debut_barre:self.fin_barre] = fines[max(pas, 0)]
+        if self.a_la_minute:
+            trame[self.debut_minutes:self.fin_minutes] = self.minutes[-(-secondes_restantes // 60)]
+            return trame
+        trame[self.debut_minutes:self.fin_minutes] = self.minutes[secondes_restantes // 60]
+        trame[self.debut_secondes:self.fin_secondes] = self.secondes[secondes_restantes % 60]
+        return trame
+
+    def prochain_changement(self, secondes_restantes):
+        """
+        Donne le prochain temps restant dont la trame diffère de l'actuelle.
+
+        Args:
+            secondes_restantes (int): Le temps restant affiché, en secondes.
+
+        Returns:
+            int: Le plus grand temps restant inférieur dont la trame change
+            (la seconde suivante, sauf à la minute près).
+        """
+        if self.changements is None:
+            return max(secondes_restantes - 1, 0)
+        position = bisect_left(self.changements, secondes_restantes)
+        return self.changements[position - 1] if position else 0
+
+    def afficher(self, secondes_restantes, restant=None):
+        """
+        Compose et émet la trame correspondant au temps restant.
+
+        Args:
+            secondes_restantes (int): Le temps restant, en secondes.
+            restant (float): Le temps restant exact (voir composer()).
+        """
+        self.emettre(self.composer(secondes_restantes, restant))
+
+    def emettre(self, trame):
+        """
+        Émet une trame composée par composer().
+
+        Sur un terminal, la trame est écrite d'un seul appel système. Sur
+        tout autre flux, elle est décodée et passée à flux.write().
+
+        Args:
+            trame (bytearray): La trame à écrire.
+        """
+        if self.descripteur is not None:
+            ecrits = os.write(self.descripteur, trame)
+            if ecrits < len(trame):
+                # Écriture partielle (rare) : on complète
+                reste = memoryview(trame)[ecrits:]
+                while reste:
+                    reste = reste[os.write(self.descripteur, reste):]
+        else:
+            self.flux.write(trame.decode("utf-8"))
+            self.flux.flush()
+
+
+# =============================================================================
+# MODES DE SORTIE
+# =============================================================================
+
+# Intervalle par défaut entre deux jalons du mode journal (en minutes)
+INTERVALLE_JOURNAL_DEFAUT = 5
+
+
+class SortieTerminal:
+    """
+    Affichage interactif : une trame réécrite sur la même ligne à chaque tick.
+
+    C'est le mode historique, utilisé lorsque la sortie est un terminal.
+
+    Avec une fréquence d'affichage (--fps), les trames sont cadencées à
+    cette fréquence, indépendamment de la seconde affichée, et la barre au
+    huitième de case suit le temps restant exact de la session (lu sur son
+    ordonnanceur) : elle avance en douceur entre deux secondes.
+
+    Args:
+        econome (bool): True pour un affichage à la minute près, réveillé
+                        seulement quand la trame change (--low-power).
+        fps (int): Le nombre de trames par seconde (contexte.periode_tick
+                   entre deux trames, barre à la case près, si None).
+
+    Attributs:
+        ordonnanceur (OrdonnanceurTicks): L'ordonnanceur de la session en
+                                          cours, qui donne le temps restant
+                                          exact avec --fps.
+    """
+
+    def __init__(self, econome=False, fps=None):
+        self.econome = econome
+        self.fps = fps
+        self.ordonnanceur = None
+
+    def periode_ticks(self, duree_totale_secondes):
+        """
+        Args:
+            duree_totale_secondes (int): La durée de la session, en secondes.
+
+        Returns:
+            float: L'intervalle souhaité entre deux trames, en secondes.
+        """
+        if self.fps is not None:
+            return 1.0 / self.fps
+        return contexte.periode_tick
+
+    def prochain_changement(self, secondes_restantes):
+        """
+        Args:
+            secondes_restantes (int): Le temps restant affiché, en secondes.
+
+        Returns:
+            int: Le prochain temps restant dont la trame diffère (voir
+            RenduProgression.prochain_changement).
+        """
+        return self.rendu.prochain_changement(secondes_restantes)
+
+    def debut_session(self, type_session, duree_minutes, emoji, couleur_debut):
+        """
+        Affiche l'en-tête de la session et prépare le rendu des trames.
+
+        Args:
+            type_session (str): Le type de session.
+            duree_minutes (int): La durée de la session en minutes.
+            emoji (str): L'emoji associé au type de session.
+            couleur_debut (str): La séquence ANSI de couleur du temps restant.
+        """
+        print(f"\n    {emoji} Session de {type_session} démarrée ({duree_minutes} minutes)")
+        print("    " + "─" * 45)
+        if contexte.clavier is not None:
+            print("    Espace : pause, s : passer, + : prolonger, q : quitter.\n")
+        else:
+            print("    Appuyez sur Ctrl+C pour annuler.\n")
+
+        # Trames précalculées ; le tampon de stdout est vidé avant les
+        # écritures directes sur le descripteur du terminal
+        self.apparence = (emoji, couleur_debut)
+        self.rendu = RenduProgression(emoji, couleur_debut, duree_minutes * 60,
+                                      a_la_minute=self.econome,
+                                      huitiemes=self.fps is not None)
+        sys.stdout.flush()
+
+    def reprise_session(self, secondes_restantes):
+        """
+        Signale qu'une session interrompue reprend en cours de route.
+
+        Args:
+            secondes_restantes (int): Le temps restant à la reprise, en secondes.
+        """
+        # Session prolongée au-delà de sa durée : trames recalculées
+        if secondes_restantes >= len(self.rendu.barre_par_restant):
+            self.rendu = RenduProgression(*self.apparence, secondes_restantes,
+                                          a_la_minute=self.econome,
+                                          huitiemes=self.fps is not None)
+        effacer_ligne()
+        print(f"    ⏯️  Reprise : {formater_temps(secondes_restantes)} restant\n")
+        sys.stdout.flush()
+
+    def pause_session(self, secondes_restantes):
+        """
+        Signale que la session est mise en pause.
+
+        Args:
+            secondes_restantes (int): Le temps restant à la pause, en secondes.
+        """
+        effacer_ligne()
+        print(f"    ⏸️  En pause : {formater_temps(secondes_restantes)} restant")
+        sys.stdout.flush()
+
+    def composer(self, secondes_restantes):
+        """
+        Compose la trame d'un tick, sans l'émettre.
+
+        Args:
+            secondes_restantes (int): Le temps restant, en secondes.
+
+        Returns:
+            bytearray: La trame (voir RenduProgression.composer).
+        """
+        ordonnanceur = self.ordonnanceur
+        if ordonnanceur is None:
+            return self.rendu.composer(secondes_restantes)
+        maintenant = (ordonnanceur.horloge or contexte.horloge).maintenant()
+        return self.rendu.composer(secondes_restantes, ordonnanceur.restant(maintenant))
+
+    def trame(self, secondes_restantes):
+        """
+        Affiche la trame d'un tick.
+
+        Args:
+            secondes_restantes (int): Le temps restant, en secondes.
+        """
+        self.rendu.emettre(self.composer(secondes_restantes))
+
+    def fin_session(self):
+        """Efface la ligne de progression à la fin de la session."""
+        effacer_ligne()
+
+    def annulation(self):
+        """Efface la ligne de progression lors d'une annulation."""
+        effacer_ligne()
+
+    def fin_cycle(self, numero_cycle, total_cycles):
+        """
+        Signale la fin d'un cycle (rien à afficher en mode interactif).
+
+        Args:
+            numero_cycle (int): Le numéro du cycle terminé.
+            total_cycles (int): Le nombre total de cycles.
+        """
+
+
+class SortieJournal:
+    """
+    Affichage ligne à ligne pour une sortie non interactive (fichier, CI).
+
+    Au lieu d'une trame par seconde terminée par \r, seuls des jalons sont
+    écrits : le démarrage, une ligne toutes les N minutes et la fin. Les
+    lignes ne contiennent aucune séquence ANSI, le moteur ne se réveille
+    qu'aux jalons et le flux n'est vidé qu'à ces moments-là.
+
+    Args:
+        intervalle_minutes (int): L'intervalle entre deux jalons, en minutes.
+        flux: Le flux de sortie (sys.stdout au moment de l'écriture si None).
+    """
+
+    def __init__(self, intervalle_minutes=INTERVALLE_JOURNAL_DEFAUT, flux=None):
+        self.intervalle_minutes = intervalle_minutes
+        self.flux = flux
+
+    def _ecrire(self, ligne):
+        flux = self.flux if self.flux is not None else sys.stdout
+        flux.write(ligne)
+        flux.flush()
+
+    def periode_ticks(self, duree_totale_secondes):
+        return self.intervalle_minutes * 60
+
+    def debut_session(self, type_session, duree_minutes, emoji, couleur_debut):
+        self.type_session = type_session
+        self.duree_totale_secondes = duree_minutes * 60
+        self._ecrire(f"\n    Session de {type_session} démarrée ({duree_minutes} minutes)\n")
+
+    def reprise_session(self, secondes_restantes):
+        # Le premier jalon indique déjà le temps restant ; une prolongation
+        # agrandit la durée de référence des pourcentages
+        if secondes_restantes > self.duree_totale_secondes:
+            self.duree_totale_secondes = secondes_restantes
+
+    def pause_session(self, secondes_restantes):
+        self._ecrire(f"    {self.type_session} : en pause, "
+                     f"{formater_temps(secondes_restantes)} restant\n")
+
+    def trame(self, secondes_restantes):
+        # Le début et la fin ont leurs propres messages
+        if secondes_restantes in (0, self.duree_totale_secondes):
+            return
+        ecoule = self.duree_totale_secondes - secondes_restantes
+        pourcentage = ecoule * 100 // self.duree_totale_secondes
+        self._ecrire(f"    {self.type_session} : {formater_temps(secondes_restantes)} "
+                     f"restant ({pourcentage} %)\n")
+
+    def fin_session(self):
+        pass
+
+    def annulation(self):
+        pass
+
+    def fin_cycle(self, numero_cycle, total_cycles):
+        pass
+
+
+class SortieNulle:
+    """
+    Aucune sortie : pour les minuteries sans affichage (simulations, moteur
+    asyncio hébergeant de nombreuses sessions).
+
+    Sans affichage, aucune trame intermédiaire n'est utile : la session ne
+    se réveille qu'une fois, à son échéance.
+    """
+
+    def periode_ticks(self, duree_totale_secondes):
+        return max(duree_totale_secondes, contexte.periode_tick)
+
+    def debut_session(self, type_session, duree_minutes, emoji, couleur_debut):
+        pass
+
+    def reprise_session(self, secondes_restantes):
+        pass
+
+    def pause_session(self, secondes_restantes):
+        pass
+
+    def trame(self, secondes_restantes):
+        pass
+
+    def fin_session(self):
+        pass
+
+    def annulation(self):
+        pass
+
+    def fin_cycle(self, numero_cycle, total_cycles):
+        pass
+
+
+# Nom stable des types de session dans les événements JSON
+TYPES_SESSION_JSON = {
+    "TRAVAIL": "work",
+    "PAUSE": "break",
+    "PAUSE LONGUE": "long_break",
+}
+
+# Fréquence par défaut des événements "tick" du mode JSON (en Hz)
+FREQUENCE_TICKS_JSON_DEFAUT = 1.0
+
+
+class SortieJSON:
+    """
+    Flux d'événements JSON (un objet compact par ligne) pour les machines.
+
+    Événements émis: session_start, resumed, paused, tick, session_end,
+    cancelled et cycle_end. Chacun porte un horodatage monotone (`mono`) et mural
+    (`wall`) lus sur l'horloge du contexte.
+
+    Les événements rares passent par json.dumps ; les ticks, fréquents,
+    sont formatés directement en octets à partir d'un préfixe précalculé
+    pour la session, ce qui tient sans peine une cadence de 10 Hz.
+
+    Args:
+        frequence (float): Le nombre d'événements "tick" par seconde.
+        flux: Le flux de sortie (sys.stdout au moment de la création si None).
+    """
+
+    def __init__(self, frequence=FREQUENCE_TICKS_JSON_DEFAUT, flux=None):
+        self.frequence = frequence
+        self.flux = flux if flux is not None else sys.stdout
+        # Écriture binaire directe quand le flux le permet
+        self.tampon = getattr(self.flux, 'buffer', None)
+        self.type_session = None
+        self.fin = 0.0
+
+    def _emettre(self, ligne):
+        if self.tampon is not None:
+            self.tampon.write(ligne)
+            self.tampon.flush()
+        else:
+            self.flux.write(ligne.decode("utf-8"))
+            self.flux.flush()
+
+    def evenement(self, nom, **champs):
+        """
+        Émet un événement JSON horodaté.
+
+        Args:
+            nom (str): Le nom de l'événement.
+            **champs: Les champs supplémentaires de l'événement.
+        """
+        import json
+        horloge = contexte.horloge
+        objet = {"event": nom}
+        objet.update(champs)
+        objet["mono"] = round(horloge.maintenant(), 6)
+        objet["wall"] = round(horloge.heure_murale(), 6)
+        ligne = json.dumps(objet, separators=(",", ":"), ensure_ascii=False) + "\n"
+        self._emettre(ligne.encode("utf-8"))
+
+    def _restant(self):
+        return max(self.fin - contexte.horloge.maintenant(), 0.0)
+
+    def periode_ticks(self, duree_totale_secondes):
+        return 1.0 / self.frequence
+
+    def debut_session(self, type_session, duree_minutes, emoji, couleur_debut):
+        import json
+        self.type_session = TYPES_SESSION_JSON.get(type_session, type_session)
+        self.fin = contexte.horloge.maintenant() + duree_minutes * 60
+        self.prefixe_tick = ('{"event":"tick","session":%s,"remaining":'
+                             % json.dumps(self.type_session)).encode("utf-8")
+        self.evenement("session_start", session=self.type_session,
+                       duration=duree_minutes * 60)
+
+    def reprise_session(self, secondes_restantes):
+        self.fin = contexte.horloge.maintenant() + secondes_restantes
+        self.evenement("resumed", session=self.type_session, remaining=secondes_restantes)
+
+    def pause_session(self, secondes_restantes):
+        self.evenement("paused", session=self.type_session, remaining=secondes_restantes)
+
+    def trame(self, secondes_restantes):
+        horloge = contexte.horloge
+        mono = horloge.maintenant()
+        restant = self.fin - mono
+        self._emettre(b'%s%.3f,"mono":%.6f,"wall":%.6f}\n' % (
+            self.prefixe_tick, restant if restant > 0 else 0.0,
+            mono, horloge.heure_murale()))
+
+    def fin_session(self):
+        self.evenement("session_end", session=self.type_session)
+
+    def annulation(self):
+        self.evenement("cancelled", session=self.type_session,
+                       remaining=round(self._restant(), 3))
+
+    def fin_cycle(self, numero_cycle, total_cycles):
+        self.evenement("cycle_end", cycle=numero_cycle, total=total_cycles)
+
+
+def choisir_sortie(flux=None, intervalle_minutes=INTERVALLE_JOURNAL_DEFAUT, econome=False,
+                   fps=None):
+    """
+    Choisit le mode de sortie adapté au flux de sortie standard.
+
+    Args:
+        flux: Le flux à examiner (sys.stdout si None).
+        intervalle_minutes (int): L'intervalle des jalons en mode journal.
+        econome (bool): Affichage à la minute près en mode interactif.
+        fps (int): Trames par seconde en mode interactif (voir SortieTerminal).
+
+    Returns:
+        SortieTerminal | SortieJournal: Le mode interactif si le flux est un
+        terminal, le mode journal sinon.
+    """
+    flux = flux if flux is not None else sys.stdout
+    try:
+        interactif = flux.isatty() is True
+    except (AttributeError, ValueError):
+        interactif = False
+    if interactif:
+        return SortieTerminal(econome, fps)
+    return SortieJournal(intervalle_minutes)
+
+
+# =============================================================================
+# ORDONNANCEMENT DES TICKS
+# =============================================================================
+
+class OrdonnanceurTicks:
+    """
+    Cadence les trames d'un compte à rebours sur des échéances absolues.
+
+    Chaque tick k est planifié à l'instant `debut + k * periode`, mesuré avec
+    l'horloge monotone du contexte (ou celle fournie). Le temps passé à
+    construire et écrire une trame n'est donc jamais ajouté à la durée de la
+    session : l'erreur ne s'accumule pas.
+    Si le processus prend du retard (machine chargée, terminal lent), les
+    trames manquées sont sautées au lieu d'être rattrapées une par une.
+    Avec `prochain_changement`, les ticks dont la trame serait identique à la
+    précédente sont sautés d'avance : le moteur dort jusqu'au prochain
+    changement visible (--low-power).
+
+    Attributs:
+        nombre_ticks (int): Nombre de ticks après le tick initial.
+        periode (float): Intervalle entre deux ticks, en secondes.
+        horloge (Horloge): L'horloge utilisée ; celle du contexte si None.
+        duree (float): Si fournie, plafonne l'échéance du dernier tick à
+                       `debut + duree` quand la période ne divise pas la durée.
+        retard_max (float): Pire retard observé au réveil, en secondes.
+        ticks_sautes (int): Nombre de trames sautées pour rattraper le retard.
+        pause_depuis (float): L'instant de la mise en pause, None hors pause.
+        interrompu (bool): True si la session a été passée avant son terme.
+        politique_veille (str): VEILLE_PAUSE : une mise en veille du système
+                                ne compte pas ; VEILLE_COMPTEE : elle est
+                                comptée comme écoulée.
+        temps_veille (float): Le temps de veille constaté pendant la session.
+        histogramme_retard (Histogramme): Si fourni, reçoit le retard au
+                                          réveil de chaque tick.
+        profil (ProfilTicks): Si fourni, enregistre l'échéance et l'instant
+                              du réveil de chaque tick.
+        prochain_changement (callable): Si fourni, donne pour un temps
+                                        restant affiché le prochain temps
+                                        restant dont la trame diffère (la
+                                        durée est requise).
+        reveils (int): Le nombre d'attentes de tick de la session.
+        au_changement (callable): Si fourni, appelé avec le temps restant et
+                                  l'état de pause après une mise en veille,
+                                  qui déplace l'heure murale de la fin.
+
+    Exemple:
+        >>> ordonnanceur = OrdonnanceurTicks(3)
+        >>> [tick for tick in ordonnanceur]   # doctest: +SKIP
+        [0, 1, 2, 3]
+    """
+
+    def __init__(self, nombre_ticks, periode=1.0, horloge=None, duree=None):
+        self.nombre_ticks = nombre_ticks
+        self.periode = periode
+        self.horloge = horloge
+        self.duree = duree
+        self.retard_max = 0.0
+        self.ticks_sautes = 0
+        self.debut = None
+        self.pause_depuis = None
+        self.interrompu = False
+        self.histogramme_retard = None
+        self.profil = None
+        self.politique_veille = VEILLE_PAUSE
+        self.temps_veille = 0.0
+        self._suspendu = 0.0
+        self.prochain_changement = None
+        self.reveils = 0
+        self.au_changement = None
+
+    def __iter__(self):
+        """
+        Produit les indices de tick, de 0 à `nombre_ticks` inclus.
+
+        Avec un serveur de pilotage dans le contexte, c'est lui qui attend
+        l'échéance de chaque tick, en répondant aux requêtes entre-temps.
+        Une mise en veille du système est constatée à chaque réveil.
+
+        Yields:
+            int: L'indice du tick à afficher.
+        """
+        horloge = self.horloge or contexte.horloge
+        controle = contexte.controle
+        self.demarrer(horloge)
+        tick = 0
+        yield tick
+
+        while tick < self.nombre_ticks:
+            tick = self.prochaine_attente(tick)
+
+            # Attente jusqu'à l'échéance absolue du tick
+            if controle is None:
+                horloge.dormir_jusqua(self.echeance(tick))
+            else:
+                controle.attendre(self, tick, horloge)
+                if self.interrompu:
+                    return
+
+            tick = self.reveiller(tick, horloge)
+            yield tick
+
+    # -------------------------------------------------------------------------
+    # Étapes d'un tick, partagées avec le moteur asyncio (pomodoro_async)
+    # -------------------------------------------------------------------------
+
+    def demarrer(self, horloge):
+        """
+        Démarre la session : le tick 0 a lieu maintenant.
+
+        Args:
+            horloge (Horloge): L'horloge de la session.
+        """
+        self.debut = horloge.maintenant()
+        self._suspendu = horloge.temps_suspendu()
+        if self.profil is not None:
+            self.profil.debut_session(self.debut)
+
+    def prochaine_attente(self, tick):
+        """
+        Désigne le tick à attendre après un tick affiché et compte le réveil.
+
+        Args:
+            tick (int): Le tick qui vient d'être affiché.
+
+        Returns:
+            int: Le tick dont l'échéance doit être attendue (tick_suivant()).
+        """
+        self.reveils += 1
+        return self.tick_suivant(tick)
+
+    def reveiller(self, tick, horloge):
+        """
+        Traite le réveil à l'échéance d'un tick : veille, retard, trames sautées.
+
+        Après une mise en veille, `au_changement` republie la session : l'heure
+        murale de la fin a changé sans pause ni reprise.
+
+        Args:
+            tick (int): Le tick dont l'échéance vient d'être attendue.
+            horloge (Horloge): L'horloge de la session.
+
+        Returns:
+            int: Le tick à afficher, éventuellement plus loin que `tick`.
+        """
+        maintenant = horloge.maintenant()
+        if self.constater_veille(horloge.temps_suspendu()) and self.au_changement is not None:
+            self.au_changement(math.ceil(self.restant(maintenant)), self.pause_depuis is not None)
+        return self.rattraper(tick, maintenant)
+
+    def tick_suivant(self, tick):
+        """
+        Donne le prochain tick à attendre.
+
+        Args:
+            tick (int): Le tick qui vient d'être affiché.
+
+        Returns:
+            int: `tick + 1`, ou avec `prochain_changement` le premier tick
+            dont la trame diffère, sans dépasser `nombre_ticks`.
+        """
+        if self.prochain_changement is None:
+            return tick + 1
+        cible = self.prochain_changement(self.secondes_restantes(tick))
+        suivant = math.ceil((math.ceil(self.duree) - cible) / self.periode)
+        return min(max(suivant, tick + 1), self.nombre_ticks)
+
+    def echeance(self, tick):
+        """
+        Calcule l'instant absolu d'un tick.
+
+        Args:
+            tick (int): L'indice du tick.
+
+        Returns:
+            float: L'échéance du tick, sur l'échelle de l'horloge.
+        """
+        decalage = tick * self.periode
+        if self.duree is not None and decalage > self.duree:
+            decalage = self.duree
+        return self.debut + decalage
+
+    def rattraper(self, tick, maintenant):
+        """
+        Mesure le retard au réveil d'un tick et saute les trames manquées.
+
+        Args:
+            tick (int): Le tick dont l'échéance vient d'être attendue.
+            maintenant (float): L'instant du réveil.
+
+        Returns:
+            int: Le tick à afficher, éventuellement plus loin que `tick`.
+        """
+        echeance = self.echeance(tick)
+        retard = maintenant - echeance
+        if retard > self.retard_max:
+            self.retard_max = retard
+        if self.histogramme_retard is not None:
+            self.histogramme_retard.observer(max(retard, 0.0))
+        if self.profil is not None:
+            self.profil.reveil(echeance, maintenant)
+
+        # Trop en retard : on saute directement au tick courant
+        if retard >= self.periode:
+            saut = min(int(retard // self.periode), self.nombre_ticks - tick)
+            tick += saut
+            self.ticks_sautes += saut
+        return tick
+
+    def constater_veille(self, suspendu):
+        """
+        Constate une mise en veille du système depuis le réveil précédent.
+
+        Le temps monotone ne compte pas la veille : avec VEILLE_PAUSE, la
+        session reprend là où elle s'était arrêtée. Avec VEILLE_COMPTEE, les
+        échéances sont avancées de la durée de la veille, comme si la session
+        avait continué (une session en pause le reste).
+
+        Args:
+            suspendu (float): Le cumul des mises en veille selon l'horloge
+                              (Horloge.temps_suspendu()).
+
+        Returns:
+            float: La durée de la veille constatée, 0.0 s'il n'y en a pas eu.
+        """
+        ecart = suspendu - self._suspendu
+        self._suspendu = suspendu
+        if ecart < SEUIL_VEILLE:
+            return 0.0
+        self.temps_veille += ecart
+        if self.politique_veille == VEILLE_COMPTEE and self.pause_depuis is None:
+            self.debut -= ecart
+        return ecart
+
+    def secondes_restantes(self, tick):
+        """
+        Calcule le temps restant affiché à un tick (la durée est requise).
+
+        Args:
+            tick (int): L'indice du tick.
+
+        Returns:
+            int: Le temps restant, en secondes entières.
+        """
+        return max(math.ceil(self.duree) - int(tick * self.periode), 0)
+
+    # -------------------------------------------------------------------------
+    # Pilotage (pause, prolongation, passage à la session suivante)
+    # -------------------------------------------------------------------------
+
+    def suspendre(self, maintenant):
+        """
+        Met le compte à rebours en pause.
+
+        Args:
+            maintenant (float): L'instant de la mise en pause.
+
+        Returns:
+            bool: False si l'ordonnanceur n'a pas démarré ou est déjà en pause.
+        """
+        if self.debut is None or self.pause_depuis is not None:
+            return False
+        self.pause_depuis = maintenant
+        return True
+
+    def reprendre(self, maintenant):
+        """
+        Reprend après une pause : les échéances sont décalées de sa durée.
+
+        Args:
+            maintenant (float): L'instant de la reprise.
+
+        Returns:
+            bool: False si l'ordonnanceur n'était pas en pause.
+        """
+        if self.pause_depuis is None:
+            return False
+        self.debut += maintenant - self.pause_depuis
+        self.pause_depuis = None
+        return True
+
+    def prolonger(self, secondes):
+        """
+        Prolonge la session (la durée est requise).
+
+        Args:
+            secondes (float): Le temps ajouté, en secondes.
+        """
+        self.duree += secondes
+        self.nombre_ticks = math.ceil(self.duree / self.periode)
+
+    def passer(self):
+        """Termine la session à la prochaine attente, sans aller à son terme."""
+        self.interrompu = True
+
+    def restant(self, maintenant):
+        """
+        Calcule le temps restant exact, pause comprise (la durée est requise).
+
+        Args:
+            maintenant (float): L'instant courant.
+
+        Returns:
+            float: Le temps restant, en secondes.
+        """
+        if self.debut is None:
+            return float(self.duree)
+        if self.pause_depuis is not None:
+            maintenant = self.pause_depuis
+        return max(self.debut + self.duree - maintenant, 0.0)
+
+
 # =============================================================================
 # FONCTION PRINCIPALE DU COMPTE À REBOURS
 # =============================================================================
 
-def compte_a_rebours(duree_minutes, type_session="TRAVAIL", mode_silencieux=False):
+def apparence_session(type_session):
+    """
+    Retourne l'emoji et la couleur associés à un type de session.
+
+    Args:
+        type_session (str): Le type de session ("TRAVAIL", "PAUSE"...).
+
+    Returns:
+        tuple: (emoji, séquence ANSI de couleur du temps restant).
+    """
+    if type_session == "TRAVAIL":
+        return "🍅", "\033[91m"  # Rouge pour le travail
+    return "☕", "\033[92m"  # Vert pour la pause
+
+
+def creer_ordonnanceur_session(duree_totale_secondes, sortie, horloge=None):
+    """
+    Crée l'ordonnanceur d'une session à la cadence voulue par la sortie.
+
+    Args:
+        duree_totale_secondes (float): La durée de la session, en secondes.
+        sortie: Le mode de sortie qui fixe la période des ticks.
+        horloge (Horloge): L'horloge à utiliser (celle du contexte si None).
+
+    Returns:
+        OrdonnanceurTicks: L'ordonnanceur prêt à être parcouru.
+    """
+    periode = sortie.periode_ticks(duree_totale_secondes)
+    ordonnanceur = OrdonnanceurTicks(math.ceil(duree_totale_secondes / periode), periode,
+                                     horloge=horloge, duree=duree_totale_secondes)
+    if contexte.metriques is not None:
+        ordonnanceur.histogramme_retard = contexte.metriques.retard_ticks
+    ordonnanceur.profil = contexte.profil
+    ordonnanceur.politique_veille = contexte.politique_veille
+    if isinstance(sortie, SortieTerminal):
+        if sortie.econome:
+            ordonnanceur.prochain_changement = sortie.prochain_changement
+        if sortie.fps is not None:
+            sortie.ordonnanceur = ordonnanceur
+    return ordonnanceur
+
+
+def _trame_mesuree(sortie, secondes_restantes, rendu, profil):
+    """
+    Émet une trame en mesurant sa composition et son écriture.
+
+    En mode terminal, les deux étapes du rendu précalculé sont chronométrées
+    séparément ; les autres modes de sortie composent en écrivant, et tout
+    leur temps est compté comme écriture.
+
+    Args:
+        sortie: Le mode de sortie de la session.
+        secondes_restantes (int): Le temps restant, en secondes.
+        rendu (Histogramme): Reçoit le temps total de la trame (aucun si None).
+        profil (ProfilTicks): Reçoit les deux temps (aucun si None).
+    """
+    terminal = isinstance(sortie, SortieTerminal)
+    debut = time.perf_counter()
+    if not terminal:
+        sortie.trame(secondes_restantes)
+        ecriture = debut
+    else:
+        trame = sortie.composer(secondes_restantes)
+        ecriture = time.perf_counter()
+        sortie.rendu.emettre(trame)
+    fin = time.perf_counter()
+    if rendu is not None:
+        rendu.observer(fin - debut)
+    if profil is not None:
+        profil.rendu(ecriture - debut, fin - ecriture)
+
+
+def compte_a_rebours(duree_minutes, type_session="TRAVAIL", mode_silencieux=False,
+                     reprise=None):
     """
     Lance un compte à rebours dynamique dans le terminal.
 
     Cette fonction affiche un compte à rebours qui s'actualise sur la même ligne,
     sans spammer la console. Elle utilise le retour chariot (\r) pour écraser
-    l'affichage précédent.
+    l'affichage précédent. Le mode de sortie du contexte peut remplacer cet
+    affichage (par exemple des jalons ligne à ligne hors d'un terminal).
 
     Args:
         duree_minutes (int): La durée du compte à rebours en minutes.
         type_session (str): Le type de session ("TRAVAIL" ou "PAUSE").
                            Utilisé pour personnaliser l'affichage.
         mode_silencieux (bool): Si True, désactive les notifications sonores.
+        reprise (int): Pour une session interrompue qui reprend (--resume),
+                       le temps qu'il lui restait, en secondes.
+
+    Returns:
+        OrdonnanceurTicks: L'ordonnanceur utilisé, qui expose le pire retard
+        observé (`retard_max`) et le nombre de trames sautées.
 
     Raises:
         KeyboardInterrupt: Si l'utilisateur appuie sur Ctrl+C pour annuler.
     """
     # Conversion de la durée en secondes
     duree_totale_secondes = duree_minutes * 60
-    secondes_restantes = duree_totale_secondes
+    duree_a_courir = duree_totale_secondes if reprise is None else reprise
+    sortie = contexte.sortie or SortieTerminal()
+    ordonnanceur = creer_ordonnanceur_session(duree_a_courir, sortie)
 
     # Définition des couleurs et emojis selon le type de session
-    if type_session == "TRAVAIL":
-        emoji = "🍅"
-        couleur_debut = "\033[91m"  # Rouge pour le travail
-    else:
-        emoji = "☕"
-        couleur_debut = "\033[92m"  # Vert pour la pause
-
-    couleur_fin = "\033[0m"  # Réinitialisation de la couleur
+    emoji, couleur_debut = apparence_session(type_session)
 
     # Message de démarrage
-    print(f"\n    {emoji} Session de {type_session} démarrée ({duree_minutes} minutes)")
-    print("    " + "─" * 45)
-    print("    Appuyez sur Ctrl+C pour annuler.\n")
+    sortie.debut_session(type_session, duree_minutes, emoji, couleur_debut)
+    if reprise is not None:
+        sortie.reprise_session(reprise)
+    reperes = _reperes_historique()
+    _sauvegarder_position(type_session, duree_a_courir)
+    _publier_statut("en_cours", type_session, duree_a_courir, duree_totale_secondes)
+
+    # Événements de la session : rien n'est construit sans abonné, et les
+    # abonnés aux ticks sont relevés une fois pour toute la session
+    evenements = contexte.evenements
+    if evenements.ecoute("session_debut"):
+        evenements.publier("session_debut", {
+            "type_session": type_session, "duree": duree_totale_secondes,
+            "restant": duree_a_courir, "cycle": contexte.numero_cycle})
+    abonnes_ticks = evenements.abonnes(EVENEMENT_TICK)
+
+    # Coût des trames mesuré pour les métriques et pour --profile
+    rendu = contexte.metriques.duree_rendu if contexte.metriques is not None else None
+    profil = contexte.profil
+
+    # Session pilotable par la socket de contrôle, le clavier et Ctrl+Z ; une
+    # pause, une reprise, une prolongation ou une mise en veille met à jour
+    # le point de reprise et le statut
+    def au_changement(restant, en_pause):
+        duree = duree_totale_secondes + ordonnanceur.duree - duree_a_courir
+        _sauvegarder_position(type_session, restant, en_pause)
+        _publier_statut("en_pause" if en_pause else "en_cours", type_session, restant, duree)
+
+    ordonnanceur.au_changement = au_changement
+
+    controle = contexte.controle
+    if controle is not None:
+        controle.suivre(type_session, ordonnanceur, sortie, contexte.horloge,
+                        cycle=contexte.numero_cycle, au_changement=au_changement)
+    suspension = contexte.suspension
+    if suspension is not None:
+        suspension.suivre(ordonnanceur, sortie, contexte.horloge, au_changement)
 
     try:
-        # Boucle principale du compte à rebours
-        while secondes_restantes >= 0:
-            # Calcul de la progression (barre de progression visuelle)
-            progression = 1 - (secondes_restantes / duree_totale_secondes)
-            largeur_barre = 30
-            rempli = int(largeur_barre * progression)
-            vide = largeur_barre - rempli
-
-            # Construction de la barre de progression
-            barre = "█" * rempli + "░" * vide
-
-            # Formatage du temps restant
-            temps_formate = formater_temps(secondes_restantes)
+        # Boucle principale du compte à rebours, cadencée sur des échéances
+        # absolues : une trame lente ne retarde pas la fin de la session
+        for tick in ordonnanceur:
+            secondes_restantes = ordonnanceur.secondes_restantes(tick)
 
             # Affichage dynamique sur la même ligne
             # \r ramène le curseur au début de la ligne
-            message = f"    {emoji} [{barre}] {couleur_debut}{temps_formate}{couleur_fin} restant"
-            sys.stdout.write('\r' + message)
-            sys.stdout.flush()
-
-            # Attente d'une seconde avant la prochaine mise à jour
-            if secondes_restantes > 0:
-                time.sleep(1)
-
-            secondes_restantes -= 1
+            if rendu is None and profil is None:
+                sortie.trame(secondes_restantes)
+            else:
+                _trame_mesuree(sortie, secondes_restantes, rendu, profil)
+            if abonnes_ticks:
+                evenements.publier(EVENEMENT_TICK, {"type_session": type_session,
+                                                    "restant": secondes_restantes},
+                                   abonnes_ticks)
 
         # Fin du compte à rebours
-        effacer_ligne()
-
-        # Notification sonore (sauf en mode silencieux)
-        if not mode_silencieux:
-            emettre_son()
+        sortie.fin_session()
+        _consigner_session(type_session, duree_totale_secondes, reperes, annulee=False)
+        if evenements.ecoute("session_fin"):
+            evenements.publier("session_fin", {
+                "type_session": type_session, "duree": ordonnanceur.duree,
+                "passee": ordonnanceur.interrompu, "cycle": contexte.numero_cycle})
+
+        # Signalement du retard si des trames ont dû être sautées
+        if ordonnanceur.ticks_sautes:
+            print(f"    ⏱️  {ordonnanceur.ticks_sautes} trame(s) sautée(s), "
+                  f"retard max {ordonnanceur.retard_max * 1000:.0f} ms")
+        if ordonnanceur.temps_veille:
+            sort_veille = ("comptée comme écoulée"
+                           if ordonnanceur.politique_veille == VEILLE_COMPTEE
+                           else "hors du décompte")
+            print(f"    💤 Mise en veille de {formater_temps(round(ordonnanceur.temps_veille))} "
+                  f"pendant la session, {sort_veille}")
+
+        # Notification sonore (sauf en mode silencieux ou session passée)
+        if not mode_silencieux and not ordonnanceur.interrompu:
+            _notifier_son()
 
         # Message visuel de fin
         if type_session == "TRAVAIL":
@@ -233,17 +1736,199 @@ def compte_a_rebours(duree_minutes, type_session="TRAVAIL", mode_silencieux=Fals
             afficher_fin_session("PAUSE", "✨")
             print("    💪 Conseil : Prêt pour une nouvelle session de travail !\n")
 
+        return ordonnanceur
+
     except KeyboardInterrupt:
         # Gestion de l'annulation par l'utilisateur (Ctrl+C)
-        effacer_ligne()
+        sortie.annulation()
+        _consigner_session(type_session, duree_totale_secondes, reperes, annulee=True)
+        if evenements.ecoute("session_annulee"):
+            evenements.publier("session_annulee", {"type_session": type_session,
+                                                   "cycle": contexte.numero_cycle})
         print(f"\n\n    ⚠️  Session de {type_session} annulée par l'utilisateur.\n")
         sys.exit(0)
 
+    finally:
+        if controle is not None:
+            controle.oublier()
+        if suspension is not None:
+            suspension.oublier()
+        _publier_statut("inactif")
+
+
+def _notifier_son():
+    """
+    Émet le son de fin de session, sans bloquer si une file est active.
+
+    Avec une file de notifications dans le contexte, le son y est déposé et
+    le moteur continue aussitôt ; sinon emettre_son() est appelé directement.
+    """
+    if contexte.notifications is None:
+        emettre_son()
+    else:
+        contexte.notifications.soumettre("son", emettre_son)
+
+
+def _publier_statut(etat, type_session=None, restant=0.0, duree=0.0):
+    """
+    Publie l'état de la session dans le statut partagé du contexte.
+
+    Appelée aux seuls changements d'état, jamais à chaque tick. Comme pour
+    l'historique, une erreur désactive le statut sans interrompre la minuterie.
+
+    Args:
+        etat (str): "inactif", "en_cours" ou "en_pause".
+        type_session (str): Le type de la session (None si inactif).
+        restant (float): Le temps restant, en secondes.
+        duree (float): La durée de la session, en secondes.
+    """
+    if contexte.statut is None:
+        return
+    try:
+        contexte.statut.publier(etat, type_session, contexte.numero_cycle, restant, duree,
+                                contexte.horloge.heure_murale())
+    except OSError as erreur:
+        print(f"    ⚠️  Statut désactivé : {erreur}")
+        contexte.statut = None
+
+
+def _reperes_historique():
+    """
+    Relève les instants de début d'une session, si l'historique est actif.
+
+    Returns:
+        tuple: (instant monotone, heure murale), ou None sans historique.
+    """
+    if contexte.historique is None:
+        return None
+    return contexte.horloge.maintenant(), contexte.horloge.heure_murale()
+
+
+def _consigner_session(type_session, duree_prevue, reperes, annulee):
+    """
+    Consigne une session terminée ou annulée dans l'historique du contexte.
+
+    Une erreur d'écriture (disque plein, dossier en lecture seule) ne doit
+    pas interrompre la minuterie : l'historique est alors désactivé pour le
+    reste de l'exécution, avec un avertissement.
+
+    Args:
+        type_session (str): Le type de session.
+        duree_prevue (float): La durée planifiée, en secondes.
+        reperes (tuple): Les repères relevés par _reperes_historique().
+        annulee (bool): True si la session a été interrompue.
+    """
+    if reperes is None or contexte.historique is None:
+        return
+    debut, debut_mural = reperes
+    duree_reelle = contexte.horloge.maintenant() - debut
+    try:
+        contexte.historique.consigner(type_session, duree_prevue, duree_reelle,
+                                      debut_mural, debut_mural + duree_reelle,
+                                      annulee=annulee, cycle=contexte.numero_cycle)
+    except OSError as erreur:
+        print(f"    ⚠️  Historique désactivé : {erreur}")
+        contexte.historique = None
+
+
+def _sauvegarder_position(type_session, duree_secondes, en_pause=False):
+    """
+    Sauvegarde la session en cours dans le point de reprise du contexte.
+
+    Appelée avant le premier tick puis à chaque pause, reprise ou
+    prolongation : la boucle des trames n'écrit jamais sur disque. Une
+    session en pause est sauvegardée avec son temps restant, sans échéance :
+    la pause peut durer au-delà de l'échéance prévue. Comme pour
+    l'historique, une erreur d'écriture désactive la reprise sans
+    interrompre la minuterie.
+
+    Args:
+        type_session (str): Le type de session.
+        duree_secondes (float): Le temps jusqu'à la fin de la session.
+        en_pause (bool): True si la session est en pause.
+    """
+    if contexte.point_reprise is None:
+        return
+    if en_pause:
+        echeance, restant = None, duree_secondes
+    else:
+        echeance, restant = contexte.horloge.heure_murale() + duree_secondes, None
+    try:
+        contexte.point_reprise.enregistrer(contexte.numero_cycle, type_session, echeance,
+                                           restant)
+    except OSError as erreur:
+        print(f"    ⚠️  Point de reprise désactivé : {erreur}")
+        contexte.point_reprise = None
+
+
+def position_reprise(etat, heure_murale):
+    """
+    Détermine où reprendre un plan interrompu.
+
+    Une session sauvegardée en pause reprend avec le temps qu'il lui
+    restait à la mise en pause. Une session non échue reprend avec le temps
+    qu'il lui reste. Sinon, elle est considérée comme terminée et le plan
+    reprend au début de la session suivante, lue dans le PlanCycles
+    reconstruit à partir de l'état sauvegardé.
+
+    Args:
+        etat (EtatReprise): La position sauvegardée.
+        heure_murale (float): Le timestamp Unix courant.
+
+    Returns:
+        tuple: (cycle, type de session, secondes restantes), ou None si le
+        plan était déjà terminé.
+
+    Exemple:
+        >>> etat = EtatReprise(25, 5, 15, 8, True, 4, "TRAVAIL", 1000.0)
+        >>> position_reprise(etat, 2000.0)
+        (4, 'PAUSE LONGUE', 900.0)
+    """
+    if etat.restant is not None:
+        return etat.cycle, etat.type_session, math.ceil(etat.restant)
+    restant = etat.echeance - heure_murale
+    if restant > 0:
+        return etat.cycle, etat.type_session, math.ceil(restant)
+
+    plan = PlanCycles(etat.travail, etat.pause, etat.pause_longue, etat.total_cycles,
+                      etat.mode_auto)
+    try:
+        suivante = plan.indice_session(etat.cycle, etat.type_session) + 1
+    except IndexError:
+        return None
+    if suivante >= len(plan):
+        return None
+    _, duree, type_session, cycle = plan[suivante]
+    return cycle, type_session, duree
+
 
 # =============================================================================
 # GESTION DES ARGUMENTS EN LIGNE DE COMMANDE
 # =============================================================================
 
+def _largeur_aide():
+    """
+    Retourne la largeur du texte d'aide, calculée comme le ferait argparse.
+
+    Sans largeur explicite, argparse appelle shutil.get_terminal_size() à
+    chaque add_argument, ce qui importe shutil (et bz2, lzma) à chaque
+    démarrage ; la largeur est lue ici une seule fois.
+
+    Returns:
+        int: Le nombre de colonnes disponibles pour l'aide.
+    """
+    try:
+        colonnes = int(os.environ['COLUMNS'])
+    except (KeyError, ValueError):
+        colonnes = 0
+    if colonnes <= 0:
+        try:
+            colonnes = os.get_terminal_size(sys.__stdout__.fileno()).columns
+        except (AttributeError, ValueError, OSError):
+            colonnes = 80
+    return (colonnes or 80) - 2
+
+
 def creer_parseur_arguments():
     """
     Crée et configure le parseur d'arguments de ligne de commande.
@@ -261,6 +1946,8 @@ def creer_parseur_arguments():
         --cycles, -c  : Nombre de cycles Pomodoro à effectuer
         --auto        : Mode automatique (enchaîne travail et pauses)
     """
+    import argparse
+    largeur = _largeur_aide()
     parser = argparse.ArgumentParser(
         prog='pomodoro',
         description='''
@@ -278,7 +1965,8 @@ def creer_parseur_arguments():
           python pomodoro.py -w 25 -b 5 -c 4    # 4 cycles complets
           python pomodoro.py --auto -c 4        # Mode automatique avec 4 cycles
         ''',
-        formatter_class=argparse.RawDescriptionHelpFormatter
+        formatter_class=lambda prog: argparse.RawDescriptionHelpFormatter(
+            prog, width=largeur)
     )
 
     # Argument pour la durée de travail
@@ -340,15 +2028,392 @@ def creer_parseur_arguments():
         help='Mode silencieux : désactive les notifications sonores'
     )
 
+    # Flux d'événements JSON pour les outils
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Écrit un événement JSON par ligne sur stdout (le texte passe sur stderr)'
+    )
+
+    # Fréquence des événements "tick" du mode JSON
+    parser.add_argument(
+        '--tick-rate',
+        type=float,
+        default=FREQUENCE_TICKS_JSON_DEFAUT,
+        dest='frequence_ticks',
+        metavar='HZ',
+        help='Nombre d\'événements "tick" par seconde en mode JSON '
+             f'(défaut: {FREQUENCE_TICKS_JSON_DEFAUT:g})'
+    )
+
+    # Intervalle des jalons lorsque la sortie n'est pas un terminal
+    parser.add_argument(
+        '--log-interval',
+        type=int,
+        default=INTERVALLE_JOURNAL_DEFAUT,
+        dest='intervalle_journal',
+        metavar='MINUTES',
+        help='Hors terminal (fichier, CI), intervalle entre deux lignes de '
+             f'progression en minutes (défaut: {INTERVALLE_JOURNAL_DEFAUT})'
+    )
+
+    # Emplacement de l'historique des sessions
+    parser.add_argument(
+        '--history-file',
+        dest='fichier_historique',
+        metavar='FICHIER',
+        help='Fichier d\'historique des sessions '
+             '(défaut: $XDG_DATA_HOME/pymodoro/historique.bin)'
+    )
+
+    # Désactivation de l'historique
+    parser.add_argument(
+        '--no-history',
+        action='store_true',
+        dest='sans_historique',
+        help='N\'enregistre pas les sessions dans l\'historique'
+    )
+
+    # Tonalité de notification
+    parser.add_argument(
+        '--beep-freq',
+        type=float,
+        default=FREQUENCE_SON_DEFAUT,
+        dest='frequence_son',
+        metavar='HZ',
+        help=f'Fréquence des bips de fin de session (défaut: {FREQUENCE_SON_DEFAUT})'
+    )
+    parser.add_argument(
+        '--beep-ms',
+        type=int,
+        default=DUREE_SON_DEFAUT_MS,
+        dest='duree_son',
+        metavar='MS',
+        help=f'Durée d\'un bip en millisecondes (défaut: {DUREE_SON_DEFAUT_MS})'
+    )
+
+    # Reprise d'un plan interrompu
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        dest='reprendre',
+        help='Reprend le dernier plan de cycles interrompu là où il s\'est arrêté'
+    )
+
+    # Pilotage à distance par socket Unix
+    parser.add_argument(
+        '--control-socket',
+        dest='socket_controle',
+        metavar='CHEMIN',
+        help='Socket de pilotage (status, pause, resume, skip, extend, stop) '
+             '(défaut: $XDG_RUNTIME_DIR/pymodoro.sock)'
+    )
+    parser.add_argument(
+        '--no-control',
+        action='store_true',
+        dest='sans_controle',
+        help='N\'ouvre pas de socket de pilotage'
+    )
+
+    parser.add_argument(
+        '--on-suspend',
+        choices=POLITIQUES_VEILLE,
+        default=VEILLE_PAUSE,
+        dest='politique_veille',
+        help='Pendant une mise en veille ou un Ctrl+Z : pause (la session attend) '
+             'ou count (le temps est compté comme écoulé) (défaut: pause)'
+    )
+    parser.add_argument(
+        '--no-keys',
+        action='store_true',
+        dest='sans_clavier',
+        help='Ignore les touches du terminal (espace, s, +, q) pendant les sessions'
+    )
+
+    # Statut partagé pour `pymodoro status`
+    parser.add_argument(
+        '--no-status',
+        action='store_true',
+        dest='sans_statut',
+        help='Ne publie pas le statut lu par `pymodoro status` '
+             '($XDG_RUNTIME_DIR/pymodoro.status)'
+    )
+
+    # Commandes lancées en fin de session, sans jamais retarder la minuterie
+    parser.add_argument(
+        '--on-work-end',
+        action='append',
+        dest='crochets_travail',
+        metavar='COMMANDE',
+        help='Commande du shell lancée à la fin de chaque session de travail '
+             '(répétable ; contexte dans les variables PYMODORO_*)'
+    )
+    parser.add_argument(
+        '--on-break-end',
+        action='append',
+        dest='crochets_pause',
+        metavar='COMMANDE',
+        help='Commande du shell lancée à la fin de chaque pause (répétable)'
+    )
+    parser.add_argument(
+        '--hook-timeout',
+        type=float,
+        default=DELAI_CROCHET_DEFAUT,
+        dest='delai_crochets',
+        metavar='SECONDES',
+        help='Délai au-delà duquel une commande de fin de session est tuée '
+             f'(défaut: {DELAI_CROCHET_DEFAUT:g})'
+    )
+
+    # Métriques Prometheus pour les minuteries lancées comme service
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        dest='port_metriques',
+        metavar='PORT',
+        help='Expose les métriques Prometheus sur http://127.0.0.1:PORT/metrics'
+    )
+
+    # Profil du retard des ticks et du coût des trames
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        dest='profil',
+        help='Mesure le retard de chaque tick et le coût de ses trames ; '
+             'affiche p50/p95/p99/max à la sortie'
+    )
+    parser.add_argument(
+        '--profile-output',
+        dest='fichier_profil',
+        metavar='FICHIER',
+        help='Enregistre les mesures brutes de --profile au format CSV'
+    )
+
+    # Réveils des ticks sur échéances absolues et marge des minuteries (Linux)
+    parser.add_argument(
+        '--precise',
+        action='store_true',
+        dest='reveil_precis',
+        help='Réveils précis des ticks (Linux) : minuterie timerfd sur des échéances '
+             'absolues et marge des minuteries minimale'
+    )
+    parser.add_argument(
+        '--timer-slack',
+        type=int,
+        dest='marge_timer',
+        metavar='NS',
+        help='Marge accordée au noyau pour regrouper les réveils, en nanosecondes (Linux)'
+    )
+    parser.add_argument(
+        '--low-power',
+        action='store_true',
+        dest='economie',
+        help='Affichage à la minute près, réveillé seulement quand il change '
+             '(quelques dizaines de réveils par session au lieu d\'un par seconde)'
+    )
+
+    # Fréquence d'affichage du terminal, indépendante de la seconde affichée
+    parser.add_argument(
+        '--fps',
+        type=int,
+        metavar='HZ',
+        help=f'Trames par seconde sur un terminal ({FPS_MIN} à {FPS_MAX}), avec une barre '
+             f'au huitième de case qui avance entre deux secondes'
+    )
+
     return parser
 
 
+# =============================================================================
+# PLAN DES CYCLES
+# =============================================================================
+
+# Types de session, dans l'ordre de leur code dans PlanCycles
+TYPES_SESSION_PLAN = ("TRAVAIL", "PAUSE", "PAUSE LONGUE")
+
+
+class PlanCycles:
+    """
+    Plan immuable d'une suite de cycles, calculé une fois pour toutes.
+
+    Le plan est une suite de segments (décalage de début, durée, type) rangés
+    dans des tableaux compacts : deux `array('d')` et un `array('B')` des
+    codes de type. Le segment 2k est le travail du cycle k+1, le segment
+    2k+1 la pause qui le suit ; le dernier cycle n'a pas de pause. Les
+    règles de cycle (pause longue tous les CYCLES_PAUSE_LONGUE cycles, pas
+    de pause après le dernier cycle, DELAI_ENCHAINEMENT_AUTO avant la pause
+    en mode automatique) ne sont
+    appliquées qu'ici : le moteur, la reprise, l'affichage, le statut et les
+    minuteries du démon interrogent le plan au lieu de les rejouer.
+
+    Les décalages sont nominaux, en secondes depuis le début du plan : en
+    mode manuel, l'attente des confirmations n'y figure pas.
+
+    Args:
+        duree_travail (float): Durée du travail en minutes.
+        duree_pause (float): Durée de la pause courte en minutes.
+        duree_pause_longue (float): Durée de la pause longue en minutes.
+        total_cycles (int): Nombre de cycles du plan.
+        mode_auto (bool): Si True, chaque pause commence après le délai
+                          d'enchaînement automatique.
+
+    Exemple:
+        >>> plan = PlanCycles(25, 5, 15, 4)
+        >>> plan[1]
+        (1502.0, 300.0, 'PAUSE', 1)
+        >>> plan.position_a(1600)
+        (1, 202.0)
+    """
+
+    __slots__ = ('duree_travail', 'duree_pause', 'duree_pause_longue', 'total_cycles',
+                 'mode_auto', '_debuts', '_durees', '_types', '_debuts_pauses', '__weakref__')
+
+    def __init__(self, duree_travail, duree_pause, duree_pause_longue, total_cycles,
+                 mode_auto=True):
+        self.duree_travail = duree_travail
+        self.duree_pause = duree_pause
+        self.duree_pause_longue = duree_pause_longue
+        self.total_cycles = total_cycles
+        self.mode_auto = mode_auto
+
+        delai = DELAI_ENCHAINEMENT_AUTO if mode_auto else 0
+        self._debuts = array('d')
+        self._durees = array('d')
+        self._types = array('B')
+        self._debuts_pauses = array('d')
+        decalage = 0.0
+        for cycle in range(1, total_cycles + 1):
+            segments = [(0, duree_travail, "TRAVAIL")]
+            if cycle % CYCLES_PAUSE_LONGUE == 0 and cycle < total_cycles:
+                segments.append((delai, duree_pause_longue, "PAUSE LONGUE"))
+            elif cycle < total_cycles:
+                segments.append((delai, duree_pause, "PAUSE"))
+            for attente, minutes, type_session in segments:
+                decalage += attente
+                if type_session != "TRAVAIL":
+                    self._debuts_pauses.append(decalage)
+                self._debuts.append(decalage)
+                self._durees.append(minutes * 60)
+                self._types.append(TYPES_SESSION_PLAN.index(type_session))
+                decalage += minutes * 60
+
+    def __len__(self):
+        """Retourne le nombre de segments du plan."""
+        return len(self._debuts)
+
+    def __getitem__(self, indice):
+        """
+        Retourne un segment du plan.
+
+        Args:
+            indice (int): L'indice du segment (négatif depuis la fin).
+
+        Returns:
+            tuple: (décalage de début, durée en secondes, type de session, cycle).
+
+        Raises:
+            IndexError: Si le segment n'existe pas.
+        """
+        if indice < 0:
+            indice += len(self._debuts)
+        return (self._debuts[indice], self._durees[indice],
+                TYPES_SESSION_PLAN[self._types[indice]], indice // 2 + 1)
+
+    def __iter__(self):
+        """Parcourt les segments dans l'ordre du plan."""
+        return (self[indice] for indice in range(len(self)))
+
+    @property
+    def duree_totale(self):
+        """La durée nominale du plan complet, en secondes."""
+        if not self._debuts:
+            return 0.0
+        return self._debuts[-1] + self._durees[-1]
+
+    def indice_session(self, cycle, type_session):
+        """
+        Retourne l'indice du segment d'une session, en O(1).
+
+        Args:
+            cycle (int): Le numéro du cycle (commence à 1).
+            type_session (str): "TRAVAIL", ou un type de pause.
+
+        Returns:
+            int: L'indice du segment.
+
+        Raises:
+            IndexError: Si le plan ne contient pas cette session.
+        """
+        indice = 2 * (cycle - 1) + (type_session != "TRAVAIL")
+        if cycle < 1 or indice >= len(self._debuts):
+            raise IndexError(f"pas de {type_session} au cycle {cycle} du plan")
+        return indice
+
+    def pause_du_cycle(self, cycle):
+        """
+        Retourne la pause qui suit le travail d'un cycle.
+
+        Args:
+            cycle (int): Le numéro du cycle (commence à 1).
+
+        Returns:
+            tuple: (durée en minutes, type de pause), ou None après le
+            dernier cycle.
+        """
+        if cycle >= self.total_cycles:
+            return None
+        type_session = TYPES_SESSION_PLAN[self._types[self.indice_session(cycle, "PAUSE")]]
+        if type_session == "PAUSE LONGUE":
+            return self.duree_pause_longue, type_session
+        return self.duree_pause, type_session
+
+    def position_a(self, decalage):
+        """
+        Retourne la session en cours à un décalage donné, par bisection.
+
+        Pendant le délai d'enchaînement qui précède une pause, la session
+        en cours est le travail qui vient de finir (0 seconde restante).
+
+        Args:
+            decalage (float): Le temps écoulé depuis le début du plan, en secondes.
+
+        Returns:
+            tuple: (indice du segment, secondes restantes), ou None si le
+            plan est terminé.
+        """
+        if decalage >= self.duree_totale:
+            return None
+        indice = max(bisect_right(self._debuts, decalage) - 1, 0)
+        fin = self._debuts[indice] + self._durees[indice]
+        return indice, max(fin - decalage, 0.0)
+
+    def temps_avant_pause(self, decalage):
+        """
+        Retourne le temps jusqu'à la prochaine pause, par bisection.
+
+        Args:
+            decalage (float): Le temps écoulé depuis le début du plan, en secondes.
+
+        Returns:
+            float: Les secondes avant le début de la prochaine pause (0.0
+            pendant une pause), ou None si aucune pause ne reste.
+        """
+        position = self.position_a(decalage)
+        if position is not None and self._types[position[0]] and position[1] > 0:
+            return 0.0
+        suivante = bisect_right(self._debuts_pauses, decalage)
+        if suivante >= len(self._debuts_pauses):
+            return None
+        return self._debuts_pauses[suivante] - decalage
+
+
 # =============================================================================
 # FONCTIONS DE GESTION DES CYCLES
 # =============================================================================
 
 def executer_cycle_pomodoro(duree_travail, duree_pause, duree_pause_longue,
-                            numero_cycle, total_cycles, mode_auto, mode_silencieux=False):
+                            numero_cycle, total_cycles, mode_auto, mode_silencieux=False,
+                            reprise=None, plan=None):
     """
     Exécute un cycle Pomodoro complet (travail + pause).
 
@@ -360,42 +2425,106 @@ def executer_cycle_pomodoro(duree_travail, duree_pause, duree_pause_longue,
         total_cycles (int): Nombre total de cycles à effectuer.
         mode_auto (bool): Si True, enchaîne automatiquement les sessions.
         mode_silencieux (bool): Si True, désactive les notifications sonores.
+        reprise (tuple): (type de session, secondes restantes) de la session
+                         interrompue par laquelle le cycle reprend (--resume).
+        plan (PlanCycles): Le plan dont le cycle fait partie (construit à
+                           partir des durées si None).
     """
-    print(f"\n    📊 Cycle {numero_cycle}/{total_cycles}")
-    print("    " + "═" * 45)
+    if plan is None:
+        plan = PlanCycles(duree_travail, duree_pause, duree_pause_longue, total_cycles,
+                          mode_auto)
+    reprise_travail = reprise if reprise is not None and reprise[0] == "TRAVAIL" else None
+    reprise_pause = reprise if reprise is not None and reprise[0] != "TRAVAIL" else None
+
+    # Le numéro de cycle accompagne chaque session consignée dans l'historique
+    with contexte_temporaire(numero_cycle=numero_cycle):
+        print(f"\n    📊 Cycle {numero_cycle}/{total_cycles}")
+        print("    " + "═" * 45)
+        if contexte.evenements.ecoute("cycle_debut"):
+            contexte.evenements.publier("cycle_debut", {"cycle": numero_cycle,
+                                                        "total_cycles": total_cycles})
+
+        # Session de travail (déjà faite si le cycle reprend à la pause)
+        if reprise_pause is None:
+            if reprise_travail is None:
+                compte_a_rebours(duree_travail, "TRAVAIL", mode_silencieux)
+            else:
+                compte_a_rebours(duree_travail, "TRAVAIL", mode_silencieux,
+                                 reprise=reprise_travail[1])
+
+        # Pause prévue par le plan (longue après 4 cycles, aucune au dernier)
+        pause = plan.pause_du_cycle(numero_cycle)
+        if pause is None:
+            print("    🏆 Félicitations ! Tous les cycles sont terminés !")
+            print("    " + "═" * 45 + "\n")
+            _signaler_fin_cycle(numero_cycle, total_cycles)
+            return
+
+        duree_pause_actuelle, type_pause = pause
+
+        # Reprise d'une pause interrompue, sans nouvelle confirmation
+        if reprise_pause is not None:
+            compte_a_rebours(duree_pause_actuelle, type_pause, mode_silencieux,
+                             reprise=reprise_pause[1])
+        # En mode automatique, on enchaîne directement, la boucle des ticks
+        # restant servie pendant le délai
+        elif mode_auto:
+            print(f"    ⏭️  Enchaînement automatique vers la {type_pause}...")
+            if contexte.controle is None:
+                contexte.horloge.dormir(DELAI_ENCHAINEMENT_AUTO)
+            else:
+                contexte.controle.patienter(DELAI_ENCHAINEMENT_AUTO, contexte.horloge)
+            compte_a_rebours(duree_pause_actuelle, type_pause, mode_silencieux)
+        else:
+            # Sinon, on demande confirmation à l'utilisateur
+            print(f"    ❓ Appuyez sur Entrée pour démarrer la {type_pause} ({duree_pause_actuelle} min)...")
+            print("       (ou Ctrl+C pour quitter)")
+            try:
+                attendre_entree()
+                compte_a_rebours(duree_pause_actuelle, type_pause, mode_silencieux)
+            except KeyboardInterrupt:
+                print("\n\n    👋 À bientôt !\n")
+                sys.exit(0)
 
-    # Session de travail
-    compte_a_rebours(duree_travail, "TRAVAIL", mode_silencieux)
+        _signaler_fin_cycle(numero_cycle, total_cycles)
 
-    # Vérification si c'est le dernier cycle
-    if numero_cycle == total_cycles:
-        print("    🏆 Félicitations ! Tous les cycles sont terminés !")
-        print("    " + "═" * 45 + "\n")
-        return
 
-    # Détermination du type de pause (longue après 4 cycles)
-    if numero_cycle % 4 == 0:
-        duree_pause_actuelle = duree_pause_longue
-        type_pause = "PAUSE LONGUE"
-    else:
-        duree_pause_actuelle = duree_pause
-        type_pause = "PAUSE"
-
-    # En mode automatique, on enchaîne directement
-    if mode_auto:
-        print(f"    ⏭️  Enchaînement automatique vers la {type_pause}...")
-        time.sleep(2)
-        compte_a_rebours(duree_pause_actuelle, type_pause, mode_silencieux)
-    else:
-        # Sinon, on demande confirmation à l'utilisateur
-        print(f"    ❓ Appuyez sur Entrée pour démarrer la {type_pause} ({duree_pause_actuelle} min)...")
-        print("       (ou Ctrl+C pour quitter)")
+def attendre_entree():
+    """
+    Attend que l'utilisateur appuie sur Entrée, entre deux sessions.
+
+    Avec le clavier du contexte, l'attente se fait dans la boucle des ticks :
+    la socket de pilotage reste servie et q quitte. Sinon (entrée qui n'est
+    pas un terminal, ou --no-keys), c'est un input() classique, pendant
+    lequel Ctrl+Z est traité dès le signal.
+
+    Raises:
+        KeyboardInterrupt: Si l'utilisateur quitte (Ctrl+C, q ou stop) ou si
+                           l'entrée est épuisée.
+    """
+    if contexte.clavier is None:
+        suspension = contexte.suspension
+        if suspension is not None:
+            suspension.au_repos = True
+            suspension.traiter_en_attente()
         try:
             input()
-            compte_a_rebours(duree_pause_actuelle, type_pause, mode_silencieux)
-        except KeyboardInterrupt:
-            print("\n\n    👋 À bientôt !\n")
-            sys.exit(0)
+        except EOFError:
+            raise KeyboardInterrupt from None
+        finally:
+            if suspension is not None:
+                suspension.au_repos = False
+    else:
+        contexte.clavier.attendre_entree()
+
+
+def _signaler_fin_cycle(numero_cycle, total_cycles):
+    """Transmet la fin d'un cycle au mode de sortie actif et aux abonnés."""
+    if contexte.sortie is not None:
+        contexte.sortie.fin_cycle(numero_cycle, total_cycles)
+    if contexte.evenements.ecoute("cycle_fin"):
+        contexte.evenements.publier("cycle_fin", {"cycle": numero_cycle,
+                                                  "total_cycles": total_cycles})
 
 
 # =============================================================================
@@ -408,19 +2537,45 @@ def main():
 
     Cette fonction orchestre l'exécution du chronomètre Pomodoro:
     1. Configure le terminal pour l'UTF-8 (Windows)
-    2. Affiche la bannière de bienvenue
-    3. Parse les arguments de ligne de commande
-    4. Exécute les cycles Pomodoro selon les paramètres
+    2. Parse les arguments de ligne de commande
+    3. Choisit le mode de sortie (terminal, journal ou JSON) et l'historique
+    4. Affiche la bannière de bienvenue
+    5. Exécute les cycles Pomodoro selon les paramètres
     """
     # Configuration du terminal pour supporter les emojis sur Windows
     configurer_terminal()
 
-    # Affichage de la bannière
-    afficher_banniere()
+    # Démon et commandes qui lui sont transmises, avec le même sens que pour
+    # pymodoroc (qui les transmet sans importer ce module) : sans démon,
+    # `pymodoro status` lit le statut d'un pymodoro en cours, sans construire
+    # le parseur
+    commande = sys.argv[1] if len(sys.argv) > 1 else None
+    if commande == "daemon":
+        from pomodoro_serveur import main_demon
+        sys.exit(main_demon(sys.argv[2:]))
+    if commande in ("start", "stop", "status", "shutdown"):
+        from pomodoro_client import commande_demon
+        sys.exit(commande_demon(sys.argv[1:]))
 
     # Création et parsing des arguments
     parser = creer_parseur_arguments()
     args = parser.parse_args()
+    if args.frequence_ticks <= 0:
+        parser.error("--tick-rate doit être strictement positif")
+    if args.frequence_son <= 0 or args.duree_son <= 0:
+        parser.error("--beep-freq et --beep-ms doivent être strictement positifs")
+    if args.delai_crochets <= 0:
+        parser.error("--hook-timeout doit être strictement positif")
+    if args.port_metriques is not None and not 0 <= args.port_metriques <= 65535:
+        parser.error("--metrics-port doit être compris entre 0 et 65535")
+    if args.fichier_profil and not args.profil:
+        parser.error("--profile-output s'utilise avec --profile")
+    if args.marge_timer is not None and args.marge_timer <= 0:
+        parser.error("--timer-slack doit être strictement positif")
+    if args.fps is not None and not FPS_MIN <= args.fps <= FPS_MAX:
+        parser.error(f"--fps doit être compris entre {FPS_MIN} et {FPS_MAX}")
+    if args.fps is not None and args.economie:
+        parser.error("--fps et --low-power s'excluent")
 
     # Récupération des paramètres
     duree_travail = args.work
@@ -431,44 +2586,235 @@ def main():
     pause_seule = args.pause_only
     mode_silencieux = args.silent
 
-    # Affichage de la configuration actuelle
-    print("    ⚙️  Configuration:")
-    print(f"       • Travail    : {duree_travail} minutes")
-    print(f"       • Pause      : {duree_pause} minutes")
-    print(f"       • Pause longue: {duree_pause_longue} minutes")
-    print(f"       • Cycles     : {nombre_cycles}")
-    print(f"       • Mode auto  : {'Oui' if mode_auto else 'Non'}")
-    print(f"       • Silencieux : {'Oui' if mode_silencieux else 'Non'}")
-
-    # Mode pause seule
-    if pause_seule:
-        compte_a_rebours(duree_pause, "PAUSE", mode_silencieux)
-        return
-
-    # Exécution des cycles
-    for cycle in range(1, nombre_cycles + 1):
-        executer_cycle_pomodoro(
-            duree_travail=duree_travail,
-            duree_pause=duree_pause,
-            duree_pause_longue=duree_pause_longue,
-            numero_cycle=cycle,
-            total_cycles=nombre_cycles,
-            mode_auto=mode_auto,
-            mode_silencieux=mode_silencieux
-        )
-
-        # Pause entre les cycles (sauf mode auto)
-        if cycle < nombre_cycles and not mode_auto:
-            print(f"\n    ⏭️  Appuyez sur Entrée pour démarrer le cycle {cycle + 1}...")
+    # Mode de sortie : en JSON, stdout est réservé aux événements et le
+    # texte destiné à l'utilisateur part sur stderr ; sinon trames
+    # dynamiques sur un terminal et jalons ailleurs
+    if args.json:
+        sortie = SortieJSON(args.frequence_ticks)
+        redirection = contextlib.redirect_stdout(sys.stderr)
+    else:
+        sortie = choisir_sortie(intervalle_minutes=args.intervalle_journal,
+                                econome=args.economie, fps=args.fps)
+        redirection = contextlib.nullcontext()
+
+    # Historique des sessions, en ajout seul
+    from pomodoro_historique import JournalHistorique, chemin_historique_defaut
+    from pomodoro_reprise import PointDeReprise, chemin_reprise_defaut, lire_reprise
+    historique = None
+    if not args.sans_historique:
+        historique = JournalHistorique(args.fichier_historique or chemin_historique_defaut())
+
+    # Notifications distribuées en arrière-plan : le son de fin ne retarde
+    # pas la session suivante ; la sortie du bloc attend les dernières, puis
+    # le lecteur audio (lancé à la première alerte) finit de jouer
+    notifications = None
+    lecteur_audio = None
+    if not mode_silencieux:
+        from pomodoro_notifications import FileNotifications
+        from pomodoro_son import LecteurAudio
+        notifications = FileNotifications(horloge=contexte.horloge)
+        lecteur_audio = LecteurAudio(args.frequence_son, args.duree_son)
+
+    # Touches du terminal, servies par la boucle des ticks
+    clavier_possible = (not args.sans_clavier and not args.json
+                        and _descripteur_terminal(sys.stdin) is not None)
+
+    # Ctrl+Z depuis un terminal seulement, traité par la boucle des ticks
+    suspension_possible = os.name == "posix" and _descripteur_terminal(sys.stdin) is not None
+
+    # Socket de pilotage, ouverte à la première attente et servie par la
+    # boucle des ticks ; avec --no-control, la boucle sert encore les
+    # métriques, le clavier et Ctrl+Z
+    controle = None
+    if (not args.sans_controle or args.port_metriques is not None or clavier_possible
+            or suspension_possible):
+        from pomodoro_controle import ServeurControle
+        controle = ServeurControle(args.socket_controle, pilotage=not args.sans_controle)
+    clavier = None
+    if clavier_possible:
+        from pomodoro_clavier import Clavier
+        clavier = Clavier(controle)
+
+    # Ctrl+Z : session en pause, ou non, et terminal rendu au shell pendant
+    # l'arrêt
+    suspension = None
+    if suspension_possible:
+        from pomodoro_suspension import GestionSuspension
+        suspension = GestionSuspension(args.politique_veille == VEILLE_PAUSE, clavier,
+                                       controle)
+
+    # Métriques Prometheus, comptées par le moteur et servies par la même boucle
+    metriques = None
+    serveur_metriques = None
+    if args.port_metriques is not None:
+        from pomodoro_metriques import Metriques, ServeurMetriques
+        metriques = Metriques()
+        metriques.notifications = notifications
+        metriques.abonner(contexte.evenements)
+        serveur_metriques = ServeurMetriques(metriques, args.port_metriques)
+
+    # Profil des ticks, rapporté sur stderr à la sortie du bloc
+    profil = None
+    if args.profil:
+        from pomodoro_profil import ProfilTicks
+        profil = ProfilTicks(chemin_export=args.fichier_profil)
+
+    # Réveils sur échéances absolues : minuterie timerfd avec --precise,
+    # select() sinon, et marge des minuteries réglée par prctl() (large avec
+    # --low-power, pour que le noyau regroupe les réveils)
+    horloge_reveil = None
+    reveil_ignore = False
+    if args.reveil_precis or args.marge_timer is not None:
+        if sys.platform.startswith("linux"):
+            from pomodoro_reveil import MARGE_PRECISE, HorlogeReveil
+            marge = args.marge_timer
+            if marge is None:
+                marge = MARGE_PRECISE
+            horloge_reveil = HorlogeReveil(marge, minuterie=args.reveil_precis)
+        else:
+            reveil_ignore = True
+    elif args.economie and sys.platform.startswith("linux"):
+        from pomodoro_reveil import MARGE_ECONOME, HorlogeReveil
+        horloge_reveil = HorlogeReveil(MARGE_ECONOME, minuterie=False)
+
+    # Statut partagé, publié à chaque changement d'état des sessions
+    statut = None
+    if not args.sans_statut:
+        from pomodoro_statut import PublicationStatut
+        statut = PublicationStatut()
+
+    # Commandes de fin de session, lancées par un groupe de threads borné
+    crochets = None
+    if args.crochets_travail or args.crochets_pause:
+        from pomodoro_crochets import ExecuteurCrochets
+        crochets = ExecuteurCrochets(args.crochets_travail, args.crochets_pause,
+                                     args.delai_crochets)
+        crochets.abonner(contexte.evenements)
+
+    with redirection, profil or contextlib.nullcontext(), \
+            lecteur_audio or contextlib.nullcontext(), \
+            crochets or contextlib.nullcontext(), \
+            controle or contextlib.nullcontext(), horloge_reveil or contextlib.nullcontext(), \
+            metriques or contextlib.nullcontext(), \
+            serveur_metriques or contextlib.nullcontext(), clavier or contextlib.nullcontext(), \
+            suspension or contextlib.nullcontext(), statut or contextlib.nullcontext(), \
+            contexte_temporaire(sortie=sortie, historique=historique, point_reprise=None,
+                                notifications=notifications, lecteur_audio=lecteur_audio,
+                                controle=controle, statut=statut, metriques=metriques,
+                                profil=profil,
+                                clavier=clavier if clavier is not None and clavier.actif
+                                else None,
+                                politique_veille=args.politique_veille,
+                                suspension=suspension,
+                                horloge=horloge_reveil or contexte.horloge), \
+            notifications or contextlib.nullcontext(), contexte.evenements:
+        # Affichage de la bannière
+        afficher_banniere()
+
+        if serveur_metriques is not None:
             try:
-                input()
-            except KeyboardInterrupt:
-                print("\n\n    👋 À bientôt !\n")
-                sys.exit(0)
-
-    # Message final
-    print("\n    🍅 Merci d'avoir utilisé Pymodoro-CLI !")
-    print("    📈 Continuez à travailler efficacement !\n")
+                serveur_metriques.brancher(controle)
+            except OSError as erreur:
+                print(f"    ⚠️  Métriques désactivées : {erreur}\n")
+            else:
+                print(f"    📈 Métriques : http://{serveur_metriques.adresse}:"
+                      f"{serveur_metriques.port}/metrics\n")
+        if reveil_ignore:
+            print("    ⚠️  --precise et --timer-slack ne sont disponibles que sous Linux.\n")
+
+        # Reprise d'un plan interrompu : le plan sauvegardé remplace les options
+        premier_cycle = 1
+        reprise = None
+        if args.reprendre and not pause_seule:
+            etat = lire_reprise(chemin_reprise_defaut())
+            position = None
+            if etat is not None:
+                position = position_reprise(etat, contexte.horloge.heure_murale())
+            if position is None:
+                print("    ℹ️  Aucun plan interrompu à reprendre : nouveau plan.\n")
+            else:
+                duree_travail = etat.travail
+                duree_pause = etat.pause
+                duree_pause_longue = etat.pause_longue
+                nombre_cycles = etat.total_cycles
+                mode_auto = etat.mode_auto
+                premier_cycle, type_reprise, secondes_restantes = position
+                if not (type_reprise == "TRAVAIL" and secondes_restantes == duree_travail * 60):
+                    reprise = (type_reprise, secondes_restantes)
+                print(f"    ⏯️  Reprise du plan au cycle {premier_cycle}/{nombre_cycles} "
+                      f"({type_reprise})\n")
+
+        # Affichage de la configuration actuelle
+        print("    ⚙️  Configuration:")
+        print(f"       • Travail    : {duree_travail} minutes")
+        print(f"       • Pause      : {duree_pause} minutes")
+        print(f"       • Pause longue: {duree_pause_longue} minutes")
+        print(f"       • Cycles     : {nombre_cycles}")
+        if not pause_seule:
+            plan = PlanCycles(duree_travail, duree_pause, duree_pause_longue, nombre_cycles,
+                              mode_auto)
+            print(f"       • Durée totale: {math.ceil(plan.duree_totale / 60)} minutes")
+        print(f"       • Mode auto  : {'Oui' if mode_auto else 'Non'}")
+        print(f"       • Silencieux : {'Oui' if mode_silencieux else 'Non'}")
+        if contexte.clavier is not None:
+            print("       • Touches    : espace pause/reprise, s passer, + prolonger, q quitter")
+        if args.economie:
+            print("       • Économie   : affichage à la minute, réveils aux seuls changements")
+        if args.fps is not None and isinstance(sortie, SortieTerminal):
+            print(f"       • Affichage  : {args.fps} trame(s) par seconde, barre au huitième")
+        if horloge_reveil is not None:
+            print(f"       • Réveils    : {horloge_reveil.description()}")
+
+        # Mode pause seule
+        if pause_seule:
+            compte_a_rebours(duree_pause, "PAUSE", mode_silencieux)
+            return
+
+        # Plan publié avec le statut, nombre de cycles transmis aux commandes
+        # (après une éventuelle reprise)
+        if contexte.statut is not None:
+            contexte.statut.plan = plan
+        if crochets is not None:
+            crochets.total_cycles = plan.total_cycles
+
+        # Position du plan sauvegardée à chaque session, pour --resume
+        contexte.point_reprise = PointDeReprise(chemin_reprise_defaut(), plan.duree_travail,
+                                                plan.duree_pause, plan.duree_pause_longue,
+                                                plan.total_cycles, plan.mode_auto)
+
+        # Exécution des cycles
+        for cycle in range(premier_cycle, nombre_cycles + 1):
+            executer_cycle_pomodoro(
+                duree_travail=duree_travail,
+                duree_pause=duree_pause,
+                duree_pause_longue=duree_pause_longue,
+                numero_cycle=cycle,
+                total_cycles=nombre_cycles,
+                mode_auto=mode_auto,
+                mode_silencieux=mode_silencieux,
+                reprise=reprise if cycle == premier_cycle else None,
+                plan=plan
+            )
+
+            # Pause entre les cycles (sauf mode auto)
+            if cycle < nombre_cycles and not mode_auto:
+                print(f"\n    ⏭️  Appuyez sur Entrée pour démarrer le cycle {cycle + 1}...")
+                try:
+                    attendre_entree()
+                except KeyboardInterrupt:
+                    print("\n\n    👋 À bientôt !\n")
+                    sys.exit(0)
+
+        # Plan terminé : plus rien à reprendre
+        if contexte.point_reprise is not None:
+            contexte.point_reprise.effacer()
+        if contexte.evenements.ecoute("plan_fin"):
+            contexte.evenements.publier("plan_fin", {"total_cycles": nombre_cycles,
+                                                     "duree": plan.duree_totale})
+
+        # Message final
+        print("\n    🍅 Merci d'avoir utilisé Pymodoro-CLI !")
+        print("    📈 Continuez à travailler efficacement !\n")
 
 
 # =============================================================================
@@ -476,4 +2822,8 @@ def main():
 # =============================================================================
 
 if __name__ == "__main__":
+    # Lancé comme script, ce module s'appelle __main__ : les modules qui
+    # importent pomodoro doivent le retrouver, avec son contexte, au lieu
+    # d'en charger une seconde copie
+    sys.modules.setdefault("pomodoro", sys.modules[__name__])
     main()
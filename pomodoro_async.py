@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Moteur asyncio de Pymodoro-CLI.
+===============================
+
+Versions `async` du compte à rebours et des cycles Pomodoro : des milliers
+de minuteries indépendantes peuvent partager une seule boucle d'événements
+et un seul thread.
+
+Le moteur bloquant de pomodoro.py et ce moteur partagent le même cœur :
+l'ordonnancement sur échéances absolues et ses étapes par tick
+(OrdonnanceurTicks : profil, veille, ticks sautés par --low-power), les
+modes de sortie et les règles de cycle (PlanCycles). Seule la manière
+d'attendre diffère : time.sleep() ou la boucle de pilotage d'un côté,
+asyncio.sleep() de l'autre. La socket de pilotage (ServeurControle) ne
+pilote que la session du moteur bloquant ; une session asynchrone se
+pilote par son ordonnanceur (suspendre(), reprendre(), passer()).
+
+Exemple:
+    import asyncio
+    from pomodoro_async import executer_cycle_pomodoro_async
+
+    async def kiosque():
+        await asyncio.gather(*(
+            executer_cycle_pomodoro_async(25, 5, 15, 1, 4, mode_auto=True)
+            for _ in range(1000)
+        ))
+
+    asyncio.run(kiosque())
+"""
+
+import asyncio
+
+import pomodoro
+from pomodoro import (
+    HorlogeVirtuelle,
+    SortieNulle,
+    PlanCycles,
+    apparence_session,
+    contexte,
+    creer_ordonnanceur_session,
+)
+
+
+# =============================================================================
+# ATTENTE ET ITÉRATION DES TICKS
+# =============================================================================
+
+async def attendre_echeance(horloge, echeance):
+    """
+    Attend une échéance absolue sans bloquer la boucle d'événements.
+
+    Avec une horloge virtuelle, le temps avance immédiatement jusqu'à
+    l'échéance et la main est seulement rendue à la boucle.
+
+    Args:
+        horloge (Horloge): L'horloge de référence.
+        echeance (float): L'instant de réveil, sur l'échelle de l'horloge.
+    """
+    if isinstance(horloge, HorlogeVirtuelle):
+        horloge.dormir_jusqua(echeance)
+        await asyncio.sleep(0)
+        return
+    attente = echeance - horloge.maintenant()
+    await asyncio.sleep(attente if attente > 0 else 0)
+
+
+async def attendre_tick(ordonnanceur, tick, horloge):
+    """
+    Attend l'échéance d'un tick, pauses comprises, sans bloquer la boucle.
+
+    Une reprise repousse l'échéance de la durée de la pause ; pendant la
+    pause, l'échéance est réexaminée à chaque période.
+
+    Args:
+        ordonnanceur (OrdonnanceurTicks): L'ordonnanceur de la session.
+        tick (int): Le tick dont l'échéance est attendue.
+        horloge (Horloge): L'horloge de l'ordonnanceur.
+    """
+    while not ordonnanceur.interrompu:
+        if ordonnanceur.pause_depuis is not None:
+            await attendre_echeance(horloge, horloge.maintenant() + ordonnanceur.periode)
+            continue
+        echeance = ordonnanceur.echeance(tick)
+        if horloge.maintenant() >= echeance:
+            return
+        await attendre_echeance(horloge, echeance)
+
+
+async def iterer_ticks(ordonnanceur):
+    """
+    Parcourt les ticks d'un ordonnanceur sans bloquer la boucle.
+
+    Équivalent asynchrone de `for tick in ordonnanceur`, avec les mêmes
+    étapes par tick (OrdonnanceurTicks.demarrer, prochaine_attente et
+    reveiller).
+
+    Args:
+        ordonnanceur (OrdonnanceurTicks): L'ordonnanceur de la session.
+
+    Yields:
+        int: L'indice du tick à afficher.
+    """
+    horloge = ordonnanceur.horloge or contexte.horloge
+    ordonnanceur.demarrer(horloge)
+    tick = 0
+    yield tick
+
+    while tick < ordonnanceur.nombre_ticks:
+        tick = ordonnanceur.prochaine_attente(tick)
+        await attendre_tick(ordonnanceur, tick, horloge)
+        if ordonnanceur.interrompu:
+            return
+        tick = ordonnanceur.reveiller(tick, horloge)
+        yield tick
+
+
+# =============================================================================
+# COMPTE À REBOURS ET CYCLES ASYNCHRONES
+# =============================================================================
+
+async def compte_a_rebours_async(duree_minutes, type_session="TRAVAIL",
+                                 mode_silencieux=False, sortie=None, horloge=None):
+    """
+    Lance un compte à rebours sans bloquer la boucle d'événements.
+
+    Par défaut la session n'affiche rien (SortieNulle) : plusieurs sessions
+    concurrentes ne peuvent pas partager une même ligne de terminal.
+
+    Args:
+        duree_minutes (float): La durée du compte à rebours en minutes.
+        type_session (str): Le type de session ("TRAVAIL" ou "PAUSE").
+        mode_silencieux (bool): Si True, désactive les notifications sonores.
+        sortie: Le mode de sortie de la session (SortieNulle si None).
+        horloge (Horloge): L'horloge à utiliser (celle du contexte si None).
+
+    Returns:
+        OrdonnanceurTicks: L'ordonnanceur utilisé (retard et trames sautées).
+
+    Raises:
+        asyncio.CancelledError: Si la tâche est annulée ; la sortie en est
+                                informée avant la propagation.
+    """
+    sortie = sortie if sortie is not None else SortieNulle()
+    ordonnanceur = creer_ordonnanceur_session(duree_minutes * 60, sortie, horloge)
+    emoji, couleur_debut = apparence_session(type_session)
+    sortie.debut_session(type_session, duree_minutes, emoji, couleur_debut)
+
+    try:
+        async for tick in iterer_ticks(ordonnanceur):
+            sortie.trame(ordonnanceur.secondes_restantes(tick))
+    except asyncio.CancelledError:
+        sortie.annulation()
+        raise
+
+    sortie.fin_session()
+
+    # La notification sonore bloque : elle part dans la file de notifications
+    # du contexte, ou à défaut dans un thread, sans être attendue
+    if not mode_silencieux:
+        if contexte.notifications is not None:
+            contexte.notifications.soumettre("son", pomodoro.emettre_son)
+        else:
+            asyncio.get_running_loop().run_in_executor(None, pomodoro.emettre_son)
+
+    return ordonnanceur
+
+
+async def executer_cycle_pomodoro_async(duree_travail, duree_pause, duree_pause_longue,
+                                        numero_cycle, total_cycles, mode_auto,
+                                        mode_silencieux=False, sortie=None,
+                                        horloge=None, confirmation=None, plan=None):
+    """
+    Exécute un cycle Pomodoro complet (travail + pause) sans bloquer.
+
+    Mêmes règles que executer_cycle_pomodoro() : pause longue tous les 4
+    cycles, pas de pause après le dernier cycle et délai de 2 secondes
+    avant la pause en mode automatique.
+
+    Args:
+        duree_travail (float): Durée de la session de travail en minutes.
+        duree_pause (float): Durée de la pause courte en minutes.
+        duree_pause_longue (float): Durée de la pause longue en minutes.
+        numero_cycle (int): Numéro du cycle actuel (commence à 1).
+        total_cycles (int): Nombre total de cycles à effectuer.
+        mode_auto (bool): Si True, enchaîne automatiquement les sessions.
+        mode_silencieux (bool): Si True, désactive les notifications sonores.
+        sortie: Le mode de sortie des sessions (SortieNulle si None).
+        horloge (Horloge): L'horloge à utiliser (celle du contexte si None).
+        confirmation: Coroutine sans argument attendue avant la pause en
+                      mode manuel (la pause démarre aussitôt si None).
+        plan (PlanCycles): Le plan dont le cycle fait partie (construit à
+                           partir des durées si None).
+
+    Returns:
+        list: Les ordonnanceurs des sessions exécutées.
+    """
+    sortie = sortie if sortie is not None else SortieNulle()
+    horloge = horloge or contexte.horloge
+    if plan is None:
+        plan = PlanCycles(duree_travail, duree_pause, duree_pause_longue, total_cycles,
+                          mode_auto)
+
+    sessions = [await compte_a_rebours_async(duree_travail, "TRAVAIL", mode_silencieux,
+                                             sortie, horloge)]
+
+    pause = plan.pause_du_cycle(numero_cycle)
+    if pause is not None:
+        duree_pause_actuelle, type_pause = pause
+        if mode_auto:
+            await attendre_echeance(horloge,
+                                    horloge.maintenant() + pomodoro.DELAI_ENCHAINEMENT_AUTO)
+        elif confirmation is not None:
+            await confirmation()
+        sessions.append(await compte_a_rebours_async(duree_pause_actuelle, type_pause,
+                                                     mode_silencieux, sortie, horloge))
+
+    sortie.fin_cycle(numero_cycle, total_cycles)
+    return sessions
+
+
+async def executer_plan_async(nombre_cycles, duree_travail=pomodoro.DUREE_TRAVAIL_DEFAUT,
+                              duree_pause=pomodoro.DUREE_PAUSE_DEFAUT,
+                              duree_pause_longue=pomodoro.DUREE_PAUSE_LONGUE_DEFAUT,
+                              mode_silencieux=True, sortie=None, horloge=None):
+    """
+    Enchaîne tous les cycles d'un plan en mode automatique.
+
+    Args:
+        nombre_cycles (int): Nombre de cycles Pomodoro.
+        duree_travail (float): Durée du travail en minutes.
+        duree_pause (float): Durée de la pause courte en minutes.
+        duree_pause_longue (float): Durée de la pause longue en minutes.
+        mode_silencieux (bool): Si True, désactive les notifications sonores.
+        sortie: Le mode de sortie des sessions (SortieNulle si None).
+        horloge (Horloge): L'horloge à utiliser (celle du contexte si None).
+
+    Returns:
+        list: Les ordonnanceurs de toutes les sessions du plan.
+    """
+    plan = PlanCycles(duree_travail, duree_pause, duree_pause_longue, nombre_cycles)
+    sessions = []
+    for cycle in range(1, nombre_cycles + 1):
+        sessions += await executer_cycle_pomodoro_async(
+            duree_travail, duree_pause, duree_pause_longue, cycle, nombre_cycles,
+            True, mode_silencieux, sortie, horloge, plan=plan)
+    return sessions
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Touches du clavier et signaux de Pymodoro-CLI.
+==============================================
+
+Sur un terminal, le clavier pilote la session en cours, touche par touche,
+sans attendre Entrée:
+
+    espace      Met en pause, ou reprend
+    s           Passe la session (skip)
+    +           Prolonge la session (PROLONGATION_DEFAUT secondes)
+    q           Quitte, comme Ctrl+C
+
+L'entrée standard passe en mode caractère (sans écho ni tampon de ligne)
+et devient une source de la boucle des ticks (pomodoro_controle) : une
+touche réveille le même select() que la socket de pilotage et l'échéance
+du prochain tick, et rien n'est exécuté entre deux événements. Les touches
+deviennent les commandes de la socket, exécutées par le même code.
+
+L'invite entre deux sessions attend Entrée dans cette même boucle : la
+socket de pilotage et les métriques restent servies. Si l'entrée est
+épuisée (fin de fichier), la session en cours continue sans clavier, mais
+l'invite arrête pymodoro : Entrée ne peut plus arriver. SIGTERM et SIGHUP
+(terminal fermé) arrêtent pymodoro comme la commande stop : la session en
+cours est consignée comme annulée et le terminal est restauré. Autour d'un
+Ctrl+Z, pomodoro_suspension rend le terminal au shell puis le reprend.
+"""
+
+import os
+
+from pomodoro_controle import PROLONGATION_DEFAUT, ArretDemande
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Commande de la socket associée à chaque touche (l'espace bascule la pause)
+TOUCHES = {
+    b" ": "pause",
+    b"s": "skip",
+    b"S": "skip",
+    b"+": f"extend {PROLONGATION_DEFAUT}",
+    b"q": "stop",
+    b"Q": "stop",
+}
+
+# Touches qui valident l'invite entre deux sessions
+TOUCHES_ENTREE = (b"\n", b"\r")
+
+# Signaux traités comme la commande stop
+SIGNAUX_ARRET = ("SIGTERM", "SIGHUP")
+
+
+# =============================================================================
+# CLAVIER
+# =============================================================================
+
+class Clavier:
+    """
+    Sert les touches du terminal depuis la boucle des ticks.
+
+    S'utilise comme gestionnaire de contexte : l'entrée du bloc passe le
+    terminal en mode caractère, branche l'entrée standard sur la boucle et
+    installe les signaux d'arrêt ; la sortie du bloc rétablit le tout.
+
+    Args:
+        boucle (ServeurControle): La boucle qui sert les sockets et exécute
+                                  les commandes.
+        flux: L'entrée lue (sys.stdin si None), qui doit être un terminal.
+
+    Attributs:
+        touches (int): Le nombre de touches reconnues.
+        actif (bool): True entre l'entrée et la sortie du bloc.
+        epuise (bool): True une fois la fin de l'entrée atteinte.
+    """
+
+    def __init__(self, boucle, flux=None):
+        import sys
+        self.boucle = boucle
+        self.flux = flux if flux is not None else sys.stdin
+        self.touches = 0
+        self.actif = False
+        self.epuise = False
+        self._reglages = None
+        self._caractere = None
+        self._signaux = {}
+        self._entree = False
+
+    def __enter__(self):
+        self.ouvrir()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    def ouvrir(self):
+        """
+        Passe le terminal en mode caractère et branche l'entrée sur la boucle.
+
+        Returns:
+            bool: True si le clavier est actif, False si le terminal ne le
+            permet pas (pas de termios, entrée qui n'est pas un terminal).
+        """
+        if self.actif:
+            return True
+        try:
+            import termios
+        except ImportError:
+            return False
+        try:
+            descripteur = self.flux.fileno()
+            reglages = termios.tcgetattr(descripteur)
+        except (termios.error, AttributeError, OSError, ValueError):
+            return False
+
+        # Mode caractère : ni tampon de ligne ni écho ; Ctrl+C, Ctrl+Z
+        # et le traitement de la sortie sont conservés
+        caractere = list(reglages)
+        caractere[3] &= ~(termios.ICANON | termios.ECHO)
+        caractere[6] = list(reglages[6])
+        caractere[6][termios.VMIN] = 1
+        caractere[6][termios.VTIME] = 0
+        termios.tcsetattr(descripteur, termios.TCSANOW, caractere)
+        self._reglages = reglages
+        self._caractere = caractere
+
+        self.boucle.ajouter_source(self.flux, self._lire)
+        self._installer_signaux()
+        self.actif = True
+        return True
+
+    def fermer(self):
+        """Rétablit le terminal et les signaux, et débranche l'entrée."""
+        if not self.actif:
+            return
+        import signal
+        self.actif = False
+        for numero, precedent in self._signaux.items():
+            signal.signal(numero, precedent)
+        self._signaux.clear()
+        self.boucle.retirer_source(self.flux)
+        self.liberer_terminal()
+
+    def liberer_terminal(self):
+        """Rend au terminal ses réglages d'origine (sortie du bloc, Ctrl+Z)."""
+        self._regler(self._reglages)
+
+    def reprendre_terminal(self):
+        """Repasse le terminal en mode caractère, au retour d'un Ctrl+Z."""
+        if self.actif:
+            self._regler(self._caractere)
+
+    def _regler(self, reglages):
+        if reglages is None:
+            return
+        import termios
+        try:
+            termios.tcsetattr(self.flux.fileno(), termios.TCSADRAIN, reglages)
+        except (termios.error, OSError, ValueError):
+            pass
+
+    def _installer_signaux(self):
+        import signal
+        import threading
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for nom in SIGNAUX_ARRET:
+            numero = getattr(signal, nom, None)
+            if numero is not None:
+                self._signaux[numero] = signal.signal(numero, _signal_arret)
+
+    # -------------------------------------------------------------------------
+    # Touches
+    # -------------------------------------------------------------------------
+
+    def _lire(self, flux):
+        """Lit les touches disponibles et exécute les commandes associées."""
+        try:
+            donnees = os.read(flux.fileno(), 64)
+        except BlockingIOError:
+            return
+        except OSError:
+            donnees = b""
+        if not donnees:
+            # Terminal fermé : plus rien à lire
+            self.boucle.retirer_source(flux)
+            self.epuise = True
+            return
+        for octet in donnees:
+            self.touche(bytes((octet,)))
+
+    def touche(self, touche):
+        """
+        Exécute la commande associée à une touche.
+
+        Args:
+            touche (bytes): La touche, un octet.
+
+        Raises:
+            ArretDemande: Pour la touche q.
+        """
+        if touche in TOUCHES_ENTREE:
+            self._entree = True
+            return
+        commande = TOUCHES.get(touche)
+        if commande is None:
+            return
+        self.touches += 1
+        if commande == "stop":
+            raise ArretDemande()
+        if commande == "pause" and self.boucle.etat().get("paused"):
+            commande = "resume"
+        self.boucle.executer(commande)
+
+    def attendre_entree(self):
+        """
+        Attend la touche Entrée en servant la boucle entre-temps.
+
+        Raises:
+            ArretDemande: Si q, la commande stop ou un signal d'arrêt arrive,
+                          ou si l'entrée est épuisée.
+        """
+        self._entree = False
+        self.boucle.ouvrir()
+        while not self._entree:
+            if self.epuise:
+                raise ArretDemande()
+            self.boucle.traiter(None)
+
+
+def _signal_arret(numero, trame):
+    """Gestionnaire de SIGTERM et SIGHUP : arrêt propre, comme la commande stop."""
+    raise ArretDemande()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Client léger du démon Pymodoro.
+===============================
+
+Le point d'entrée `pymodoroc` ne fait que transmettre ses arguments au démon
+(`pymodoro daemon`) par une socket Unix et recopier la réponse déjà rendue
+sur sa sortie standard. Il n'importe ni le moteur, ni argparse, ni même le
+module socket (enum et selectors coûtent à eux seuls ~15 ms) : une commande
+ne paie que le démarrage de l'interpréteur et un aller-retour sur la socket.
+
+Sans démon, `pymodoroc` se comporte exactement comme `pymodoro`. Les deux
+points d'entrée donnent le même sens aux commandes du démon (voir
+commande_demon()) : `status` liste les minuteries du démon s'il est
+joignable, et sinon lit le statut partagé d'un pymodoro en cours.
+
+Protocole (une requête par connexion):
+    requête : les arguments séparés par des octets nuls, puis "\\n"
+    réponse : le code de sortie en ASCII, "\\n", puis la sortie rendue
+              jusqu'à la fermeture de la connexion
+
+Exemple:
+    $ pymodoro daemon &
+    $ pymodoroc start -w 50 -c 2
+    $ pymodoroc status
+"""
+
+import os
+import sys
+
+from pomodoro_controle import chemin_execution
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Extension de la socket du démon dans le dossier d'exécution
+EXTENSION_SOCKET_DEMON = "daemon.sock"
+
+# Commandes servies par le démon
+COMMANDES_DEMON = ("start", "stop", "status", "shutdown")
+
+# Attente maximale de la réponse du démon (en secondes)
+DELAI_REPONSE = 5.0
+
+
+def chemin_socket_demon():
+    """
+    Retourne l'emplacement par défaut de la socket du démon.
+
+    Returns:
+        str: Le chemin de la socket (voir pomodoro_controle.chemin_execution()).
+    """
+    return chemin_execution(EXTENSION_SOCKET_DEMON)
+
+
+# =============================================================================
+# TRANSMISSION
+# =============================================================================
+
+def transmettre(arguments, sortie=None, chemin=None, delai=DELAI_REPONSE):
+    """
+    Transmet une commande au démon et recopie sa réponse.
+
+    Args:
+        arguments (list): Les arguments de la commande ("start", "-w", "50"...).
+        sortie: Le flux binaire où recopier la réponse (stdout si None).
+        chemin (str): Le chemin de la socket (chemin_socket_demon() si None).
+        delai (float): L'attente maximale de la réponse, en secondes.
+
+    Returns:
+        int: Le code de sortie de la commande, ou None si aucun démon
+        n'écoute.
+
+    Raises:
+        OSError: Si le démon ne répond pas dans le délai, ferme la connexion
+                 sans répondre (ConnectionError) ou envoie une réponse
+                 illisible (ConnectionError).
+    """
+    # Le module C suffit pour un client : le module socket importe enum et selectors
+    import _socket
+    if not hasattr(_socket, 'AF_UNIX'):
+        return None
+    client = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        client.settimeout(delai)
+        try:
+            client.connect(chemin or chemin_socket_demon())
+        except OSError:
+            return None
+        client.sendall(b"\0".join(os.fsencode(argument) for argument in arguments) + b"\n")
+
+        tampon = b""
+        while b"\n" not in tampon:
+            morceau = client.recv(4096)
+            if not morceau:
+                raise ConnectionError("le démon a fermé la connexion sans répondre")
+            tampon += morceau
+        code, _, reste = tampon.partition(b"\n")
+
+        sortie = sortie if sortie is not None else sys.stdout.buffer
+        while reste:
+            sortie.write(reste)
+            reste = client.recv(65536)
+        sortie.flush()
+        try:
+            return int(code)
+        except ValueError:
+            raise ConnectionError(f"réponse illisible du démon : {code[:32]!r}") from None
+    finally:
+        client.close()
+
+
+def commande_demon(arguments):
+    """
+    Exécute une commande du démon, pour `pymodoro` comme pour `pymodoroc`.
+
+    La commande est transmise au démon. Sans démon, `status` lit le statut
+    partagé d'un pymodoro en cours (pomodoro_statut) ; les autres commandes
+    échouent.
+
+    Args:
+        arguments (list): La commande (une de COMMANDES_DEMON) et ses arguments.
+
+    Returns:
+        int: Le code de sortie de la commande.
+    """
+    try:
+        code = transmettre(arguments)
+    except OSError as erreur:
+        print(f"⚠️  Démon injoignable : {erreur}", file=sys.stderr)
+        return 1
+    if code is not None:
+        return code
+    if arguments[0] == "status":
+        from pomodoro_statut import commande_status
+        return commande_status(arguments[1:])
+    print("Aucun démon Pymodoro : lancez d'abord `pymodoro daemon`.", file=sys.stderr)
+    return 1
+
+
+def main():
+    """
+    Point d'entrée de `pymodoroc`.
+
+    Les commandes du démon passent par commande_demon() ; toute autre
+    commande exécute pymodoro dans ce processus.
+    """
+    arguments = sys.argv[1:]
+    if arguments and arguments[0] in COMMANDES_DEMON:
+        sys.exit(commande_demon(arguments))
+
+    from pomodoro import main as main_autonome
+    main_autonome()
+
+
+if __name__ == "__main__":
+    main()
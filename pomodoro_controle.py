@@ -0,0 +1,605 @@
+# -*- coding: utf-8 -*-
+"""
+Pilotage à distance d'un pymodoro en cours, par socket Unix.
+============================================================
+
+Le processus écoute sur une socket Unix. Chaque requête est une ligne de
+texte, chaque réponse une ligne JSON décrivant l'état de la session après
+la commande:
+
+    status              État de la session en cours
+    pause               Met le compte à rebours en pause
+    resume              Reprend après une pause
+    skip                Termine la session en cours et passe à la suivante
+    extend [SECONDES]   Prolonge la session (PROLONGATION_DEFAUT si omis,
+                        PROLONGATION_MAX au plus par session)
+    stop                Arrête pymodoro, comme Ctrl+C
+
+Une connexion peut enchaîner plusieurs requêtes ; elle est fermée après
+DELAI_INACTIVITE secondes sans requête. La socket est servie par la boucle
+des ticks elle-même : l'attente de la prochaine échéance se fait dans un
+select() sur la socket, si bien qu'une requête est traitée dès son arrivée,
+sans thread ni interrogation périodique. Entre deux sessions, les
+requêtes attendent la session suivante, sauf à l'invite de confirmation
+servie par le clavier (pomodoro_clavier).
+
+D'autres sockets peuvent être servies par le même select() (voir
+ServeurControle.ajouter_source), par exemple l'exposition des métriques.
+
+Exemple:
+    $ echo status | nc -U "$XDG_RUNTIME_DIR/pymodoro.sock"
+    {"ok":true,"session":"TRAVAIL","cycle":1,"remaining":1234.5,...}
+"""
+
+import math
+import os
+import time
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Extension de la socket dans le dossier d'exécution de l'utilisateur
+EXTENSION_SOCKET = "sock"
+
+# Prolongation par défaut de la commande extend (en secondes)
+PROLONGATION_DEFAUT = 300
+
+# Prolongation maximale cumulée d'une session (en secondes)
+PROLONGATION_MAX = 4 * 3600
+
+# Taille maximale d'une requête (en octets)
+TAILLE_MAX_REQUETE = 1024
+
+# Attente maximale d'une réponse côté client (en secondes)
+DELAI_CLIENT = 2.0
+
+# Une connexion restée sans requête pendant ce délai est fermée (en secondes)
+DELAI_INACTIVITE = 30.0
+
+
+class ArretDemande(KeyboardInterrupt):
+    """
+    Levée dans la boucle des ticks lorsque la commande stop est reçue.
+
+    Hérite de KeyboardInterrupt : l'arrêt à distance suit exactement le
+    chemin d'un Ctrl+C (session consignée comme annulée, sortie propre).
+    """
+
+
+def chemin_execution(extension):
+    """
+    Retourne l'emplacement d'un fichier d'exécution de pymodoro.
+
+    Les fichiers qui ne vivent que le temps d'un processus (socket, statut)
+    vont dans $XDG_RUNTIME_DIR ; à défaut, dans le dossier temporaire, avec
+    l'identifiant de l'utilisateur dans le nom (sous Windows, le dossier
+    temporaire est déjà propre à l'utilisateur).
+
+    Args:
+        extension (str): L'extension du fichier ("sock", "status").
+
+    Returns:
+        str: $XDG_RUNTIME_DIR/pymodoro.EXTENSION ou pymodoro-UID.EXTENSION
+        dans le dossier temporaire.
+    """
+    dossier = os.environ.get('XDG_RUNTIME_DIR')
+    if dossier:
+        return os.path.join(dossier, f"pymodoro.{extension}")
+    import tempfile
+    if not hasattr(os, 'getuid'):
+        return os.path.join(tempfile.gettempdir(), f"pymodoro.{extension}")
+    return os.path.join(tempfile.gettempdir(), f"pymodoro-{os.getuid()}.{extension}")
+
+
+def chemin_socket_defaut():
+    """
+    Retourne l'emplacement par défaut de la socket de pilotage.
+
+    Returns:
+        str: Le chemin de la socket (voir chemin_execution()).
+    """
+    return chemin_execution(EXTENSION_SOCKET)
+
+
+def ecouter(chemin):
+    """
+    Ouvre une socket Unix d'écoute, accessible au seul utilisateur.
+
+    Une socket orpheline (processus disparu) est remplacée.
+
+    Args:
+        chemin (str): Le chemin de la socket.
+
+    Returns:
+        socket.socket: La socket en écoute.
+
+    Raises:
+        OSError: Si un autre processus écoute déjà sur ce chemin, ou si la
+                 socket ne peut pas être créée.
+    """
+    import socket
+    if os.path.exists(chemin):
+        sonde = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sonde.connect(chemin)
+        except OSError:
+            os.unlink(chemin)
+        else:
+            raise OSError(f"une autre instance écoute sur {chemin}")
+        finally:
+            sonde.close()
+    ecoute = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        ecoute.bind(chemin)
+        os.chmod(chemin, 0o600)
+        ecoute.listen(8)
+    except OSError:
+        ecoute.close()
+        raise
+    return ecoute
+
+
+# =============================================================================
+# SERVEUR
+# =============================================================================
+
+class ServeurControle:
+    """
+    Sert la socket de pilotage depuis la boucle des ticks.
+
+    La socket n'est ouverte qu'à la première attente, après la première
+    trame : le démarrage n'en paie pas le coût. Sans sockets Unix (Windows),
+    le pilotage est simplement inactif. Si une autre instance écoute déjà sur
+    le même chemin, il est désactivé avec un avertissement ; une socket
+    orpheline (processus disparu) est remplacée.
+
+    D'autres sockets (sources) peuvent être servies par la même attente ;
+    la boucle des ticks les sert même quand le pilotage est désactivé.
+
+    Une connexion restée sans requête pendant `delai_inactivite` secondes est
+    fermée : un client bloqué n'occupe pas le serveur indéfiniment.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc ferme les
+    connexions et supprime la socket.
+
+    Args:
+        chemin (str): Le chemin de la socket (chemin_socket_defaut() si None).
+        pilotage (bool): Si False, aucune socket de pilotage n'est ouverte :
+                         seules les sources ajoutées sont servies.
+        delai_inactivite (float): Le délai de fermeture d'une connexion
+                                  inactive, en secondes.
+
+    Attributs:
+        requetes (int): Le nombre de requêtes traitées.
+    """
+
+    def __init__(self, chemin=None, pilotage=True, delai_inactivite=DELAI_INACTIVITE):
+        self.chemin = chemin
+        self.pilotage = pilotage
+        self.delai_inactivite = delai_inactivite
+        self.requetes = 0
+        self.ecoute = None
+        self.selecteur = None
+        self._desactive = False
+        self._session = None
+        self._prolongation = 0
+        self._sources = {}
+        self._activite = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    # -------------------------------------------------------------------------
+    # Socket
+    # -------------------------------------------------------------------------
+
+    def ouvrir(self):
+        """
+        Ouvre la socket d'écoute et l'attente sur les sockets, si ce n'est pas déjà fait.
+
+        Returns:
+            bool: True si l'attente sert au moins une socket, False si le
+            pilotage est désactivé et qu'aucune source n'a été ajoutée.
+        """
+        if self.selecteur is not None:
+            return True
+        if self._desactive:
+            return False
+        import selectors
+
+        ecoute = self._ouvrir_socket() if self.pilotage else None
+        if ecoute is None and not self._sources:
+            self._desactive = True
+            return False
+
+        self.selecteur = selectors.DefaultSelector()
+        if ecoute is not None:
+            ecoute.setblocking(False)
+            self.ecoute = ecoute
+            self.selecteur.register(ecoute, selectors.EVENT_READ)
+        for fichier, (gestionnaire, evenements) in self._sources.items():
+            self.selecteur.register(fichier, evenements, gestionnaire)
+        return True
+
+    def _ouvrir_socket(self):
+        """Ouvre la socket de pilotage ; None (avec un avertissement) en cas d'échec."""
+        import socket
+        if not hasattr(socket, 'AF_UNIX'):
+            return None
+        if self.chemin is None:
+            self.chemin = chemin_socket_defaut()
+        try:
+            return ecouter(self.chemin)
+        except OSError as erreur:
+            print(f"\n    ⚠️  Pilotage désactivé : {erreur}")
+            return None
+
+    def fermer(self):
+        """Ferme les connexions et supprime la socket."""
+        if self.selecteur is None:
+            return
+        for cle in list(self.selecteur.get_map().values()):
+            cle.fileobj.close()
+        self.selecteur.close()
+        self.selecteur = None
+        self._sources.clear()
+        self._activite.clear()
+        if self.ecoute is not None:
+            self.ecoute = None
+            try:
+                os.unlink(self.chemin)
+            except OSError:
+                pass
+
+    def ajouter_source(self, fichier, gestionnaire, ecriture=False, delai_inactivite=None):
+        """
+        Sert une autre socket depuis l'attente des ticks.
+
+        Args:
+            fichier (socket.socket): La socket, non bloquante.
+            gestionnaire (callable): Appelé avec la socket dès qu'elle est
+                                     lisible (inscriptible si `ecriture`).
+            ecriture (bool): Si True, la socket est attendue en écriture.
+            delai_inactivite (float): Si donné, la socket est retirée et
+                                      fermée lorsque le gestionnaire n'a pas
+                                      été appelé depuis ce délai, en secondes.
+        """
+        import selectors
+        evenements = selectors.EVENT_WRITE if ecriture else selectors.EVENT_READ
+        self._sources[fichier] = (gestionnaire, evenements)
+        if delai_inactivite is not None:
+            self._activite[fichier] = (time.monotonic(), delai_inactivite)
+        if self.selecteur is not None:
+            self.selecteur.register(fichier, evenements, gestionnaire)
+
+    def retirer_source(self, fichier):
+        """
+        Cesse de servir une socket ajoutée par ajouter_source() (sans la fermer).
+
+        Args:
+            fichier (socket.socket): La socket.
+        """
+        self._activite.pop(fichier, None)
+        if self._sources.pop(fichier, None) is not None and self.selecteur is not None:
+            self.selecteur.unregister(fichier)
+
+    # -------------------------------------------------------------------------
+    # Session suivie
+    # -------------------------------------------------------------------------
+
+    def suivre(self, type_session, ordonnanceur, sortie, horloge, cycle=0, au_changement=None):
+        """
+        Désigne la session que les commandes pilotent.
+
+        Args:
+            type_session (str): Le type de la session.
+            ordonnanceur (OrdonnanceurTicks): L'ordonnanceur de la session.
+            sortie: Le mode de sortie, informé des pauses et reprises.
+            horloge (Horloge): L'horloge de la session.
+            cycle (int): Le numéro du cycle, 0 hors d'un cycle.
+            au_changement (callable): Appelé après chaque pause, reprise ou
+                                      prolongation avec le temps restant et
+                                      l'état de pause (point de reprise, statut).
+        """
+        self._session = (type_session, ordonnanceur, sortie, horloge, cycle, au_changement)
+        self._prolongation = 0
+
+    def oublier(self):
+        """Signale qu'aucune session n'est en cours."""
+        self._session = None
+
+    # -------------------------------------------------------------------------
+    # Boucle
+    # -------------------------------------------------------------------------
+
+    def attendre(self, ordonnanceur, tick, horloge):
+        """
+        Attend l'échéance d'un tick en servant les requêtes entre-temps.
+
+        Avec une horloge réelle, l'attente est un select() sur les sockets,
+        borné par l'échéance, ou sur la minuterie de l'horloge, armée sur
+        l'échéance (pomodoro_reveil). Avec une autre horloge (temps virtuel), les
+        requêtes en attente sont traitées puis l'horloge avance. En pause,
+        l'attente dure jusqu'à la requête suivante.
+
+        Args:
+            ordonnanceur (OrdonnanceurTicks): L'ordonnanceur de la session.
+            tick (int): Le tick dont l'échéance est attendue.
+            horloge (Horloge): L'horloge de l'ordonnanceur.
+
+        Raises:
+            ArretDemande: Si la commande stop a été reçue.
+        """
+        if not self.ouvrir():
+            horloge.dormir_jusqua(ordonnanceur.echeance(tick))
+            return
+        reelle = horloge.temps_reel
+        minuterie = horloge.minuterie if reelle else None
+        if minuterie is not None and minuterie not in self._sources:
+            self.ajouter_source(minuterie, minuterie.lire)
+        while not ordonnanceur.interrompu:
+            if ordonnanceur.pause_depuis is not None:
+                self.traiter(None)
+                continue
+            attente = ordonnanceur.echeance(tick) - horloge.maintenant()
+            if attente <= 0:
+                return
+            if minuterie is not None:
+                minuterie.armer(ordonnanceur.echeance(tick))
+                self.traiter(None)
+            elif reelle:
+                self.traiter(attente)
+            else:
+                self.traiter(0)
+                if ordonnanceur.pause_depuis is None and not ordonnanceur.interrompu:
+                    horloge.dormir_jusqua(ordonnanceur.echeance(tick))
+
+    def patienter(self, secondes, horloge):
+        """
+        Attend un délai hors session en servant les requêtes entre-temps.
+
+        Utilisée pour l'enchaînement automatique entre deux sessions : la
+        socket, le clavier et les métriques restent servis pendant le délai.
+
+        Args:
+            secondes (float): Le délai à attendre.
+            horloge (Horloge): L'horloge qui mesure le délai.
+
+        Raises:
+            ArretDemande: Si la commande stop a été reçue.
+        """
+        echeance = horloge.maintenant() + secondes
+        if not self.ouvrir():
+            horloge.dormir_jusqua(echeance)
+            return
+        if not horloge.temps_reel:
+            self.traiter(0)
+            horloge.dormir_jusqua(echeance)
+            return
+        attente = secondes
+        while attente > 0:
+            self.traiter(attente)
+            attente = echeance - horloge.maintenant()
+
+    def traiter(self, delai):
+        """
+        Accepte les connexions, répond aux requêtes arrivées et ferme les
+        connexions inactives.
+
+        Args:
+            delai (float): L'attente maximale en secondes (0 : aucune,
+                           None : jusqu'au prochain événement). L'attente
+                           s'arrête au plus tard à l'expiration de la
+                           connexion la plus ancienne.
+
+        Raises:
+            ArretDemande: Si la commande stop a été reçue.
+        """
+        import selectors
+        if self._activite:
+            expiration = min(activite + inactivite for activite, inactivite
+                             in self._activite.values())
+            limite = max(expiration - time.monotonic(), 0)
+            delai = limite if delai is None else min(delai, limite)
+        arret = False
+        for cle, _ in self.selecteur.select(delai):
+            if cle.fileobj is self.ecoute:
+                try:
+                    client, _ = self.ecoute.accept()
+                except OSError:
+                    continue
+                client.setblocking(False)
+                self.selecteur.register(client, selectors.EVENT_READ, bytearray())
+                self._activite[client] = (time.monotonic(), self.delai_inactivite)
+            elif callable(cle.data):
+                if cle.fileobj in self._activite:
+                    self._activite[cle.fileobj] = (time.monotonic(),
+                                                   self._activite[cle.fileobj][1])
+                cle.data(cle.fileobj)
+            else:
+                arret = self._lire(cle.fileobj, cle.data) or arret
+        self._expirer()
+        if arret:
+            raise ArretDemande()
+
+    def _expirer(self):
+        """Ferme les connexions restées inactives au-delà de leur délai."""
+        maintenant = time.monotonic()
+        for fichier, (activite, inactivite) in list(self._activite.items()):
+            if activite + inactivite <= maintenant:
+                self._deconnecter(fichier)
+
+    def _lire(self, client, tampon):
+        """Lit un client et répond à ses requêtes complètes ; True si stop."""
+        try:
+            donnees = client.recv(4096)
+        except BlockingIOError:
+            return False
+        except OSError:
+            donnees = b""
+        if not donnees:
+            self._deconnecter(client)
+            return False
+        self._activite[client] = (time.monotonic(), self.delai_inactivite)
+        tampon += donnees
+        arret = False
+        while b"\n" in tampon:
+            ligne, _, reste = bytes(tampon).partition(b"\n")
+            tampon[:] = reste
+            reponse = self.executer(ligne.decode("utf-8", "replace"))
+            arret = arret or reponse.pop("_arret", False)
+            try:
+                client.sendall(_encoder(reponse))
+            except OSError:
+                self._deconnecter(client)
+                return arret
+        if len(tampon) > TAILLE_MAX_REQUETE:
+            self._deconnecter(client)
+        return arret
+
+    def _deconnecter(self, client):
+        if client in self._sources:
+            self.retirer_source(client)
+        else:
+            self._activite.pop(client, None)
+            self.selecteur.unregister(client)
+        client.close()
+
+    # -------------------------------------------------------------------------
+    # Commandes
+    # -------------------------------------------------------------------------
+
+    def executer(self, requete):
+        """
+        Exécute une requête et décrit l'état qui en résulte.
+
+        Args:
+            requete (str): La ligne reçue ("status", "extend 120"...).
+
+        Une commande qui échoue donne une réponse d'erreur : la boucle des
+        ticks qui la sert n'est pas interrompue.
+
+        Returns:
+            dict: La réponse ; "ok" vaut False avec un message "error" si la
+            requête est invalide ou si la commande a échoué.
+        """
+        self.requetes += 1
+        mots = requete.split()
+        commande = mots[0].lower() if mots else ""
+        if commande not in COMMANDES:
+            return {"ok": False, "error": f"commande inconnue : {requete.strip()!r}"}
+        try:
+            return self._appliquer(commande, mots)
+        except Exception as erreur:
+            return {"ok": False, "error": f"échec de {commande} : {erreur}"}
+
+    def _appliquer(self, commande, mots):
+        """Applique une commande reconnue et décrit l'état qui en résulte."""
+        if commande == "stop":
+            return dict(self.etat(), _arret=True)
+        if commande == "status":
+            return self.etat()
+        if self._session is None:
+            return dict(self.etat(), ok=False, error="aucune session en cours")
+
+        _, ordonnanceur, sortie, horloge, _, au_changement = self._session
+        maintenant = horloge.maintenant()
+        change = False
+        if commande == "pause":
+            change = ordonnanceur.suspendre(maintenant)
+            if change:
+                sortie.pause_session(math.ceil(ordonnanceur.restant(maintenant)))
+        elif commande == "resume":
+            change = ordonnanceur.reprendre(maintenant)
+            if change:
+                sortie.reprise_session(math.ceil(ordonnanceur.restant(maintenant)))
+        elif commande == "skip":
+            ordonnanceur.passer()
+        elif commande == "extend":
+            try:
+                secondes = float(mots[1]) if len(mots) > 1 else PROLONGATION_DEFAUT
+            except ValueError:
+                secondes = 0
+            if not (math.isfinite(secondes) and secondes > 0):
+                return dict(self.etat(), ok=False, error="extend attend un nombre de secondes > 0")
+            if self._prolongation + secondes > PROLONGATION_MAX:
+                return dict(self.etat(), ok=False,
+                            error=f"extend limité à {PROLONGATION_MAX} s par session")
+            ordonnanceur.prolonger(secondes)
+            self._prolongation += secondes
+            change = True
+            if ordonnanceur.pause_depuis is None:
+                sortie.reprise_session(math.ceil(ordonnanceur.restant(maintenant)))
+        if change and au_changement is not None:
+            au_changement(math.ceil(ordonnanceur.restant(maintenant)),
+                          ordonnanceur.pause_depuis is not None)
+        return self.etat()
+
+    def etat(self):
+        """
+        Décrit la session en cours.
+
+        Returns:
+            dict: ok, session (None hors session), cycle, remaining (s),
+            duration (s), paused et skipped.
+        """
+        if self._session is None:
+            return {"ok": True, "session": None}
+        type_session, ordonnanceur, _, horloge, cycle, _ = self._session
+        return {
+            "ok": True,
+            "session": type_session,
+            "cycle": cycle,
+            "remaining": round(ordonnanceur.restant(horloge.maintenant()), 3),
+            "duration": ordonnanceur.duree,
+            "paused": ordonnanceur.pause_depuis is not None,
+            "skipped": ordonnanceur.interrompu,
+        }
+
+
+# Commandes reconnues par le serveur
+COMMANDES = ("status", "pause", "resume", "skip", "extend", "stop")
+
+
+def _encoder(reponse):
+    import json
+    return (json.dumps(reponse, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+
+def envoyer_commande(commande, chemin=None, delai=DELAI_CLIENT):
+    """
+    Envoie une commande à un pymodoro en cours et retourne sa réponse.
+
+    Args:
+        commande (str): La requête ("status", "extend 120"...).
+        chemin (str): Le chemin de la socket (chemin_socket_defaut() si None).
+        delai (float): L'attente maximale de la réponse, en secondes.
+
+    Returns:
+        dict: La réponse décodée.
+
+    Raises:
+        OSError: Si aucun pymodoro n'écoute ou s'il ne répond pas à temps.
+    """
+    import json
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(delai)
+        client.connect(chemin or chemin_socket_defaut())
+        client.sendall(commande.encode("utf-8") + b"\n")
+        reponse = bytearray()
+        while not reponse.endswith(b"\n"):
+            morceau = client.recv(4096)
+            if not morceau:
+                raise ConnectionError("connexion fermée avant la réponse")
+            reponse += morceau
+    return json.loads(reponse.decode("utf-8"))
@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Commandes de fin de session de Pymodoro-CLI.
+============================================
+
+`--on-work-end COMMANDE` et `--on-break-end COMMANDE` lancent une commande
+du shell à la fin de chaque session de travail ou de pause : couper les
+notifications de la messagerie, verrouiller l'écran, alimenter un outil de
+suivi du temps...
+
+La minuterie n'attend jamais ces commandes : l'abonné du bus d'événements
+ne fait que déposer la commande dans une file bornée, servie par un petit
+groupe de threads. Chaque commande a un délai maximal, au-delà duquel son
+groupe de processus est tué. Sa sortie (stdout et stderr) est consignée
+dans un journal à rotation.
+
+Variables d'environnement transmises aux commandes:
+    PYMODORO_EVENT         work_end ou break_end
+    PYMODORO_SESSION       TRAVAIL, PAUSE ou PAUSE LONGUE
+    PYMODORO_CYCLE         Le numéro du cycle (0 hors d'un plan)
+    PYMODORO_TOTAL_CYCLES  Le nombre de cycles du plan
+    PYMODORO_DURATION      La durée de la session, en secondes
+    PYMODORO_SKIPPED       1 si la session a été passée (skip), sinon 0
+
+Exemple:
+    $ pymodoro -c 4 --auto --on-work-end 'loginctl lock-session' \\
+          --on-break-end 'notify-send "Au travail !"'
+"""
+
+import os
+
+from pomodoro_historique import dossier_donnees
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Délai maximal d'une commande, par défaut (en secondes)
+DELAI_CROCHET_DEFAUT = 30.0
+
+# Nombre de commandes exécutées en parallèle
+NOMBRE_EXECUTANTS_DEFAUT = 2
+
+# Nombre de commandes en attente ; au-delà, les nouvelles sont rejetées
+CAPACITE_FILE_CROCHETS = 32
+
+# Nom du journal des commandes dans le dossier de données
+NOM_JOURNAL_CROCHETS = "crochets.log"
+
+# Taille du journal avant rotation (en octets) et nombre d'archives gardées
+TAILLE_MAX_JOURNAL = 1024 * 1024
+NOMBRE_ARCHIVES_JOURNAL = 3
+
+# Sortie d'une commande conservée dans le journal (en octets)
+TAILLE_MAX_SORTIE = 64 * 1024
+
+# Attente des exécutants après avoir tué les commandes à la fermeture (en secondes)
+ATTENTE_APRES_ARRET = 1.0
+
+
+def chemin_journal_defaut():
+    """
+    Retourne l'emplacement par défaut du journal des commandes.
+
+    Returns:
+        str: Le chemin du journal dans dossier_donnees().
+    """
+    return os.path.join(dossier_donnees(), NOM_JOURNAL_CROCHETS)
+
+
+# =============================================================================
+# EXÉCUTION DES COMMANDES
+# =============================================================================
+
+class ExecuteurCrochets:
+    """
+    Lance les commandes de fin de session dans un groupe de threads borné.
+
+    Les threads sont lancés au premier dépôt, jusqu'à `nombre_executants`.
+    La file est bornée : si les commandes s'accumulent (commandes trop
+    lentes, sessions très courtes), les nouvelles sont rejetées et comptées.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc se
+    désabonne du bus et attend les commandes en attente ou en cours, au plus
+    le délai d'une commande en tout ; les commandes restantes sont ensuite
+    abandonnées ou tuées.
+
+    Args:
+        commandes_travail (list): Les commandes lancées à la fin du travail.
+        commandes_pause (list): Les commandes lancées à la fin d'une pause.
+        delai (float): Le délai maximal d'une commande, en secondes.
+        chemin_journal (str): Le journal des sorties (chemin_journal_defaut()
+                              si None).
+        nombre_executants (int): Le nombre de commandes exécutées en parallèle.
+        capacite (int): Le nombre de commandes en attente.
+
+    Attributs:
+        total_cycles (int): Le nombre de cycles transmis aux commandes.
+        reussies (int): Les commandes terminées avec le code 0.
+        echouees (int): Les commandes terminées avec une erreur, ou non lancées.
+        expirees (int): Les commandes tuées au-delà de leur délai, ou à la fermeture.
+        rejetees (int): Les commandes écartées, file pleine.
+        abandonnees (int): Les commandes en attente écartées à la fermeture.
+    """
+
+    def __init__(self, commandes_travail=(), commandes_pause=(), delai=DELAI_CROCHET_DEFAUT,
+                 chemin_journal=None, nombre_executants=NOMBRE_EXECUTANTS_DEFAUT,
+                 capacite=CAPACITE_FILE_CROCHETS):
+        import collections
+        import threading
+        self.commandes_travail = list(commandes_travail or ())
+        self.commandes_pause = list(commandes_pause or ())
+        self.delai = delai
+        self.chemin_journal = chemin_journal or chemin_journal_defaut()
+        self.nombre_executants = nombre_executants
+        self.capacite = capacite
+        self.total_cycles = 0
+        self.reussies = 0
+        self.echouees = 0
+        self.expirees = 0
+        self.rejetees = 0
+        self.abandonnees = 0
+        self._file = collections.deque()
+        self._condition = threading.Condition()
+        self._verrou_journal = threading.Lock()
+        self._executants = []
+        self._occupes = 0
+        self._processus = set()
+        self._arret = False
+        self._force = False
+        self._bus = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    # -------------------------------------------------------------------------
+    # Abonnement et dépôt
+    # -------------------------------------------------------------------------
+
+    def abonner(self, bus):
+        """
+        Abonne l'exécuteur à la fin des sessions publiée sur un bus.
+
+        Args:
+            bus (BusEvenements): Le bus d'événements du moteur.
+        """
+        self._bus = bus
+        bus.abonner(self.a_la_fin_session, ["session_fin"])
+
+    def a_la_fin_session(self, evenement, donnees):
+        """
+        Dépose les commandes associées à une session terminée.
+
+        Args:
+            evenement (str): "session_fin".
+            donnees (dict): Les données de l'événement (type_session, duree,
+                            passee, cycle).
+        """
+        travail = donnees["type_session"] == "TRAVAIL"
+        commandes = self.commandes_travail if travail else self.commandes_pause
+        if not commandes:
+            return
+        environnement = dict(os.environ,
+                             PYMODORO_EVENT="work_end" if travail else "break_end",
+                             PYMODORO_SESSION=donnees["type_session"],
+                             PYMODORO_CYCLE=str(donnees["cycle"]),
+                             PYMODORO_TOTAL_CYCLES=str(self.total_cycles),
+                             PYMODORO_DURATION=f"{donnees['duree']:g}",
+                             PYMODORO_SKIPPED="1" if donnees["passee"] else "0")
+        for commande in commandes:
+            self.soumettre(commande, environnement)
+
+    def soumettre(self, commande, environnement=None):
+        """
+        Dépose une commande sans attendre son exécution.
+
+        Args:
+            commande (str): La commande, interprétée par le shell.
+            environnement (dict): Son environnement (celui du processus si None).
+
+        Returns:
+            bool: True si la commande est mise en file, False si la file est pleine.
+        """
+        import threading
+        with self._condition:
+            if len(self._file) >= self.capacite:
+                self.rejetees += 1
+                return False
+            self._file.append((commande, environnement))
+            if (self._occupes + len(self._file) > len(self._executants)
+                    and len(self._executants) < self.nombre_executants):
+                executant = threading.Thread(
+                    target=self._servir, daemon=True,
+                    name=f"pymodoro-crochet-{len(self._executants) + 1}")
+                self._executants.append(executant)
+                executant.start()
+            self._condition.notify()
+            return True
+
+    # -------------------------------------------------------------------------
+    # Exécution
+    # -------------------------------------------------------------------------
+
+    def _servir(self):
+        """Boucle d'un thread exécutant : vide la file jusqu'à fermer()."""
+        while True:
+            with self._condition:
+                while not self._file and not self._arret:
+                    self._condition.wait()
+                if not self._file:
+                    return
+                commande, environnement = self._file.popleft()
+                self._occupes += 1
+            try:
+                self._executer(commande, environnement)
+            finally:
+                with self._condition:
+                    self._occupes -= 1
+
+    def _executer(self, commande, environnement):
+        """
+        Lance une commande, attend au plus le délai et consigne sa sortie.
+
+        Les compteurs sont mis à jour sous le verrou : plusieurs exécutants
+        terminent leurs commandes en même temps.
+        """
+        import subprocess
+        import time
+        debut = time.monotonic()
+        try:
+            processus = subprocess.Popen(commande, shell=True, env=environnement,
+                                         stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                         stderr=subprocess.STDOUT,
+                                         start_new_session=os.name == "posix")
+        except OSError as erreur:
+            with self._condition:
+                self.echouees += 1
+            self._journaliser(commande, f"non lancée : {erreur}", b"")
+            return
+
+        # Visible de fermer(), qui tue les commandes encore en cours
+        with self._condition:
+            self._processus.add(processus)
+            if self._force:
+                _tuer(processus)
+        expiree = False
+        try:
+            sortie, _ = processus.communicate(timeout=self.delai)
+        except subprocess.TimeoutExpired:
+            _tuer(processus)
+            sortie, _ = processus.communicate()
+            expiree = True
+
+        with self._condition:
+            self._processus.discard(processus)
+            if expiree:
+                self.expirees += 1
+                bilan = f"tuée après {self.delai:g} s"
+            elif self._force and processus.returncode != 0:
+                self.expirees += 1
+                bilan = "tuée à la fermeture"
+            elif processus.returncode == 0:
+                self.reussies += 1
+                bilan = f"code 0 en {time.monotonic() - debut:.2f} s"
+            else:
+                self.echouees += 1
+                bilan = f"code {processus.returncode} en {time.monotonic() - debut:.2f} s"
+        self._journaliser(commande, bilan, sortie or b"")
+
+    # -------------------------------------------------------------------------
+    # Journal
+    # -------------------------------------------------------------------------
+
+    def _journaliser(self, commande, bilan, sortie):
+        """
+        Ajoute l'exécution d'une commande au journal, après rotation au besoin.
+
+        Une erreur d'écriture n'est pas signalée : le journal est accessoire
+        et les commandes continuent d'être lancées.
+        """
+        import time
+        if len(sortie) > TAILLE_MAX_SORTIE:
+            sortie = sortie[:TAILLE_MAX_SORTIE] + b"\n[...]\n"
+        entete = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {commande} : {bilan}\n"
+        with self._verrou_journal:
+            try:
+                os.makedirs(os.path.dirname(self.chemin_journal) or ".", exist_ok=True)
+                try:
+                    trop_grand = os.path.getsize(self.chemin_journal) >= TAILLE_MAX_JOURNAL
+                except OSError:
+                    trop_grand = False
+                if trop_grand:
+                    self._pivoter()
+                with open(self.chemin_journal, "ab") as journal:
+                    journal.write(entete.encode("utf-8", "replace"))
+                    if sortie:
+                        journal.write(sortie if sortie.endswith(b"\n") else sortie + b"\n")
+            except OSError:
+                pass
+
+    def _pivoter(self):
+        """Décale les archives (journal.1 → journal.2...) et archive le journal."""
+        for numero in range(NOMBRE_ARCHIVES_JOURNAL - 1, 0, -1):
+            archive = f"{self.chemin_journal}.{numero}"
+            if os.path.exists(archive):
+                os.replace(archive, f"{self.chemin_journal}.{numero + 1}")
+        os.replace(self.chemin_journal, f"{self.chemin_journal}.1")
+
+    # -------------------------------------------------------------------------
+    # Arrêt
+    # -------------------------------------------------------------------------
+
+    def fermer(self, delai=None):
+        """
+        Se désabonne du bus, puis attend les commandes en attente ou en cours.
+
+        L'attente est bornée : au-delà, les commandes encore en file sont
+        abandonnées (et consignées) et celles en cours sont tuées.
+
+        Args:
+            delai (float): L'attente maximale en secondes (le délai d'une
+                           commande si None).
+        """
+        import time
+        if self._bus is not None:
+            self._bus.desabonner(self.a_la_fin_session)
+            self._bus = None
+        with self._condition:
+            self._arret = True
+            self._condition.notify_all()
+            executants = list(self._executants)
+        limite = time.monotonic() + (self.delai if delai is None else delai)
+        for executant in executants:
+            executant.join(max(limite - time.monotonic(), 0))
+        if not any(executant.is_alive() for executant in executants):
+            return
+
+        with self._condition:
+            self._force = True
+            abandonnees = list(self._file)
+            self._file.clear()
+            self.abandonnees += len(abandonnees)
+            for processus in self._processus:
+                if processus.returncode is None:
+                    _tuer(processus)
+        for commande, _ in abandonnees:
+            self._journaliser(commande, "abandonnée à la fermeture", b"")
+        limite = time.monotonic() + ATTENTE_APRES_ARRET
+        for executant in executants:
+            executant.join(max(limite - time.monotonic(), 0))
+
+
+def _tuer(processus):
+    """Tue une commande : sous POSIX, son groupe entier (le shell et ce qu'il a lancé)."""
+    if os.name == "posix":
+        import signal
+        try:
+            os.killpg(processus.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    else:
+        try:
+            processus.kill()
+        except OSError:
+            pass
@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+"""
+Cœur du mode démon de Pymodoro-CLI.
+===================================
+
+Un seul processus héberge les minuteries Pomodoro de toute une organisation.
+Les minuteries sont rangées dans un tas (heapq) indexé par leur prochaine
+échéance : un réveil ne touche que les minuteries qui changent réellement
+d'état, pour un coût O(log n) chacune. Aucune minuterie n'est interrogée
+périodiquement, qu'il y en ait dix ou un million.
+
+Chaque minuterie suit un PlanCycles en mode automatique, comme
+`executer_cycle_pomodoro` : pause longue tous les 4 cycles, enchaînement
+vers la pause après DELAI_ENCHAINEMENT_AUTO secondes, fin après le travail
+du dernier cycle. Les minuteries de mêmes durées partagent le même plan.
+
+Exemple:
+    from pomodoro_demon import OrdonnanceurMinuteries
+
+    ordonnanceur = OrdonnanceurMinuteries(a_la_transition=notifier)
+    ordonnanceur.ajouter(total_cycles=4)
+    ordonnanceur.demarrer()
+"""
+
+import heapq
+import itertools
+import threading
+import weakref
+
+import pomodoro
+from pomodoro import PlanCycles, contexte
+from pomodoro_statistiques import StatistiquesRetard
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# États d'une minuterie
+ETAT_ACTIVE = "ACTIVE"
+ETAT_TERMINEE = "TERMINEE"
+ETAT_ANNULEE = "ANNULEE"
+
+# Nombre de retards conservés pour le calcul des percentiles
+CAPACITE_RETARDS_DEFAUT = 65536
+
+
+# =============================================================================
+# MINUTERIE
+# =============================================================================
+
+class Minuterie:
+    """
+    Une minuterie Pomodoro hébergée par le démon.
+
+    La minuterie ne retient que son plan, l'instant où il commence et
+    l'indice du segment en cours : les règles de cycle ne sont appliquées
+    que par le PlanCycles, partagé par les minuteries de mêmes durées. La
+    classe utilise __slots__ : un million de minuteries doivent tenir en
+    mémoire.
+
+    Args:
+        identifiant (int): L'identifiant attribué par l'ordonnanceur.
+        plan (PlanCycles): Le plan suivi, en mode automatique (au moins un cycle).
+        debut (float): L'instant de début du premier travail.
+
+    Attributs:
+        indice (int): L'indice du segment en cours dans le plan.
+        debut (float): L'instant de début de la session en cours.
+        echeance (float): L'instant de fin de la session en cours.
+        version (int): Incrémentée à chaque reprogrammation ; les entrées
+                       du tas portant une version antérieure sont périmées.
+        etat (str): ETAT_ACTIVE, ETAT_TERMINEE ou ETAT_ANNULEE.
+    """
+
+    __slots__ = ('identifiant', 'plan', 'origine', 'indice', 'debut', 'echeance',
+                 'version', 'etat')
+
+    def __init__(self, identifiant, plan, debut):
+        self.identifiant = identifiant
+        self.plan = plan
+        self.origine = debut
+        self.indice = 0
+        self.version = 0
+        self.etat = ETAT_ACTIVE
+        self._placer()
+
+    def _placer(self):
+        """Calcule le début et l'échéance du segment en cours."""
+        decalage, duree, _, _ = self.plan[self.indice]
+        self.debut = self.origine + decalage
+        self.echeance = self.debut + duree
+
+    @property
+    def type_session(self):
+        """Le type de la session en cours ("TRAVAIL", "PAUSE" ou "PAUSE LONGUE")."""
+        return self.plan[self.indice][2]
+
+    @property
+    def cycle(self):
+        """Le numéro du cycle en cours (commence à 1)."""
+        return self.indice // 2 + 1
+
+    @property
+    def total_cycles(self):
+        """Le nombre de cycles du plan."""
+        return self.plan.total_cycles
+
+    def avancer(self):
+        """
+        Passe à la session suivante à l'échéance de la session en cours.
+
+        Les échéances sont les décalages du plan depuis son début, pas
+        l'instant de traitement : un réveil tardif ne décale pas le reste
+        du plan.
+
+        Returns:
+            bool: True si la minuterie a une nouvelle échéance, False si
+                  le plan est terminé.
+        """
+        if self.indice + 1 >= len(self.plan):
+            self.etat = ETAT_TERMINEE
+            return False
+        self.indice += 1
+        self._placer()
+        return True
+
+    def secondes_restantes(self, maintenant):
+        """Retourne le temps restant de la session en cours, en secondes."""
+        return max(self.echeance - maintenant, 0.0)
+
+
+# =============================================================================
+# ORDONNANCEUR DE MINUTERIES
+# =============================================================================
+
+class OrdonnanceurMinuteries:
+    """
+    Héberge un grand nombre de minuteries dans un tas de prochaines échéances.
+
+    Chaque entrée du tas est un tuple (échéance, identifiant, version).
+    L'annulation est paresseuse : la minuterie quitte l'index et son entrée
+    est ignorée lorsqu'elle remonte au sommet du tas. Le tas est compacté
+    lorsque les entrées périmées deviennent majoritaires.
+
+    Les méthodes publiques sont sûres entre threads : la boucle `executer()`
+    tourne dans un thread pendant que d'autres ajoutent ou annulent des
+    minuteries.
+
+    Args:
+        horloge (Horloge): L'horloge de référence (celle du contexte si None).
+        a_la_transition (callable): Appelé avec (minuterie, type_precedent)
+                                    à chaque changement de session, sous le
+                                    verrou de l'ordonnanceur : il doit rester
+                                    bref.
+        capacite_retards (int): Nombre de retards conservés pour les
+                                percentiles.
+
+    Attributs:
+        retards (StatistiquesRetard): Le retard de chaque transition, entre
+                                      l'échéance et son traitement.
+        transitions (int): Le nombre total de transitions traitées.
+    """
+
+    def __init__(self, horloge=None, a_la_transition=None,
+                 capacite_retards=CAPACITE_RETARDS_DEFAUT):
+        self.horloge = horloge or contexte.horloge
+        self.a_la_transition = a_la_transition
+        self.retards = StatistiquesRetard(capacite_retards)
+        self.transitions = 0
+        self._tas = []
+        self._minuteries = {}
+        self._perimees = 0
+        self._compteur = itertools.count(1)
+        self._plans = weakref.WeakValueDictionary()
+        self._condition = threading.Condition()
+        self._en_marche = False
+
+    def __len__(self):
+        """Retourne le nombre de minuteries actives."""
+        return len(self._minuteries)
+
+    # -------------------------------------------------------------------------
+    # Gestion des minuteries
+    # -------------------------------------------------------------------------
+
+    def ajouter(self, duree_travail=pomodoro.DUREE_TRAVAIL_DEFAUT,
+                duree_pause=pomodoro.DUREE_PAUSE_DEFAUT,
+                duree_pause_longue=pomodoro.DUREE_PAUSE_LONGUE_DEFAUT,
+                total_cycles=1, debut=None):
+        """
+        Ajoute une minuterie dont le premier travail commence à `debut`.
+
+        Args:
+            duree_travail (float): Durée du travail en minutes.
+            duree_pause (float): Durée de la pause courte en minutes.
+            duree_pause_longue (float): Durée de la pause longue en minutes.
+            total_cycles (int): Nombre de cycles à effectuer.
+            debut (float): L'instant de début, sur l'échelle de l'horloge
+                           (maintenant si None).
+
+        Returns:
+            int: L'identifiant de la minuterie.
+
+        Raises:
+            ValueError: Si total_cycles est inférieur à 1.
+        """
+        if total_cycles < 1:
+            raise ValueError(f"une minuterie compte au moins un cycle ({total_cycles})")
+        with self._condition:
+            if debut is None:
+                debut = self.horloge.maintenant()
+            identifiant = next(self._compteur)
+            plan = self._plan(duree_travail, duree_pause, duree_pause_longue, total_cycles)
+            minuterie = Minuterie(identifiant, plan, debut)
+            self._minuteries[identifiant] = minuterie
+            heapq.heappush(self._tas, (minuterie.echeance, identifiant, 0))
+
+            # La boucle ne se réveille plus tôt que si l'échéance la plus
+            # proche vient de changer
+            if self._tas[0][1] == identifiant:
+                self._condition.notify()
+            return identifiant
+
+    def _plan(self, *durees):
+        """
+        Retourne le plan des durées données, partagé entre les minuteries.
+
+        Le plan est libéré avec la dernière minuterie qui le suit.
+        """
+        plan = self._plans.get(durees)
+        if plan is None:
+            plan = self._plans[durees] = PlanCycles(*durees, mode_auto=True)
+        return plan
+
+    def annuler(self, identifiant):
+        """
+        Annule une minuterie.
+
+        Args:
+            identifiant (int): L'identifiant de la minuterie.
+
+        Returns:
+            bool: True si la minuterie était active.
+        """
+        with self._condition:
+            minuterie = self._minuteries.pop(identifiant, None)
+            if minuterie is None:
+                return False
+            minuterie.etat = ETAT_ANNULEE
+            minuterie.version += 1
+            self._perimees += 1
+            if self._perimees > len(self._minuteries):
+                self._compacter()
+            return True
+
+    def obtenir(self, identifiant):
+        """Retourne la minuterie active `identifiant`, ou None."""
+        return self._minuteries.get(identifiant)
+
+    def lister(self, maintenant=None):
+        """
+        Retourne un instantané des minuteries actives, par identifiant.
+
+        Les champs sont relevés sous le verrou : l'instantané reste cohérent
+        pendant que la boucle `executer()` fait avancer les minuteries.
+
+        Args:
+            maintenant (float): L'instant de référence (horloge si None).
+
+        Returns:
+            list: Des tuples (identifiant, type de session, cycle,
+            nombre de cycles, secondes restantes).
+        """
+        with self._condition:
+            if maintenant is None:
+                maintenant = self.horloge.maintenant()
+            return [(m.identifiant, m.type_session, m.cycle, m.total_cycles,
+                     m.secondes_restantes(maintenant))
+                    for _, m in sorted(self._minuteries.items())]
+
+    def _compacter(self):
+        """Reconstruit le tas sans ses entrées périmées (O(n), amorti)."""
+        self._tas = [(m.echeance, m.identifiant, m.version)
+                     for m in self._minuteries.values()]
+        heapq.heapify(self._tas)
+        self._perimees = 0
+
+    # -------------------------------------------------------------------------
+    # Traitement des échéances
+    # -------------------------------------------------------------------------
+
+    def prochaine_echeance(self):
+        """
+        Retourne l'échéance la plus proche, ou None s'il n'y a rien à faire.
+
+        Returns:
+            float: L'instant du prochain changement de session.
+        """
+        with self._condition:
+            return self._prochaine_echeance()
+
+    def _prochaine_echeance(self):
+        tas = self._tas
+        while tas:
+            echeance, identifiant, version = tas[0]
+            minuterie = self._minuteries.get(identifiant)
+            if minuterie is not None and minuterie.version == version:
+                return echeance
+            heapq.heappop(tas)
+            self._perimees -= 1
+        return None
+
+    def traiter_echeances(self, maintenant=None):
+        """
+        Fait avancer toutes les minuteries dont l'échéance est atteinte.
+
+        Seules les minuteries échues sont touchées. Une minuterie très en
+        retard peut franchir plusieurs sessions dans le même appel.
+
+        Args:
+            maintenant (float): L'instant de traitement (horloge si None).
+
+        Returns:
+            int: Le nombre de transitions effectuées.
+        """
+        with self._condition:
+            if maintenant is None:
+                maintenant = self.horloge.maintenant()
+            return self._traiter(maintenant)
+
+    def _traiter(self, maintenant):
+        tas = self._tas
+        minuteries = self._minuteries
+        retards = self.retards
+        rappel = self.a_la_transition
+        traitees = 0
+
+        while tas and tas[0][0] <= maintenant:
+            echeance, identifiant, version = tas[0]
+            minuterie = minuteries.get(identifiant)
+            if minuterie is None or minuterie.version != version:
+                heapq.heappop(tas)
+                self._perimees -= 1
+                continue
+
+            retards.enregistrer(maintenant - echeance)
+            type_precedent = minuterie.type_session
+            if minuterie.avancer():
+                # Une seule opération O(log n) pour retirer et réinsérer
+                heapq.heapreplace(tas, (minuterie.echeance, identifiant, version))
+            else:
+                heapq.heappop(tas)
+                del minuteries[identifiant]
+            traitees += 1
+            if rappel is not None:
+                rappel(minuterie, type_precedent)
+
+        self.transitions += traitees
+        return traitees
+
+    # -------------------------------------------------------------------------
+    # Boucles d'exécution
+    # -------------------------------------------------------------------------
+
+    def executer(self):
+        """
+        Boucle du démon : dort jusqu'à la prochaine échéance et la traite.
+
+        La boucle dort indéfiniment tant qu'aucune minuterie n'est active ;
+        `ajouter()` la réveille si la nouvelle échéance est la plus proche.
+        Elle s'arrête à l'appel de `arreter()`.
+        """
+        with self._condition:
+            self._en_marche = True
+            while self._en_marche:
+                self._traiter(self.horloge.maintenant())
+                prochaine = self._prochaine_echeance()
+                if prochaine is None:
+                    self._condition.wait()
+                else:
+                    attente = prochaine - self.horloge.maintenant()
+                    if attente > 0:
+                        self._condition.wait(attente)
+
+    def demarrer(self):
+        """
+        Lance `executer()` dans un thread démon.
+
+        Returns:
+            threading.Thread: Le thread lancé.
+        """
+        thread = threading.Thread(target=self.executer, name="pymodoro-demon", daemon=True)
+        thread.start()
+        return thread
+
+    def arreter(self):
+        """Demande l'arrêt de la boucle `executer()`."""
+        with self._condition:
+            self._en_marche = False
+            self._condition.notify_all()
+
+    def simuler_jusqua(self, instant):
+        """
+        Déroule les échéances jusqu'à `instant` avec une horloge virtuelle.
+
+        Chaque échéance est traitée à l'heure exacte, comme par une boucle
+        `executer()` sans retard.
+
+        Args:
+            instant (float): L'instant à atteindre, sur l'échelle de l'horloge.
+
+        Returns:
+            int: Le nombre de transitions effectuées.
+        """
+        traitees = 0
+        while True:
+            prochaine = self.prochaine_echeance()
+            if prochaine is None or prochaine > instant:
+                break
+            self.horloge.dormir_jusqua(prochaine)
+            traitees += self.traiter_echeances()
+        self.horloge.dormir_jusqua(instant)
+        return traitees
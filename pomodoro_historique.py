@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Historique des sessions de Pymodoro-CLI.
+========================================
+
+Chaque session terminée ou annulée est consignée dans un fichier binaire en
+ajout seul, fait d'enregistrements de taille fixe (struct). Le fichier se lit
+par projection en mémoire (mmap) : le n-ième enregistrement est à l'octet
+n * TAILLE_ENREGISTREMENT, sans analyser le reste du fichier.
+
+Chaque ajout est un unique appel à os.write() sur un descripteur ouvert en
+O_APPEND : plusieurs processus pymodoro peuvent écrire dans le même fichier
+sans que leurs enregistrements ne s'entremêlent.
+
+Format d'un enregistrement (40 octets, petit-boutiste):
+    version (u8), type de session (u8), drapeaux (u8), bourrage (1 octet),
+    numéro de cycle (u32), durée prévue (f64, s), début (f64, timestamp Unix),
+    fin (f64, timestamp Unix), durée réelle (f64, s)
+
+Exemple:
+    with Historique(chemin_historique_defaut()) as historique:
+        travail = sum(e.duree_reelle for e in historique
+                      if e.type_session == "TRAVAIL" and not e.annulee)
+"""
+
+import collections
+import mmap
+import os
+import struct
+
+
+# =============================================================================
+# FORMAT DES ENREGISTREMENTS
+# =============================================================================
+
+# Version du format, écrite dans chaque enregistrement
+VERSION_FORMAT = 1
+
+# Structure binaire d'un enregistrement
+FORMAT_ENREGISTREMENT = struct.Struct('<BBBxIdddd')
+
+# Taille d'un enregistrement en octets
+TAILLE_ENREGISTREMENT = FORMAT_ENREGISTREMENT.size
+
+# Codes des types de session (l'indice est le code stocké)
+TYPES_SESSION = ("TRAVAIL", "PAUSE", "PAUSE LONGUE")
+CODES_TYPES_SESSION = {nom: code for code, nom in enumerate(TYPES_SESSION)}
+
+# Drapeau positionné lorsque la session a été annulée
+DRAPEAU_ANNULEE = 0x01
+
+# Nom du fichier d'historique dans le dossier de données de l'utilisateur
+NOM_FICHIER_HISTORIQUE = "historique.bin"
+
+
+EnregistrementSession = collections.namedtuple(
+    'EnregistrementSession',
+    ['type_session', 'duree_prevue', 'duree_reelle', 'debut', 'fin', 'annulee', 'cycle']
+)
+EnregistrementSession.__doc__ = """
+Une session consignée dans l'historique.
+
+Attributs:
+    type_session (str): "TRAVAIL", "PAUSE" ou "PAUSE LONGUE".
+    duree_prevue (float): La durée planifiée, en secondes.
+    duree_reelle (float): La durée effectivement écoulée, en secondes.
+    debut (float): Le timestamp Unix du début de la session.
+    fin (float): Le timestamp Unix de la fin (ou de l'annulation).
+    annulee (bool): True si la session a été interrompue.
+    cycle (int): Le numéro du cycle (0 hors cycle, par exemple --pause-only).
+"""
+
+
+def encoder_enregistrement(enregistrement):
+    """
+    Encode une session au format binaire de l'historique.
+
+    Args:
+        enregistrement (EnregistrementSession): La session à encoder.
+
+    Returns:
+        bytes: Les TAILLE_ENREGISTREMENT octets de l'enregistrement.
+    """
+    return FORMAT_ENREGISTREMENT.pack(
+        VERSION_FORMAT,
+        CODES_TYPES_SESSION[enregistrement.type_session],
+        DRAPEAU_ANNULEE if enregistrement.annulee else 0,
+        enregistrement.cycle,
+        enregistrement.duree_prevue,
+        enregistrement.debut,
+        enregistrement.fin,
+        enregistrement.duree_reelle
+    )
+
+
+def _decoder(champs):
+    """Construit un EnregistrementSession à partir des champs bruts."""
+    _version, code, drapeaux, cycle, duree_prevue, debut, fin, duree_reelle = champs
+    return EnregistrementSession(TYPES_SESSION[code], duree_prevue, duree_reelle,
+                                 debut, fin, bool(drapeaux & DRAPEAU_ANNULEE), cycle)
+
+
+def dossier_donnees():
+    """
+    Retourne le dossier de données de Pymodoro pour l'utilisateur.
+
+    Sous Windows, %APPDATA%\\pymodoro ; ailleurs, $XDG_DATA_HOME/pymodoro
+    ou ~/.local/share/pymodoro.
+
+    Returns:
+        str: Le chemin du dossier (il n'est pas créé).
+    """
+    if os.name == 'nt':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    else:
+        base = (os.environ.get('XDG_DATA_HOME')
+                or os.path.join(os.path.expanduser('~'), '.local', 'share'))
+    return os.path.join(base, 'pymodoro')
+
+
+def chemin_historique_defaut():
+    """
+    Retourne l'emplacement par défaut du fichier d'historique.
+
+    Returns:
+        str: Le chemin du fichier d'historique dans dossier_donnees().
+    """
+    return os.path.join(dossier_donnees(), NOM_FICHIER_HISTORIQUE)
+
+
+# =============================================================================
+# ÉCRITURE
+# =============================================================================
+
+class JournalHistorique:
+    """
+    Consigne les sessions à la fin d'un fichier d'historique.
+
+    Le fichier est ouvert à chaque ajout : une session dure des minutes, et
+    rien ne reste ouvert entre deux sessions.
+
+    Args:
+        chemin (str): Le chemin du fichier d'historique (créé au besoin,
+                      dossiers parents compris).
+    """
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+
+    def consigner(self, type_session, duree_prevue, duree_reelle, debut, fin,
+                  annulee=False, cycle=0):
+        """
+        Ajoute une session à l'historique en un seul appel à os.write().
+
+        Args:
+            type_session (str): "TRAVAIL", "PAUSE" ou "PAUSE LONGUE".
+            duree_prevue (float): La durée planifiée, en secondes.
+            duree_reelle (float): La durée écoulée, en secondes.
+            debut (float): Le timestamp Unix du début.
+            fin (float): Le timestamp Unix de la fin.
+            annulee (bool): True si la session a été interrompue.
+            cycle (int): Le numéro du cycle (0 hors cycle).
+
+        Returns:
+            EnregistrementSession: L'enregistrement ajouté.
+
+        Raises:
+            OSError: Si le fichier ne peut pas être écrit.
+        """
+        enregistrement = EnregistrementSession(type_session, duree_prevue, duree_reelle,
+                                               debut, fin, annulee, cycle)
+        self.ajouter(encoder_enregistrement(enregistrement))
+        return enregistrement
+
+    def ajouter(self, donnees):
+        """
+        Ajoute des enregistrements déjà encodés, de manière atomique.
+
+        Avec O_APPEND, le déplacement en fin de fichier et l'écriture forment
+        une seule opération : deux processus ne peuvent pas s'écraser.
+
+        Args:
+            donnees (bytes): Un ou plusieurs enregistrements encodés.
+
+        Raises:
+            OSError: Si le fichier ne peut pas être écrit en entier.
+        """
+        dossier = os.path.dirname(self.chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        drapeaux = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        descripteur = os.open(self.chemin, drapeaux, 0o644)
+        try:
+            ecrits = os.write(descripteur, donnees)
+        finally:
+            os.close(descripteur)
+        if ecrits != len(donnees):
+            raise OSError(f"écriture partielle de l'historique ({ecrits}/{len(donnees)} octets)")
+
+
+# =============================================================================
+# LECTURE
+# =============================================================================
+
+class Historique:
+    """
+    Accès en lecture à un fichier d'historique projeté en mémoire.
+
+    S'utilise comme gestionnaire de contexte. L'accès indexé ne décode que
+    l'enregistrement demandé ; l'itération décode les enregistrements à la
+    volée. Un enregistrement incomplet en fin de fichier est ignoré. Un
+    fichier absent se lit comme un historique vide.
+
+    Args:
+        chemin (str): Le chemin du fichier d'historique.
+
+    Exemple:
+        >>> with Historique("historique.bin") as historique:   # doctest: +SKIP
+        ...     historique[-1].type_session
+        'TRAVAIL'
+    """
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self._fichier = None
+        self._projection = None
+        self._nombre = 0
+
+    def __enter__(self):
+        try:
+            self._fichier = open(self.chemin, 'rb')
+        except FileNotFoundError:
+            return self
+        taille = os.fstat(self._fichier.fileno()).st_size
+        self._nombre = taille // TAILLE_ENREGISTREMENT
+        if self._nombre:
+            self._projection = mmap.mmap(self._fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    def fermer(self):
+        """Libère la projection et ferme le fichier."""
+        if self._projection is not None:
+            self._projection.close()
+            self._projection = None
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = None
+        self._nombre = 0
+
+    def __len__(self):
+        """Retourne le nombre d'enregistrements complets."""
+        return self._nombre
+
+    def __getitem__(self, indice):
+        """
+        Décode le seul enregistrement demandé (indices négatifs acceptés).
+
+        Args:
+            indice (int): La position de l'enregistrement.
+
+        Returns:
+            EnregistrementSession: L'enregistrement décodé.
+
+        Raises:
+            IndexError: Si l'indice est hors de l'historique.
+        """
+        if indice < 0:
+            indice += self._nombre
+        if not 0 <= indice < self._nombre:
+            raise IndexError("indice hors de l'historique")
+        return _decoder(FORMAT_ENREGISTREMENT.unpack_from(self._projection,
+                                                          indice * TAILLE_ENREGISTREMENT))
+
+    def __iter__(self):
+        """
+        Parcourt les enregistrements dans l'ordre d'ajout.
+
+        Yields:
+            EnregistrementSession: Chaque session consignée.
+        """
+        if not self._nombre:
+            return
+        contenu = self._projection[:self._nombre * TAILLE_ENREGISTREMENT]
+        for champs in FORMAT_ENREGISTREMENT.iter_unpack(contenu):
+            yield _decoder(champs)
+
+    def derniers(self, nombre):
+        """
+        Retourne les `nombre` dernières sessions, sans lire le reste.
+
+        Args:
+            nombre (int): Le nombre de sessions voulues.
+
+        Returns:
+            list: Les EnregistrementSession, du plus ancien au plus récent.
+        """
+        return [self[i] for i in range(max(self._nombre - nombre, 0), self._nombre)]
+
+
+def lire_historique(chemin):
+    """
+    Lit tout un fichier d'historique.
+
+    Args:
+        chemin (str): Le chemin du fichier d'historique.
+
+    Returns:
+        list: Les EnregistrementSession, dans l'ordre d'ajout.
+    """
+    with Historique(chemin) as historique:
+        return list(historique)
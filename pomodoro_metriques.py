@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+"""
+Métriques Prometheus de Pymodoro-CLI.
+=====================================
+
+Avec `--metrics-port PORT`, un pymodoro lancé comme service (kiosques,
+écrans partagés) expose ses métriques au format texte de Prometheus sur
+http://127.0.0.1:PORT/metrics:
+
+    pymodoro_sessions_completed_total{type}   Sessions terminées, par type
+    pymodoro_sessions_cancelled_total{type}   Sessions annulées, par type
+    pymodoro_active_timers                    Minuteries en cours
+    pymodoro_tick_lateness_seconds            Histogramme du retard au réveil
+    pymodoro_render_seconds                   Histogramme du temps de rendu d'une trame
+    pymodoro_notification_latency_seconds     Résumé de la latence des notifications
+    process_resident_memory_bytes             Mémoire résidente du processus
+
+Les compteurs et les histogrammes sont préalloués (tableaux d'entiers) : le
+moteur ne fait qu'incrémenter une case par trame. Le texte n'est construit
+qu'à la lecture. La socket HTTP est servie par la boucle des ticks, dans le
+même select() que la socket de pilotage (pomodoro_controle), sans thread :
+les réponses partent par écritures non bloquantes, et une connexion inactive
+est fermée.
+
+Exemple:
+    $ pymodoro --auto -c 100 --metrics-port 9469 &
+    $ curl -s http://127.0.0.1:9469/metrics | grep completed
+"""
+
+import os
+import sys
+from array import array
+from bisect import bisect_left
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Adresse d'écoute : les métriques ne sont exposées qu'en local
+ADRESSE_METRIQUES = "127.0.0.1"
+
+# Bornes des histogrammes (en secondes)
+BORNES_RETARD = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+BORNES_RENDU = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+# Types de session et leur étiquette Prometheus, dans l'ordre des compteurs
+ETIQUETTES_TYPES = {"TRAVAIL": "work", "PAUSE": "break", "PAUSE LONGUE": "long_break"}
+
+# Taille maximale d'une requête HTTP (en octets)
+TAILLE_MAX_REQUETE = 8192
+
+# Une connexion qui n'envoie pas sa requête ou ne lit pas sa réponse pendant
+# ce délai est fermée (en secondes)
+DELAI_INACTIVITE = 10.0
+
+
+# =============================================================================
+# COLLECTE
+# =============================================================================
+
+class Histogramme:
+    """
+    Histogramme à bornes fixes, au sens de Prometheus.
+
+    Les comptes sont rangés dans un tableau préalloué, un par borne plus un
+    pour +Inf : une observation coûte une bisection et une incrémentation.
+
+    Args:
+        bornes (tuple): Les bornes supérieures des classes, croissantes.
+
+    Attributs:
+        comptes (array): Le nombre d'observations par classe (non cumulé).
+        somme (float): La somme des observations.
+    """
+
+    __slots__ = ('bornes', 'comptes', 'somme')
+
+    def __init__(self, bornes):
+        self.bornes = tuple(bornes)
+        self.comptes = array('Q', bytes(8 * (len(self.bornes) + 1)))
+        self.somme = 0.0
+
+    def observer(self, valeur):
+        """Ajoute une observation."""
+        self.comptes[bisect_left(self.bornes, valeur)] += 1
+        self.somme += valeur
+
+    @property
+    def total(self):
+        """Le nombre d'observations."""
+        return sum(self.comptes)
+
+
+class Metriques:
+    """
+    Métriques d'un processus pymodoro.
+
+    Les sessions sont comptées par abonnement au bus d'événements du moteur ;
+    le retard des ticks et le temps de rendu sont observés par le moteur
+    lui-même (contexte.metriques). La latence des notifications et la
+    mémoire résidente sont relevées à la lecture.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc se
+    désabonne du bus.
+
+    Attributs:
+        sessions_terminees (array): Les sessions terminées, par type.
+        sessions_annulees (array): Les sessions annulées, par type.
+        sessions_actives (int): Les sessions en cours.
+        retard_ticks (Histogramme): Le retard au réveil de chaque tick.
+        duree_rendu (Histogramme): Le temps de rendu de chaque trame.
+        notifications (FileNotifications): La file dont la latence est
+                                           exposée (aucune si None).
+    """
+
+    def __init__(self):
+        self.sessions_terminees = array('Q', bytes(8 * len(ETIQUETTES_TYPES)))
+        self.sessions_annulees = array('Q', bytes(8 * len(ETIQUETTES_TYPES)))
+        self.sessions_actives = 0
+        self.retard_ticks = Histogramme(BORNES_RETARD)
+        self.duree_rendu = Histogramme(BORNES_RENDU)
+        self.notifications = None
+        self._codes = {nom: code for code, nom in enumerate(ETIQUETTES_TYPES)}
+        self._bus = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.desabonner()
+
+    def abonner(self, bus):
+        """
+        Compte les sessions publiées sur un bus d'événements.
+
+        Args:
+            bus (BusEvenements): Le bus d'événements du moteur.
+        """
+        self._bus = bus
+        bus.abonner(self.a_l_evenement, ["session_debut", "session_fin", "session_annulee"])
+
+    def desabonner(self):
+        """Cesse de compter les sessions."""
+        if self._bus is not None:
+            self._bus.desabonner(self.a_l_evenement)
+            self._bus = None
+
+    def a_l_evenement(self, evenement, donnees):
+        """Met à jour les compteurs de sessions."""
+        if evenement == "session_debut":
+            self.sessions_actives += 1
+            return
+        self.sessions_actives = max(self.sessions_actives - 1, 0)
+        code = self._codes[donnees["type_session"]]
+        if evenement == "session_fin":
+            self.sessions_terminees[code] += 1
+        else:
+            self.sessions_annulees[code] += 1
+
+    # -------------------------------------------------------------------------
+    # Exposition
+    # -------------------------------------------------------------------------
+
+    def exposer(self):
+        """
+        Rend les métriques au format texte de Prometheus (version 0.0.4).
+
+        Returns:
+            str: Le texte exposé, terminé par un saut de ligne.
+        """
+        lignes = []
+
+        def famille(nom, type_metrique, aide):
+            lignes.append(f"# HELP {nom} {aide}")
+            lignes.append(f"# TYPE {nom} {type_metrique}")
+
+        famille("pymodoro_sessions_completed_total", "counter", "Sessions terminées, par type.")
+        for code, etiquette in enumerate(ETIQUETTES_TYPES.values()):
+            lignes.append(f'pymodoro_sessions_completed_total{{type="{etiquette}"}} '
+                          f'{self.sessions_terminees[code]}')
+        famille("pymodoro_sessions_cancelled_total", "counter", "Sessions annulées, par type.")
+        for code, etiquette in enumerate(ETIQUETTES_TYPES.values()):
+            lignes.append(f'pymodoro_sessions_cancelled_total{{type="{etiquette}"}} '
+                          f'{self.sessions_annulees[code]}')
+        famille("pymodoro_active_timers", "gauge", "Minuteries en cours.")
+        lignes.append(f"pymodoro_active_timers {self.sessions_actives}")
+
+        famille("pymodoro_tick_lateness_seconds", "histogram",
+                "Retard au réveil des ticks, en secondes.")
+        _histogramme(lignes, "pymodoro_tick_lateness_seconds", self.retard_ticks)
+        famille("pymodoro_render_seconds", "histogram",
+                "Temps de rendu d'une trame, en secondes.")
+        _histogramme(lignes, "pymodoro_render_seconds", self.duree_rendu)
+
+        if self.notifications is not None:
+            statistiques = self.notifications.statistiques()
+            famille("pymodoro_notification_latency_seconds", "summary",
+                    "Latence de distribution des notifications, en secondes.")
+            for quantile, cle in (("0.5", "latence_p50"), ("0.99", "latence_p99")):
+                lignes.append(f'pymodoro_notification_latency_seconds{{quantile="{quantile}"}} '
+                              f'{statistiques[cle]!r}')
+            lignes.append(f"pymodoro_notification_latency_seconds_sum "
+                          f"{statistiques['latence_somme']!r}")
+            lignes.append(f"pymodoro_notification_latency_seconds_count "
+                          f"{statistiques['latence_nombre']}")
+            famille("pymodoro_notifications_total", "counter",
+                    "Notifications distribuées dans leur délai.")
+            lignes.append(f"pymodoro_notifications_total {statistiques['distribuees']}")
+
+        rss = memoire_residente()
+        if rss is not None:
+            famille("process_resident_memory_bytes", "gauge", "Mémoire résidente, en octets.")
+            lignes.append(f"process_resident_memory_bytes {rss}")
+        return "\n".join(lignes) + "\n"
+
+
+def _histogramme(lignes, nom, histogramme):
+    """Ajoute les lignes _bucket (cumulées), _sum et _count d'un histogramme."""
+    cumul = 0
+    for borne, compte in zip(histogramme.bornes, histogramme.comptes):
+        cumul += compte
+        lignes.append(f'{nom}_bucket{{le="{borne!r}"}} {cumul}')
+    cumul += histogramme.comptes[-1]
+    lignes.append(f'{nom}_bucket{{le="+Inf"}} {cumul}')
+    lignes.append(f"{nom}_sum {histogramme.somme!r}")
+    lignes.append(f"{nom}_count {cumul}")
+
+
+def memoire_residente():
+    """
+    Retourne la mémoire résidente du processus.
+
+    Returns:
+        int: La mémoire résidente en octets (/proc sous Linux, pic de
+        getrusage() ailleurs), ou None si elle n'est pas mesurable.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pic if sys.platform == "darwin" else pic * 1024
+
+
+# =============================================================================
+# EXPOSITION HTTP
+# =============================================================================
+
+class ServeurMetriques:
+    """
+    Expose les métriques en HTTP, depuis l'attente des ticks.
+
+    La socket d'écoute et les connexions sont des sources du ServeurControle
+    (ajouter_source) : une requête est traitée dès son arrivée, entre deux
+    trames, et la réponse part sans bloquer, au rythme où le client la lit.
+    Seul `GET /metrics` est servi ; chaque connexion reçoit une réponse puis
+    est fermée (HTTP/1.0). Une connexion inactive pendant DELAI_INACTIVITE
+    secondes est fermée par la boucle.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc ferme la
+    socket.
+
+    Args:
+        metriques (Metriques): Les métriques exposées.
+        port (int): Le port TCP (0 : choisi par le système).
+        adresse (str): L'adresse d'écoute.
+
+    Attributs:
+        requetes (int): Le nombre de requêtes servies.
+    """
+
+    def __init__(self, metriques, port, adresse=ADRESSE_METRIQUES):
+        self.metriques = metriques
+        self.port = port
+        self.adresse = adresse
+        self.requetes = 0
+        self.ecoute = None
+        self._boucle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    def brancher(self, boucle):
+        """
+        Ouvre la socket et la confie à la boucle des ticks.
+
+        Args:
+            boucle (ServeurControle): La boucle qui sert les sockets.
+
+        Raises:
+            OSError: Si le port ne peut pas être ouvert.
+        """
+        import socket
+        ecoute = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            ecoute.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            ecoute.bind((self.adresse, self.port))
+            ecoute.listen(8)
+        except OSError:
+            ecoute.close()
+            raise
+        ecoute.setblocking(False)
+        self.ecoute = ecoute
+        self.port = ecoute.getsockname()[1]
+        self._boucle = boucle
+        boucle.ajouter_source(ecoute, self._accepter)
+
+    def fermer(self):
+        """Ferme la socket d'écoute."""
+        if self.ecoute is None:
+            return
+        self._boucle.retirer_source(self.ecoute)
+        self.ecoute.close()
+        self.ecoute = None
+
+    # -------------------------------------------------------------------------
+    # Connexions
+    # -------------------------------------------------------------------------
+
+    def _accepter(self, ecoute):
+        try:
+            client, _ = ecoute.accept()
+        except OSError:
+            return
+        client.setblocking(False)
+        tampon = bytearray()
+        self._boucle.ajouter_source(client, lambda client: self._lire(client, tampon),
+                                    delai_inactivite=DELAI_INACTIVITE)
+
+    def _lire(self, client, tampon):
+        """Lit une requête ; dès qu'elle est complète, commence l'envoi de la réponse."""
+        try:
+            donnees = client.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            donnees = b""
+        tampon += donnees
+        if donnees and b"\r\n\r\n" not in tampon and len(tampon) <= TAILLE_MAX_REQUETE:
+            return
+
+        self._boucle.retirer_source(client)
+        if b"\r\n\r\n" not in tampon:
+            client.close()
+            return
+        reponse = bytearray(self.repondre(bytes(tampon)))
+        self._envoyer(client, reponse)
+        if reponse:
+            # Le client lit moins vite que la réponse n'est produite : la
+            # suite part quand la socket redevient inscriptible
+            self._boucle.ajouter_source(client, lambda client: self._poursuivre(client, reponse),
+                                        ecriture=True, delai_inactivite=DELAI_INACTIVITE)
+        else:
+            client.close()
+
+    def _poursuivre(self, client, reponse):
+        """Envoie la suite d'une réponse ; ferme la connexion une fois tout envoyé."""
+        self._envoyer(client, reponse)
+        if not reponse:
+            self._boucle.retirer_source(client)
+            client.close()
+
+    @staticmethod
+    def _envoyer(client, reponse):
+        """Envoie ce que la socket accepte sans bloquer et le retire de `reponse`."""
+        try:
+            envoyes = client.send(reponse)
+        except BlockingIOError:
+            return
+        except OSError:
+            # Client parti : le reste de la réponse est abandonné
+            envoyes = len(reponse)
+        del reponse[:envoyes]
+
+    def repondre(self, requete):
+        """
+        Construit la réponse HTTP à une requête.
+
+        Args:
+            requete (bytes): La requête reçue, en-têtes compris.
+
+        Returns:
+            bytes: La réponse complète.
+        """
+        self.requetes += 1
+        ligne = requete.split(b"\r\n", 1)[0].split()
+        if len(ligne) < 2 or ligne[0] not in (b"GET", b"HEAD"):
+            return _reponse_http("405 Method Not Allowed", b"GET /metrics\n")
+        if ligne[1].split(b"?", 1)[0] != b"/metrics":
+            return _reponse_http("404 Not Found", b"GET /metrics\n")
+        corps = self.metriques.exposer().encode("utf-8")
+        return _reponse_http("200 OK", corps, ligne[0] == b"HEAD",
+                             "text/plain; version=0.0.4; charset=utf-8")
+
+
+def _reponse_http(etat, corps, sans_corps=False, type_contenu="text/plain; charset=utf-8"):
+    entete = (f"HTTP/1.0 {etat}\r\nContent-Type: {type_contenu}\r\n"
+              f"Content-Length: {len(corps)}\r\nConnection: close\r\n\r\n")
+    return entete.encode("ascii") + (b"" if sans_corps else corps)
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+File de notifications de Pymodoro-CLI.
+======================================
+
+Les notifications (son de fin de session) bloquent : deux bips de 500 ms
+sous Windows, l'attente de `afplay` sous macOS. En mode automatique, ce temps retardait la session suivante.
+
+Le moteur dépose désormais ses notifications dans une file et continue
+immédiatement ; un thread de fond les distribue:
+- Une alerte déjà en attente sur le même canal absorbe les doublons
+- Chaque canal a un délai maximal : une notification qui ne rend pas la main
+  à temps est abandonnée à son thread et la file passe à la suivante
+- La profondeur de la file et la latence de distribution (entre le dépôt et
+  le début de la notification) sont exposées pour la supervision
+
+Exemple:
+    with FileNotifications() as notifications:
+        notifications.soumettre("son", emettre_son)
+        ...
+        print(notifications.statistiques())
+"""
+
+import collections
+import threading
+import time
+
+from pomodoro_statistiques import StatistiquesRetard
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Délai maximal d'une notification, par défaut (en secondes)
+DELAI_NOTIFICATION_DEFAUT = 2.0
+
+# Nombre de latences conservées pour le calcul des percentiles
+CAPACITE_LATENCES_DEFAUT = 1024
+
+
+# =============================================================================
+# FILE DE NOTIFICATIONS
+# =============================================================================
+
+class FileNotifications:
+    """
+    Distribue les notifications depuis un thread de fond.
+
+    Le thread de distribution n'est lancé qu'au premier dépôt. Chaque
+    notification s'exécute dans son propre thread, attendu au plus le délai
+    de son canal. Les méthodes publiques sont sûres entre threads.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc distribue
+    les notifications encore en attente avant de rendre la main.
+
+    Args:
+        delais (dict): Le délai maximal par canal, en secondes
+                       (DELAI_NOTIFICATION_DEFAUT pour les autres canaux).
+        horloge (Horloge): L'horloge des latences, celle du moteur (time.monotonic()
+                           si None).
+        capacite_latences (int): Nombre de latences conservées.
+
+    Attributs:
+        latences (StatistiquesRetard): La latence de chaque distribution.
+        distribuees (int): Les notifications terminées dans leur délai.
+        fusionnees (int): Les doublons absorbés par une alerte du même canal.
+        expirees (int): Les notifications qui ont dépassé leur délai.
+        echecs (int): Les notifications qui ont levé une exception.
+    """
+
+    def __init__(self, delais=None, horloge=None, capacite_latences=CAPACITE_LATENCES_DEFAUT):
+        self.delais = dict(delais or {})
+        self.horloge = horloge
+        self._maintenant = horloge.maintenant if horloge is not None else time.monotonic
+        self.latences = StatistiquesRetard(capacite_latences)
+        self.distribuees = 0
+        self.fusionnees = 0
+        self.expirees = 0
+        self.echecs = 0
+        self._file = collections.deque()
+        self._en_attente = {}
+        self._executants = {}
+        self._en_cours = None
+        self._condition = threading.Condition()
+        self._thread = None
+        self._arret = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    @property
+    def profondeur(self):
+        """Le nombre de notifications en attente de distribution."""
+        with self._condition:
+            return len(self._file)
+
+    # -------------------------------------------------------------------------
+    # Dépôt
+    # -------------------------------------------------------------------------
+
+    def soumettre(self, canal, action):
+        """
+        Dépose une notification sans attendre sa distribution.
+
+        Args:
+            canal (str): Le canal de la notification ("son"...) : une seule
+                         alerte par canal attend dans la file.
+            action (callable): La notification, appelée sans argument.
+
+        Returns:
+            bool: True si la notification est mise en file, False si une
+            alerte du même canal attendait déjà.
+        """
+        with self._condition:
+            if canal in self._en_attente:
+                self.fusionnees += 1
+                return False
+            self._en_attente[canal] = (action, self._maintenant())
+            self._file.append(canal)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._distribuer,
+                                                name="pymodoro-notifications", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+            return True
+
+    # -------------------------------------------------------------------------
+    # Distribution
+    # -------------------------------------------------------------------------
+
+    def _distribuer(self):
+        """Boucle du thread de fond : vide la file jusqu'à fermer()."""
+        while True:
+            with self._condition:
+                while not self._file and not self._arret:
+                    self._condition.wait()
+                if not self._file:
+                    return
+                canal = self._file.popleft()
+                action, depot = self._en_attente.pop(canal)
+                self._en_cours = canal
+            try:
+                self._executer(canal, action, depot)
+            finally:
+                with self._condition:
+                    self._en_cours = None
+                    self._condition.notify_all()
+
+    def _executer(self, canal, action, depot):
+        """Exécute une notification dans son thread, au plus le délai du canal."""
+        precedent = self._executants.get(canal)
+        if precedent is not None and precedent.is_alive():
+            # La notification précédente du canal, expirée, joue encore
+            self.fusionnees += 1
+            return
+        self.latences.enregistrer(self._maintenant() - depot)
+        executant = threading.Thread(target=self._appeler, args=(action,),
+                                     name=f"pymodoro-notification-{canal}", daemon=True)
+        self._executants[canal] = executant
+        executant.start()
+        executant.join(self.delais.get(canal, DELAI_NOTIFICATION_DEFAUT))
+        if executant.is_alive():
+            self.expirees += 1
+        else:
+            self.distribuees += 1
+
+    def _appeler(self, action):
+        try:
+            action()
+        except Exception:
+            self.echecs += 1
+
+    # -------------------------------------------------------------------------
+    # Attente et arrêt
+    # -------------------------------------------------------------------------
+
+    def vider(self, delai=None):
+        """
+        Attend que toutes les notifications déposées soient distribuées.
+
+        Args:
+            delai (float): L'attente maximale en secondes (illimitée si None).
+
+        Returns:
+            bool: True si la file est vide, False si le délai a expiré avant.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._file and self._en_cours is None, delai)
+
+    def fermer(self):
+        """
+        Distribue les notifications en attente puis arrête le thread de fond.
+
+        L'attente est bornée : chaque notification dure au plus le délai de
+        son canal.
+        """
+        with self._condition:
+            self._arret = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def statistiques(self):
+        """
+        Retourne un instantané des indicateurs de la file.
+
+        Returns:
+            dict: profondeur, compteurs et latences de distribution
+            (p50, p99, maximum et somme en secondes, nombre de latences).
+        """
+        latences = self.latences.percentiles(50, 99)
+        return {
+            "profondeur": self.profondeur,
+            "distribuees": self.distribuees,
+            "fusionnees": self.fusionnees,
+            "expirees": self.expirees,
+            "echecs": self.echecs,
+            "latence_p50": latences.get(50, 0.0),
+            "latence_p99": latences.get(99, 0.0),
+            "latence_max": self.latences.maximum,
+            "latence_somme": self.latences.somme,
+            "latence_nombre": self.latences.nombre,
+        }
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Profil des ticks de Pymodoro-CLI.
+=================================
+
+Avec `--profile`, chaque tick du compte à rebours est enregistré :
+l'échéance prévue et l'instant réel du réveil, le temps passé à composer la
+trame et le temps passé à l'écrire (os.write ou write + flush). En fin
+d'exécution, les quantiles p50/p95/p99 et le maximum de chaque mesure sont
+affichés sur stderr ; `--profile-output FICHIER` enregistre en plus les
+mesures brutes au format CSV, pour une analyse hors ligne.
+
+Les mesures sont rangées dans un tampon circulaire `array('d')` alloué une
+fois pour toutes : un tick écrit quatre flottants, sans allocation, pour ne
+pas fausser ce qu'il mesure. Au-delà de la capacité, les ticks les plus
+anciens sont écrasés.
+
+Le rapport compte aussi les réveils du moteur, c'est-à-dire les ticks
+attendus après la trame initiale de chaque session : 1500 pour une session
+de 25 minutes à une trame par seconde, quelques dizaines avec --low-power.
+
+Exemple:
+    $ pymodoro -c 4 --auto --profile --profile-output ticks.csv
+"""
+
+import sys
+from array import array
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Nombre de ticks gardés (8 h à une trame par seconde, 32 octets par tick)
+CAPACITE_PROFIL = 32768
+
+# Colonnes du tampon, dans l'ordre d'un enregistrement
+COLONNES_PROFIL = ("echeance", "reveil", "composition", "ecriture")
+
+# Quantiles du rapport
+QUANTILES_PROFIL = (0.50, 0.95, 0.99)
+
+
+# =============================================================================
+# ENREGISTREMENT
+# =============================================================================
+
+class ProfilTicks:
+    """
+    Enregistre les mesures de chaque tick dans un tampon circulaire.
+
+    L'ordonnanceur appelle reveil() au réveil de chaque tick, puis le moteur
+    appelle rendu() après avoir émis la trame ; les deux appels remplissent
+    le même enregistrement.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc affiche le
+    rapport et, si un chemin est fourni, exporte les mesures.
+
+    Args:
+        capacite (int): Le nombre de ticks gardés.
+        chemin_export (str): Le fichier CSV des mesures brutes (aucun si None).
+        flux: Le flux du rapport (sys.stderr si None).
+
+    Attributs:
+        tampon (array): Les mesures, COLONNES_PROFIL par tick, en secondes.
+        ecrits (int): Le nombre de ticks enregistrés depuis le début.
+        sessions (int): Le nombre de sessions commencées.
+    """
+
+    def __init__(self, capacite=CAPACITE_PROFIL, chemin_export=None, flux=None):
+        self.capacite = capacite
+        self.chemin_export = chemin_export
+        self.flux = flux
+        self.tampon = array('d', bytes(8 * len(COLONNES_PROFIL) * capacite))
+        self.ecrits = 0
+        self.sessions = 0
+        self._position = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.terminer()
+
+    def debut_session(self, debut):
+        """
+        Enregistre la trame initiale d'une session, affichée sans attente.
+
+        Args:
+            debut (float): L'instant du début de la session.
+        """
+        self.sessions += 1
+        self.reveil(debut, debut)
+
+    def reveil(self, echeance, maintenant):
+        """
+        Ouvre l'enregistrement d'un tick.
+
+        Args:
+            echeance (float): L'instant prévu du tick.
+            maintenant (float): L'instant réel du réveil.
+        """
+        position = (self.ecrits % self.capacite) * 4
+        tampon = self.tampon
+        tampon[position] = echeance
+        tampon[position + 1] = maintenant
+        tampon[position + 2] = 0.0
+        tampon[position + 3] = 0.0
+        self._position = position
+        self.ecrits += 1
+
+    def rendu(self, composition, ecriture):
+        """
+        Complète l'enregistrement du tick courant avec le coût de sa trame.
+
+        Args:
+            composition (float): Le temps de composition, en secondes.
+            ecriture (float): Le temps d'écriture, en secondes.
+        """
+        self.tampon[self._position + 2] = composition
+        self.tampon[self._position + 3] = ecriture
+
+    # -------------------------------------------------------------------------
+    # Lecture
+    # -------------------------------------------------------------------------
+
+    @property
+    def gardes(self):
+        """Le nombre de ticks gardés dans le tampon."""
+        return min(self.ecrits, self.capacite)
+
+    @property
+    def reveils(self):
+        """Le nombre de réveils : les ticks attendus, hors trames initiales."""
+        return self.ecrits - self.sessions
+
+    def mesures(self):
+        """
+        Retourne les ticks gardés, du plus ancien au plus récent.
+
+        Returns:
+            list: Des tuples (echeance, reveil, composition, ecriture).
+        """
+        premier = self.ecrits - self.gardes
+        tampon = self.tampon
+        resultat = []
+        for indice in range(premier, self.ecrits):
+            position = (indice % self.capacite) * 4
+            resultat.append(tuple(tampon[position:position + 4]))
+        return resultat
+
+    def statistiques(self):
+        """
+        Calcule les quantiles et le maximum du retard, de la composition et de l'écriture.
+
+        Returns:
+            dict: Pour "retard", "composition" et "ecriture", un dict avec
+            les clés p50, p95, p99 et max (en secondes) ; vide sans tick.
+        """
+        mesures = self.mesures()
+        if not mesures:
+            return {}
+        series = {
+            "retard": sorted(max(reveil - echeance, 0.0)
+                             for echeance, reveil, _, _ in mesures),
+            "composition": sorted(mesure[2] for mesure in mesures),
+            "ecriture": sorted(mesure[3] for mesure in mesures),
+        }
+        resultat = {}
+        for nom, valeurs in series.items():
+            resultat[nom] = {f"p{round(q * 100)}": _quantile(valeurs, q)
+                             for q in QUANTILES_PROFIL}
+            resultat[nom]["max"] = valeurs[-1]
+        return resultat
+
+    # -------------------------------------------------------------------------
+    # Rapport et export
+    # -------------------------------------------------------------------------
+
+    def rapport(self):
+        """
+        Met en forme les statistiques, en millisecondes.
+
+        Returns:
+            str: Le rapport, sur plusieurs lignes.
+        """
+        statistiques = self.statistiques()
+        if not statistiques:
+            return "    📊 Profil : aucun tick enregistré.\n"
+        ecrases = self.ecrits - self.gardes
+        lignes = [f"    📊 Profil de {self.ecrits} tick(s)"
+                  + (f" ({ecrases} plus anciens écrasés)" if ecrases else ""),
+                  f"       {self.reveils} réveil(s) pour {self.sessions} session(s)"
+                  + (f", {self.reveils / self.sessions:.0f} par session" if self.sessions else ""),
+                  f"       {'':<12}" + "".join(f"{cle:>10}" for cle in statistiques["retard"])]
+        for nom, libelle in (("retard", "Retard"), ("composition", "Composition"),
+                             ("ecriture", "Écriture")):
+            valeurs = "".join(f"{valeur * 1000:>7.3f} ms" for valeur in statistiques[nom].values())
+            lignes.append(f"       {libelle:<12}{valeurs}")
+        return "\n".join(lignes) + "\n"
+
+    def exporter(self, chemin):
+        """
+        Enregistre les mesures brutes au format CSV.
+
+        Le retard au réveil est ajouté pour la lecture ; les instants sont
+        ceux de l'horloge monotone du moteur.
+
+        Args:
+            chemin (str): Le fichier à écrire (remplacé s'il existe).
+
+        Raises:
+            OSError: Si le fichier ne peut pas être écrit.
+        """
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            fichier.write(",".join(COLONNES_PROFIL[:2] + ("retard",) + COLONNES_PROFIL[2:]) + "\n")
+            for echeance, reveil, composition, ecriture in self.mesures():
+                fichier.write(f"{echeance!r},{reveil!r},{reveil - echeance!r},"
+                              f"{composition!r},{ecriture!r}\n")
+
+    def terminer(self):
+        """Affiche le rapport et exporte les mesures si un chemin a été fourni."""
+        flux = self.flux if self.flux is not None else sys.stderr
+        flux.write("\n" + self.rapport())
+        if self.chemin_export:
+            try:
+                self.exporter(self.chemin_export)
+            except OSError as erreur:
+                flux.write(f"    ⚠️  Profil non enregistré : {erreur}\n")
+            else:
+                flux.write(f"    💾 Mesures enregistrées dans {self.chemin_export}\n")
+        flux.flush()
+
+
+def _quantile(valeurs, quantile):
+    """Quantile au rang le plus proche d'une liste triée non vide."""
+    rang = max(int(quantile * len(valeurs) + 0.5) - 1, 0)
+    return valeurs[min(rang, len(valeurs) - 1)]
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Point de reprise d'un plan de cycles de Pymodoro-CLI.
+=====================================================
+
+Pendant un plan de plusieurs cycles, la position courante (cycle, type de
+session, échéance) est sauvegardée dans un petit fichier d'état. Si le
+terminal disparaît ou que la machine redémarre, `pymodoro --resume` repart
+de cette position au lieu du cycle 1.
+
+Le fichier n'est écrit qu'aux changements d'état (session, pause,
+reprise, prolongation), jamais à chaque tick. L'écriture passe par un
+fichier temporaire synchronisé sur disque puis renommé (os.replace), et
+le dossier est synchronisé à son tour : le fichier d'état est toujours
+soit l'ancienne version, soit la nouvelle, jamais un mélange des deux.
+
+L'échéance est une heure murale (timestamp Unix) : l'horloge monotone
+repart de zéro au redémarrage de la machine. Une session en pause n'a pas
+d'échéance : c'est son temps restant qui est sauvegardé.
+"""
+
+import collections
+import os
+
+from pomodoro_historique import dossier_donnees
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Version du format du fichier d'état
+VERSION_REPRISE = 1
+
+# Nom du fichier d'état dans le dossier de données de l'utilisateur
+NOM_FICHIER_REPRISE = "reprise.json"
+
+
+EtatReprise = collections.namedtuple(
+    'EtatReprise',
+    ['travail', 'pause', 'pause_longue', 'total_cycles', 'mode_auto',
+     'cycle', 'type_session', 'echeance', 'restant'],
+    defaults=(None,)
+)
+EtatReprise.__doc__ = """
+La position d'un plan de cycles au dernier changement de session.
+
+Attributs:
+    travail (int): Durée du travail en minutes.
+    pause (int): Durée de la pause courte en minutes.
+    pause_longue (int): Durée de la pause longue en minutes.
+    total_cycles (int): Nombre total de cycles du plan.
+    mode_auto (bool): True si le plan enchaîne les sessions sans confirmation.
+    cycle (int): Le cycle de la session en cours.
+    type_session (str): "TRAVAIL", "PAUSE" ou "PAUSE LONGUE".
+    echeance (float): Le timestamp Unix de fin de la session en cours, None
+                      si elle est en pause.
+    restant (float): Le temps restant de la session en pause, en secondes
+                     (None hors pause).
+"""
+
+
+def chemin_reprise_defaut():
+    """
+    Retourne l'emplacement par défaut du fichier d'état.
+
+    Returns:
+        str: Le chemin du fichier d'état dans le dossier de données.
+    """
+    return os.path.join(dossier_donnees(), NOM_FICHIER_REPRISE)
+
+
+# =============================================================================
+# ÉCRITURE ATOMIQUE
+# =============================================================================
+
+def ecrire_atomiquement(chemin, donnees):
+    """
+    Remplace le contenu d'un fichier en une seule opération visible.
+
+    Les données sont écrites dans un fichier temporaire du même dossier,
+    synchronisées sur disque (fsync), puis le fichier temporaire prend la
+    place du fichier final par os.replace(). Le dossier est enfin
+    synchronisé, pour que le renommage survive lui aussi à une panne.
+
+    Args:
+        chemin (str): Le fichier à remplacer (créé au besoin).
+        donnees (bytes): Le nouveau contenu.
+
+    Raises:
+        OSError: Si l'écriture ou le renommage échoue.
+    """
+    dossier = os.path.dirname(chemin)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    drapeaux = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    descripteur = os.open(temporaire, drapeaux, 0o644)
+    try:
+        try:
+            reste = memoryview(donnees)
+            while reste:
+                reste = reste[os.write(descripteur, reste):]
+            os.fsync(descripteur)
+        finally:
+            os.close(descripteur)
+        os.replace(temporaire, chemin)
+    except OSError:
+        try:
+            os.remove(temporaire)
+        except OSError:
+            pass
+        raise
+    _synchroniser_dossier(dossier or os.curdir)
+
+
+def _synchroniser_dossier(dossier):
+    """Synchronise les entrées d'un dossier sur disque (sans effet sous Windows)."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    descripteur = os.open(dossier, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descripteur)
+    finally:
+        os.close(descripteur)
+
+
+# =============================================================================
+# POINT DE REPRISE
+# =============================================================================
+
+class PointDeReprise:
+    """
+    Sauvegarde la position d'un plan de cycles à chaque changement d'état.
+
+    Args:
+        chemin (str): Le chemin du fichier d'état.
+        travail (int): Durée du travail en minutes.
+        pause (int): Durée de la pause courte en minutes.
+        pause_longue (int): Durée de la pause longue en minutes.
+        total_cycles (int): Nombre total de cycles du plan.
+        mode_auto (bool): True si le plan enchaîne les sessions.
+    """
+
+    def __init__(self, chemin, travail, pause, pause_longue, total_cycles, mode_auto):
+        self.chemin = chemin
+        self.plan = {
+            'version': VERSION_REPRISE,
+            'travail': travail,
+            'pause': pause,
+            'pause_longue': pause_longue,
+            'total_cycles': total_cycles,
+            'mode_auto': mode_auto,
+        }
+
+    def enregistrer(self, cycle, type_session, echeance, restant=None):
+        """
+        Sauvegarde la session en cours.
+
+        Args:
+            cycle (int): Le cycle de la session.
+            type_session (str): Le type de la session.
+            echeance (float): Le timestamp Unix de fin de la session, None si
+                              elle est en pause.
+            restant (float): Le temps restant d'une session en pause, en
+                             secondes.
+
+        Raises:
+            OSError: Si le fichier d'état ne peut pas être écrit.
+        """
+        # json n'est importé qu'ici : le point de reprise est construit avant la
+        # première trame, mais n'est écrit qu'après
+        import json
+        etat = dict(self.plan, cycle=cycle, type_session=type_session, echeance=echeance,
+                    restant=restant)
+        ecrire_atomiquement(self.chemin, json.dumps(etat).encode("utf-8"))
+
+    def effacer(self):
+        """Supprime le fichier d'état une fois le plan terminé."""
+        try:
+            os.remove(self.chemin)
+        except FileNotFoundError:
+            pass
+
+
+def lire_reprise(chemin):
+    """
+    Lit le fichier d'état d'un plan interrompu.
+
+    Args:
+        chemin (str): Le chemin du fichier d'état.
+
+    Returns:
+        EtatReprise: La position sauvegardée, ou None si le fichier est
+        absent, illisible ou d'une autre version.
+    """
+    import json
+    try:
+        with open(chemin, 'rb') as fichier:
+            etat = json.loads(fichier.read().decode("utf-8"))
+        if etat.pop('version') != VERSION_REPRISE:
+            return None
+        return EtatReprise(**etat)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
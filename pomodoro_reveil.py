@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+Réveils précis des ticks sous Linux.
+====================================
+
+Par défaut, le moteur attend l'échéance de chaque tick avec time.sleep()
+ou un select() borné par le temps restant (HorlogeSysteme). Avec
+`--precise` ou `--timer-slack`, l'horloge HorlogeReveil attend des
+échéances absolues sur CLOCK_MONOTONIC :
+
+- Avec os.timerfd_create (Python 3.13+), une minuterie du noyau est armée
+  sur l'échéance absolue (TFD_TIMER_ABSTIME). Elle ne dérive pas si
+  l'attente est interrompue, et la boucle des ticks (pomodoro_controle)
+  l'attend dans son select() comme une socket.
+- Sinon, select() est relancé jusqu'à l'échéance absolue.
+
+La marge des minuteries (timer slack, réglée par prctl(PR_SET_TIMERSLACK))
+autorise le noyau à retarder un réveil pour le regrouper avec d'autres :
+une marge large économise l'énergie, une marge minimale donne des réveils
+serrés. Elle s'applique aux attentes de select() et de time.sleep() du
+thread qui la règle, le thread principal des ticks ; les minuteries
+timerfd, elles, expirent sans marge.
+
+Avec `--low-power`, sans autre option, la marge est large (MARGE_ECONOME)
+et les échéances sont attendues par select().
+
+Exemple:
+    $ pymodoro --precise
+    $ pymodoro --timer-slack 50000000
+"""
+
+import os
+import sys
+import time
+
+from pomodoro import HorlogeSysteme
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Options de prctl() (linux/prctl.h)
+PR_SET_TIMERSLACK = 29
+PR_GET_TIMERSLACK = 30
+
+# Marge des minuteries en mode précis (en nanosecondes ; 50 µs par défaut
+# sous Linux)
+MARGE_PRECISE = 1000
+
+# Marge des minuteries avec --low-power : un retard de 50 ms est invisible
+# sur un affichage à la minute, et laisse le noyau regrouper les réveils
+MARGE_ECONOME = 50_000_000
+
+
+# =============================================================================
+# MARGE DES MINUTERIES
+# =============================================================================
+
+def _prctl():
+    """Retourne la fonction prctl() de la libc, ou None hors de Linux."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+    except (ImportError, OSError):
+        return None
+    prctl = getattr(libc, "prctl", None)
+    if prctl is not None:
+        prctl.restype = ctypes.c_int
+    return prctl
+
+
+def lire_marge_timer():
+    """
+    Lit la marge des minuteries du thread courant.
+
+    Returns:
+        int: La marge en nanosecondes, ou None si elle n'est pas accessible
+        (hors de Linux, ctypes absent).
+    """
+    prctl = _prctl()
+    if prctl is None:
+        return None
+    import ctypes
+    zero = ctypes.c_ulong(0)
+    marge = prctl(PR_GET_TIMERSLACK, zero, zero, zero, zero)
+    return None if marge < 0 else marge
+
+
+def regler_marge_timer(nanosecondes):
+    """
+    Règle la marge des minuteries du thread courant.
+
+    Args:
+        nanosecondes (int): La nouvelle marge ; 0 rétablit la marge par
+                            défaut du thread.
+
+    Returns:
+        int: La marge précédente en nanosecondes, ou None si la marge n'est
+        pas accessible (hors de Linux, ctypes absent).
+
+    Raises:
+        OSError: Si le noyau refuse la nouvelle marge.
+    """
+    precedente = lire_marge_timer()
+    if precedente is None:
+        return None
+    import ctypes
+    zero = ctypes.c_ulong(0)
+    if _prctl()(PR_SET_TIMERSLACK, ctypes.c_ulong(nanosecondes), zero, zero, zero) != 0:
+        numero = ctypes.get_errno()
+        raise OSError(numero, os.strerror(numero))
+    return precedente
+
+
+# =============================================================================
+# MINUTERIE ABSOLUE
+# =============================================================================
+
+class MinuterieAbsolue:
+    """
+    Minuterie timerfd armée sur une échéance absolue de CLOCK_MONOTONIC.
+
+    Le descripteur devient lisible à l'échéance : la minuterie s'attend
+    seule (attendre()) ou dans un select(), comme une socket (fileno()).
+
+    Attributs:
+        expirations (int): Le nombre d'échéances atteintes et lues.
+
+    Raises:
+        OSError: Si la minuterie ne peut pas être créée.
+    """
+
+    def __init__(self):
+        self.descripteur = os.timerfd_create(time.CLOCK_MONOTONIC, flags=os.TFD_CLOEXEC)
+        self.expirations = 0
+
+    def fileno(self):
+        return self.descripteur
+
+    def armer(self, echeance):
+        """
+        Arme la minuterie, en remplaçant l'échéance précédente.
+
+        Args:
+            echeance (float): L'instant d'expiration, sur l'échelle de
+                              time.monotonic() (CLOCK_MONOTONIC).
+        """
+        os.timerfd_settime(self.descripteur, flags=os.TFD_TIMER_ABSTIME, initial=echeance)
+
+    def attendre(self):
+        """Attend l'échéance armée."""
+        self.lire()
+
+    def lire(self, _fichier=None):
+        """Lit le nombre d'expirations (gestionnaire de la boucle des ticks)."""
+        self.expirations += int.from_bytes(os.read(self.descripteur, 8), sys.byteorder)
+
+    def close(self):
+        """Ferme la minuterie (sans effet si elle l'est déjà)."""
+        if self.descripteur >= 0:
+            os.close(self.descripteur)
+            self.descripteur = -1
+
+
+# =============================================================================
+# HORLOGE
+# =============================================================================
+
+class HorlogeReveil(HorlogeSysteme):
+    """
+    Horloge réelle qui attend des échéances absolues de CLOCK_MONOTONIC.
+
+    S'utilise comme gestionnaire de contexte : l'entrée du bloc crée la
+    minuterie et règle la marge, la sortie ferme l'une et rétablit l'autre.
+
+    Args:
+        marge (int): La marge des minuteries en nanosecondes (inchangée si
+                     None).
+        minuterie (bool): False pour attendre avec select() même si
+                          os.timerfd_create est disponible.
+
+    Attributs:
+        minuterie (MinuterieAbsolue): La minuterie des échéances, None sans
+                                      timerfd (select() jusqu'à l'échéance).
+        marge_precedente (int): La marge remplacée, None si elle n'a pas été
+                                réglée.
+    """
+
+    def __init__(self, marge=None, minuterie=True):
+        self.marge = marge
+        self.avec_minuterie = minuterie
+        self.minuterie = None
+        self.marge_precedente = None
+
+    def __enter__(self):
+        self.ouvrir()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    def ouvrir(self):
+        """Crée la minuterie et règle la marge, dans la mesure du possible."""
+        if self.marge is not None and self.marge_precedente is None:
+            try:
+                self.marge_precedente = regler_marge_timer(self.marge)
+            except OSError:
+                pass
+        if self.avec_minuterie and self.minuterie is None and hasattr(os, "timerfd_create"):
+            self.minuterie = MinuterieAbsolue()
+
+    def fermer(self):
+        """Ferme la minuterie et rétablit la marge précédente."""
+        if self.minuterie is not None:
+            self.minuterie.close()
+            self.minuterie = None
+        if self.marge_precedente is not None:
+            regler_marge_timer(self.marge_precedente)
+            self.marge_precedente = None
+
+    def description(self):
+        """
+        Décrit le mode d'attente, pour la configuration affichée.
+
+        Returns:
+            str: La méthode d'attente et la marge des minuteries.
+        """
+        attente = "minuterie timerfd" if self.minuterie is not None else "select()"
+        if self.marge_precedente is None:
+            return f"échéances absolues ({attente}), marge inchangée"
+        return f"échéances absolues ({attente}), marge de {self.marge} ns"
+
+    def dormir(self, secondes):
+        self.dormir_jusqua(time.monotonic() + secondes)
+
+    def dormir_jusqua(self, echeance):
+        if self.minuterie is not None:
+            if echeance > time.monotonic():
+                self.minuterie.armer(echeance)
+                self.minuterie.attendre()
+            return
+        import select
+        attente = echeance - time.monotonic()
+        while attente > 0:
+            select.select((), (), (), attente)
+            attente = echeance - time.monotonic()
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+Démon Pymodoro : serveur des commandes du client léger.
+=======================================================
+
+`pymodoro daemon` lance un processus persistant qui héberge toutes les
+minuteries dans un OrdonnanceurMinuteries (pomodoro_demon) et sert les
+commandes transmises par `pymodoroc` (pomodoro_client) sur une socket Unix.
+Le démon a déjà payé le démarrage de l'interpréteur, les imports et la
+construction des parseurs : une commande ne coûte plus qu'un aller-retour
+sur la socket.
+
+Commandes servies:
+    start [-w MIN] [-b MIN] [-l MIN] [-c N]
+                     Démarre une minuterie en mode automatique
+    status [--json]  Liste les minuteries en cours
+    stop [ID...]     Arrête des minuteries (toutes si aucun identifiant)
+    shutdown         Arrête le démon
+
+Les minuteries suivent les règles de `pymodoro --auto`. À chaque fin de
+session, le son de notification est déposé dans la file de notifications
+du démon (sauf avec `pymodoro daemon -s`).
+
+Exemple:
+    $ pymodoro daemon &
+    $ pymodoroc start -w 50
+    🍅 Minuterie 1 démarrée : 1 cycle(s) de 50 minutes
+"""
+
+import contextlib
+import io
+import math
+import os
+import sys
+import time
+
+import pomodoro
+from pomodoro import apparence_session, formater_temps
+from pomodoro_client import chemin_socket_demon
+from pomodoro_controle import ecouter
+from pomodoro_demon import OrdonnanceurMinuteries
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Taille maximale d'une requête (en octets)
+TAILLE_MAX_REQUETE = 65536
+
+# Une connexion restée sans échange pendant ce délai est fermée (en secondes)
+DELAI_REQUETE = 2.0
+
+
+def creer_parseur_demarrage():
+    """
+    Crée le parseur de la commande `start` du démon.
+
+    Returns:
+        argparse.ArgumentParser: Le parseur, avec les options de durée de
+        `pymodoro` (-w, -b, -l, -c).
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="pymodoro start",
+                                     description="Démarre une minuterie dans le démon.")
+    parser.add_argument('-w', '--work', type=float, default=pomodoro.DUREE_TRAVAIL_DEFAUT,
+                        metavar='MINUTES', help='Durée du travail en minutes')
+    parser.add_argument('-b', '--break', dest='pause', type=float,
+                        default=pomodoro.DUREE_PAUSE_DEFAUT, metavar='MINUTES',
+                        help='Durée de la pause courte en minutes')
+    parser.add_argument('-l', '--long-break', dest='pause_longue', type=float,
+                        default=pomodoro.DUREE_PAUSE_LONGUE_DEFAUT, metavar='MINUTES',
+                        help='Durée de la pause longue en minutes')
+    parser.add_argument('-c', '--cycles', type=int, default=1, metavar='N',
+                        help='Nombre de cycles Pomodoro')
+    return parser
+
+
+# =============================================================================
+# SERVEUR
+# =============================================================================
+
+class ServeurDemon:
+    """
+    Héberge les minuteries et répond aux commandes du client léger.
+
+    Les échéances sont traitées par le thread de l'OrdonnanceurMinuteries ;
+    le thread principal sert la socket dans un select() : les connexions
+    sont lues et écrites sans bloquer, si bien qu'un client lent ne retarde
+    pas les autres. Chaque commande est immédiate.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc arrête les
+    minuteries et supprime la socket.
+
+    Args:
+        chemin (str): Le chemin de la socket (chemin_socket_demon() si None).
+        a_la_transition (callable): Appelé avec (minuterie, type_precedent)
+                                    à chaque fin de session.
+        horloge (Horloge): L'horloge des minuteries (celle du contexte si None).
+
+    Attributs:
+        ordonnanceur (OrdonnanceurMinuteries): Les minuteries hébergées.
+        requetes (int): Le nombre de commandes servies.
+    """
+
+    def __init__(self, chemin=None, a_la_transition=None, horloge=None):
+        self.chemin = chemin or chemin_socket_demon()
+        self.ordonnanceur = OrdonnanceurMinuteries(horloge=horloge,
+                                                   a_la_transition=a_la_transition)
+        self.parseur_demarrage = creer_parseur_demarrage()
+        self.requetes = 0
+        self.ecoute = None
+        self.selecteur = None
+        self._en_marche = False
+        self._reponses = {}
+        self._echeances = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    def ouvrir(self):
+        """
+        Ouvre la socket et lance le traitement des échéances.
+
+        Raises:
+            OSError: Si un autre démon écoute déjà sur la socket.
+        """
+        self.ecoute = ecouter(self.chemin)
+        self.ordonnanceur.demarrer()
+        self._en_marche = True
+
+    def fermer(self):
+        """Arrête les minuteries, ferme les connexions et supprime la socket."""
+        self.ordonnanceur.arreter()
+        for client in list(self._echeances):
+            self._deconnecter(client)
+        if self.selecteur is not None:
+            self.selecteur.close()
+            self.selecteur = None
+        if self.ecoute is not None:
+            self.ecoute.close()
+            self.ecoute = None
+            try:
+                os.unlink(self.chemin)
+            except OSError:
+                pass
+
+    # -------------------------------------------------------------------------
+    # Boucle
+    # -------------------------------------------------------------------------
+
+    def servir(self):
+        """Sert les connexions jusqu'à la commande shutdown."""
+        import selectors
+        if self.selecteur is None:
+            self.selecteur = selectors.DefaultSelector()
+            self.ecoute.setblocking(False)
+            self.selecteur.register(self.ecoute, selectors.EVENT_READ)
+        while self._en_marche or self._reponses:
+            self.traiter(None)
+
+    def traiter(self, delai):
+        """
+        Accepte les connexions, lit les requêtes, écrit les réponses et
+        ferme les connexions inactives.
+
+        Args:
+            delai (float): L'attente maximale en secondes (None : jusqu'au
+                           prochain événement). L'attente s'arrête au plus
+                           tard à l'expiration de la connexion la plus ancienne.
+        """
+        import selectors
+        if self._echeances:
+            limite = max(min(self._echeances.values()) - time.monotonic(), 0)
+            delai = limite if delai is None else min(delai, limite)
+        for cle, evenements in self.selecteur.select(delai):
+            if cle.fileobj is self.ecoute:
+                self._accepter()
+            elif evenements & selectors.EVENT_WRITE:
+                self._ecrire(cle.fileobj)
+            else:
+                self._lire(cle.fileobj, cle.data)
+        maintenant = time.monotonic()
+        for client, echeance in list(self._echeances.items()):
+            if echeance <= maintenant:
+                self._deconnecter(client)
+
+    def _accepter(self):
+        """Accepte une connexion ; une erreur (EMFILE, client parti) est ignorée."""
+        import selectors
+        try:
+            client, _ = self.ecoute.accept()
+        except OSError:
+            return
+        client.setblocking(False)
+        self.selecteur.register(client, selectors.EVENT_READ, bytearray())
+        self._echeances[client] = time.monotonic() + DELAI_REQUETE
+
+    def _lire(self, client, tampon):
+        """Lit un client ; une requête complète est exécutée et sa réponse préparée."""
+        import selectors
+        try:
+            morceau = client.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            morceau = b""
+        if not morceau:
+            self._deconnecter(client)
+            return
+        self._echeances[client] = time.monotonic() + DELAI_REQUETE
+        tampon += morceau
+        if b"\n" not in tampon:
+            if len(tampon) > TAILLE_MAX_REQUETE:
+                self._deconnecter(client)
+            return
+        requete = bytes(tampon.partition(b"\n")[0])
+        arguments = [argument.decode("utf-8", "surrogateescape")
+                     for argument in requete.split(b"\0")] if requete else []
+        code, texte = self.executer(arguments)
+        self._reponses[client] = memoryview(b"%d\n" % code + texte.encode("utf-8", "replace"))
+        self.selecteur.modify(client, selectors.EVENT_WRITE)
+
+    def _ecrire(self, client):
+        """Envoie la suite d'une réponse ; la connexion est fermée une fois tout envoyé."""
+        reponse = self._reponses[client]
+        try:
+            envoye = client.send(reponse)
+        except BlockingIOError:
+            return
+        except OSError:
+            self._deconnecter(client)
+            return
+        if envoye < len(reponse):
+            self._reponses[client] = reponse[envoye:]
+            self._echeances[client] = time.monotonic() + DELAI_REQUETE
+        else:
+            self._deconnecter(client)
+
+    def _deconnecter(self, client):
+        """Ferme une connexion et oublie sa requête et sa réponse."""
+        self._reponses.pop(client, None)
+        self._echeances.pop(client, None)
+        if self.selecteur is not None:
+            self.selecteur.unregister(client)
+        client.close()
+
+    # -------------------------------------------------------------------------
+    # Commandes
+    # -------------------------------------------------------------------------
+
+    def executer(self, arguments):
+        """
+        Exécute une commande et rend sa sortie.
+
+        Args:
+            arguments (list): La commande et ses arguments.
+
+        Returns:
+            tuple: (code de sortie, texte rendu).
+        """
+        self.requetes += 1
+        commande = arguments[0] if arguments else ""
+        methode = getattr(self, f"_commande_{commande}", None)
+        if methode is None:
+            return 2, f"Commande inconnue : {commande!r} (start, status, stop, shutdown)\n"
+
+        # Les messages d'argparse (aide, erreurs) font partie de la réponse
+        rendu = io.StringIO()
+        with contextlib.redirect_stdout(rendu), contextlib.redirect_stderr(rendu):
+            try:
+                code = methode(arguments[1:])
+            except SystemExit as sortie:
+                code = sortie.code if isinstance(sortie.code, int) else 1
+        return code, rendu.getvalue()
+
+    def _commande_start(self, arguments):
+        args = self.parseur_demarrage.parse_args(arguments)
+        if min(args.work, args.pause, args.pause_longue) <= 0 or args.cycles <= 0:
+            self.parseur_demarrage.error("les durées et le nombre de cycles doivent être "
+                                         "strictement positifs")
+        identifiant = self.ordonnanceur.ajouter(args.work, args.pause, args.pause_longue,
+                                                args.cycles)
+        print(f"🍅 Minuterie {identifiant} démarrée : {args.cycles} cycle(s) "
+              f"de {args.work:g} minutes")
+        return 0
+
+    def _commande_status(self, arguments):
+        inconnus = [argument for argument in arguments if argument != "--json"]
+        if inconnus:
+            print(f"usage: pymodoro status [--json] (argument inconnu : {inconnus[0]})")
+            return 2
+        minuteries = self.ordonnanceur.lister()
+        if "--json" in arguments:
+            import json
+            objet = {"running": bool(minuteries), "timers": [
+                {"id": identifiant, "session": type_session, "remaining": round(restant, 3),
+                 "cycle": cycle, "total": total_cycles}
+                for identifiant, type_session, cycle, total_cycles, restant in minuteries]}
+            print(json.dumps(objet, separators=(",", ":"), ensure_ascii=False))
+            return 0 if minuteries else 1
+        if not minuteries:
+            print("Aucune minuterie en cours")
+            return 1
+        for identifiant, type_session, cycle, total_cycles, restant in minuteries:
+            emoji = apparence_session(type_session)[0]
+            print(f"{emoji} #{identifiant} {type_session} "
+                  f"{formater_temps(math.ceil(restant))} (cycle {cycle}/{total_cycles})")
+        return 0
+
+    def _commande_stop(self, arguments):
+        if arguments:
+            try:
+                identifiants = [int(argument) for argument in arguments]
+            except ValueError:
+                print("usage: pymodoro stop [ID...]")
+                return 2
+        else:
+            identifiants = [minuterie[0] for minuterie in self.ordonnanceur.lister()]
+        arretees = [i for i in identifiants if self.ordonnanceur.annuler(i)]
+        print(f"⏹️ {len(arretees)} minuterie(s) arrêtée(s)")
+        return 0 if len(arretees) == len(identifiants) else 1
+
+    def _commande_shutdown(self, arguments):
+        self._en_marche = False
+        print("👋 Démon arrêté")
+        return 0
+
+
+# =============================================================================
+# POINT D'ENTRÉE
+# =============================================================================
+
+def main_demon(arguments):
+    """
+    Point d'entrée de `pymodoro daemon [-s] [--socket CHEMIN]`.
+
+    Args:
+        arguments (list): Les arguments qui suivent "daemon".
+
+    Returns:
+        int: Le code de sortie.
+    """
+    import argparse
+    import signal
+    from pomodoro_notifications import FileNotifications
+    from pomodoro_son import LecteurAudio
+
+    parser = argparse.ArgumentParser(prog="pymodoro daemon",
+                                     description="Héberge les minuteries de pymodoroc.")
+    parser.add_argument('-s', '--silent', action='store_true',
+                        help='Désactive les notifications sonores')
+    parser.add_argument('--socket', dest='chemin', metavar='CHEMIN',
+                        help='Socket du démon (défaut: $XDG_RUNTIME_DIR/pymodoro.daemon.sock)')
+    args = parser.parse_args(arguments)
+
+    # SIGTERM (systemd, kill) arrête le démon proprement, comme Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    notifications = None if args.silent else FileNotifications(horloge=pomodoro.contexte.horloge)
+    lecteur_audio = None if args.silent else LecteurAudio()
+
+    def a_la_transition(minuterie, type_precedent):
+        if notifications is not None:
+            notifications.soumettre("son", pomodoro.emettre_son)
+
+    with lecteur_audio or contextlib.nullcontext(), \
+            pomodoro.contexte_temporaire(notifications=notifications,
+                                         lecteur_audio=lecteur_audio), \
+            notifications or contextlib.nullcontext(), \
+            ServeurDemon(args.chemin, a_la_transition) as serveur:
+        try:
+            serveur.ouvrir()
+        except OSError as erreur:
+            print(f"⚠️  Démon non lancé : {erreur}", file=sys.stderr)
+            return 1
+        print(f"🍅 Démon Pymodoro à l'écoute sur {serveur.chemin}")
+        sys.stdout.flush()
+        try:
+            serveur.servir()
+        except KeyboardInterrupt:
+            pass
+    return 0
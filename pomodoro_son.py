@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Sons de notification synthétisés de Pymodoro-CLI.
+=================================================
+
+Sous Linux, le caractère BEL (\\a) est muet dans la plupart des terminaux.
+Ce module synthétise la tonalité de notification (deux bips, comme sous
+Windows) une seule fois en PCM 16 bits, la garde en cache, et la joue via
+un lecteur audio du système (paplay ou aplay) lancé une seule fois : chaque
+alerte n'est qu'une écriture du tampon sur l'entrée standard du lecteur,
+sans nouveau processus.
+
+Le lecteur reçoit un flux PCM brut continu (S16_LE, mono) : entre deux
+alertes, il attend simplement la suite du flux.
+
+Exemple:
+    with LecteurAudio(frequence=880, duree_ms=300) as lecteur:
+        lecteur.jouer()
+"""
+
+import math
+import sys
+from array import array
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Fréquence par défaut de la tonalité (en Hz)
+FREQUENCE_SON_DEFAUT = 1000
+
+# Durée par défaut d'un bip (en millisecondes)
+DUREE_SON_DEFAUT_MS = 500
+
+# Silence entre les deux bips (en millisecondes)
+SILENCE_ENTRE_BIPS_MS = 100
+
+# Fréquence d'échantillonnage du flux PCM (en Hz)
+TAUX_ECHANTILLONNAGE = 22050
+
+# Amplitude des échantillons 16 bits (environ la moitié du maximum)
+AMPLITUDE = 16000
+
+# Durée des fondus d'entrée et de sortie d'un bip, contre les claquements (en ms)
+FONDU_MS = 5
+
+# Lecteurs essayés dans l'ordre, avec les options d'un flux PCM brut
+LECTEURS = (
+    ("paplay", "--raw", "--format=s16le", f"--rate={TAUX_ECHANTILLONNAGE}", "--channels=1"),
+    ("aplay", "-q", "-t", "raw", "-f", "S16_LE", "-r", str(TAUX_ECHANTILLONNAGE), "-c", "1"),
+)
+
+# Attente maximale de la fin de lecture à la fermeture (en secondes)
+DELAI_FERMETURE = 3.0
+
+
+# =============================================================================
+# SYNTHÈSE
+# =============================================================================
+
+_cache_tonalites = {}
+
+
+def synthetiser_bip(frequence, duree_ms):
+    """
+    Synthétise un bip sinusoïdal en PCM 16 bits petit-boutiste, mono.
+
+    Args:
+        frequence (float): La fréquence du bip en Hz.
+        duree_ms (int): La durée du bip en millisecondes.
+
+    Returns:
+        bytes: Les échantillons, à TAUX_ECHANTILLONNAGE Hz.
+    """
+    nombre = TAUX_ECHANTILLONNAGE * duree_ms // 1000
+    fondu = max(min(TAUX_ECHANTILLONNAGE * FONDU_MS // 1000, nombre // 2), 1)
+    pas = 2 * math.pi * frequence / TAUX_ECHANTILLONNAGE
+    echantillons = array('h', (
+        int(AMPLITUDE * min(1.0, i / fondu, (nombre - i) / fondu) * math.sin(pas * i))
+        for i in range(nombre)
+    ))
+    if sys.byteorder == "big":
+        echantillons.byteswap()
+    return echantillons.tobytes()
+
+
+def tonalite(frequence=FREQUENCE_SON_DEFAUT, duree_ms=DUREE_SON_DEFAUT_MS):
+    """
+    Retourne la tonalité de notification (deux bips), synthétisée une fois.
+
+    Les tonalités sont gardées en cache par (fréquence, durée) : chaque
+    alerte rejoue le même tampon.
+
+    Args:
+        frequence (float): La fréquence des bips en Hz.
+        duree_ms (int): La durée d'un bip en millisecondes.
+
+    Returns:
+        bytes: Le tampon PCM (S16_LE, mono, TAUX_ECHANTILLONNAGE Hz).
+    """
+    cle = (frequence, duree_ms)
+    tampon = _cache_tonalites.get(cle)
+    if tampon is None:
+        bip = synthetiser_bip(frequence, duree_ms)
+        silence = bytes(2 * (TAUX_ECHANTILLONNAGE * SILENCE_ENTRE_BIPS_MS // 1000))
+        tampon = _cache_tonalites[cle] = bip + silence + bip
+    return tampon
+
+
+# =============================================================================
+# LECTEUR AUDIO
+# =============================================================================
+
+def detecter_lecteur():
+    """
+    Cherche un lecteur audio capable de lire un flux PCM brut.
+
+    Returns:
+        list: La commande du premier lecteur de LECTEURS présent dans le
+        PATH, ou None.
+    """
+    import shutil
+    for commande in LECTEURS:
+        if shutil.which(commande[0]):
+            return list(commande)
+    return None
+
+
+class LecteurAudio:
+    """
+    Joue la tonalité de notification via un processus lecteur unique.
+
+    Le processus est lancé à la première alerte puis réutilisé ; s'il a
+    disparu (périphérique débranché, serveur de son relancé), il est
+    relancé une fois. L'écriture attend que le lecteur ait consommé le
+    tampon : elle a sa place dans le thread de la file de notifications.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc laisse le
+    lecteur finir la tonalité en cours, puis l'arrête.
+
+    Args:
+        frequence (float): La fréquence des bips en Hz.
+        duree_ms (int): La durée d'un bip en millisecondes.
+        commande (list): La commande du lecteur, qui lit le PCM sur son
+                         entrée standard (detecter_lecteur() si None).
+    """
+
+    def __init__(self, frequence=FREQUENCE_SON_DEFAUT, duree_ms=DUREE_SON_DEFAUT_MS,
+                 commande=None):
+        self.frequence = frequence
+        self.duree_ms = duree_ms
+        self.commande = commande
+        self.processus = None
+        self._detecte = commande is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    def _demarrer(self):
+        """Lance le lecteur ; retourne False si aucun n'est disponible."""
+        import subprocess
+        if not self._detecte:
+            self.commande = detecter_lecteur()
+            self._detecte = True
+        if self.commande is None:
+            return False
+        self.processus = subprocess.Popen(self.commande, stdin=subprocess.PIPE,
+                                          stdout=subprocess.DEVNULL,
+                                          stderr=subprocess.DEVNULL)
+        return True
+
+    def jouer(self):
+        """
+        Envoie la tonalité au lecteur.
+
+        Returns:
+            bool: True si la tonalité a été transmise, False si aucun
+            lecteur n'est disponible ou s'il n'accepte plus de données.
+        """
+        tampon = tonalite(self.frequence, self.duree_ms)
+        for _ in range(2):
+            try:
+                if self.processus is None or self.processus.poll() is not None:
+                    if not self._demarrer():
+                        return False
+                self.processus.stdin.write(tampon)
+                self.processus.stdin.flush()
+                return True
+            except OSError:
+                # Lecteur disparu entre deux alertes : une seule relance
+                self.processus = None
+        return False
+
+    def fermer(self):
+        """Ferme l'entrée du lecteur et attend la fin de la lecture (bornée)."""
+        processus, self.processus = self.processus, None
+        if processus is None:
+            return
+        import subprocess
+        try:
+            processus.stdin.close()
+        except OSError:
+            pass
+        try:
+            processus.wait(DELAI_FERMETURE)
+        except subprocess.TimeoutExpired:
+            processus.kill()
+            processus.wait()
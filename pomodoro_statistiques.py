@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Statistiques en mémoire bornée de Pymodoro-CLI.
+===============================================
+
+Les processus qui tournent longtemps (le démon, la file de notifications)
+suivent des durées au fil de l'eau : retard de chaque transition, latence
+de chaque notification. Elles sont rangées dans un tampon circulaire
+`array('d')` alloué une fois pour toutes : la mémoire reste bornée quelle
+que soit la durée de vie du processus, et les percentiles portent sur les
+dernières valeurs.
+
+Le module ne dépend d'aucun autre module de Pymodoro : le démon et la file
+de notifications l'importent sans se charger l'un l'autre.
+"""
+
+import math
+from array import array
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Nombre de valeurs conservées par défaut
+CAPACITE_STATISTIQUES_DEFAUT = 65536
+
+
+# =============================================================================
+# STATISTIQUES DE RETARD
+# =============================================================================
+
+class StatistiquesRetard:
+    """
+    Conserve les derniers retards ou latences dans un tampon circulaire.
+
+    Args:
+        capacite (int): Le nombre de valeurs conservées.
+
+    Attributs:
+        nombre (int): Le nombre total de valeurs enregistrées.
+        somme (float): La somme de toutes les valeurs enregistrées, en secondes.
+        maximum (float): La plus grande valeur enregistrée, en secondes.
+    """
+
+    def __init__(self, capacite=CAPACITE_STATISTIQUES_DEFAUT):
+        self.valeurs = array('d', bytes(8 * capacite))
+        self.capacite = capacite
+        self.nombre = 0
+        self.somme = 0.0
+        self.maximum = 0.0
+
+    def enregistrer(self, retard):
+        """Enregistre un retard, en secondes."""
+        self.valeurs[self.nombre % self.capacite] = retard
+        self.nombre += 1
+        self.somme += retard
+        if retard > self.maximum:
+            self.maximum = retard
+
+    def percentiles(self, *rangs):
+        """
+        Calcule des percentiles sur les retards conservés (rang le plus proche).
+
+        Args:
+            *rangs (float): Les percentiles voulus, entre 0 et 100.
+
+        Returns:
+            dict: {rang: retard en secondes}, vide si aucun retard.
+
+        Exemple:
+            >>> stats = StatistiquesRetard(4)
+            >>> for r in (0.1, 0.2, 0.3, 0.4): stats.enregistrer(r)
+            >>> stats.percentiles(50)
+            {50: 0.2}
+        """
+        conserves = min(self.nombre, self.capacite)
+        if conserves == 0:
+            return {}
+        tries = sorted(self.valeurs[:conserves])
+        resultat = {}
+        for rang in rangs:
+            indice = max(math.ceil(rang * conserves / 100) - 1, 0)
+            resultat[rang] = tries[min(indice, conserves - 1)]
+        return resultat
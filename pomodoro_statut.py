@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+Statut partagé d'un pymodoro en cours, par projection en mémoire.
+=================================================================
+
+Les invites de shell et les barres d'état (tmux, polybar...) affichent le
+temps restant à chaque rendu : lancer Python ou se connecter à la socket de
+pilotage à chaque fois serait trop lent. Le moteur publie donc un
+enregistrement de taille fixe dans un fichier projeté en mémoire
+($XDG_RUNTIME_DIR/pymodoro.status), que les lecteurs relisent sans verrou.
+
+L'enregistrement ne change qu'aux changements d'état (début et fin de
+session, pause, reprise, prolongation), jamais à chaque tick : il contient
+l'heure de fin de la session, et le lecteur en déduit le temps restant.
+
+Cohérence par seqlock : l'écrivain rend le numéro de séquence impair, écrit
+les champs, puis le rend pair à nouveau. Le lecteur copie l'enregistrement
+d'une seule lecture de la projection, puis vérifie que le numéro copié est
+pair et n'a pas changé ; sinon il recommence.
+
+Format de l'enregistrement (56 octets, petit-boutiste):
+    magique (4 octets, b"PYMS"), version (u16), bourrage (2 octets),
+    séquence (u32), état (u8), type de session (u8, 0 si aucun), cycle
+    (u16), nombre de cycles (u16), bourrage (2 octets), pid (u32), fin de
+    session (f64, timestamp Unix), temps restant à la publication (f64, s),
+    durée de la session (f64, s), publication (f64, timestamp Unix)
+
+Exemple:
+    $ pymodoro status
+    🍅 TRAVAIL 12:34 (cycle 2/4)
+"""
+
+import collections
+import math
+import mmap
+import os
+import struct
+
+from pomodoro_controle import chemin_execution
+from pomodoro_historique import CODES_TYPES_SESSION, TYPES_SESSION
+
+
+# =============================================================================
+# FORMAT DE L'ENREGISTREMENT
+# =============================================================================
+
+# Signature et version du format
+MAGIQUE = b"PYMS"
+VERSION_FORMAT = 1
+
+# Structure binaire de l'enregistrement
+FORMAT_STATUT = struct.Struct('<4sH2xIBBHH2xIdddd')
+
+# Taille de l'enregistrement en octets
+TAILLE_STATUT = FORMAT_STATUT.size
+
+# En-tête, écrit une fois à la création
+FORMAT_ENTETE = struct.Struct('<4sH')
+
+# Position et format du numéro de séquence dans l'enregistrement
+POSITION_SEQUENCE = 8
+FORMAT_SEQUENCE = struct.Struct('<I')
+
+# Champs qui suivent le numéro de séquence
+POSITION_CORPS = POSITION_SEQUENCE + FORMAT_SEQUENCE.size
+FORMAT_CORPS = struct.Struct('<BBHH2xIdddd')
+
+# États publiés (l'indice est le code stocké)
+ETATS = ("inactif", "en_cours", "en_pause")
+CODES_ETATS = {nom: code for code, nom in enumerate(ETATS)}
+
+# Extension du fichier dans le dossier d'exécution de l'utilisateur
+EXTENSION_STATUT = "status"
+
+# Nombre maximal de relectures lorsqu'une écriture est en cours
+TENTATIVES_LECTURE = 1000
+
+
+Statut = collections.namedtuple(
+    'Statut',
+    ['etat', 'type_session', 'cycle', 'total_cycles', 'pid', 'fin', 'restant', 'duree',
+     'publication']
+)
+Statut.__doc__ = """
+Un instantané du statut publié par un pymodoro.
+
+Attributs:
+    etat (str): "inactif" (entre deux sessions), "en_cours" ou "en_pause".
+    type_session (str): "TRAVAIL", "PAUSE", "PAUSE LONGUE", ou None.
+    cycle (int): Le numéro du cycle, 0 hors d'un cycle.
+    total_cycles (int): Le nombre de cycles du plan, 0 hors d'un plan.
+    pid (int): Le processus qui publie.
+    fin (float): Le timestamp Unix de la fin de la session en cours.
+    restant (float): Le temps restant à la publication, en secondes.
+    duree (float): La durée de la session, en secondes.
+    publication (float): Le timestamp Unix de la publication.
+"""
+
+
+def chemin_statut_defaut():
+    """
+    Retourne l'emplacement par défaut du fichier de statut.
+
+    Returns:
+        str: Le chemin du fichier (voir pomodoro_controle.chemin_execution()).
+    """
+    return chemin_execution(EXTENSION_STATUT)
+
+
+def _processus_actif(pid):
+    """Indique si un processus existe (toujours True hors POSIX)."""
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+# =============================================================================
+# PUBLICATION
+# =============================================================================
+
+class PublicationStatut:
+    """
+    Publie le statut du moteur dans le fichier de statut.
+
+    Le fichier est créé et projeté à la première publication ; chaque
+    publication n'écrit que dans la projection, sans appel système. Si un
+    autre pymodoro publie déjà dans le même fichier, la publication est
+    désactivée avec un avertissement : le seqlock n'admet qu'un écrivain.
+
+    S'utilise comme gestionnaire de contexte : la sortie du bloc supprime le
+    fichier.
+
+    Args:
+        chemin (str): Le chemin du fichier (chemin_statut_defaut() si None).
+        plan (PlanCycles): Le plan en cours, qui fournit le nombre de cycles
+                           publié (None hors d'un plan).
+    """
+
+    def __init__(self, chemin=None, plan=None):
+        self.chemin = chemin
+        self.plan = plan
+        self.projection = None
+        self.sequence = 0
+        self._desactive = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fermer()
+
+    def _ouvrir(self):
+        """Crée et projette le fichier ; False si un autre pymodoro publie."""
+        if self.chemin is None:
+            self.chemin = chemin_statut_defaut()
+        statut = lire_statut(self.chemin)
+        if statut is not None and statut.pid != os.getpid() and _processus_actif(statut.pid):
+            print(f"\n    ⚠️  Statut désactivé : le processus {statut.pid} publie "
+                  f"déjà dans {self.chemin}")
+            self._desactive = True
+            return False
+
+        drapeaux = os.O_RDWR | os.O_CREAT | getattr(os, 'O_NOFOLLOW', 0)
+        descripteur = os.open(self.chemin, drapeaux, 0o600)
+        try:
+            os.ftruncate(descripteur, TAILLE_STATUT)
+            self.projection = mmap.mmap(descripteur, TAILLE_STATUT)
+        finally:
+            os.close(descripteur)
+
+        # Les lecteurs d'un fichier réutilisé gardent une séquence croissante
+        if self.projection[:len(MAGIQUE)] == MAGIQUE:
+            sequence, = FORMAT_SEQUENCE.unpack_from(self.projection, POSITION_SEQUENCE)
+            self.sequence = sequence + (sequence & 1)
+        FORMAT_ENTETE.pack_into(self.projection, 0, MAGIQUE, VERSION_FORMAT)
+        return True
+
+    def publier(self, etat, type_session=None, cycle=0, restant=0.0, duree=0.0,
+                heure_murale=0.0):
+        """
+        Publie un nouvel état.
+
+        Args:
+            etat (str): "inactif", "en_cours" ou "en_pause".
+            type_session (str): Le type de la session (None si inactif).
+            cycle (int): Le numéro du cycle, 0 hors d'un cycle.
+            restant (float): Le temps restant, en secondes.
+            duree (float): La durée de la session, en secondes.
+            heure_murale (float): L'heure murale de la publication.
+
+        Raises:
+            OSError: Si le fichier ne peut pas être créé.
+        """
+        if self.projection is None and (self._desactive or not self._ouvrir()):
+            return
+        code_type = CODES_TYPES_SESSION[type_session] + 1 if type_session else 0
+        total_cycles = self.plan.total_cycles if self.plan is not None else 0
+        projection = self.projection
+
+        # Séquence impaire pendant l'écriture : les lecteurs recommencent
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        FORMAT_SEQUENCE.pack_into(projection, POSITION_SEQUENCE, self.sequence)
+        FORMAT_CORPS.pack_into(projection, POSITION_CORPS, CODES_ETATS[etat], code_type,
+                               cycle, total_cycles, os.getpid(),
+                               heure_murale + restant, restant, duree, heure_murale)
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        FORMAT_SEQUENCE.pack_into(projection, POSITION_SEQUENCE, self.sequence)
+
+    def fermer(self):
+        """Ferme la projection et supprime le fichier."""
+        projection, self.projection = self.projection, None
+        if projection is None:
+            return
+        projection.close()
+        try:
+            os.unlink(self.chemin)
+        except OSError:
+            pass
+
+
+# =============================================================================
+# LECTURE
+# =============================================================================
+
+def decoder_statut(donnees):
+    """
+    Décode un enregistrement de statut.
+
+    Args:
+        donnees (bytes): Les TAILLE_STATUT octets de l'enregistrement.
+
+    Returns:
+        Statut: Le statut, ou None si l'enregistrement n'est pas reconnu.
+    """
+    (magique, version, _sequence, etat, code_type, cycle, total_cycles, pid,
+     fin, restant, duree, publication) = FORMAT_STATUT.unpack(donnees)
+    if magique != MAGIQUE or version != VERSION_FORMAT or etat >= len(ETATS):
+        return None
+    type_session = TYPES_SESSION[code_type - 1] if 0 < code_type <= len(TYPES_SESSION) else None
+    return Statut(ETATS[etat], type_session, cycle, total_cycles, pid, fin, restant, duree,
+                  publication)
+
+
+def lire_statut(chemin=None):
+    """
+    Lit un instantané cohérent du statut publié, sans verrou.
+
+    Args:
+        chemin (str): Le chemin du fichier (chemin_statut_defaut() si None).
+
+    Returns:
+        Statut: Le statut, ou None si aucun pymodoro ne publie (fichier
+        absent, incomplet, ou écriture jamais terminée).
+    """
+    try:
+        with open(chemin or chemin_statut_defaut(), 'rb') as fichier:
+            projection = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    with projection:
+        if len(projection) < TAILLE_STATUT:
+            return None
+        for _ in range(TENTATIVES_LECTURE):
+            # Une seule copie de l'enregistrement, puis contrôle de la séquence
+            donnees = projection[:TAILLE_STATUT]
+            sequence, = FORMAT_SEQUENCE.unpack_from(donnees, POSITION_SEQUENCE)
+            if sequence & 1:
+                continue
+            if FORMAT_SEQUENCE.unpack_from(projection, POSITION_SEQUENCE)[0] == sequence:
+                return decoder_statut(donnees)
+    return None
+
+
+def temps_restant(statut, heure_murale):
+    """
+    Calcule le temps restant d'un statut à un instant donné.
+
+    Args:
+        statut (Statut): Le statut lu.
+        heure_murale (float): L'heure murale courante.
+
+    Returns:
+        float: Le temps restant, en secondes (0 hors session).
+    """
+    if statut.etat == "en_cours":
+        return max(statut.fin - heure_murale, 0.0)
+    if statut.etat == "en_pause":
+        return statut.restant
+    return 0.0
+
+
+# =============================================================================
+# COMMANDE `pymodoro status`
+# =============================================================================
+
+def formater_statut(statut, heure_murale):
+    """
+    Formate un statut sur une ligne, pour une invite ou une barre d'état.
+
+    Args:
+        statut (Statut): Le statut lu.
+        heure_murale (float): L'heure murale courante.
+
+    Returns:
+        str: Par exemple "🍅 TRAVAIL 12:34 (cycle 2/4)".
+    """
+    from pomodoro import apparence_session, formater_temps
+    if statut.total_cycles:
+        suffixe = f" (cycle {statut.cycle}/{statut.total_cycles})"
+    else:
+        suffixe = ""
+    if statut.etat == "inactif":
+        return f"⏹️ En attente{suffixe}"
+    emoji = apparence_session(statut.type_session)[0] if statut.etat == "en_cours" else "⏸️"
+    restant = formater_temps(math.ceil(temps_restant(statut, heure_murale)))
+    return f"{emoji} {statut.type_session} {restant}{suffixe}"
+
+
+def commande_status(arguments, chemin=None):
+    """
+    Point d'entrée de `pymodoro status [--json]` lorsqu'aucun démon n'est
+    joignable (voir pomodoro_client.commande_demon()).
+
+    Args:
+        arguments (list): Les arguments qui suivent "status".
+        chemin (str): Le chemin du fichier (chemin_statut_defaut() si None).
+
+    Returns:
+        int: Le code de sortie : 0 si un pymodoro est en cours, 1 sinon,
+        2 pour un argument inconnu.
+    """
+    import time
+    inconnus = [argument for argument in arguments if argument != "--json"]
+    if inconnus:
+        print(f"usage: pymodoro status [--json] (argument inconnu : {inconnus[0]})")
+        return 2
+
+    statut = lire_statut(chemin)
+    if statut is not None and not _processus_actif(statut.pid):
+        statut = None
+    heure_murale = time.time()
+
+    if "--json" in arguments:
+        import json
+        if statut is None:
+            objet = {"running": False}
+        else:
+            objet = {"running": True, "state": statut.etat, "session": statut.type_session,
+                     "remaining": round(temps_restant(statut, heure_murale), 3),
+                     "duration": statut.duree, "cycle": statut.cycle,
+                     "total": statut.total_cycles, "pid": statut.pid}
+        print(json.dumps(objet, separators=(",", ":"), ensure_ascii=False))
+    elif statut is None:
+        print("Aucun pymodoro en cours")
+    else:
+        print(formater_statut(statut, heure_murale))
+    return 0 if statut is not None else 1
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Arrêt et reprise du processus (Ctrl+Z) pour Pymodoro-CLI.
+=========================================================
+
+Ctrl+Z envoie SIGTSTP : le shell arrête pymodoro jusqu'à `fg` (SIGCONT).
+Le temps monotone continue d'avancer pendant l'arrêt ; sans précaution,
+la session reprendrait en sautant tout le temps écoulé. Ce module traite
+SIGTSTP explicitement, selon la politique choisie par `--on-suspend`:
+
+    pause   La session est mise en pause avant l'arrêt et reprise au
+            retour : l'arrêt ne compte pas (par défaut)
+    count   L'arrêt est compté comme du temps écoulé
+
+Dans les deux cas, le terminal est rendu au shell avant l'arrêt (mode
+ligne, écho) puis repassé en mode caractère au retour, et le temps restant
+est réaffiché. La mise en veille du système, elle, est constatée par le
+moteur (OrdonnanceurTicks.constater_veille), selon la même politique.
+
+Un arrêt par SIGSTOP ne peut pas être intercepté : au retour (SIGCONT),
+le terminal est repris et l'arrêt est compté comme du temps écoulé.
+
+Les gestionnaires de signaux ne font que noter le signal et réveiller la
+boucle des ticks (pomodoro_controle) : la pause, le point de reprise, le
+statut et l'arrêt lui-même sont traités par la boucle, jamais au milieu
+d'une publication du statut. Seule exception, l'invite input() entre deux
+sessions (sans clavier), où le processus ne fait rien d'autre.
+"""
+
+import math
+import os
+import sys
+
+
+# =============================================================================
+# GESTION DE L'ARRÊT
+# =============================================================================
+
+class GestionSuspension:
+    """
+    Met la session suivie en pause autour d'un arrêt du processus.
+
+    compte_a_rebours() désigne la session en cours avec suivre() et
+    oublier(), comme pour la socket de pilotage.
+
+    S'utilise comme gestionnaire de contexte : l'entrée du bloc installe les
+    gestionnaires de SIGTSTP et SIGCONT et branche le réveil sur la boucle,
+    la sortie rétablit les précédents.
+
+    Args:
+        en_pause (bool): True pour mettre la session en pause pendant
+                         l'arrêt, False pour compter l'arrêt comme écoulé.
+        clavier (Clavier): Le clavier dont le terminal est rendu au shell
+                           pendant l'arrêt (aucun si None).
+        boucle (ServeurControle): La boucle réveillée par les signaux, qui
+                                  traite l'arrêt ; sans boucle, l'appelant
+                                  appelle traiter_en_attente().
+
+    Attributs:
+        arrets (int): Le nombre d'arrêts et de reprises traités.
+        au_repos (bool): True pendant une attente où le processus ne fait
+                         rien d'autre (input()) : l'arrêt y est traité dès
+                         le signal.
+    """
+
+    def __init__(self, en_pause=True, clavier=None, boucle=None):
+        self.en_pause = en_pause
+        self.clavier = clavier
+        self.boucle = boucle
+        self.arrets = 0
+        self.au_repos = False
+        self._session = None
+        self._signaux = {}
+        self._en_arret = False
+        self._arret_demande = False
+        self._continuation_demandee = False
+        self._reveil = None
+
+    def __enter__(self):
+        self.installer()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.retirer()
+
+    def installer(self):
+        """Installe les gestionnaires de SIGTSTP et SIGCONT (thread principal, POSIX)."""
+        import signal
+        if not hasattr(signal, "SIGTSTP"):
+            return
+        try:
+            self._signaux[signal.SIGTSTP] = signal.signal(signal.SIGTSTP, self._sur_arret)
+            self._signaux[signal.SIGCONT] = signal.signal(signal.SIGCONT,
+                                                          self._sur_continuation)
+        except ValueError:
+            # Hors du thread principal : les signaux ne peuvent pas y être traités
+            self.retirer()
+            return
+        if self.boucle is not None:
+            # Paire de sockets dont la lecture réveille le select() de la boucle
+            import socket
+            self._reveil = socket.socketpair()
+            for extremite in self._reveil:
+                extremite.setblocking(False)
+            self.boucle.ajouter_source(self._reveil[0], self._sur_reveil)
+
+    def retirer(self):
+        """Rétablit les gestionnaires précédents et débranche le réveil."""
+        import signal
+        for numero, precedent in self._signaux.items():
+            signal.signal(numero, precedent)
+        self._signaux.clear()
+        reveil, self._reveil = self._reveil, None
+        if reveil is not None:
+            self.boucle.retirer_source(reveil[0])
+            for extremite in reveil:
+                extremite.close()
+
+    # -------------------------------------------------------------------------
+    # Session suivie
+    # -------------------------------------------------------------------------
+
+    def suivre(self, ordonnanceur, sortie, horloge, au_changement=None):
+        """
+        Désigne la session concernée par un arrêt.
+
+        Args:
+            ordonnanceur (OrdonnanceurTicks): L'ordonnanceur de la session.
+            sortie: Le mode de sortie, qui réaffiche le temps restant.
+            horloge (Horloge): L'horloge de la session.
+            au_changement (callable): Appelé avec le temps restant et l'état
+                                      de pause (point de reprise, statut).
+        """
+        self._session = (ordonnanceur, sortie, horloge, au_changement)
+
+    def oublier(self):
+        """Signale qu'aucune session n'est en cours."""
+        self._session = None
+
+    # -------------------------------------------------------------------------
+    # Arrêt et reprise
+    # -------------------------------------------------------------------------
+
+    def _sur_arret(self, numero, trame):
+        self._arret_demande = True
+        self._signaler()
+
+    def _sur_continuation(self, numero, trame):
+        # Reprise après SIGSTOP ; après SIGTSTP, arreter() s'en charge
+        if self._en_arret:
+            self._en_arret = False
+            return
+        self._continuation_demandee = True
+        self._signaler()
+
+    def _signaler(self):
+        """Fait traiter un signal noté : tout de suite au repos, sinon par la boucle."""
+        if self.au_repos:
+            self.traiter_en_attente()
+        elif self._reveil is not None:
+            try:
+                self._reveil[1].send(b"\0")
+            except OSError:
+                # Tampon plein : la boucle a déjà un réveil en attente
+                pass
+
+    def _sur_reveil(self, fichier):
+        """Source de la boucle : vide la socket de réveil et traite les signaux notés."""
+        try:
+            fichier.recv(64)
+        except OSError:
+            pass
+        self.traiter_en_attente()
+
+    def traiter_en_attente(self):
+        """
+        Traite un arrêt ou une continuation noté par les gestionnaires de signaux.
+
+        Appelée par la boucle des ticks, hors de tout gestionnaire de signal.
+        """
+        if self._arret_demande:
+            self._arret_demande = False
+            self._continuation_demandee = False
+            self.arreter()
+        elif self._continuation_demandee:
+            self._continuation_demandee = False
+            self.reprendre(False)
+
+    def arreter(self):
+        """
+        Arrête le processus comme le ferait SIGTSTP, puis le reprend au retour.
+
+        La fonction rend la main une fois le processus continué (fg).
+        """
+        import signal
+        en_pause = False
+        if self._session is not None and self.en_pause:
+            ordonnanceur, _, horloge, au_changement = self._session
+            maintenant = horloge.maintenant()
+            en_pause = ordonnanceur.suspendre(maintenant)
+            if en_pause and au_changement is not None:
+                au_changement(math.ceil(ordonnanceur.restant(maintenant)), True)
+        if self.clavier is not None:
+            self.clavier.liberer_terminal()
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+        # Arrêt effectif : action par défaut de SIGTSTP, le temps de l'envoyer
+        self._en_arret = True
+        precedent = signal.signal(signal.SIGTSTP, signal.SIG_DFL)
+        try:
+            os.kill(os.getpid(), signal.SIGTSTP)
+        finally:
+            signal.signal(signal.SIGTSTP, precedent)
+        self.reprendre(en_pause)
+
+    def reprendre(self, relancer):
+        """
+        Reprend le terminal et la session au retour d'un arrêt.
+
+        Args:
+            relancer (bool): True si la session a été mise en pause par
+                             arreter() et doit repartir.
+        """
+        self.arrets += 1
+        if self.clavier is not None:
+            self.clavier.reprendre_terminal()
+        if self._session is None:
+            return
+        ordonnanceur, sortie, horloge, au_changement = self._session
+        maintenant = horloge.maintenant()
+        if relancer:
+            ordonnanceur.reprendre(maintenant)
+        if ordonnanceur.pause_depuis is not None:
+            return
+        restant = math.ceil(ordonnanceur.restant(maintenant))
+        sortie.reprise_session(restant)
+        if relancer and au_changement is not None:
+            au_changement(restant, False)
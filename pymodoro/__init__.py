@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+Outils de Pymodoro-CLI destinés aux projets tiers.
+==================================================
+
+Le moteur reste le module `pomodoro` ; ce package regroupe les outils
+importés par les outils extérieurs, comme `pymodoro.testing`.
+"""
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Outils de simulation et fixtures pytest pour Pymodoro-CLI.
+==========================================================
+
+Ce module permet d'exécuter le moteur de minuterie en temps virtuel :
+les attentes deviennent instantanées, si bien qu'un plan de 4 cycles en
+mode automatique se déroule en quelques millisecondes.
+
+C'est aussi un plugin pytest, à activer explicitement : il n'est chargé
+que par les projets qui le demandent dans leur conftest.py, et fournit
+alors les fixtures `horloge_virtuelle` et `simulation_pomodoro`.
+
+Exemple:
+    # conftest.py
+    pytest_plugins = ["pymodoro.testing"]
+
+    # test_plan.py
+    def test_plan_complet(simulation_pomodoro):
+        duree = simulation_pomodoro.executer_plan(cycles=4)
+        assert duree == 4 * 25 * 60 + 3 * 5 * 60 + 3 * 2
+"""
+
+import io
+import contextlib
+from unittest.mock import patch
+
+import pytest
+
+import pomodoro
+
+
+# =============================================================================
+# SIMULATION EN TEMPS VIRTUEL
+# =============================================================================
+
+@contextlib.contextmanager
+def temps_virtuel(horloge=None, resolution=None):
+    """
+    Installe une horloge virtuelle dans le contexte d'exécution du moteur.
+
+    Args:
+        horloge (HorlogeVirtuelle): L'horloge à installer (une neuve si None).
+        resolution (float): L'intervalle entre deux trames, en secondes.
+                            Une résolution grossière réduit le nombre de
+                            trames rendues et accélère les simulations.
+
+    Yields:
+        HorlogeVirtuelle: L'horloge installée.
+    """
+    horloge = horloge or pomodoro.HorlogeVirtuelle()
+    attributs = {'horloge': horloge}
+    if resolution is not None:
+        attributs['periode_tick'] = resolution
+    with pomodoro.contexte_temporaire(**attributs):
+        yield horloge
+
+
+class Simulation:
+    """
+    Exécute des plans Pomodoro complets en temps virtuel.
+
+    La sortie terminal est absorbée et les notifications sonores sont
+    désactivées : seul le déroulement temporel est simulé.
+
+    Args:
+        horloge (HorlogeVirtuelle): L'horloge virtuelle pilotant la simulation.
+    """
+
+    def __init__(self, horloge):
+        self.horloge = horloge
+        self.sortie = io.StringIO()
+
+    def executer_plan(self, cycles=1, travail=pomodoro.DUREE_TRAVAIL_DEFAUT,
+                      pause=pomodoro.DUREE_PAUSE_DEFAUT,
+                      pause_longue=pomodoro.DUREE_PAUSE_LONGUE_DEFAUT):
+        """
+        Déroule un plan en mode automatique, comme `pymodoro --auto`.
+
+        Args:
+            cycles (int): Nombre de cycles Pomodoro.
+            travail (int): Durée du travail en minutes.
+            pause (int): Durée de la pause courte en minutes.
+            pause_longue (int): Durée de la pause longue en minutes.
+
+        Returns:
+            float: La durée virtuelle écoulée, en secondes.
+        """
+        debut = self.horloge.maintenant()
+        self.sortie.seek(0)
+        self.sortie.truncate()
+        plan = pomodoro.PlanCycles(travail, pause, pause_longue, cycles)
+        with contextlib.redirect_stdout(self.sortie):
+            for cycle in range(1, cycles + 1):
+                pomodoro.executer_cycle_pomodoro(
+                    duree_travail=travail,
+                    duree_pause=pause,
+                    duree_pause_longue=pause_longue,
+                    numero_cycle=cycle,
+                    total_cycles=cycles,
+                    mode_auto=True,
+                    mode_silencieux=True,
+                    plan=plan
+                )
+        return self.horloge.maintenant() - debut
+
+    def executer_session(self, duree_minutes, type_session="TRAVAIL"):
+        """
+        Déroule une session unique en silence.
+
+        Args:
+            duree_minutes (int): La durée de la session en minutes.
+            type_session (str): Le type de session.
+
+        Returns:
+            OrdonnanceurTicks: L'ordonnanceur de la session.
+        """
+        with contextlib.redirect_stdout(self.sortie):
+            return pomodoro.compte_a_rebours(duree_minutes, type_session, True)
+
+
+# =============================================================================
+# FIXTURES PYTEST
+# =============================================================================
+
+@pytest.fixture
+def horloge_virtuelle():
+    """
+    Fixture installant une horloge virtuelle dans le moteur.
+
+    Yields:
+        HorlogeVirtuelle: L'horloge active pendant le test.
+    """
+    with temps_virtuel() as horloge:
+        yield horloge
+
+
+@pytest.fixture
+def simulation_pomodoro():
+    """
+    Fixture fournissant une simulation rapide de plans complets.
+
+    La résolution est d'une trame par minute et les sons sont coupés, ce
+    qui permet de simuler des milliers de cycles par seconde.
+
+    Yields:
+        Simulation: Le simulateur prêt à l'emploi.
+    """
+    with temps_virtuel(resolution=60) as horloge:
+        with patch.object(pomodoro, 'emettre_son'):
+            yield Simulation(horloge)
@@ -7,14 +7,57 @@ Ce fichier contient les fixtures pytest réutilisables dans tous les tests.
 """
 
 import pytest
+import shutil
 import sys
 import os
+import tempfile
 from io import StringIO
 from unittest.mock import MagicMock, patch
 
 # Ajouter le répertoire parent au path pour importer pomodoro
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Fixtures de simulation en temps virtuel fournies par le package
+pytest_plugins = ["pymodoro.testing"]
+
+
+# =============================================================================
+# ISOLATION DES FICHIERS UTILISATEUR
+# =============================================================================
+
+@pytest.fixture(autouse=True)
+def dossier_donnees_isole(tmp_path, monkeypatch):
+    """
+    Redirige le dossier de données de l'utilisateur vers un dossier temporaire.
+
+    main() consigne les sessions dans l'historique par défaut : les tests ne
+    doivent jamais écrire dans le vrai dossier personnel.
+
+    Returns:
+        pathlib.Path: Le dossier de données utilisé pendant le test.
+    """
+    dossier = tmp_path / "donnees"
+    monkeypatch.setenv("XDG_DATA_HOME", str(dossier))
+    monkeypatch.setenv("APPDATA", str(dossier))
+    return dossier
+
+
+@pytest.fixture(autouse=True)
+def dossier_execution_isole(monkeypatch):
+    """
+    Redirige le dossier d'exécution de l'utilisateur ($XDG_RUNTIME_DIR).
+
+    main() y ouvre sa socket de pilotage. Le dossier est court : le chemin
+    d'une socket Unix est limité à une centaine d'octets.
+
+    Yields:
+        str: Le dossier d'exécution utilisé pendant le test.
+    """
+    dossier = tempfile.mkdtemp(prefix="pym-")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", dossier)
+    yield dossier
+    shutil.rmtree(dossier, ignore_errors=True)
+
 
 # =============================================================================
 # FIXTURES POUR LA CAPTURE DE SORTIE
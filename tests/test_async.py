@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le moteur asyncio de Pymodoro-CLI.
+=======================================================
+
+Ce module teste pomodoro_async:
+- compte_a_rebours_async() et l'itération asynchrone des ticks
+- executer_cycle_pomodoro_async() et les règles de cycle
+- Les étapes par tick partagées avec le moteur bloquant (profil, veille,
+  --low-power, pause)
+- La concurrence de nombreuses minuteries dans une seule boucle
+"""
+
+import pytest
+import sys
+import time
+import asyncio
+import threading
+from unittest.mock import patch, MagicMock
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import (
+    VEILLE_COMPTEE, HorlogeVirtuelle, OrdonnanceurTicks, SortieNulle, SortieTerminal,
+    contexte_temporaire,
+)
+from pomodoro_async import (
+    compte_a_rebours_async,
+    executer_cycle_pomodoro_async,
+    executer_plan_async,
+    iterer_ticks
+)
+from pomodoro_profil import ProfilTicks
+
+
+class SortieEnregistreuse(SortieNulle):
+    """Sortie qui enregistre les appels reçus, à un tick par seconde."""
+
+    def __init__(self):
+        self.appels = []
+
+    def periode_ticks(self, duree_totale_secondes):
+        return 1.0
+
+    def debut_session(self, type_session, duree_minutes, emoji, couleur_debut):
+        self.appels.append(("debut", type_session, duree_minutes))
+
+    def trame(self, secondes_restantes):
+        self.appels.append(("trame", secondes_restantes))
+
+    def fin_session(self):
+        self.appels.append(("fin",))
+
+    def annulation(self):
+        self.appels.append(("annulation",))
+
+    def fin_cycle(self, numero_cycle, total_cycles):
+        self.appels.append(("cycle", numero_cycle, total_cycles))
+
+
+# =============================================================================
+# TESTS POUR compte_a_rebours_async()
+# =============================================================================
+
+class TestCompteAReboursAsync:
+    """Tests pour le compte à rebours asynchrone."""
+
+    def test_duree_respectee(self, horloge_virtuelle):
+        """La session dure exactement la durée demandée."""
+        asyncio.run(compte_a_rebours_async(25, "TRAVAIL", True))
+        assert horloge_virtuelle.maintenant() == 25 * 60
+
+    def test_sans_affichage_un_seul_reveil(self, horloge_virtuelle):
+        """Sans sortie, la session ne se réveille qu'à son échéance."""
+        ordonnanceur = asyncio.run(compte_a_rebours_async(25, "TRAVAIL", True))
+        assert ordonnanceur.nombre_ticks == 1
+        assert horloge_virtuelle.nombre_attentes == 1
+
+    def test_trames_chaque_seconde(self, horloge_virtuelle):
+        """Une sortie à 1 Hz reçoit 61 trames pour une minute."""
+        sortie = SortieEnregistreuse()
+        asyncio.run(compte_a_rebours_async(1, "PAUSE", True, sortie))
+
+        trames = [a[1] for a in sortie.appels if a[0] == "trame"]
+        assert trames == list(range(60, -1, -1))
+        assert sortie.appels[0] == ("debut", "PAUSE", 1)
+        assert sortie.appels[-1] == ("fin",)
+
+    def test_iteration_identique_au_moteur_bloquant(self):
+        """L'itération asynchrone produit les mêmes ticks que la bloquante."""
+        horloge = HorlogeVirtuelle()
+        attendus = list(OrdonnanceurTicks(30, horloge=HorlogeVirtuelle()))
+
+        async def collecter():
+            return [t async for t in iterer_ticks(OrdonnanceurTicks(30, horloge=horloge))]
+
+        assert asyncio.run(collecter()) == attendus
+
+    def test_annulation(self):
+        """Annuler la tâche prévient la sortie et propage CancelledError."""
+        sortie = SortieEnregistreuse()
+
+        async def scenario():
+            tache = asyncio.ensure_future(
+                compte_a_rebours_async(1, "TRAVAIL", True, sortie))
+            await asyncio.sleep(0.05)
+            tache.cancel()
+            await tache
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(scenario())
+        assert sortie.appels[-1] == ("annulation",)
+
+    def test_son_non_bloquant(self, horloge_virtuelle):
+        """La notification sonore part dans un thread sans être attendue."""
+        debloque = threading.Event()
+        son = MagicMock(side_effect=lambda: debloque.wait(5))
+
+        async def scenario():
+            await compte_a_rebours_async(1, "TRAVAIL", False)
+            return son.call_count
+
+        with patch('pomodoro.emettre_son', son):
+            debut = time.perf_counter()
+            boucle = asyncio.new_event_loop()
+            try:
+                boucle.run_until_complete(scenario())
+                duree = time.perf_counter() - debut
+                debloque.set()
+                boucle.run_until_complete(boucle.shutdown_default_executor())
+            finally:
+                boucle.close()
+
+        assert duree < 1
+        son.assert_called_once()
+
+    def test_son_depose_dans_la_file_du_contexte(self, horloge_virtuelle):
+        """Avec une file de notifications dans le contexte, le son y est déposé."""
+        file = MagicMock()
+        with patch('pomodoro.emettre_son') as son:
+            with contexte_temporaire(notifications=file):
+                asyncio.run(compte_a_rebours_async(1, "TRAVAIL", False))
+
+        file.soumettre.assert_called_once_with("son", son)
+        son.assert_not_called()
+
+
+# =============================================================================
+# TESTS POUR LES ÉTAPES PARTAGÉES
+# =============================================================================
+
+class TestEtapesPartagees:
+    """Tests pour les étapes par tick communes aux deux moteurs."""
+
+    def _parcourir(self, ordonnanceur, au_tick):
+        """Parcourt les ticks en appelant au_tick(tick) à chaque trame."""
+        async def parcourir():
+            ticks = []
+            async for tick in iterer_ticks(ordonnanceur):
+                ticks.append(tick)
+                await au_tick(tick)
+            return ticks
+        return asyncio.run(parcourir())
+
+    def test_economie_et_profil(self, horloge_virtuelle):
+        """--low-power et --profile s'appliquent aussi au moteur asyncio."""
+        profil = ProfilTicks(capacite=2000)
+        with contexte_temporaire(profil=profil), patch('sys.stdout', StringIO()):
+            ordonnanceur = asyncio.run(compte_a_rebours_async(25, "TRAVAIL", True,
+                                                              SortieTerminal(econome=True)))
+        assert 30 <= ordonnanceur.reveils == profil.reveils <= 60
+        assert profil.sessions == 1
+        assert horloge_virtuelle.maintenant() == 25 * 60
+
+    def test_veille_constatee(self):
+        """Une mise en veille comptée fait avancer la session asynchrone."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur = OrdonnanceurTicks(60, 1.0, horloge=horloge, duree=60)
+        ordonnanceur.politique_veille = VEILLE_COMPTEE
+
+        async def au_tick(tick):
+            if tick == 10:
+                horloge.mettre_en_veille(30)
+
+        assert self._parcourir(ordonnanceur, au_tick)[-1] == 60
+        assert ordonnanceur.temps_veille == 30
+        assert horloge.maintenant() == 30
+
+    def test_pause_puis_passage(self):
+        """Une pause repousse les échéances ; passer() termine la session."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur = OrdonnanceurTicks(60, 1.0, horloge=horloge, duree=60)
+
+        async def reprendre_plus_tard():
+            while horloge.maintenant() < 40:
+                await asyncio.sleep(0)
+            ordonnanceur.reprendre(horloge.maintenant())
+
+        async def au_tick(tick):
+            if tick == 10:
+                ordonnanceur.suspendre(horloge.maintenant())
+                asyncio.ensure_future(reprendre_plus_tard())
+            elif tick == 20:
+                ordonnanceur.passer()
+
+        assert self._parcourir(ordonnanceur, au_tick)[-1] == 20
+        assert horloge.maintenant() == 50
+
+
+# =============================================================================
+# TESTS POUR executer_cycle_pomodoro_async()
+# =============================================================================
+
+class TestCycleAsync:
+    """Tests pour les cycles asynchrones."""
+
+    def test_travail_puis_pause(self, horloge_virtuelle):
+        """Un cycle non final enchaîne travail, 2 s d'attente puis pause."""
+        sortie = SortieEnregistreuse()
+        asyncio.run(executer_cycle_pomodoro_async(25, 5, 15, 1, 4, True, True, sortie))
+
+        debuts = [a[1] for a in sortie.appels if a[0] == "debut"]
+        assert debuts == ["TRAVAIL", "PAUSE"]
+        assert sortie.appels[-1] == ("cycle", 1, 4)
+        assert horloge_virtuelle.maintenant() == 25 * 60 + 2 + 5 * 60
+
+    def test_pause_longue_apres_4_cycles(self, horloge_virtuelle):
+        """Le 4e cycle est suivi d'une pause longue."""
+        sortie = SortieEnregistreuse()
+        asyncio.run(executer_cycle_pomodoro_async(25, 5, 15, 4, 8, True, True, sortie))
+        assert ("debut", "PAUSE LONGUE", 15) in sortie.appels
+
+    def test_dernier_cycle_sans_pause(self, horloge_virtuelle):
+        """Le dernier cycle n'a pas de pause."""
+        sessions = asyncio.run(executer_cycle_pomodoro_async(25, 5, 15, 4, 4, True, True))
+        assert len(sessions) == 1
+
+    def test_confirmation_mode_manuel(self, horloge_virtuelle):
+        """En mode manuel, la confirmation est attendue avant la pause."""
+        confirmation = MagicMock()
+
+        async def confirmer():
+            confirmation()
+
+        asyncio.run(executer_cycle_pomodoro_async(25, 5, 15, 1, 2, False, True,
+                                                  confirmation=confirmer))
+        confirmation.assert_called_once()
+        assert horloge_virtuelle.maintenant() == 30 * 60
+
+    def test_plan_4_cycles(self, horloge_virtuelle):
+        """Un plan de 4 cycles dure 4 travaux, 3 pauses et 3 enchaînements."""
+        sessions = asyncio.run(executer_plan_async(4))
+        assert len(sessions) == 7
+        assert horloge_virtuelle.maintenant() == 4 * 25 * 60 + 3 * 5 * 60 + 3 * 2
+
+
+# =============================================================================
+# TESTS DE CONCURRENCE
+# =============================================================================
+
+class TestConcurrence:
+    """Tests pour de nombreuses minuteries dans une seule boucle."""
+
+    def test_milliers_de_minuteries_un_seul_thread(self):
+        """2000 minuteries concurrentes s'exécutent sur un seul thread."""
+        threads = set()
+
+        class SortieThread(SortieNulle):
+            def fin_session(self):
+                threads.add(threading.get_ident())
+
+        async def scenario():
+            return await asyncio.gather(*(
+                compte_a_rebours_async(0.3 / 60, "TRAVAIL", True, SortieThread())
+                for _ in range(2000)
+            ))
+
+        debut = time.perf_counter()
+        resultats = asyncio.run(scenario())
+        duree = time.perf_counter() - debut
+
+        assert len(resultats) == 2000
+        assert threads == {threading.get_ident()}
+        # Les minuteries tournent en parallèle, pas les unes après les autres
+        assert duree < 3
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour les touches du clavier de Pymodoro-CLI.
+============================================================
+
+Ce module teste le pilotage au clavier, sur un pseudo-terminal:
+- Le mode caractère et sa restauration
+- Les touches (espace, s, +, q) servies par la boucle des ticks
+- L'invite entre deux sessions, qui sert aussi la socket de pilotage
+- Les signaux d'arrêt
+"""
+
+import pytest
+import os
+import signal
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import HorlogeVirtuelle, OrdonnanceurTicks, attendre_entree, contexte_temporaire
+from pomodoro_controle import ArretDemande, ServeurControle, envoyer_commande
+
+termios = pytest.importorskip("termios")
+pty = pytest.importorskip("pty")
+
+
+@pytest.fixture
+def terminal():
+    """Un pseudo-terminal : (maître, esclave ouvert comme un fichier)."""
+    maitre, esclave = pty.openpty()
+    flux = os.fdopen(esclave, "rb", buffering=0)
+    yield maitre, flux
+    flux.close()
+    os.close(maitre)
+
+
+@pytest.fixture
+def serveur(dossier_execution_isole):
+    """Un serveur de pilotage fermé en fin de test."""
+    with ServeurControle(os.path.join(dossier_execution_isole, "test.sock")) as controle:
+        yield controle
+
+
+@pytest.fixture
+def clavier(serveur, terminal):
+    """Le clavier branché sur le pseudo-terminal et le serveur."""
+    from pomodoro_clavier import Clavier
+    with Clavier(serveur, terminal[1]) as actif:
+        assert actif.actif and serveur.ouvrir()
+        yield actif
+
+
+def _session(serveur, horloge, duree=60):
+    """Démarre un ordonnanceur d'une seconde par tick suivi par le serveur."""
+    ordonnanceur = OrdonnanceurTicks(duree, 1.0, horloge=horloge, duree=duree)
+    next(iter(ordonnanceur))
+    serveur.suivre("TRAVAIL", ordonnanceur, MagicMock(), horloge, cycle=1)
+    return ordonnanceur
+
+
+# =============================================================================
+# TESTS POUR LE TERMINAL
+# =============================================================================
+
+class TestTerminal:
+    """Tests pour le mode caractère."""
+
+    def test_mode_caractere_puis_restauration(self, serveur, terminal):
+        """Le terminal perd l'écho et le tampon de ligne, puis les retrouve."""
+        from pomodoro_clavier import Clavier
+        _, flux = terminal
+        avant = termios.tcgetattr(flux.fileno())
+        with Clavier(serveur, flux):
+            pendant = termios.tcgetattr(flux.fileno())
+            assert not pendant[3] & (termios.ICANON | termios.ECHO)
+            assert pendant[3] & termios.ISIG
+        assert termios.tcgetattr(flux.fileno()) == avant
+        assert flux not in serveur._sources
+
+    def test_entree_qui_n_est_pas_un_terminal(self, serveur):
+        """Sur un tube, le clavier reste inactif."""
+        from pomodoro_clavier import Clavier
+        lecture, ecriture = os.pipe()
+        try:
+            with os.fdopen(lecture, "rb", buffering=0) as flux:
+                with Clavier(serveur, flux) as clavier:
+                    assert not clavier.actif
+        finally:
+            os.close(ecriture)
+
+
+# =============================================================================
+# TESTS POUR LES TOUCHES
+# =============================================================================
+
+class TestTouches:
+    """Tests pour les touches servies par la boucle."""
+
+    def test_pause_et_reprise(self, clavier, serveur, terminal):
+        """L'espace met en pause, puis reprend."""
+        ordonnanceur = _session(serveur, HorlogeVirtuelle())
+        os.write(terminal[0], b" ")
+        serveur.traiter(1)
+        assert ordonnanceur.pause_depuis is not None
+        os.write(terminal[0], b" ")
+        serveur.traiter(1)
+        assert ordonnanceur.pause_depuis is None
+        assert clavier.touches == 2
+
+    def test_passer_et_prolonger(self, clavier, serveur, terminal):
+        """+ prolonge la session, s la passe."""
+        ordonnanceur = _session(serveur, HorlogeVirtuelle())
+        os.write(terminal[0], b"+s")
+        serveur.traiter(1)
+        assert ordonnanceur.duree == 60 + 300
+        assert ordonnanceur.interrompu
+
+    def test_quitter(self, clavier, serveur, terminal):
+        """q arrête pymodoro comme Ctrl+C."""
+        os.write(terminal[0], b"q")
+        with pytest.raises(ArretDemande):
+            serveur.traiter(1)
+
+    def test_touche_inconnue(self, clavier, serveur, terminal):
+        """Les autres touches sont ignorées."""
+        ordonnanceur = _session(serveur, HorlogeVirtuelle())
+        os.write(terminal[0], b"x\x1b[A")
+        serveur.traiter(1)
+        assert clavier.touches == 0
+        assert ordonnanceur.pause_depuis is None
+
+    def test_reveil_immediat(self, clavier, serveur, terminal):
+        """Une touche réveille l'attente en quelques millisecondes."""
+        _session(serveur, HorlogeVirtuelle())
+        minuterie = threading.Timer(0.05, os.write, (terminal[0], b" "))
+        minuterie.start()
+        debut = time.monotonic()
+        serveur.traiter(5)
+        minuterie.join()
+        assert time.monotonic() - debut < 1
+
+
+# =============================================================================
+# TESTS POUR L'INVITE ET LES SIGNAUX
+# =============================================================================
+
+class TestInvite:
+    """Tests pour l'attente d'Entrée et les signaux d'arrêt."""
+
+    def test_invite_sert_la_socket(self, clavier, serveur, terminal):
+        """Pendant l'invite, la socket de pilotage répond, puis Entrée la termine."""
+        reponses = []
+
+        def client():
+            reponses.append(envoyer_commande("status", serveur.chemin))
+            os.write(terminal[0], b"\r")
+
+        fil = threading.Thread(target=client)
+        fil.start()
+        with contexte_temporaire(clavier=clavier):
+            attendre_entree()
+        fil.join()
+        assert reponses == [{"ok": True, "session": None}]
+
+    def test_fin_de_l_entree(self, serveur):
+        """Une entrée épuisée arrête l'invite au lieu de l'attendre indéfiniment."""
+        from pomodoro_clavier import Clavier
+        maitre, esclave = pty.openpty()
+        flux = os.fdopen(esclave, "rb", buffering=0)
+        try:
+            with Clavier(serveur, flux) as clavier:
+                os.close(maitre)
+                with contexte_temporaire(clavier=clavier):
+                    with pytest.raises(ArretDemande):
+                        attendre_entree()
+                assert clavier.epuise
+                assert flux not in serveur._sources
+        finally:
+            flux.close()
+
+    def test_fin_de_l_entree_sans_clavier(self):
+        """Sans clavier, la fin de l'entrée quitte comme Ctrl+C."""
+        with patch('builtins.input', side_effect=EOFError):
+            with pytest.raises(KeyboardInterrupt):
+                attendre_entree()
+
+    def test_signal_arret(self, serveur, terminal):
+        """SIGTERM arrête pymodoro comme la commande stop, le temps du clavier."""
+        from pomodoro_clavier import Clavier
+        precedent = signal.getsignal(signal.SIGTERM)
+        with Clavier(serveur, terminal[1]):
+            with pytest.raises(ArretDemande):
+                os.kill(os.getpid(), signal.SIGTERM)
+                time.sleep(1)
+        assert signal.getsignal(signal.SIGTERM) is precedent
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le démon et le client léger de Pymodoro-CLI.
+=================================================================
+
+Ce module teste pomodoro_serveur et pomodoro_client:
+- Les commandes du démon (start, status, stop, shutdown)
+- L'aller-retour client/démon sur une socket Unix, sans blocage par un client lent
+- Le repli sur pymodoro autonome sans démon
+"""
+
+import pytest
+import json
+import os
+import sys
+import threading
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+# Import du module à tester
+sys.path.insert(0, '..')
+import pomodoro
+from pomodoro import HorlogeVirtuelle
+import pomodoro_client
+from pomodoro_client import chemin_socket_demon, transmettre
+from pomodoro_controle import ecouter
+from pomodoro_serveur import ServeurDemon
+
+
+@pytest.fixture
+def serveur():
+    """Un démon à l'horloge virtuelle, sans socket."""
+    with ServeurDemon(horloge=HorlogeVirtuelle()) as demon:
+        yield demon
+
+
+@pytest.fixture
+def demon_en_ecoute():
+    """Un démon servi dans un thread sur la socket par défaut."""
+    demon = ServeurDemon(horloge=HorlogeVirtuelle())
+    demon.ouvrir()
+    fil = threading.Thread(target=demon.servir)
+    fil.start()
+    yield demon
+    transmettre(["shutdown"], sortie=BytesIO())
+    fil.join(5)
+    demon.fermer()
+
+
+# =============================================================================
+# TESTS POUR LES COMMANDES DU DÉMON
+# =============================================================================
+
+class TestCommandesDemon:
+    """Tests pour ServeurDemon.executer()."""
+
+    def test_start_puis_status(self, serveur):
+        """Une minuterie démarrée apparaît dans le statut."""
+        code, texte = serveur.executer(["start", "-w", "50", "-c", "2"])
+        assert code == 0
+        assert "Minuterie 1 démarrée" in texte
+
+        code, texte = serveur.executer(["status"])
+        assert code == 0
+        assert texte == "🍅 #1 TRAVAIL 50:00 (cycle 1/2)\n"
+
+    def test_status_vide(self, serveur):
+        """Sans minuterie, status rend le code 1."""
+        assert serveur.executer(["status"]) == (1, "Aucune minuterie en cours\n")
+
+    def test_stop(self, serveur):
+        """stop arrête toutes les minuteries, ou celles désignées."""
+        for _ in range(3):
+            serveur.executer(["start"])
+        assert serveur.executer(["stop", "2"])[0] == 0
+        assert [m[0] for m in serveur.ordonnanceur.lister()] == [1, 3]
+        assert serveur.executer(["stop"])[0] == 0
+        assert serveur.ordonnanceur.lister() == []
+
+    def test_stop_inconnu(self, serveur):
+        """Arrêter une minuterie inconnue rend le code 1, un identifiant invalide le code 2."""
+        assert serveur.executer(["stop", "42"])[0] == 1
+        assert serveur.executer(["stop", "abc"])[0] == 2
+
+    def test_arguments_invalides(self, serveur):
+        """Les erreurs d'argparse sont rendues au client avec le code 2."""
+        code, texte = serveur.executer(["start", "-w", "0"])
+        assert code == 2
+        assert "strictement positifs" in texte
+        assert serveur.ordonnanceur.lister() == []
+
+    def test_commande_inconnue(self, serveur):
+        """Une commande inconnue rend le code 2."""
+        code, texte = serveur.executer(["pause"])
+        assert code == 2
+        assert "Commande inconnue" in texte
+
+    def test_status_json(self, serveur):
+        """status --json décrit les minuteries ; un argument inconnu rend le code 2."""
+        serveur.executer(["start", "-c", "2"])
+        code, texte = serveur.executer(["status", "--json"])
+        assert code == 0
+        assert json.loads(texte) == {"running": True, "timers": [
+            {"id": 1, "session": "TRAVAIL", "remaining": 1500, "cycle": 1, "total": 2}]}
+        assert serveur.executer(["status", "--bavard"])[0] == 2
+
+    def test_shutdown(self, serveur):
+        """shutdown arrête la boucle de service."""
+        serveur._en_marche = True
+        assert serveur.executer(["shutdown"])[0] == 0
+        assert serveur._en_marche is False
+
+
+# =============================================================================
+# TESTS POUR LE CLIENT
+# =============================================================================
+
+class TestClient:
+    """Tests pour transmettre() et le point d'entrée pymodoroc."""
+
+    def test_aller_retour(self, demon_en_ecoute):
+        """La sortie rendue par le démon est recopiée avec son code."""
+        sortie = BytesIO()
+        assert transmettre(["start", "-w", "25"], sortie=sortie) == 0
+        assert "Minuterie 1 démarrée".encode() in sortie.getvalue()
+
+        sortie = BytesIO()
+        assert transmettre(["status"], sortie=sortie) == 0
+        assert sortie.getvalue().decode() == "🍅 #1 TRAVAIL 25:00 (cycle 1/1)\n"
+        assert demon_en_ecoute.requetes == 2
+
+    def test_client_lent_sans_effet(self, demon_en_ecoute):
+        """Un client qui n'envoie rien ne retarde pas les autres."""
+        import socket
+        import time
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as lent:
+            lent.connect(chemin_socket_demon())
+            lent.sendall(b"sta")
+            debut = time.monotonic()
+            assert transmettre(["status"], sortie=BytesIO()) == 1
+            assert time.monotonic() - debut < 1.0
+
+    def test_accept_en_erreur(self, serveur):
+        """Une erreur d'accept() (trop de fichiers ouverts) n'arrête pas le démon."""
+        serveur.ecoute = MagicMock()
+        serveur.ecoute.accept.side_effect = OSError(24, "Too many open files")
+        serveur._accepter()
+        assert serveur._echeances == {}
+
+    def test_sans_demon(self):
+        """Sans démon à l'écoute, transmettre() retourne None."""
+        assert not os.path.exists(chemin_socket_demon())
+        assert transmettre(["status"], sortie=BytesIO()) is None
+
+    def test_second_demon_refuse(self, demon_en_ecoute):
+        """Un second démon ne prend pas la socket du premier."""
+        with pytest.raises(OSError):
+            ServeurDemon().ouvrir()
+        assert transmettre(["status"], sortie=BytesIO()) == 1
+
+    def test_main_transmet(self):
+        """pymodoroc sort avec le code de la commande transmise."""
+        with patch('sys.argv', ['pymodoroc', 'status']):
+            with patch.object(pomodoro_client, 'transmettre', return_value=1) as envoi:
+                with pytest.raises(SystemExit) as sortie:
+                    pomodoro_client.main()
+        envoi.assert_called_once_with(["status"])
+        assert sortie.value.code == 1
+
+    def test_reponse_illisible(self, capsys):
+        """Une réponse sans code de sortie est une erreur de connexion, signalée."""
+        ecoute = ecouter(chemin_socket_demon())
+
+        def repondre():
+            client, _ = ecoute.accept()
+            with client:
+                client.recv(4096)
+                client.sendall(b"pas un code\n")
+
+        fil = threading.Thread(target=repondre)
+        fil.start()
+        try:
+            assert pomodoro_client.commande_demon(["status"]) == 1
+        finally:
+            fil.join(5)
+            ecoute.close()
+        assert "réponse illisible" in capsys.readouterr().err
+
+    def test_status_meme_sens(self, demon_en_ecoute, capsys):
+        """`pymodoro status` interroge le démon, comme `pymodoroc status`."""
+        transmettre(["start"], sortie=BytesIO())
+        for point_entree, module in (('pomodoro.py', pomodoro), ('pymodoroc', pomodoro_client)):
+            with patch('sys.argv', [point_entree, 'status']):
+                with patch('pomodoro.configurer_terminal'):
+                    with pytest.raises(SystemExit) as sortie:
+                        module.main()
+            assert sortie.value.code == 0
+        assert demon_en_ecoute.requetes == 3
+
+    def test_main_repli_autonome(self):
+        """Sans démon, ou hors des commandes du démon, pymodoro s'exécute sur place."""
+        with patch('sys.argv', ['pymodoroc', '-w', '1']):
+            with patch('pomodoro.main') as autonome:
+                pomodoro_client.main()
+        autonome.assert_called_once_with()
+
+    def test_pymodoro_start_sans_demon(self, capsys):
+        """`pymodoro start` sans démon explique comment le lancer."""
+        with patch('sys.argv', ['pomodoro.py', 'start']):
+            with patch('pomodoro.configurer_terminal'):
+                with pytest.raises(SystemExit) as sortie:
+                    pomodoro.main()
+        assert sortie.value.code == 1
+        assert "pymodoro daemon" in capsys.readouterr().err
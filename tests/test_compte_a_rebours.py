@@ -6,6 +6,7 @@ Tests unitaires pour le compte à rebours de Pymodoro-CLI.
 Ce module teste les fonctionnalités de compte à rebours:
 - compte_a_rebours()
 - executer_cycle_pomodoro()
+- Le plan des cycles (PlanCycles)
 - Gestion des interruptions (Ctrl+C)
 """
 
@@ -17,9 +18,11 @@ from io import StringIO
 # Import du module à tester
 sys.path.insert(0, '..')
 from pomodoro import (
+    PlanCycles,
     compte_a_rebours,
     executer_cycle_pomodoro,
-    formater_temps
+    formater_temps,
+    OrdonnanceurTicks
 )
 
 
@@ -160,17 +163,19 @@ class TestCompteAReboursAffichage:
 class TestCompteAReboursTemps:
     """Tests pour la gestion du temps dans le compte à rebours."""
 
-    @patch('pomodoro.time.sleep')
     @patch('pomodoro.emettre_son')
-    def test_sleep_appele_correctement(self, mock_son, mock_sleep):
-        """Vérifie que time.sleep est appelé avec 1 seconde."""
-        with patch.object(sys, 'stdout', MagicMock()):
-            with patch('pomodoro.effacer_ligne'):
-                with patch('pomodoro.afficher_fin_session'):
-                    compte_a_rebours(1, "TRAVAIL")
-
-        # Vérifie que sleep(1) est appelé pour chaque seconde
-        mock_sleep.assert_called_with(1)
+    def test_sleep_appele_correctement(self, mock_son):
+        """Vérifie que time.sleep attend 1 seconde entre deux trames."""
+        horloge = HorlogeFactice()
+        with patch('pomodoro.time.monotonic', horloge.monotonic):
+            with patch('pomodoro.time.sleep', horloge.sleep):
+                with patch.object(sys, 'stdout', MagicMock()):
+                    with patch('pomodoro.effacer_ligne'):
+                        with patch('pomodoro.afficher_fin_session'):
+                            compte_a_rebours(1, "TRAVAIL")
+
+        # Vérifie qu'une attente d'une seconde sépare chaque trame
+        assert horloge.attentes == [1] * 60
 
     @patch('pomodoro.time.sleep')
     @patch('pomodoro.emettre_son')
@@ -186,6 +191,103 @@ class TestCompteAReboursTemps:
         assert mock_sleep.call_count == duree_minutes * 60
 
 
+# =============================================================================
+# TESTS POUR OrdonnanceurTicks - ÉCHÉANCES ABSOLUES
+# =============================================================================
+
+class HorlogeFactice:
+    """Horloge monotone simulée : sleep() fait avancer le temps."""
+
+    def __init__(self, cout_trame=0.0):
+        self.t = 1000.0
+        self.cout_trame = cout_trame
+        self.attentes = []
+
+    def monotonic(self):
+        return self.t
+
+    def sleep(self, secondes):
+        self.attentes.append(secondes)
+        self.t += secondes
+
+
+class TestOrdonnanceurTicks:
+    """Tests pour l'ordonnancement des ticks sur échéances absolues."""
+
+    def _executer(self, ordonnanceur, horloge):
+        ticks = []
+        with patch('pomodoro.time.monotonic', horloge.monotonic):
+            with patch('pomodoro.time.sleep', horloge.sleep):
+                for tick in ordonnanceur:
+                    ticks.append(tick)
+                    # Coût simulé du rendu de la trame
+                    horloge.t += horloge.cout_trame
+        return ticks
+
+    def test_tous_les_ticks_sans_retard(self):
+        """Sans retard, chaque tick de 0 à N est produit une fois."""
+        horloge = HorlogeFactice()
+        ticks = self._executer(OrdonnanceurTicks(5), horloge)
+        assert ticks == [0, 1, 2, 3, 4, 5]
+
+    def test_cout_de_rendu_non_cumule(self):
+        """Le temps de rendu est déduit de l'attente suivante."""
+        horloge = HorlogeFactice(cout_trame=0.2)
+        debut = horloge.t
+        self._executer(OrdonnanceurTicks(60), horloge)
+
+        # Chaque attente compense les 0,2 s passés à dessiner la trame
+        assert all(a == pytest.approx(0.8) for a in horloge.attentes)
+        # La fin arrive à la durée demandée, plus le rendu de la dernière trame
+        assert horloge.t - debut == pytest.approx(60.2)
+
+    def test_trames_en_retard_sautees(self):
+        """Un rendu plus long qu'un tick fait sauter les trames manquées."""
+        horloge = HorlogeFactice(cout_trame=2.5)
+        debut = horloge.t
+        ordonnanceur = OrdonnanceurTicks(60)
+        ticks = self._executer(ordonnanceur, horloge)
+
+        assert ticks[-1] == 60
+        assert len(ticks) < 61
+        assert ordonnanceur.ticks_sautes > 0
+        # La session se termine à moins d'un tick de la durée demandée
+        assert horloge.t - debut - horloge.cout_trame <= 60 + 1
+
+    def test_retard_max_mesure(self):
+        """Le pire retard observé au réveil est mémorisé."""
+        horloge = HorlogeFactice(cout_trame=1.5)
+        ordonnanceur = OrdonnanceurTicks(10)
+        self._executer(ordonnanceur, horloge)
+        # Les retards alternent entre 0,5 s et 1 s (le tick suivant est sauté)
+        assert ordonnanceur.retard_max == pytest.approx(1.0)
+
+    def test_ticks_strictement_croissants(self):
+        """Les indices produits sont strictement croissants."""
+        horloge = HorlogeFactice(cout_trame=3.7)
+        ticks = self._executer(OrdonnanceurTicks(100), horloge)
+        assert all(b > a for a, b in zip(ticks, ticks[1:]))
+
+    def test_periode_personnalisee(self):
+        """La période des ticks est configurable."""
+        horloge = HorlogeFactice()
+        debut = horloge.t
+        self._executer(OrdonnanceurTicks(4, periode=0.5), horloge)
+        assert horloge.t - debut == pytest.approx(2.0)
+
+    @patch('pomodoro.emettre_son')
+    def test_compte_a_rebours_retourne_ordonnanceur(self, mock_son):
+        """compte_a_rebours() expose les statistiques de l'ordonnanceur."""
+        horloge = HorlogeFactice()
+        with patch('pomodoro.time.monotonic', horloge.monotonic):
+            with patch('pomodoro.time.sleep', horloge.sleep):
+                with patch.object(sys, 'stdout', StringIO()):
+                    resultat = compte_a_rebours(1, "TRAVAIL")
+
+        assert isinstance(resultat, OrdonnanceurTicks)
+        assert resultat.ticks_sautes == 0
+
+
 # =============================================================================
 # TESTS POUR compte_a_rebours() - INTERRUPTIONS
 # =============================================================================
@@ -409,3 +511,61 @@ class TestLogiquePauseLongue:
                 assert type_pause_appele == "PAUSE LONGUE"
             else:
                 assert type_pause_appele == "PAUSE"
+
+
+# =============================================================================
+# TESTS POUR PlanCycles
+# =============================================================================
+
+class TestPlanCycles:
+    """Tests pour le plan précalculé des cycles."""
+
+    def test_segments(self):
+        """Travail et pause alternent, sans pause après le dernier cycle."""
+        plan = PlanCycles(25, 5, 15, 2)
+        assert list(plan) == [(0.0, 1500.0, "TRAVAIL", 1),
+                              (1502.0, 300.0, "PAUSE", 1),
+                              (1802.0, 1500.0, "TRAVAIL", 2)]
+        assert plan.duree_totale == 3302.0
+
+    def test_pause_longue_tous_les_4_cycles(self):
+        """La pause du 4e cycle est longue, celle du 8e aussi."""
+        plan = PlanCycles(25, 5, 15, 9)
+        assert [plan.pause_du_cycle(c) for c in (3, 4, 8)] == \
+            [(5, "PAUSE"), (15, "PAUSE LONGUE"), (15, "PAUSE LONGUE")]
+        assert plan.pause_du_cycle(9) is None
+
+    def test_mode_manuel_sans_delai(self):
+        """Hors mode automatique, la pause suit immédiatement le travail."""
+        assert PlanCycles(25, 5, 15, 2, mode_auto=False)[1][0] == 1500.0
+
+    def test_position_a(self):
+        """La session en cours et son temps restant se lisent à tout décalage."""
+        plan = PlanCycles(25, 5, 15, 2)
+        assert plan.position_a(0) == (0, 1500.0)
+        assert plan.position_a(1501) == (0, 0.0)
+        assert plan.position_a(1600) == (1, 202.0)
+        assert plan.position_a(3301) == (2, 1.0)
+        assert plan.position_a(3302) is None
+
+    def test_temps_avant_pause(self):
+        """Le temps jusqu'à la prochaine pause est nul pendant une pause."""
+        plan = PlanCycles(25, 5, 15, 2)
+        assert plan.temps_avant_pause(100) == 1402.0
+        assert plan.temps_avant_pause(1600) == 0.0
+        assert plan.temps_avant_pause(2000) is None
+
+    def test_indice_session(self):
+        """L'indice d'une session est direct ; une session hors plan est refusée."""
+        plan = PlanCycles(25, 5, 15, 3)
+        assert plan.indice_session(2, "PAUSE") == 3
+        with pytest.raises(IndexError):
+            plan.indice_session(3, "PAUSE")
+
+    def test_grand_plan_compact(self):
+        """Un plan de 100 000 cycles tient dans des tableaux compacts."""
+        plan = PlanCycles(25, 5, 15, 100000)
+        assert len(plan) == 199999
+        assert plan[-1][2:] == ("TRAVAIL", 100000)
+        assert plan.position_a(plan[-1][0])[0] == 199998
+
@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le pilotage à distance de Pymodoro-CLI.
+============================================================
+
+Ce module teste la socket de pilotage d'un pymodoro en cours:
+- Les commandes (status, pause, resume, skip, extend, stop)
+- La pause, la prolongation et le passage de l'ordonnanceur
+- Le service de la socket par la boucle des ticks
+- L'intégration avec compte_a_rebours() et main()
+"""
+
+import pytest
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+import pomodoro
+from pomodoro import (
+    HorlogeSysteme,
+    HorlogeVirtuelle,
+    OrdonnanceurTicks,
+    SortieJSON,
+    SortieTerminal,
+    compte_a_rebours,
+    main
+)
+from pomodoro_controle import (
+    PROLONGATION_MAX,
+    ArretDemande,
+    ServeurControle,
+    chemin_socket_defaut,
+    envoyer_commande
+)
+from pymodoro.testing import temps_virtuel
+
+
+@pytest.fixture
+def chemin_socket(dossier_execution_isole):
+    """Le chemin d'une socket de test, dans le dossier d'exécution isolé."""
+    return os.path.join(dossier_execution_isole, "test.sock")
+
+
+@pytest.fixture
+def serveur(chemin_socket):
+    """Un serveur de pilotage fermé en fin de test."""
+    with ServeurControle(chemin_socket) as controle:
+        yield controle
+
+
+def _session(serveur, horloge, duree=60, sortie=None):
+    """Démarre un ordonnanceur d'une seconde par tick suivi par le serveur."""
+    ordonnanceur = OrdonnanceurTicks(duree, 1.0, horloge=horloge, duree=duree)
+    iterateur = iter(ordonnanceur)
+    next(iterateur)
+    serveur.suivre("TRAVAIL", ordonnanceur, sortie or MagicMock(), horloge, cycle=2)
+    return ordonnanceur
+
+
+def _client(chemin, *requetes):
+    """Connecte un client et envoie des requêtes sans attendre de réponse."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(chemin)
+    client.sendall("".join(requete + "\n" for requete in requetes).encode("utf-8"))
+    return client
+
+
+def _reponses(client, nombre):
+    """Lit `nombre` réponses JSON sur un client."""
+    client.settimeout(2)
+    tampon = b""
+    while tampon.count(b"\n") < nombre:
+        tampon += client.recv(4096)
+    return [json.loads(ligne) for ligne in tampon.splitlines()]
+
+
+# =============================================================================
+# TESTS POUR LES COMMANDES
+# =============================================================================
+
+class TestCommandes:
+    """Tests pour ServeurControle.executer()."""
+
+    def test_chemin_defaut(self, monkeypatch):
+        """La socket est placée dans $XDG_RUNTIME_DIR."""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        assert chemin_socket_defaut() == "/run/user/1000/pymodoro.sock"
+
+    def test_status_hors_session(self, serveur):
+        """Hors session, status répond sans session."""
+        assert serveur.executer("status") == {"ok": True, "session": None}
+
+    def test_status(self, serveur):
+        """status décrit la session suivie."""
+        horloge = HorlogeVirtuelle()
+        _session(serveur, horloge)
+        horloge.avancer(10)
+        etat = serveur.executer("status")
+        assert etat["session"] == "TRAVAIL"
+        assert etat["cycle"] == 2
+        assert etat["remaining"] == 50
+        assert etat["duration"] == 60
+        assert not etat["paused"]
+
+    def test_pause_et_reprise(self, serveur):
+        """Le temps passé en pause ne compte pas dans la session."""
+        horloge = HorlogeVirtuelle()
+        sortie = MagicMock()
+        ordonnanceur = _session(serveur, horloge, sortie=sortie)
+        horloge.avancer(10)
+        assert serveur.executer("pause")["paused"]
+        sortie.pause_session.assert_called_once_with(50)
+        horloge.avancer(100)
+        assert serveur.executer("status")["remaining"] == 50
+        assert not serveur.executer("resume")["paused"]
+        sortie.reprise_session.assert_called_once_with(50)
+        assert ordonnanceur.echeance(60) == 160
+
+    def test_pause_repetee(self, serveur):
+        """Une seconde pause ne change rien."""
+        horloge = HorlogeVirtuelle()
+        sortie = MagicMock()
+        _session(serveur, horloge, sortie=sortie)
+        serveur.executer("pause")
+        serveur.executer("pause")
+        assert sortie.pause_session.call_count == 1
+
+    def test_extend(self, serveur):
+        """extend prolonge la session et signale chaque changement."""
+        horloge = HorlogeVirtuelle()
+        changements = []
+        ordonnanceur = OrdonnanceurTicks(60, 1.0, horloge=horloge, duree=60)
+        next(iter(ordonnanceur))
+        serveur.suivre("TRAVAIL", ordonnanceur, MagicMock(), horloge,
+                       au_changement=lambda *changement: changements.append(changement))
+        assert serveur.executer("extend 30")["remaining"] == 90
+        assert serveur.executer("extend")["remaining"] == 390
+        serveur.executer("pause")
+        serveur.executer("status")
+        assert ordonnanceur.nombre_ticks == 390
+        assert changements == [(90, False), (390, False), (390, True)]
+
+    @pytest.mark.parametrize("requete", ["extend 0", "extend -5", "extend abc",
+                                         "extend inf", "extend nan", "extend 1e9"])
+    def test_extend_invalide(self, serveur, requete):
+        """extend refuse une durée invalide, non finie ou démesurée."""
+        ordonnanceur = _session(serveur, HorlogeVirtuelle())
+        reponse = serveur.executer(requete)
+        assert reponse["ok"] is False
+        assert "error" in reponse
+        assert ordonnanceur.duree == 60
+
+    def test_extend_plafonne_par_session(self, serveur):
+        """Les prolongations d'une session sont plafonnées à PROLONGATION_MAX en tout."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur = _session(serveur, horloge)
+        assert serveur.executer(f"extend {PROLONGATION_MAX - 100}")["ok"]
+        assert serveur.executer("extend 200")["ok"] is False
+        assert serveur.executer("extend 100")["ok"]
+        assert ordonnanceur.duree == 60 + PROLONGATION_MAX
+        _session(serveur, horloge)
+        assert serveur.executer("extend")["ok"]
+
+    def test_commande_en_echec(self, serveur):
+        """Une commande qui lève une exception donne une réponse d'erreur."""
+        sortie = MagicMock()
+        sortie.pause_session.side_effect = RuntimeError("terminal fermé")
+        _session(serveur, HorlogeVirtuelle(), sortie=sortie)
+        reponse = serveur.executer("pause")
+        assert reponse["ok"] is False
+        assert "terminal fermé" in reponse["error"]
+        assert serveur.executer("status")["ok"]
+
+    def test_skip(self, serveur):
+        """skip marque la session comme passée."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur = _session(serveur, horloge)
+        assert serveur.executer("skip")["skipped"]
+        assert ordonnanceur.interrompu
+
+    def test_commande_inconnue(self, serveur):
+        """Une commande inconnue est refusée."""
+        reponse = serveur.executer("reboot")
+        assert reponse["ok"] is False
+        assert "reboot" in reponse["error"]
+
+    def test_pause_hors_session(self, serveur):
+        """Les commandes de session sont refusées hors session."""
+        assert serveur.executer("pause")["ok"] is False
+
+
+# =============================================================================
+# TESTS POUR LA SOCKET
+# =============================================================================
+
+class TestSocket:
+    """Tests pour l'ouverture et le service de la socket."""
+
+    def test_ouverture_paresseuse(self, serveur, chemin_socket):
+        """La socket n'existe qu'après la première attente."""
+        assert not os.path.exists(chemin_socket)
+        assert serveur.ouvrir()
+        assert oct(os.stat(chemin_socket).st_mode & 0o777) == "0o600"
+
+    def test_fermeture_supprime_la_socket(self, chemin_socket):
+        """La sortie du bloc supprime la socket."""
+        with ServeurControle(chemin_socket) as controle:
+            controle.ouvrir()
+        assert not os.path.exists(chemin_socket)
+
+    def test_socket_orpheline_remplacee(self, chemin_socket):
+        """Une socket laissée par un processus disparu est remplacée."""
+        orpheline = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        orpheline.bind(chemin_socket)
+        orpheline.close()
+        with ServeurControle(chemin_socket) as controle:
+            assert controle.ouvrir()
+
+    def test_instance_active(self, serveur, chemin_socket, capsys):
+        """Une seconde instance sur la même socket désactive son pilotage."""
+        serveur.ouvrir()
+        with ServeurControle(chemin_socket) as seconde:
+            assert not seconde.ouvrir()
+        assert "Pilotage désactivé" in capsys.readouterr().out
+        assert os.path.exists(chemin_socket)
+
+    def test_requetes_enchainees(self, serveur, chemin_socket):
+        """Une connexion enchaîne plusieurs requêtes, une réponse par ligne."""
+        _session(serveur, HorlogeVirtuelle())
+        serveur.ouvrir()
+        client = _client(chemin_socket, "status", "pause", "status")
+        serveur.traiter(0.5)
+        serveur.traiter(0.5)
+        reponses = _reponses(client, 3)
+        client.close()
+        assert [reponse["paused"] for reponse in reponses] == [False, True, True]
+        assert serveur.requetes == 3
+
+    def test_connexion_inactive_fermee(self, chemin_socket):
+        """Une connexion sans requête est fermée après le délai d'inactivité."""
+        with ServeurControle(chemin_socket, delai_inactivite=0.5) as controle:
+            controle.ouvrir()
+            muet = _client(chemin_socket)
+            actif = _client(chemin_socket)
+            while len(controle.selecteur.get_map()) < 3:
+                controle.traiter(0.5)
+            time.sleep(0.3)
+            actif.sendall(b"status\n")
+            controle.traiter(0.5)
+            debut = time.monotonic()
+            controle.traiter(None)
+            assert time.monotonic() - debut < 0.4
+            assert len(controle.selecteur.get_map()) == 2
+            muet.settimeout(2)
+            assert muet.recv(4096) == b""
+            assert _reponses(actif, 1)[0]["ok"]
+            muet.close()
+            actif.close()
+
+    def test_stop(self, serveur, chemin_socket):
+        """stop répond puis lève ArretDemande, un KeyboardInterrupt."""
+        serveur.ouvrir()
+        client = _client(chemin_socket, "stop")
+        serveur.traiter(0.5)
+        with pytest.raises(ArretDemande) as erreur:
+            serveur.traiter(0.5)
+        assert isinstance(erreur.value, KeyboardInterrupt)
+        assert _reponses(client, 1)[0]["ok"]
+        client.close()
+
+    def test_servie_pendant_l_enchainement(self, serveur, chemin_socket):
+        """Entre deux sessions enchaînées, les requêtes sont servies pendant le délai."""
+        serveur.ouvrir()
+        reponses = []
+        fil = threading.Thread(
+            target=lambda: reponses.append(envoyer_commande("status", chemin_socket)))
+        debut = time.monotonic()
+        fil.start()
+        serveur.patienter(0.5, HorlogeSysteme())
+        fil.join(5)
+        assert reponses == [{"ok": True, "session": None}]
+        assert time.monotonic() - debut >= 0.5
+
+    @patch('pomodoro.emettre_son')
+    def test_enchainement_par_la_boucle(self, mock_son, horloge_virtuelle):
+        """En mode automatique, le délai avant la pause est attendu par la boucle."""
+        controle = MagicMock()
+        with pomodoro.contexte_temporaire(controle=controle):
+            with patch.object(sys, 'stdout', StringIO()):
+                with patch.object(OrdonnanceurTicks, '__iter__', return_value=iter([0])):
+                    pomodoro.executer_cycle_pomodoro(1, 1, 1, 1, 2, True, True)
+        controle.patienter.assert_called_once_with(pomodoro.DELAI_ENCHAINEMENT_AUTO,
+                                                   horloge_virtuelle)
+
+    def test_servie_par_la_boucle_des_ticks(self, serveur, chemin_socket):
+        """En temps réel, les requêtes sont servies pendant l'attente des ticks."""
+        horloge = HorlogeSysteme()
+        ordonnanceur = OrdonnanceurTicks(100, 0.05, horloge=horloge, duree=5)
+        serveur.suivre("TRAVAIL", ordonnanceur, MagicMock(), horloge)
+        reponses = []
+
+        def client():
+            reponses.append(envoyer_commande("status", chemin_socket))
+            reponses.append(envoyer_commande("skip", chemin_socket))
+
+        fil = threading.Thread(target=client)
+        with pomodoro.contexte_temporaire(controle=serveur):
+            ticks = []
+            for tick in ordonnanceur:
+                if tick == 1:
+                    fil.start()
+                ticks.append(tick)
+        fil.join(5)
+
+        assert reponses[0]["session"] == "TRAVAIL"
+        assert reponses[1]["skipped"]
+        assert ticks[-1] < 100
+
+
+# =============================================================================
+# TESTS POUR L'INTÉGRATION AU MOTEUR
+# =============================================================================
+
+class TestIntegrationMoteur:
+    """Tests pour compte_a_rebours() et main() avec le pilotage."""
+
+    @patch('pomodoro.emettre_son')
+    def test_skip_termine_sans_son(self, mock_son, serveur, chemin_socket, horloge_virtuelle):
+        """Une session passée se termine sans son et n'est pas annulée."""
+        serveur.ouvrir()
+        client = _client(chemin_socket, "skip")
+        historique = MagicMock()
+        with pomodoro.contexte_temporaire(controle=serveur, historique=historique):
+            with patch.object(sys, 'stdout', StringIO()):
+                ordonnanceur = compte_a_rebours(1, "TRAVAIL")
+        client.close()
+
+        assert ordonnanceur.interrompu
+        assert horloge_virtuelle.maintenant() < 60
+        mock_son.assert_not_called()
+        assert historique.consigner.call_args.kwargs["annulee"] is False
+        assert serveur.executer("status")["session"] is None
+
+    def test_stop_annule_la_session(self, serveur, chemin_socket, horloge_virtuelle):
+        """stop suit le chemin d'un Ctrl+C."""
+        serveur.ouvrir()
+        client = _client(chemin_socket, "stop")
+        with pomodoro.contexte_temporaire(controle=serveur):
+            with patch.object(sys, 'stdout', StringIO()) as sortie:
+                with pytest.raises(SystemExit):
+                    compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+        client.close()
+        assert "annulée" in sortie.getvalue()
+
+    def test_terminal_prolonge(self, capsys):
+        """Le rendu du terminal est recalculé quand la session est prolongée."""
+        sortie = SortieTerminal()
+        sortie.debut_session("TRAVAIL", 1, "🍅", "")
+        sortie.reprise_session(90)
+        sortie.trame(90)
+        assert "01:30" in capsys.readouterr().out
+
+    def test_evenement_json_pause(self, horloge_virtuelle):
+        """Le mode JSON émet un événement "paused"."""
+        flux = StringIO()
+        sortie = SortieJSON(flux=flux)
+        sortie.debut_session("TRAVAIL", 1, "🍅", "")
+        sortie.pause_session(42)
+        evenement = json.loads(flux.getvalue().splitlines()[-1])
+        assert evenement["event"] == "paused"
+        assert evenement["remaining"] == 42
+
+    def test_main_ouvre_et_ferme_la_socket(self, chemin_socket):
+        """main() sert la socket demandée et la supprime en sortie."""
+        ouvertures = []
+        ouvrir = ServeurControle.ouvrir
+
+        def espionner(controle):
+            ouverte = ouvrir(controle)
+            ouvertures.append(ouverte and os.path.exists(controle.chemin))
+            return ouverte
+
+        arguments = ['pomodoro.py', '-w', '1', '-s', '--no-history',
+                     '--control-socket', chemin_socket]
+        with patch('sys.argv', arguments), patch('pomodoro.configurer_terminal'):
+            with patch.object(ServeurControle, 'ouvrir', espionner):
+                with patch.object(sys, 'stdout', StringIO()):
+                    with temps_virtuel(resolution=60):
+                        main()
+
+        assert ouvertures and all(ouvertures)
+        assert not os.path.exists(chemin_socket)
+        assert pomodoro.contexte.controle is None
+
+    def test_main_sans_controle(self):
+        """--no-control ne crée pas de serveur."""
+        with patch('sys.argv', ['pomodoro.py', '-w', '1', '-s', '--no-history', '--no-control']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch('pomodoro_controle.ServeurControle') as mock_serveur:
+                    with patch.object(sys, 'stdout', StringIO()):
+                        with temps_virtuel(resolution=60):
+                            main()
+        mock_serveur.assert_not_called()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour les commandes de fin de session de Pymodoro-CLI.
+=====================================================================
+
+Ce module teste l'exécution des commandes --on-work-end / --on-break-end:
+- Le contexte transmis par les variables d'environnement
+- Le dépôt sans attente, le délai maximal et la file bornée
+- Le journal des sorties et sa rotation
+- L'abonnement au bus d'événements par main()
+"""
+
+import pytest
+import os
+import sys
+import time
+from unittest.mock import patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import BusEvenements, main
+from pomodoro_crochets import ExecuteurCrochets, chemin_journal_defaut
+from pymodoro.testing import temps_virtuel
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="commandes du shell POSIX")
+
+
+@pytest.fixture
+def chemin_journal(tmp_path):
+    """Le chemin d'un journal de test."""
+    return str(tmp_path / "crochets.log")
+
+
+def _lire(chemin):
+    with open(chemin, encoding="utf-8") as journal:
+        return journal.read()
+
+
+def _fin(type_session="TRAVAIL", passee=False):
+    """Les données d'un événement session_fin."""
+    return {"type_session": type_session, "duree": 1500, "passee": passee, "cycle": 2}
+
+
+# =============================================================================
+# TESTS POUR L'EXÉCUTION
+# =============================================================================
+
+class TestExecution:
+    """Tests pour ExecuteurCrochets."""
+
+    def test_variables_environnement(self, chemin_journal):
+        """Le contexte de la session est transmis par l'environnement."""
+        commande = ('echo "$PYMODORO_EVENT $PYMODORO_SESSION $PYMODORO_CYCLE/'
+                    '$PYMODORO_TOTAL_CYCLES $PYMODORO_DURATION $PYMODORO_SKIPPED"')
+        with ExecuteurCrochets([commande], chemin_journal=chemin_journal) as crochets:
+            crochets.total_cycles = 4
+            crochets.a_la_fin_session("session_fin", _fin())
+        assert "work_end TRAVAIL 2/4 1500 0\n" in _lire(chemin_journal)
+        assert crochets.reussies == 1
+
+    def test_commande_selon_le_type(self, chemin_journal):
+        """La fin d'une pause lance les seules commandes de pause."""
+        with ExecuteurCrochets(["echo travail"], ["echo $PYMODORO_EVENT"],
+                               chemin_journal=chemin_journal) as crochets:
+            crochets.a_la_fin_session("session_fin", _fin("PAUSE LONGUE", passee=True))
+        contenu = _lire(chemin_journal)
+        assert "break_end" in contenu
+        assert "travail\n" not in contenu
+
+    def test_depot_sans_attente(self, chemin_journal):
+        """Le dépôt rend la main pendant que la commande s'exécute."""
+        with ExecuteurCrochets(chemin_journal=chemin_journal) as crochets:
+            debut = time.monotonic()
+            assert crochets.soumettre("sleep 1") is True
+            assert time.monotonic() - debut < 0.5
+
+    def test_delai_maximal(self, chemin_journal):
+        """Une commande trop longue est tuée, avec les processus qu'elle a lancés."""
+        debut = time.monotonic()
+        with ExecuteurCrochets(delai=0.2, chemin_journal=chemin_journal) as crochets:
+            crochets.soumettre("sleep 10 & sleep 10")
+        assert time.monotonic() - debut < 5
+        assert crochets.expirees == 1
+        assert "tuée après 0.2 s" in _lire(chemin_journal)
+
+    def test_echec_compte(self, chemin_journal):
+        """Un code de sortie non nul est compté et consigné."""
+        with ExecuteurCrochets(chemin_journal=chemin_journal) as crochets:
+            crochets.soumettre("echo oups >&2; exit 3")
+        assert crochets.echouees == 1
+        contenu = _lire(chemin_journal)
+        assert "code 3" in contenu and "oups" in contenu
+
+    def test_file_bornee(self, chemin_journal):
+        """Au-delà de la capacité, les nouvelles commandes sont rejetées."""
+        with ExecuteurCrochets(delai=2, chemin_journal=chemin_journal, nombre_executants=1,
+                               capacite=1) as crochets:
+            assert crochets.soumettre("sleep 0.2") is True
+            limite = time.monotonic() + 2
+            while crochets._file and time.monotonic() < limite:
+                time.sleep(0.001)
+            # L'exécutant est occupé : une commande attend, la suivante est rejetée
+            resultats = [crochets.soumettre("true"), crochets.soumettre("true")]
+        assert resultats == [True, False]
+        assert crochets.rejetees == 1
+        assert crochets.reussies == 2
+
+    def test_compteurs_sous_verrou(self, chemin_journal):
+        """Les exécutants qui terminent ensemble ne perdent aucun compte."""
+        with ExecuteurCrochets(chemin_journal=chemin_journal, nombre_executants=4,
+                               capacite=64) as crochets:
+            for numero in range(40):
+                crochets.soumettre("true" if numero % 2 else "false")
+        assert (crochets.reussies, crochets.echouees) == (20, 20)
+
+    def test_fermeture_bornee(self, chemin_journal):
+        """La fermeture attend au plus son délai, puis tue et abandonne le reste."""
+        crochets = ExecuteurCrochets(delai=30, chemin_journal=chemin_journal,
+                                     nombre_executants=1)
+        crochets.soumettre("sleep 30 & sleep 30")
+        crochets.soumettre("echo jamais")
+        limite = time.monotonic() + 2
+        while len(crochets._file) > 1 and time.monotonic() < limite:
+            time.sleep(0.001)
+        debut = time.monotonic()
+        crochets.fermer(0.2)
+        assert time.monotonic() - debut < 5
+        assert crochets.expirees == 1
+        assert crochets.abandonnees == 1
+        contenu = _lire(chemin_journal)
+        assert "tuée à la fermeture" in contenu
+        assert "echo jamais : abandonnée à la fermeture" in contenu
+        assert "jamais\n" not in contenu.replace("echo jamais", "")
+
+    def test_groupe_borne(self, chemin_journal):
+        """Pas plus de threads exécutants que demandé."""
+        with ExecuteurCrochets(chemin_journal=chemin_journal, nombre_executants=2) as crochets:
+            for _ in range(5):
+                crochets.soumettre("sleep 0.1")
+            assert len(crochets._executants) <= 2
+        assert crochets.reussies == 5
+
+
+# =============================================================================
+# TESTS POUR LE JOURNAL
+# =============================================================================
+
+class TestJournal:
+    """Tests pour le journal des sorties."""
+
+    def test_chemin_defaut(self, dossier_donnees_isole):
+        """Le journal est rangé dans le dossier de données."""
+        assert chemin_journal_defaut().startswith(str(dossier_donnees_isole))
+
+    def test_rotation(self, chemin_journal):
+        """Un journal trop grand est archivé avant l'ajout suivant."""
+        with patch('pomodoro_crochets.TAILLE_MAX_JOURNAL', 10):
+            with ExecuteurCrochets(chemin_journal=chemin_journal,
+                                   nombre_executants=1) as crochets:
+                for numero in range(3):
+                    crochets.soumettre(f"echo sortie {numero}")
+        assert "sortie 2" in _lire(chemin_journal)
+        assert "sortie 1" in _lire(chemin_journal + ".1")
+        assert "sortie 0" in _lire(chemin_journal + ".2")
+
+
+# =============================================================================
+# TESTS POUR L'INTÉGRATION
+# =============================================================================
+
+class TestIntegration:
+    """Tests pour l'abonnement au bus et les options de main()."""
+
+    def test_desabonnement_a_la_fermeture(self, chemin_journal):
+        """La fermeture retire l'abonné du bus."""
+        bus = BusEvenements()
+        with ExecuteurCrochets(["true"], chemin_journal=chemin_journal) as crochets:
+            crochets.abonner(bus)
+            assert bus.ecoute("session_fin")
+        assert not bus.ecoute("session_fin")
+
+    def test_main(self):
+        """main() lance les commandes à la fin de chaque session."""
+        with patch('sys.argv', ['pomodoro.py', '-w', '1', '-b', '1', '-c', '2', '-a', '-s',
+                                '--no-history', '--on-work-end', 'echo T $PYMODORO_CYCLE',
+                                '--on-break-end', 'echo P $PYMODORO_TOTAL_CYCLES']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(sys, 'stdout', StringIO()):
+                    with temps_virtuel(resolution=60):
+                        main()
+        lignes = [ligne for ligne in _lire(chemin_journal_defaut()).splitlines()
+                  if not ligne.startswith("[")]
+        assert sorted(lignes) == ["P 2", "T 1", "T 2"]
+
+    def test_delai_invalide(self):
+        """Un délai nul est refusé."""
+        with patch('sys.argv', ['pomodoro.py', '--hook-timeout', '0']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(sys, 'stderr', StringIO()):
+                    with pytest.raises(SystemExit) as sortie:
+                        main()
+        assert sortie.value.code == 2
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du budget de démarrage de Pymodoro-CLI.
+=============================================
+
+Ce module vérifie, dans des processus neufs:
+- Que `import pomodoro` n'importe pas les modules réservés aux chemins rares
+- Que la première trame arrive dans le budget de benchmarks/bench_demarrage.py,
+  à une marge près
+
+Comme le benchmark, le test mesure le temps entre l'interpréteur prêt et
+l'événement "session_start" de `pymodoro -w 1 -s --json`, et non la première
+trame dessinée sur un terminal : sans terminal, ni le clavier, ni Ctrl+Z
+ne sont préparés. La limite imposée est BUDGET_PREMIERE_TRAME_MS *
+MARGE_BUDGET, soit 60 ms ; le budget de 30 ms n'est vérifié que par le
+benchmark.
+"""
+
+import compileall
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget entre l'interpréteur prêt et l'événement "session_start" de --json
+# (en ms), celui de benchmarks/bench_demarrage.py
+BUDGET_PREMIERE_TRAME_MS = 30
+
+# Marge du test sur ce budget, d'où une limite de 60 ms : la suite complète
+# et l'intégration continue tournent sur des machines chargées, le test ne
+# relève que les régressions nettes (le benchmark mesure le budget lui-même)
+MARGE_BUDGET = 2
+
+
+@pytest.fixture(scope="module")
+def copie_compilee(tmp_path_factory):
+    """
+    Copie les modules dans un dossier temporaire et y compile les .pyc.
+
+    Les processus mesurés chargent ainsi du bytecode compilé, comme pour un
+    paquet installé, sans écrire de __pycache__ dans le dépôt.
+
+    Returns:
+        str: Le dossier de la copie.
+    """
+    copie = str(tmp_path_factory.mktemp("demarrage"))
+    for module in glob.glob(os.path.join(RACINE, "*.py")):
+        shutil.copy(module, copie)
+    compileall.compile_dir(copie, maxlevels=0, quiet=1)
+    return copie
+
+
+def _modules_importes(dossier, code):
+    """Retourne les modules chargés après `code` dans un interpréteur neuf."""
+    resultat = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys; print(' '.join(sys.modules))"],
+        cwd=dossier, capture_output=True, text=True, check=True)
+    return set(resultat.stdout.split())
+
+
+# =============================================================================
+# TESTS POUR LES IMPORTS PARESSEUX
+# =============================================================================
+
+class TestImportsParesseux:
+    """Tests pour les modules importés à la demande."""
+
+    @pytest.mark.parametrize("module", [
+        "argparse", "json", "platform", "shutil", "winsound",
+        "pomodoro_historique", "pomodoro_reprise", "pomodoro_notifications",
+        "pomodoro_son", "subprocess", "pomodoro_controle", "socket", "selectors",
+        "pomodoro_statut", "mmap", "pomodoro_crochets", "pomodoro_metriques",
+        "pomodoro_profil", "pomodoro_clavier", "termios", "pomodoro_suspension", "pomodoro_reveil",
+        "pomodoro_statistiques",
+    ])
+    def test_import_pomodoro_ne_charge_pas(self, copie_compilee, module):
+        """import pomodoro ne charge que le moteur."""
+        assert module not in _modules_importes(copie_compilee, "import pomodoro")
+
+    @pytest.mark.parametrize("module", ["pomodoro", "argparse", "socket", "enum"])
+    def test_client_leger(self, copie_compilee, module):
+        """Le client léger ne charge ni le moteur, ni le module socket."""
+        assert module not in _modules_importes(
+            copie_compilee, "import pomodoro_client; pomodoro_client.transmettre(['status'])")
+
+    def test_parseur_sans_shutil(self, copie_compilee):
+        """La construction du parseur n'importe ni shutil, ni le son, ni les crochets."""
+        modules = _modules_importes(copie_compilee,
+                                    "import pomodoro; pomodoro.creer_parseur_arguments()")
+        assert "argparse" in modules
+        assert not modules & {"shutil", "pomodoro_son", "pomodoro_crochets",
+                              "pomodoro_historique"}
+
+    @pytest.mark.parametrize("module", ["pomodoro", "pomodoro_demon"])
+    def test_notifications_independantes(self, copie_compilee, module):
+        """La file de notifications ne charge ni le moteur, ni le démon."""
+        assert module not in _modules_importes(copie_compilee, "import pomodoro_notifications")
+
+    def test_script_un_seul_moteur(self, copie_compilee):
+        """Lancé comme script, le moteur n'est pas rechargé par les autres modules."""
+        code = (
+            "import os, runpy, sys\n"
+            "sys.argv = ['pomodoro.py', '--help']\n"
+            "sys.stdout = open(os.devnull, 'w')\n"
+            "try:\n"
+            "    runpy.run_path('pomodoro.py', run_name='__main__')\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "sys.stdout = sys.__stdout__\n"
+            "import pomodoro_async\n"
+            "print(sys.modules['pomodoro'].__name__)\n"
+        )
+        resultat = subprocess.run([sys.executable, "-c", code], cwd=copie_compilee,
+                                  capture_output=True, text=True, check=True)
+        assert resultat.stdout.split() == ["__main__"]
+
+    def test_valeurs_par_defaut_du_parseur(self):
+        """Les valeurs par défaut reprises par le parseur sont celles des modules."""
+        import pomodoro
+        import pomodoro_crochets
+        import pomodoro_son
+        assert pomodoro.FREQUENCE_SON_DEFAUT == pomodoro_son.FREQUENCE_SON_DEFAUT
+        assert pomodoro.DUREE_SON_DEFAUT_MS == pomodoro_son.DUREE_SON_DEFAUT_MS
+        assert pomodoro.DELAI_CROCHET_DEFAUT == pomodoro_crochets.DELAI_CROCHET_DEFAUT
+
+
+# =============================================================================
+# TESTS POUR LE BUDGET DE LA PREMIÈRE TRAME
+# =============================================================================
+
+class TestBudgetDemarrage:
+    """Tests pour le temps jusqu'à la première trame du mode --json."""
+
+    SCRIPT = (
+        "import sys, time\n"
+        "debut = time.monotonic()\n"
+        "sys.argv[1:] = ['-w', '1', '-s', '--json']\n"
+        "sys.stdout.write('%r\\n' % debut)\n"
+        "from pomodoro import main\n"
+        "main()\n"
+    )
+
+    def _premiere_trame(self, copie, dossier):
+        environnement = dict(os.environ, XDG_DATA_HOME=dossier, APPDATA=dossier,
+                             XDG_RUNTIME_DIR=dossier)
+        processus = subprocess.Popen([sys.executable, "-c", self.SCRIPT], cwd=copie,
+                                     env=environnement, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL)
+        try:
+            debut = float(processus.stdout.readline())
+            evenement = json.loads(processus.stdout.readline())
+        finally:
+            processus.kill()
+            processus.wait()
+        assert evenement["event"] == "session_start"
+        return (evenement["mono"] - debut) * 1e3
+
+    def test_premiere_trame_dans_le_budget(self, copie_compilee, tmp_path):
+        """session_start arrive en moins de BUDGET_PREMIERE_TRAME_MS * MARGE_BUDGET (60 ms)."""
+        # Le meilleur de plusieurs lancements écarte le bruit de l'ordonnanceur
+        meilleur = min(self._premiere_trame(copie_compilee, str(tmp_path)) for _ in range(5))
+        limite = BUDGET_PREMIERE_TRAME_MS * MARGE_BUDGET
+        assert meilleur < limite, (
+            f"première trame en {meilleur:.1f} ms (budget {BUDGET_PREMIERE_TRAME_MS} ms, "
+            f"limite du test {limite} ms)")
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le cœur du mode démon de Pymodoro-CLI.
+===========================================================
+
+Ce module teste l'ordonnanceur de minuteries de pomodoro_demon:
+- Les règles de cycle partagées avec executer_cycle_pomodoro
+- Le traitement des seules minuteries échues
+- L'annulation paresseuse et le compactage du tas
+- Les statistiques de retard
+- La boucle d'exécution dans un thread
+"""
+
+import pytest
+import sys
+import time
+import threading
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import HorlogeVirtuelle, PlanCycles
+from pomodoro_demon import (
+    ETAT_ANNULEE,
+    ETAT_TERMINEE,
+    Minuterie,
+    OrdonnanceurMinuteries
+)
+from pomodoro_statistiques import StatistiquesRetard
+
+
+def _ordonnanceur(**kwargs):
+    """Crée un ordonnanceur piloté par une horloge virtuelle."""
+    return OrdonnanceurMinuteries(horloge=HorlogeVirtuelle(), **kwargs)
+
+
+# =============================================================================
+# TESTS POUR LES RÈGLES DE CYCLE
+# =============================================================================
+
+class TestReglesDeCycle:
+    """Tests pour l'enchaînement des sessions d'une minuterie."""
+
+    def test_premiere_echeance(self):
+        """La première échéance est la fin du travail."""
+        minuterie = Minuterie(1, PlanCycles(25, 5, 15, 4), debut=100.0)
+        assert minuterie.type_session == "TRAVAIL"
+        assert minuterie.echeance == 100.0 + 25 * 60
+
+    def test_pause_apres_delai_enchainement(self):
+        """La pause commence 2 s après la fin du travail, comme en mode auto."""
+        minuterie = Minuterie(1, PlanCycles(25, 5, 15, 4), debut=0.0)
+        assert minuterie.avancer() is True
+        assert minuterie.type_session == "PAUSE"
+        assert minuterie.debut == 25 * 60 + 2
+        assert minuterie.echeance == 25 * 60 + 2 + 5 * 60
+
+    def test_pause_longue_au_4e_cycle(self):
+        """La pause qui suit le 4e cycle est longue."""
+        minuterie = Minuterie(1, PlanCycles(25, 5, 15, 5), debut=0.0)
+        types = [minuterie.type_session]
+        while minuterie.avancer():
+            types.append(minuterie.type_session)
+        assert types == ["TRAVAIL", "PAUSE"] * 3 + ["TRAVAIL", "PAUSE LONGUE", "TRAVAIL"]
+        assert minuterie.cycle == 5
+        assert minuterie.etat == ETAT_TERMINEE
+
+    def test_segments_du_plan(self):
+        """Chaque session de la minuterie est un segment de son plan, décalé du début."""
+        plan = PlanCycles(25, 5, 15, 5)
+        minuterie = Minuterie(1, plan, debut=1000.0)
+        sessions = [(minuterie.debut, minuterie.echeance, minuterie.type_session,
+                     minuterie.cycle)]
+        while minuterie.avancer():
+            sessions.append((minuterie.debut, minuterie.echeance, minuterie.type_session,
+                             minuterie.cycle))
+        assert sessions == [(1000.0 + debut, 1000.0 + debut + duree, type_session, cycle)
+                            for debut, duree, type_session, cycle in plan]
+
+    def test_plans_partages(self):
+        """Les minuteries de mêmes durées partagent un seul plan."""
+        ordonnanceur = _ordonnanceur()
+        premiere = ordonnanceur.obtenir(ordonnanceur.ajouter(25, 5, 15, 4))
+        seconde = ordonnanceur.obtenir(ordonnanceur.ajouter(25, 5, 15, 4))
+        autre = ordonnanceur.obtenir(ordonnanceur.ajouter(50, 10, 15, 4))
+        assert premiere.plan is seconde.plan
+        assert autre.plan is not premiere.plan
+        assert premiere.total_cycles == 4
+
+    def test_sans_cycle_refuse(self):
+        """Une minuterie sans cycle est refusée."""
+        with pytest.raises(ValueError):
+            _ordonnanceur().ajouter(total_cycles=0)
+
+    def test_plan_identique_a_la_simulation(self, simulation_pomodoro):
+        """Le démon suit exactement le plan du moteur interactif en mode auto."""
+        duree_moteur = simulation_pomodoro.executer_plan(cycles=5)
+        instants = []
+        ordonnanceur = _ordonnanceur(a_la_transition=lambda m, t: instants.append(
+            ordonnanceur.horloge.maintenant()))
+        ordonnanceur.ajouter(total_cycles=5, debut=0.0)
+        ordonnanceur.simuler_jusqua(10 ** 6)
+
+        assert len(instants) == 9
+        assert instants[-1] == duree_moteur
+        assert len(ordonnanceur) == 0
+
+    def test_fin_du_dernier_cycle(self):
+        """Un plan d'un cycle se termine après le travail, sans pause."""
+        fins = []
+        ordonnanceur = _ordonnanceur(a_la_transition=lambda m, t: fins.append(
+            (ordonnanceur.horloge.maintenant(), m.etat)))
+        ordonnanceur.ajouter(duree_travail=25, total_cycles=1)
+        ordonnanceur.simuler_jusqua(3600)
+        assert fins == [(25 * 60, ETAT_TERMINEE)]
+
+    def test_echeances_absolues_malgre_retard(self):
+        """Un traitement tardif ne décale pas le reste du plan."""
+        ordonnanceur = _ordonnanceur()
+        identifiant = ordonnanceur.ajouter(total_cycles=2, debut=0.0)
+        ordonnanceur.traiter_echeances(25 * 60 + 30)
+        assert ordonnanceur.obtenir(identifiant).echeance == 25 * 60 + 2 + 5 * 60
+        assert ordonnanceur.retards.maximum == 30
+
+
+# =============================================================================
+# TESTS POUR LE TRAITEMENT DES ÉCHÉANCES
+# =============================================================================
+
+class TestTraitementEcheances:
+    """Tests pour le coût et la portée d'un réveil."""
+
+    def test_seules_les_minuteries_echues_sont_touchees(self):
+        """Un réveil ne traite que les minuteries arrivées à échéance."""
+        touchees = []
+        ordonnanceur = _ordonnanceur(a_la_transition=lambda m, t: touchees.append(m.identifiant))
+        for minute in range(1, 1001):
+            ordonnanceur.ajouter(duree_travail=minute, total_cycles=1, debut=0.0)
+
+        assert ordonnanceur.traiter_echeances(10 * 60) == 10
+        assert touchees == list(range(1, 11))
+        assert len(ordonnanceur) == 990
+
+    def test_rien_avant_la_premiere_echeance(self):
+        """Aucune transition n'a lieu avant la première échéance."""
+        ordonnanceur = _ordonnanceur()
+        ordonnanceur.ajouter(duree_travail=1, debut=0.0)
+        assert ordonnanceur.traiter_echeances(59.9) == 0
+
+    def test_prochaine_echeance(self):
+        """prochaine_echeance() donne l'échéance la plus proche."""
+        ordonnanceur = _ordonnanceur()
+        assert ordonnanceur.prochaine_echeance() is None
+        ordonnanceur.ajouter(duree_travail=10, debut=0.0)
+        ordonnanceur.ajouter(duree_travail=3, debut=0.0)
+        assert ordonnanceur.prochaine_echeance() == 180.0
+
+    def test_retard_plusieurs_sessions(self):
+        """Une minuterie très en retard rattrape plusieurs sessions d'un coup."""
+        ordonnanceur = _ordonnanceur()
+        identifiant = ordonnanceur.ajouter(total_cycles=4, debut=0.0)
+        ordonnanceur.traiter_echeances(3600)
+        minuterie = ordonnanceur.obtenir(identifiant)
+        assert minuterie.cycle == 2
+        assert minuterie.type_session == "PAUSE"
+
+    def test_simuler_jusqua_avance_horloge(self):
+        """simuler_jusqua() traite chaque échéance à l'heure exacte."""
+        ordonnanceur = _ordonnanceur()
+        for _ in range(100):
+            ordonnanceur.ajouter(total_cycles=4, debut=0.0)
+        ordonnanceur.simuler_jusqua(7200)
+        assert ordonnanceur.horloge.maintenant() == 7200
+        assert ordonnanceur.retards.maximum == 0.0
+
+
+# =============================================================================
+# TESTS POUR L'ANNULATION
+# =============================================================================
+
+class TestAnnulation:
+    """Tests pour l'annulation paresseuse."""
+
+    def test_annulation_sans_transition(self):
+        """Une minuterie annulée ne déclenche plus de transition."""
+        touchees = []
+        ordonnanceur = _ordonnanceur(a_la_transition=lambda m, t: touchees.append(m))
+        identifiant = ordonnanceur.ajouter(debut=0.0)
+        minuterie = ordonnanceur.obtenir(identifiant)
+
+        assert ordonnanceur.annuler(identifiant) is True
+        assert minuterie.etat == ETAT_ANNULEE
+        assert ordonnanceur.traiter_echeances(3600) == 0
+        assert touchees == []
+
+    def test_annulation_inconnue(self):
+        """Annuler une minuterie inconnue retourne False."""
+        assert _ordonnanceur().annuler(42) is False
+
+    def test_prochaine_echeance_ignore_annulees(self):
+        """Les entrées périmées au sommet du tas sont ignorées."""
+        ordonnanceur = _ordonnanceur()
+        proche = ordonnanceur.ajouter(duree_travail=1, debut=0.0)
+        ordonnanceur.ajouter(duree_travail=2, debut=0.0)
+        ordonnanceur.ajouter(duree_travail=3, debut=0.0)
+        ordonnanceur.annuler(proche)
+        assert ordonnanceur.prochaine_echeance() == 120.0
+
+    def test_compactage(self):
+        """Le tas est compacté quand les entrées périmées sont majoritaires."""
+        ordonnanceur = _ordonnanceur()
+        identifiants = [ordonnanceur.ajouter(debut=0.0) for _ in range(100)]
+        for identifiant in identifiants[:60]:
+            ordonnanceur.annuler(identifiant)
+        assert len(ordonnanceur._tas) < 100
+        assert len(ordonnanceur) == 40
+
+    def test_lister_ignore_annulees(self):
+        """L'instantané ne contient que les minuteries actives, par identifiant."""
+        ordonnanceur = _ordonnanceur()
+        premiere = ordonnanceur.ajouter(duree_travail=1, total_cycles=2, debut=0.0)
+        ordonnanceur.annuler(ordonnanceur.ajouter(debut=0.0))
+        troisieme = ordonnanceur.ajouter(duree_travail=2, debut=0.0)
+        assert ordonnanceur.lister(30.0) == [(premiere, "TRAVAIL", 1, 2, 30.0),
+                                             (troisieme, "TRAVAIL", 1, 1, 90.0)]
+
+
+# =============================================================================
+# TESTS POUR LES STATISTIQUES DE RETARD
+# =============================================================================
+
+class TestStatistiquesRetard:
+    """Tests pour le tampon circulaire des retards."""
+
+    def test_percentiles(self):
+        """Les percentiles utilisent le rang le plus proche."""
+        stats = StatistiquesRetard(100)
+        for valeur in range(1, 101):
+            stats.enregistrer(valeur / 1000)
+        resultat = stats.percentiles(50, 99, 100)
+        assert resultat == {50: 0.05, 99: 0.099, 100: 0.1}
+
+    def test_sans_retard(self):
+        """Aucun retard enregistré donne un résultat vide."""
+        assert StatistiquesRetard(10).percentiles(50) == {}
+
+    def test_memoire_bornee(self):
+        """Seuls les derniers retards sont conservés."""
+        stats = StatistiquesRetard(4)
+        for valeur in (9.0, 1.0, 2.0, 3.0, 4.0):
+            stats.enregistrer(valeur)
+        assert stats.nombre == 5
+        assert stats.maximum == 9.0
+        assert stats.percentiles(100) == {100: 4.0}
+
+
+# =============================================================================
+# TESTS POUR LA BOUCLE D'EXÉCUTION
+# =============================================================================
+
+class TestBoucleExecution:
+    """Tests de la boucle réelle du démon."""
+
+    def test_minuterie_traitee_dans_le_thread(self):
+        """La boucle traite une minuterie courte puis s'arrête à la demande."""
+        terminee = threading.Event()
+        ordonnanceur = OrdonnanceurMinuteries(
+            a_la_transition=lambda m, t: terminee.set())
+        thread = ordonnanceur.demarrer()
+        try:
+            ordonnanceur.ajouter(duree_travail=0.05 / 60)
+            assert terminee.wait(2.0)
+        finally:
+            ordonnanceur.arreter()
+            thread.join(2.0)
+        assert not thread.is_alive()
+        assert len(ordonnanceur) == 0
+
+    def test_ajout_reveille_la_boucle(self):
+        """Une échéance plus proche réveille une boucle qui dort longtemps."""
+        terminee = threading.Event()
+        ordonnanceur = OrdonnanceurMinuteries(
+            a_la_transition=lambda m, t: terminee.set())
+        ordonnanceur.ajouter(duree_travail=60)
+        thread = ordonnanceur.demarrer()
+        try:
+            time.sleep(0.05)
+            debut = time.perf_counter()
+            ordonnanceur.ajouter(duree_travail=0.05 / 60)
+            assert terminee.wait(2.0)
+            assert time.perf_counter() - debut < 1.0
+        finally:
+            ordonnanceur.arreter()
+            thread.join(2.0)
+        assert len(ordonnanceur) == 1
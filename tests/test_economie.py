@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le mode --low-power de Pymodoro-CLI.
+=========================================================
+
+Ce module teste l'affichage réveillé aux seuls changements visibles:
+- Les trames à la minute près et leurs instants de changement
+- Les ticks sautés d'avance par l'ordonnanceur
+- Le nombre de réveils d'une session, rapporté par le profil
+"""
+
+import sys
+from unittest.mock import patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import (
+    HorlogeVirtuelle, OrdonnanceurTicks, RenduProgression, SortieTerminal, choisir_sortie,
+    compte_a_rebours, contexte_temporaire, creer_parseur_arguments,
+)
+from pomodoro_profil import ProfilTicks
+from pymodoro.testing import temps_virtuel
+
+
+def _trame(rendu, secondes_restantes):
+    """Le texte d'une trame composée."""
+    return rendu.composer(secondes_restantes).decode("utf-8")
+
+
+# =============================================================================
+# TESTS POUR LES TRAMES À LA MINUTE
+# =============================================================================
+
+class TestTramesALaMinute:
+    """Tests pour RenduProgression(a_la_minute=True)."""
+
+    def test_minutes_entamees(self):
+        """Le temps restant est affiché en minutes entamées."""
+        rendu = RenduProgression("🍅", "", 25 * 60, flux=StringIO(), a_la_minute=True)
+        assert "25\033[0m min restant" in _trame(rendu, 25 * 60)
+        assert "25\033[0m min restant" in _trame(rendu, 24 * 60 + 1)
+        assert "24\033[0m min restant" in _trame(rendu, 24 * 60)
+        assert "01\033[0m min restant" in _trame(rendu, 1)
+
+    def test_changements_exacts(self):
+        """prochain_changement() désigne exactement les trames qui changent."""
+        rendu = RenduProgression("🍅", "", 25 * 60, flux=StringIO(), a_la_minute=True)
+        trames = {restant: _trame(rendu, restant) for restant in range(25 * 60 + 1)}
+        restant = 25 * 60
+        visites = [restant]
+        while restant > 0:
+            suivant = rendu.prochain_changement(restant)
+            assert all(trames[entre] == trames[restant] for entre in range(suivant + 1, restant))
+            assert trames[suivant] != trames[restant] or suivant == 0
+            visites.append(suivant)
+            restant = suivant
+        # 25 minutes et 30 pas de barre, dont certains confondus
+        assert 30 <= len(visites) - 1 <= 55
+
+    def test_a_la_seconde(self):
+        """Sans l'option, chaque seconde change la trame."""
+        rendu = RenduProgression("🍅", "", 60, flux=StringIO())
+        assert rendu.prochain_changement(42) == 41
+        assert rendu.prochain_changement(0) == 0
+
+
+# =============================================================================
+# TESTS POUR L'ORDONNANCEUR
+# =============================================================================
+
+class TestOrdonnanceur:
+    """Tests pour les ticks sautés d'avance."""
+
+    def test_tick_suivant(self):
+        """Le tick suivant est le premier qui affiche le prochain changement."""
+        ordonnanceur = OrdonnanceurTicks(120, 1.0, horloge=HorlogeVirtuelle(), duree=120)
+        ordonnanceur.prochain_changement = lambda restant: (restant - 1) // 60 * 60
+        assert ordonnanceur.tick_suivant(0) == 60
+        assert ordonnanceur.tick_suivant(60) == 120
+
+    def test_periode_fractionnaire(self):
+        """Avec plusieurs ticks par seconde, le tick choisi affiche bien la cible."""
+        ordonnanceur = OrdonnanceurTicks(600, 0.1, horloge=HorlogeVirtuelle(), duree=60)
+        ordonnanceur.prochain_changement = lambda restant: restant - 7
+        suivant = ordonnanceur.tick_suivant(0)
+        assert ordonnanceur.secondes_restantes(suivant) == 53
+        assert ordonnanceur.secondes_restantes(suivant - 1) == 54
+
+    def test_dernier_tick_toujours_atteint(self):
+        """Le tick final est atteint même sans changement d'ici là."""
+        ordonnanceur = OrdonnanceurTicks(10, 1.0, horloge=HorlogeVirtuelle(), duree=10)
+        ordonnanceur.prochain_changement = lambda restant: 0
+        assert list(ordonnanceur) == [0, 10]
+        assert ordonnanceur.reveils == 1
+
+
+# =============================================================================
+# TESTS POUR LA SESSION
+# =============================================================================
+
+class TestSession:
+    """Tests pour compte_a_rebours() en mode économe."""
+
+    def _session(self, econome):
+        profil = ProfilTicks(capacite=2000)
+        with temps_virtuel(resolution=1) as horloge:
+            with contexte_temporaire(sortie=SortieTerminal(econome), profil=profil):
+                with patch('sys.stdout', StringIO()) as sortie:
+                    ordonnanceur = compte_a_rebours(25, "TRAVAIL", mode_silencieux=True)
+        return ordonnanceur, profil, horloge, sortie.getvalue()
+
+    def test_quelques_dizaines_de_reveils(self):
+        """Une session de 25 minutes passe de 1500 réveils à quelques dizaines."""
+        normal, profil_normal, _, _ = self._session(False)
+        econome, profil, horloge, texte = self._session(True)
+        assert normal.reveils == profil_normal.reveils == 1500
+        assert 30 <= econome.reveils == profil.reveils <= 60
+        assert horloge.maintenant() == 25 * 60
+        assert "min restant" in texte
+        assert "1 session(s)" in profil.rapport()
+
+    def test_option(self):
+        """--low-power est reconnue et choisit un terminal à la minute."""
+        assert creer_parseur_arguments().parse_args(['--low-power']).economie
+        flux = StringIO()
+        flux.isatty = lambda: True
+        assert choisir_sortie(flux, econome=True).econome
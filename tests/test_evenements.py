@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le bus d'événements de Pymodoro-CLI.
+=========================================================
+
+Ce module teste la publication des événements du moteur:
+- Les abonnements (cycle de vie, ticks sur demande, désabonnement)
+- Les abonnés différés, appelés hors de la boucle des trames
+- Les événements publiés par compte_a_rebours(), les cycles et main()
+- L'absence de publication sans abonné
+"""
+
+import pytest
+import sys
+import threading
+from unittest.mock import patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+import pomodoro
+from pomodoro import (
+    EVENEMENT_TICK,
+    BusEvenements,
+    compte_a_rebours,
+    executer_cycle_pomodoro,
+    main
+)
+from pymodoro.testing import temps_virtuel
+
+
+@pytest.fixture
+def bus():
+    """Un bus installé dans le contexte, fermé en fin de test."""
+    with BusEvenements() as bus:
+        with pomodoro.contexte_temporaire(evenements=bus):
+            yield bus
+
+
+def _enregistreur(evenements):
+    """Retourne un abonné qui consigne les noms reçus dans `evenements`."""
+    def abonne(nom, donnees):
+        evenements.append((nom, donnees))
+    return abonne
+
+
+# =============================================================================
+# TESTS POUR LES ABONNEMENTS
+# =============================================================================
+
+class TestAbonnements:
+    """Tests pour abonner(), desabonner() et publier()."""
+
+    def test_cycle_de_vie_par_defaut(self):
+        """Un abonné reçoit le cycle de vie, pas les ticks."""
+        bus = BusEvenements()
+        bus.abonner(_enregistreur([]))
+        assert bus.ecoute("session_fin") and bus.ecoute("plan_fin")
+        assert not bus.ecoute(EVENEMENT_TICK)
+
+    def test_ticks_sur_demande(self):
+        """Les ticks s'ajoutent aux événements choisis."""
+        bus = BusEvenements()
+        bus.abonner(_enregistreur([]), ["session_fin"], ticks=True)
+        assert bus.ecoute(EVENEMENT_TICK) and bus.ecoute("session_fin")
+        assert not bus.ecoute("cycle_fin")
+
+    def test_evenement_inconnu(self):
+        """Un événement inconnu est refusé."""
+        with pytest.raises(ValueError):
+            BusEvenements().abonner(_enregistreur([]), ["session_pause"])
+
+    def test_desabonner(self):
+        """Sans abonné restant, l'événement n'est plus écouté."""
+        bus = BusEvenements()
+        abonne = _enregistreur([])
+        bus.abonner(abonne)
+        bus.desabonner(abonne)
+        assert not bus.ecoute("session_debut")
+        assert bus.abonnes("session_debut") == ()
+
+    def test_exception_comptee(self):
+        """L'exception d'un abonné est comptée sans atteindre l'appelant."""
+        bus = BusEvenements()
+        bus.abonner(lambda nom, donnees: 1 / 0)
+        recus = []
+        bus.abonner(_enregistreur(recus))
+        bus.publier("cycle_fin", {"cycle": 1})
+        assert bus.echecs == 1
+        assert recus == [("cycle_fin", {"cycle": 1})]
+
+
+# =============================================================================
+# TESTS POUR LES ABONNÉS DIFFÉRÉS
+# =============================================================================
+
+class TestAbonnesDifferes:
+    """Tests pour les abonnés appelés depuis le thread de fond."""
+
+    def test_publication_sans_attente(self):
+        """Un abonné différé bloqué ne retient pas la publication."""
+        debloquer = threading.Event()
+        recus = []
+
+        def lent(nom, donnees):
+            debloquer.wait(5)
+            recus.append((nom, threading.current_thread().name))
+
+        with BusEvenements() as bus:
+            bus.abonner(lent, differe=True)
+            bus.publier("cycle_fin", {})
+            bus.publier("plan_fin", {})
+            assert recus == []
+            debloquer.set()
+        assert recus == [("cycle_fin", "pymodoro-evenements"),
+                         ("plan_fin", "pymodoro-evenements")]
+
+    def test_file_bornee(self):
+        """Au-delà de la capacité, les événements les plus anciens sont perdus."""
+        occupe = threading.Event()
+        debloquer = threading.Event()
+        recus = []
+
+        def lent(nom, donnees):
+            occupe.set()
+            debloquer.wait(5)
+            recus.append(donnees["cycle"])
+
+        with BusEvenements(capacite_differee=2) as bus:
+            bus.abonner(lent, differe=True)
+            bus.publier("cycle_fin", {"cycle": 0})
+            occupe.wait(5)
+            for cycle in range(1, 5):
+                bus.publier("cycle_fin", {"cycle": cycle})
+            debloquer.set()
+        assert bus.perdus == 2
+        assert recus == [0, 3, 4]
+
+
+# =============================================================================
+# TESTS POUR LES ÉVÉNEMENTS DU MOTEUR
+# =============================================================================
+
+class TestEvenementsMoteur:
+    """Tests pour les événements publiés par le moteur."""
+
+    def test_session(self, bus, horloge_virtuelle):
+        """Une session publie son début, ses ticks et sa fin."""
+        recus = []
+        bus.abonner(_enregistreur(recus), ticks=True)
+        with patch.object(sys, 'stdout', StringIO()):
+            compte_a_rebours(1, "PAUSE", mode_silencieux=True)
+
+        noms = [nom for nom, _ in recus]
+        assert noms == ["session_debut"] + [EVENEMENT_TICK] * 61 + ["session_fin"]
+        assert recus[0][1] == {"type_session": "PAUSE", "duree": 60, "restant": 60, "cycle": 0}
+        assert recus[-2][1]["restant"] == 0
+        assert recus[-1][1]["passee"] is False
+
+    def test_session_annulee(self, bus, horloge_virtuelle):
+        """Ctrl+C publie l'annulation de la session."""
+        recus = []
+        bus.abonner(_enregistreur(recus), ["session_annulee", "session_fin"])
+        with patch.object(sys, 'stdout', StringIO()):
+            with patch.object(pomodoro.SortieTerminal, 'trame', side_effect=KeyboardInterrupt):
+                with pytest.raises(SystemExit):
+                    compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+        assert recus == [("session_annulee", {"type_session": "TRAVAIL", "cycle": 0})]
+
+    def test_cycle(self, bus, simulation_pomodoro):
+        """Un cycle publie son début et sa fin, encadrant ses sessions."""
+        recus = []
+        bus.abonner(_enregistreur(recus))
+        with patch.object(sys, 'stdout', StringIO()):
+            executer_cycle_pomodoro(1, 1, 1, 1, 2, True, True)
+        assert [nom for nom, _ in recus] == ["cycle_debut", "session_debut", "session_fin",
+                                             "session_debut", "session_fin", "cycle_fin"]
+        assert recus[-1][1] == {"cycle": 1, "total_cycles": 2}
+
+    def test_sans_abonne_rien_publie(self, bus, simulation_pomodoro):
+        """Sans abonné, le moteur ne publie rien."""
+        with patch.object(BusEvenements, 'publier') as publier:
+            simulation_pomodoro.executer_plan(cycles=2)
+        publier.assert_not_called()
+
+    def test_main_publie_la_fin_du_plan(self, bus):
+        """main() publie la fin du plan et distribue les abonnés différés."""
+        recus = []
+        bus.abonner(_enregistreur(recus), ["plan_fin"], differe=True)
+        with patch('sys.argv', ['pomodoro.py', '-w', '1', '-b', '1', '-c', '2', '-a', '-s',
+                                '--no-history']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(sys, 'stdout', StringIO()):
+                    with temps_virtuel(resolution=60):
+                        main()
+        assert recus == [("plan_fin", {"total_cycles": 2, "duree": 182.0})]
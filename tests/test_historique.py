@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour l'historique des sessions de Pymodoro-CLI.
+===============================================================
+
+Ce module teste le fichier d'historique binaire:
+- Le format des enregistrements de taille fixe
+- L'ajout en un seul appel à os.write(), y compris entre processus
+- La lecture par projection en mémoire
+- La consignation des sessions par le moteur et par main()
+"""
+
+import pytest
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+import pomodoro
+from pomodoro import compte_a_rebours, executer_cycle_pomodoro, main
+from pomodoro_historique import (
+    TAILLE_ENREGISTREMENT,
+    EnregistrementSession,
+    Historique,
+    JournalHistorique,
+    chemin_historique_defaut,
+    encoder_enregistrement,
+    lire_historique
+)
+from pymodoro.testing import temps_virtuel
+
+
+def _session(numero=0, type_session="TRAVAIL", annulee=False):
+    """Construit une session de test."""
+    return EnregistrementSession(type_session, 1500.0, 1500.0 - numero,
+                                 1_700_000_000.0 + numero, 1_700_001_500.0 + numero,
+                                 annulee, numero)
+
+
+# =============================================================================
+# TESTS POUR LE FORMAT
+# =============================================================================
+
+class TestFormat:
+    """Tests pour le format binaire des enregistrements."""
+
+    def test_taille_fixe(self):
+        """Chaque enregistrement fait 40 octets."""
+        assert TAILLE_ENREGISTREMENT == 40
+        assert len(encoder_enregistrement(_session())) == 40
+
+    @pytest.mark.parametrize("type_session", ["TRAVAIL", "PAUSE", "PAUSE LONGUE"])
+    def test_aller_retour(self, tmp_path, type_session):
+        """Un enregistrement relu est identique à l'original."""
+        chemin = str(tmp_path / "historique.bin")
+        session = _session(3, type_session, annulee=True)
+        JournalHistorique(chemin).ajouter(encoder_enregistrement(session))
+        assert lire_historique(chemin) == [session]
+
+    def test_chemin_defaut_xdg(self, dossier_donnees_isole):
+        """L'historique est rangé dans le dossier de données de l'utilisateur."""
+        chemin = chemin_historique_defaut()
+        assert chemin.startswith(str(dossier_donnees_isole))
+        assert chemin.endswith(os.path.join("pymodoro", "historique.bin"))
+
+
+# =============================================================================
+# TESTS POUR L'ÉCRITURE
+# =============================================================================
+
+class TestEcriture:
+    """Tests pour l'ajout d'enregistrements."""
+
+    def test_un_seul_write_en_ajout(self, tmp_path):
+        """Un ajout est un unique os.write() sur un descripteur O_APPEND."""
+        chemin = str(tmp_path / "historique.bin")
+        ouvertures = []
+        vrai_open = os.open
+
+        def ouvrir(chemin, drapeaux, *args):
+            ouvertures.append(drapeaux)
+            return vrai_open(chemin, drapeaux, *args)
+
+        with patch('pomodoro_historique.os.open', side_effect=ouvrir):
+            with patch('pomodoro_historique.os.write', wraps=os.write) as mock_write:
+                JournalHistorique(chemin).consigner("PAUSE", 300, 300, 0.0, 300.0)
+
+        mock_write.assert_called_once()
+        assert len(mock_write.call_args[0][1]) == TAILLE_ENREGISTREMENT
+        assert ouvertures[0] & os.O_APPEND
+
+    def test_dossiers_parents_crees(self, tmp_path):
+        """Les dossiers manquants sont créés au premier ajout."""
+        chemin = str(tmp_path / "a" / "b" / "historique.bin")
+        JournalHistorique(chemin).consigner("TRAVAIL", 1500, 1500, 0.0, 1500.0)
+        assert len(lire_historique(chemin)) == 1
+
+    def test_ecriture_partielle_signalee(self, tmp_path):
+        """Une écriture incomplète lève OSError."""
+        chemin = str(tmp_path / "historique.bin")
+        with patch('pomodoro_historique.os.write', return_value=10):
+            with pytest.raises(OSError):
+                JournalHistorique(chemin).consigner("TRAVAIL", 1500, 1500, 0.0, 1500.0)
+
+    def test_ajouts_concurrents_entre_processus(self, tmp_path):
+        """Des processus concurrents n'entremêlent pas leurs enregistrements."""
+        chemin = str(tmp_path / "historique.bin")
+        racine = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1])\n"
+            "from pomodoro_historique import JournalHistorique\n"
+            "journal = JournalHistorique(sys.argv[2])\n"
+            "for i in range(200):\n"
+            "    journal.consigner('TRAVAIL', 1500, 1500, 0.0, 1500.0, cycle=int(sys.argv[3]))\n"
+        )
+        processus = [subprocess.Popen([sys.executable, "-c", script, racine, chemin, str(n)])
+                     for n in range(1, 5)]
+        for p in processus:
+            assert p.wait(timeout=30) == 0
+
+        assert os.path.getsize(chemin) == 4 * 200 * TAILLE_ENREGISTREMENT
+        sessions = lire_historique(chemin)
+        assert sorted({s.cycle for s in sessions}) == [1, 2, 3, 4]
+        assert all(s.duree_prevue == 1500 and s.type_session == "TRAVAIL" for s in sessions)
+
+
+# =============================================================================
+# TESTS POUR LA LECTURE
+# =============================================================================
+
+class TestLecture:
+    """Tests pour la lecture par projection en mémoire."""
+
+    def _remplir(self, chemin, nombre):
+        donnees = b"".join(encoder_enregistrement(_session(i)) for i in range(nombre))
+        JournalHistorique(chemin).ajouter(donnees)
+
+    def test_fichier_absent(self, tmp_path):
+        """Un fichier absent se lit comme un historique vide."""
+        with Historique(str(tmp_path / "absent.bin")) as historique:
+            assert len(historique) == 0
+            assert list(historique) == []
+
+    def test_fichier_vide(self, tmp_path):
+        """Un fichier vide se lit sans erreur."""
+        chemin = tmp_path / "vide.bin"
+        chemin.write_bytes(b"")
+        assert lire_historique(str(chemin)) == []
+
+    def test_acces_indexe(self, tmp_path):
+        """L'accès indexé décode l'enregistrement demandé."""
+        chemin = str(tmp_path / "historique.bin")
+        self._remplir(chemin, 10)
+        with Historique(chemin) as historique:
+            assert len(historique) == 10
+            assert historique[0] == _session(0)
+            assert historique[-1] == _session(9)
+            with pytest.raises(IndexError):
+                historique[10]
+
+    def test_derniers(self, tmp_path):
+        """derniers() retourne la fin de l'historique dans l'ordre."""
+        chemin = str(tmp_path / "historique.bin")
+        self._remplir(chemin, 10)
+        with Historique(chemin) as historique:
+            assert historique.derniers(3) == [_session(7), _session(8), _session(9)]
+            assert len(historique.derniers(50)) == 10
+
+    def test_enregistrement_tronque_ignore(self, tmp_path):
+        """Un enregistrement incomplet en fin de fichier est ignoré."""
+        chemin = str(tmp_path / "historique.bin")
+        self._remplir(chemin, 2)
+        with open(chemin, "ab") as fichier:
+            fichier.write(encoder_enregistrement(_session(2))[:17])
+        assert lire_historique(chemin) == [_session(0), _session(1)]
+
+    def test_50000_enregistrements_en_millisecondes(self, tmp_path):
+        """Une année d'historique (50k sessions) se lit en quelques ms."""
+        chemin = str(tmp_path / "historique.bin")
+        self._remplir(chemin, 50_000)
+
+        debut = time.perf_counter()
+        sessions = lire_historique(chemin)
+        duree = time.perf_counter() - debut
+
+        assert len(sessions) == 50_000
+        assert sessions[-1] == _session(49_999)
+        assert duree < 0.25
+
+
+# =============================================================================
+# TESTS POUR LA CONSIGNATION PAR LE MOTEUR
+# =============================================================================
+
+class TestConsignation:
+    """Tests pour l'enregistrement des sessions par le moteur."""
+
+    @pytest.fixture
+    def journal(self, tmp_path):
+        journal = JournalHistorique(str(tmp_path / "historique.bin"))
+        with pomodoro.contexte_temporaire(historique=journal):
+            yield journal
+
+    @patch('pomodoro.emettre_son')
+    def test_session_terminee(self, mock_son, horloge_virtuelle, journal):
+        """Une session terminée est consignée avec sa durée réelle."""
+        with patch.object(sys, 'stdout', StringIO()):
+            compte_a_rebours(5, "PAUSE", True)
+
+        [session] = lire_historique(journal.chemin)
+        assert session.type_session == "PAUSE"
+        assert session.duree_prevue == 300
+        assert session.duree_reelle == 300
+        assert session.debut == horloge_virtuelle.heure_murale_depart
+        assert session.fin == session.debut + 300
+        assert session.annulee is False
+        assert session.cycle == 0
+
+    def test_session_annulee(self, horloge_virtuelle, journal):
+        """Une session interrompue par Ctrl+C est consignée comme annulée."""
+        sortie = pomodoro.SortieNulle()
+
+        def interrompre(secondes_restantes):
+            if secondes_restantes < 1500:
+                raise KeyboardInterrupt
+
+        sortie.periode_ticks = lambda duree: 60
+        sortie.trame = interrompre
+        with pomodoro.contexte_temporaire(sortie=sortie):
+            with patch.object(sys, 'stdout', StringIO()):
+                with pytest.raises(SystemExit):
+                    compte_a_rebours(25, "TRAVAIL")
+
+        [session] = lire_historique(journal.chemin)
+        assert session.annulee is True
+        assert session.duree_reelle == 60
+        assert session.duree_prevue == 1500
+
+    @patch('pomodoro.emettre_son')
+    def test_numero_de_cycle(self, mock_son, horloge_virtuelle, journal):
+        """Les sessions d'un cycle portent son numéro."""
+        with patch.object(sys, 'stdout', StringIO()):
+            executer_cycle_pomodoro(1, 1, 2, 4, 5, True, True)
+
+        sessions = lire_historique(journal.chemin)
+        assert [(s.type_session, s.cycle) for s in sessions] == [
+            ("TRAVAIL", 4), ("PAUSE LONGUE", 4)]
+        assert pomodoro.contexte.numero_cycle == 0
+
+    @patch('pomodoro.emettre_son')
+    def test_erreur_ecriture_desactive_historique(self, mock_son, horloge_virtuelle):
+        """Une erreur d'écriture n'interrompt pas la minuterie."""
+        journal = JournalHistorique("/chemin/interdit/historique.bin")
+        capture = StringIO()
+        with pomodoro.contexte_temporaire(historique=journal):
+            with patch.object(journal, 'ajouter', side_effect=PermissionError("refusé")):
+                with patch.object(sys, 'stdout', capture):
+                    compte_a_rebours(1, "TRAVAIL", True)
+            assert pomodoro.contexte.historique is None
+        assert "Historique désactivé" in capture.getvalue()
+
+
+# =============================================================================
+# TESTS POUR LES OPTIONS DE main()
+# =============================================================================
+
+class TestOptionsHistorique:
+    """Tests pour --history-file et --no-history."""
+
+    def _executer(self, arguments):
+        with patch('sys.argv', ['pomodoro.py', '-w', '1', '-s'] + arguments):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(sys, 'stdout', StringIO()):
+                    with temps_virtuel(resolution=60):
+                        main()
+
+    def test_historique_par_defaut(self):
+        """Par défaut, main() consigne les sessions dans le dossier de données."""
+        self._executer([])
+        assert len(lire_historique(chemin_historique_defaut())) == 1
+
+    def test_history_file(self, tmp_path):
+        """--history-file choisit le fichier d'historique."""
+        chemin = str(tmp_path / "perso.bin")
+        self._executer(['--history-file', chemin])
+        assert len(lire_historique(chemin)) == 1
+        assert not os.path.exists(chemin_historique_defaut())
+
+    def test_no_history(self):
+        """--no-history n'écrit aucun historique."""
+        self._executer(['--no-history'])
+        assert not os.path.exists(chemin_historique_defaut())
+        assert pomodoro.contexte.historique is None
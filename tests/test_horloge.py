@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour les horloges et la simulation de Pymodoro-CLI.
+===================================================================
+
+Ce module teste l'abstraction d'horloge utilisée par le moteur:
+- HorlogeSysteme et HorlogeVirtuelle
+- Le contexte d'exécution partagé
+- Les fixtures de simulation de pymodoro.testing
+"""
+
+import sys
+import time
+from unittest.mock import patch, MagicMock
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+import pomodoro
+from pomodoro import (
+    HorlogeSysteme,
+    HorlogeVirtuelle,
+    OrdonnanceurTicks,
+    compte_a_rebours,
+    executer_cycle_pomodoro
+)
+from pymodoro.testing import temps_virtuel, Simulation
+
+
+# =============================================================================
+# TESTS POUR HorlogeSysteme
+# =============================================================================
+
+class TestHorlogeSysteme:
+    """Tests pour l'horloge réelle."""
+
+    def test_maintenant_monotone(self):
+        """Vérifie que maintenant() utilise time.monotonic()."""
+        with patch('pomodoro.time.monotonic', return_value=42.0):
+            assert HorlogeSysteme().maintenant() == 42.0
+
+    def test_heure_murale(self):
+        """Vérifie que heure_murale() utilise time.time()."""
+        with patch('pomodoro.time.time', return_value=1234.5):
+            assert HorlogeSysteme().heure_murale() == 1234.5
+
+    @patch('pomodoro.time.sleep')
+    def test_dormir_utilise_sleep(self, mock_sleep):
+        """Vérifie que dormir() délègue à time.sleep()."""
+        HorlogeSysteme().dormir(0.5)
+        mock_sleep.assert_called_once_with(0.5)
+
+    @patch('pomodoro.time.sleep')
+    def test_dormir_jusqua_echeance_passee(self, mock_sleep):
+        """Une échéance déjà passée ne provoque aucune attente."""
+        horloge = HorlogeSysteme()
+        horloge.dormir_jusqua(horloge.maintenant() - 10)
+        mock_sleep.assert_not_called()
+
+
+# =============================================================================
+# TESTS POUR HorlogeVirtuelle
+# =============================================================================
+
+class TestHorlogeVirtuelle:
+    """Tests pour l'horloge simulée."""
+
+    def test_temps_initial(self):
+        """Vérifie l'instant de départ."""
+        assert HorlogeVirtuelle(depart=10).maintenant() == 10.0
+
+    def test_dormir_avance_le_temps(self):
+        """Vérifie que dormir() fait avancer le temps instantanément."""
+        horloge = HorlogeVirtuelle()
+        debut = time.perf_counter()
+        horloge.dormir(3600)
+        assert horloge.maintenant() == 3600.0
+        assert time.perf_counter() - debut < 0.1
+
+    def test_dormir_jusqua(self):
+        """Vérifie que dormir_jusqua() atteint exactement l'échéance."""
+        horloge = HorlogeVirtuelle()
+        horloge.dormir_jusqua(12.5)
+        assert horloge.maintenant() == 12.5
+
+    def test_heure_murale_suit_le_temps(self):
+        """L'heure murale avance avec le temps virtuel."""
+        horloge = HorlogeVirtuelle(heure_murale_depart=1000.0)
+        horloge.dormir(60)
+        assert horloge.heure_murale() == 1060.0
+
+    def test_avancer_sans_attente(self):
+        """avancer() simule un retard sans compter d'attente."""
+        horloge = HorlogeVirtuelle()
+        horloge.avancer(5)
+        assert horloge.maintenant() == 5.0
+        assert horloge.nombre_attentes == 0
+
+    def test_duree_negative_ignoree(self):
+        """Une attente négative ne recule pas le temps."""
+        horloge = HorlogeVirtuelle(depart=5)
+        horloge.dormir(-1)
+        assert horloge.maintenant() == 5.0
+
+
+# =============================================================================
+# TESTS POUR LE MOTEUR EN TEMPS VIRTUEL
+# =============================================================================
+
+class TestMoteurTempsVirtuel:
+    """Tests du moteur piloté par une horloge injectée."""
+
+    def test_ordonnanceur_horloge_explicite(self):
+        """L'ordonnanceur accepte une horloge explicite."""
+        horloge = HorlogeVirtuelle()
+        ticks = list(OrdonnanceurTicks(10, horloge=horloge))
+        assert ticks == list(range(11))
+        assert horloge.maintenant() == 10.0
+
+    @patch('pomodoro.time.sleep')
+    @patch('pomodoro.emettre_son')
+    def test_compte_a_rebours_sans_sleep_reel(self, mock_son, mock_sleep,
+                                              horloge_virtuelle):
+        """Avec une horloge virtuelle, time.sleep n'est jamais appelé."""
+        with patch.object(sys, 'stdout', StringIO()):
+            compte_a_rebours(25, "TRAVAIL")
+
+        mock_sleep.assert_not_called()
+        assert horloge_virtuelle.maintenant() == 25 * 60
+
+    @patch('pomodoro.compte_a_rebours')
+    @patch('pomodoro.time.sleep')
+    def test_enchainement_auto_utilise_horloge(self, mock_sleep, mock_compte,
+                                               horloge_virtuelle):
+        """Le délai de 2 s du mode auto passe par l'horloge du contexte."""
+        with patch.object(sys, 'stdout', StringIO()):
+            executer_cycle_pomodoro(25, 5, 15, 1, 2, True)
+
+        mock_sleep.assert_not_called()
+        assert horloge_virtuelle.maintenant() == 2.0
+
+    def test_resolution_configurable(self, horloge_virtuelle):
+        """La résolution des ticks réduit le nombre de trames rendues."""
+        sortie = MagicMock()
+        with patch.object(pomodoro.contexte, 'periode_tick', 60):
+            with patch.object(sys, 'stdout', sortie):
+                with patch('pomodoro.effacer_ligne'):
+                    compte_a_rebours(25, "TRAVAIL", True)
+
+        trames = [c for c in sortie.write.call_args_list if c[0][0].startswith('\r')]
+        assert len(trames) == 26
+        assert "00:00" in trames[-1][0][0]
+        assert horloge_virtuelle.maintenant() == 25 * 60
+
+    def test_temps_virtuel_restaure_contexte(self):
+        """Le contexte retrouve son horloge d'origine après la simulation."""
+        horloge_origine = pomodoro.contexte.horloge
+        with temps_virtuel(resolution=30):
+            assert isinstance(pomodoro.contexte.horloge, HorlogeVirtuelle)
+            assert pomodoro.contexte.periode_tick == 30
+        assert pomodoro.contexte.horloge is horloge_origine
+        assert pomodoro.contexte.periode_tick == 1.0
+
+
+# =============================================================================
+# TESTS POUR LA SIMULATION DE PLANS
+# =============================================================================
+
+class TestSimulation:
+    """Tests pour la fixture de simulation."""
+
+    def test_plan_4_cycles_auto_duree(self, simulation_pomodoro):
+        """Un plan de 4 cycles dure 4 travaux, 3 pauses et 3 enchaînements."""
+        duree = simulation_pomodoro.executer_plan(cycles=4)
+        assert duree == 4 * 25 * 60 + 3 * 5 * 60 + 3 * 2
+
+    def test_plan_avec_pause_longue(self, simulation_pomodoro):
+        """La pause longue du 4e cycle est incluse dans un plan de 5 cycles."""
+        duree = simulation_pomodoro.executer_plan(cycles=5)
+        assert duree == 5 * 25 * 60 + 3 * 5 * 60 + 15 * 60 + 4 * 2
+
+    def test_plan_4_cycles_en_millisecondes(self):
+        """Un plan de 4 cycles à pleine résolution prend quelques ms."""
+        with temps_virtuel() as horloge:
+            with patch.object(pomodoro, 'emettre_son'):
+                simulation = Simulation(horloge)
+                debut = time.perf_counter()
+                simulation.executer_plan(cycles=4)
+                assert time.perf_counter() - debut < 1.0
+
+    def test_milliers_de_cycles_par_seconde(self, simulation_pomodoro):
+        """La fixture simule des milliers de cycles par seconde."""
+        debut = time.perf_counter()
+        for _ in range(250):
+            simulation_pomodoro.executer_plan(cycles=4)
+        assert time.perf_counter() - debut < 1.0
+
+    def test_sortie_absorbee(self, simulation_pomodoro, capsys):
+        """La simulation n'écrit rien sur la sortie réelle."""
+        simulation_pomodoro.executer_plan(cycles=2)
+        assert capsys.readouterr().out == ""
+        assert "Cycle 2/2" in simulation_pomodoro.sortie.getvalue()
+
+    def test_executer_session(self, simulation_pomodoro):
+        """Une session isolée se simule aussi."""
+        ordonnanceur = simulation_pomodoro.executer_session(5, "PAUSE")
+        assert simulation_pomodoro.horloge.maintenant() == 5 * 60
+        assert ordonnanceur.ticks_sautes == 0
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le mode JSON de Pymodoro-CLI.
+==================================================
+
+Ce module teste le flux d'événements JSON (--json):
+- Format et horodatage des événements
+- Cadence des événements "tick"
+- Intégration avec compte_a_rebours(), executer_cycle_pomodoro() et main()
+"""
+
+import pytest
+import sys
+import json
+from unittest.mock import patch
+from io import StringIO, BytesIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import (
+    SortieJSON,
+    compte_a_rebours,
+    contexte_temporaire,
+    creer_parseur_arguments,
+    executer_cycle_pomodoro,
+    main,
+    FREQUENCE_TICKS_JSON_DEFAUT
+)
+
+
+def _evenements(texte):
+    """Décode chaque ligne JSON d'une sortie."""
+    return [json.loads(ligne) for ligne in texte.splitlines() if ligne]
+
+
+def _session_json(duree_minutes, frequence=1.0, type_session="TRAVAIL"):
+    """Exécute une session en mode JSON et retourne ses événements."""
+    flux = StringIO()
+    with contexte_temporaire(sortie=SortieJSON(frequence, flux=flux)):
+        with patch.object(sys, 'stdout', StringIO()):
+            compte_a_rebours(duree_minutes, type_session, True)
+    return _evenements(flux.getvalue())
+
+
+# =============================================================================
+# TESTS POUR LE FORMAT DES ÉVÉNEMENTS
+# =============================================================================
+
+class TestFormatEvenements:
+    """Tests pour le format des événements JSON."""
+
+    def test_sequence_session(self, horloge_virtuelle):
+        """Une session émet session_start, des ticks puis session_end."""
+        evenements = _session_json(1)
+        noms = [e["event"] for e in evenements]
+        assert noms[0] == "session_start"
+        assert noms[-1] == "session_end"
+        assert set(noms[1:-1]) == {"tick"}
+
+    def test_horodatages_presents(self, horloge_virtuelle):
+        """Chaque événement porte un horodatage monotone et mural."""
+        for evenement in _session_json(1):
+            assert "mono" in evenement
+            assert "wall" in evenement
+
+    def test_horodatages_croissants(self, horloge_virtuelle):
+        """Les horodatages monotones ne reculent jamais."""
+        monos = [e["mono"] for e in _session_json(2)]
+        assert monos == sorted(monos)
+
+    def test_type_session_stable(self, horloge_virtuelle):
+        """Les types de session ont un nom stable en anglais."""
+        assert _session_json(1, type_session="PAUSE LONGUE")[0]["session"] == "long_break"
+        assert _session_json(1, type_session="TRAVAIL")[0]["session"] == "work"
+
+    def test_duree_dans_session_start(self, horloge_virtuelle):
+        """session_start indique la durée en secondes."""
+        assert _session_json(5)[0]["duration"] == 300
+
+    def test_lignes_compactes(self, horloge_virtuelle):
+        """Les objets sont écrits sans espaces superflus."""
+        flux = StringIO()
+        with contexte_temporaire(sortie=SortieJSON(flux=flux)):
+            with patch.object(sys, 'stdout', StringIO()):
+                compte_a_rebours(1, "TRAVAIL", True)
+        assert ", " not in flux.getvalue()
+        assert '": ' not in flux.getvalue()
+
+    def test_restant_decroissant(self, horloge_virtuelle):
+        """Le temps restant des ticks décroît jusqu'à zéro."""
+        ticks = [e["remaining"] for e in _session_json(1) if e["event"] == "tick"]
+        assert ticks[0] == 60
+        assert ticks[-1] == 0
+        assert ticks == sorted(ticks, reverse=True)
+
+    def test_ecriture_binaire_si_disponible(self, horloge_virtuelle):
+        """Les événements passent par le tampon binaire du flux s'il existe."""
+        class Flux(StringIO):
+            buffer = BytesIO()
+
+        flux = Flux()
+        with contexte_temporaire(sortie=SortieJSON(flux=flux)):
+            with patch.object(sys, 'stdout', StringIO()):
+                compte_a_rebours(1, "TRAVAIL", True)
+
+        assert flux.getvalue() == ""
+        assert len(_evenements(flux.buffer.getvalue().decode("utf-8"))) == 63
+
+
+# =============================================================================
+# TESTS POUR LA CADENCE DES TICKS
+# =============================================================================
+
+class TestCadenceTicks:
+    """Tests pour la fréquence configurable des ticks."""
+
+    def test_frequence_1_hz(self, horloge_virtuelle):
+        """À 1 Hz, une minute produit 61 ticks."""
+        ticks = [e for e in _session_json(1) if e["event"] == "tick"]
+        assert len(ticks) == 61
+
+    def test_frequence_10_hz(self, horloge_virtuelle):
+        """À 10 Hz, une minute produit 601 ticks espacés de 0,1 s."""
+        ticks = [e for e in _session_json(1, frequence=10) if e["event"] == "tick"]
+        assert len(ticks) == 601
+        assert ticks[1]["mono"] - ticks[0]["mono"] == pytest.approx(0.1)
+
+    def test_tick_rate_defaut(self):
+        """Vérifie la valeur par défaut de --tick-rate."""
+        args = creer_parseur_arguments().parse_args([])
+        assert args.frequence_ticks == FREQUENCE_TICKS_JSON_DEFAUT
+        assert args.json is False
+
+    def test_tick_rate_invalide(self):
+        """Une fréquence nulle est refusée."""
+        with patch('sys.argv', ['pomodoro.py', '--json', '--tick-rate', '0']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(sys, 'stderr', StringIO()):
+                    with pytest.raises(SystemExit):
+                        main()
+
+
+# =============================================================================
+# TESTS POUR LES ÉVÉNEMENTS DE CYCLE ET D'ANNULATION
+# =============================================================================
+
+class TestEvenementsCycle:
+    """Tests pour cycle_end et cancelled."""
+
+    def test_annulation(self, horloge_virtuelle):
+        """Ctrl+C émet un événement cancelled avec le temps restant."""
+        flux = StringIO()
+        with contexte_temporaire(sortie=SortieJSON(flux=flux)):
+            with patch.object(sys, 'stdout', StringIO()):
+                with patch.object(horloge_virtuelle, 'dormir',
+                                  side_effect=KeyboardInterrupt):
+                    with pytest.raises(SystemExit):
+                        compte_a_rebours(25, "TRAVAIL", True)
+
+        dernier = _evenements(flux.getvalue())[-1]
+        assert dernier["event"] == "cancelled"
+        assert dernier["remaining"] == 1500
+
+    def test_fin_de_cycle(self, horloge_virtuelle):
+        """executer_cycle_pomodoro() émet cycle_end après la pause."""
+        flux = StringIO()
+        with contexte_temporaire(sortie=SortieJSON(flux=flux)):
+            with patch.object(sys, 'stdout', StringIO()):
+                executer_cycle_pomodoro(1, 1, 1, 1, 2, True, True)
+
+        evenements = _evenements(flux.getvalue())
+        assert evenements[-1]["event"] == "cycle_end"
+        assert evenements[-1]["cycle"] == 1
+        assert evenements[-1]["total"] == 2
+        debuts = [e["session"] for e in evenements if e["event"] == "session_start"]
+        assert debuts == ["work", "break"]
+
+    def test_fin_du_dernier_cycle(self, horloge_virtuelle):
+        """Le dernier cycle émet aussi cycle_end."""
+        flux = StringIO()
+        with contexte_temporaire(sortie=SortieJSON(flux=flux)):
+            with patch.object(sys, 'stdout', StringIO()):
+                executer_cycle_pomodoro(1, 1, 1, 2, 2, True, True)
+
+        assert _evenements(flux.getvalue())[-1]["event"] == "cycle_end"
+
+    def test_reprise(self, horloge_virtuelle):
+        """Une session reprise émet resumed et décompte depuis le temps restant."""
+        flux = StringIO()
+        with contexte_temporaire(sortie=SortieJSON(flux=flux)):
+            with patch.object(sys, 'stdout', StringIO()):
+                compte_a_rebours(25, "TRAVAIL", True, reprise=90)
+
+        evenements = _evenements(flux.getvalue())
+        assert [e["event"] for e in evenements[:2]] == ["session_start", "resumed"]
+        assert evenements[1]["remaining"] == 90
+        ticks = [e["remaining"] for e in evenements if e["event"] == "tick"]
+        assert max(ticks) <= 90
+        assert evenements[-1]["event"] == "session_end"
+
+
+# =============================================================================
+# TESTS POUR main() EN MODE JSON
+# =============================================================================
+
+class TestMainJSON:
+    """Tests pour l'option --json de main()."""
+
+    @patch('pomodoro.configurer_terminal')
+    def test_stdout_ne_contient_que_du_json(self, mock_config, horloge_virtuelle):
+        """En mode JSON, stdout ne reçoit que des objets JSON."""
+        stdout, stderr = StringIO(), StringIO()
+        with patch('sys.argv', ['pomodoro.py', '--json', '-w', '1', '-s']):
+            with patch.object(sys, 'stdout', stdout):
+                with patch.object(sys, 'stderr', stderr):
+                    main()
+
+        evenements = _evenements(stdout.getvalue())
+        assert evenements[0]["event"] == "session_start"
+        assert evenements[-1]["event"] == "cycle_end"
+
+    @patch('pomodoro.configurer_terminal')
+    def test_texte_redirige_sur_stderr(self, mock_config, horloge_virtuelle):
+        """La bannière et les messages humains partent sur stderr."""
+        stdout, stderr = StringIO(), StringIO()
+        with patch('sys.argv', ['pomodoro.py', '--json', '-w', '1', '-s']):
+            with patch.object(sys, 'stdout', stdout):
+                with patch.object(sys, 'stderr', stderr):
+                    main()
+
+        assert "PYMODORO-CLI" in stderr.getvalue()
+        assert "PYMODORO-CLI" not in stdout.getvalue()
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour les métriques Prometheus de Pymodoro-CLI.
+==============================================================
+
+Ce module teste l'exposition des métriques (--metrics-port):
+- Les compteurs de sessions et les histogrammes préalloués
+- Le format texte de Prometheus
+- Le service HTTP par la boucle des ticks, lu par un client réel
+- L'intégration avec compte_a_rebours() et main()
+"""
+
+import pytest
+import re
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import BusEvenements, SortieJSON, compte_a_rebours, contexte_temporaire, main
+from pomodoro_controle import ServeurControle
+from pomodoro_metriques import Histogramme, Metriques, ServeurMetriques, memoire_residente
+from pymodoro.testing import temps_virtuel
+
+# Une ligne d'échantillon : nom, étiquettes facultatives, valeur
+ECHANTILLON = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[a-z_]+="[^"]*"\})? (\S+)$')
+
+
+def _analyser(texte):
+    """Analyse un texte exposé : {(nom, étiquettes): valeur}, après vérification du format."""
+    assert texte.endswith("\n")
+    echantillons = {}
+    types = {}
+    for ligne in texte.splitlines():
+        if ligne.startswith("# TYPE "):
+            _, _, nom, type_metrique = ligne.split(" ")
+            types[nom] = type_metrique
+            continue
+        if ligne.startswith("# HELP "):
+            continue
+        correspondance = ECHANTILLON.match(ligne)
+        assert correspondance, ligne
+        nom, etiquettes, valeur = correspondance.groups()
+        assert any(nom == famille or nom.startswith(famille + "_") for famille in types), ligne
+        echantillons[(nom, etiquettes or "")] = float(valeur)
+    return echantillons
+
+
+def _fin(type_session="TRAVAIL"):
+    return {"type_session": type_session, "duree": 60, "passee": False, "cycle": 1}
+
+
+# =============================================================================
+# TESTS POUR LA COLLECTE
+# =============================================================================
+
+class TestCollecte:
+    """Tests pour Histogramme et Metriques."""
+
+    def test_histogramme(self):
+        """Chaque observation tombe dans la première classe qui la contient."""
+        histogramme = Histogramme((0.1, 1.0))
+        for valeur in (0.05, 0.1, 0.5, 3.0):
+            histogramme.observer(valeur)
+        assert list(histogramme.comptes) == [2, 1, 1]
+        assert histogramme.total == 4
+        assert histogramme.somme == pytest.approx(3.65)
+
+    def test_sessions_comptees_par_type(self):
+        """Les sessions publiées sur le bus sont comptées par type."""
+        bus = BusEvenements()
+        with Metriques() as metriques:
+            metriques.abonner(bus)
+            bus.publier("session_debut", {"type_session": "TRAVAIL"})
+            assert metriques.sessions_actives == 1
+            bus.publier("session_fin", _fin())
+            bus.publier("session_debut", {"type_session": "PAUSE LONGUE"})
+            bus.publier("session_annulee", {"type_session": "PAUSE LONGUE", "cycle": 4})
+        assert not bus.ecoute("session_fin")
+        echantillons = _analyser(metriques.exposer())
+        assert echantillons[("pymodoro_sessions_completed_total", '{type="work"}')] == 1
+        assert echantillons[("pymodoro_sessions_cancelled_total", '{type="long_break"}')] == 1
+        assert echantillons[("pymodoro_sessions_completed_total", '{type="break"}')] == 0
+        assert echantillons[("pymodoro_active_timers", "")] == 0
+
+    def test_histogramme_expose_cumule(self):
+        """Les classes exposées sont cumulées jusqu'à +Inf, avec la somme et le compte."""
+        metriques = Metriques()
+        for retard in (0.0005, 0.02, 10.0):
+            metriques.retard_ticks.observer(retard)
+        echantillons = _analyser(metriques.exposer())
+        assert echantillons[("pymodoro_tick_lateness_seconds_bucket", '{le="0.001"}')] == 1
+        assert echantillons[("pymodoro_tick_lateness_seconds_bucket", '{le="0.05"}')] == 2
+        assert echantillons[("pymodoro_tick_lateness_seconds_bucket", '{le="+Inf"}')] == 3
+        assert echantillons[("pymodoro_tick_lateness_seconds_count", "")] == 3
+        assert echantillons[("pymodoro_tick_lateness_seconds_sum", "")] == pytest.approx(10.0205)
+
+    def test_latence_notifications(self):
+        """La latence de la file de notifications est un résumé : quantiles, somme et compte."""
+        metriques = Metriques()
+        with patch.object(metriques, "notifications") as notifications:
+            notifications.statistiques.return_value = {
+                "latence_p50": 0.002, "latence_p99": 0.01, "latence_somme": 0.03,
+                "latence_nombre": 6, "distribuees": 5}
+            texte = metriques.exposer()
+        echantillons = _analyser(texte)
+        assert "# TYPE pymodoro_notification_latency_seconds summary\n" in texte
+        assert echantillons[("pymodoro_notification_latency_seconds",
+                             '{quantile="0.99"}')] == 0.01
+        assert echantillons[("pymodoro_notification_latency_seconds_sum", "")] == 0.03
+        assert echantillons[("pymodoro_notification_latency_seconds_count", "")] == 6
+        assert echantillons[("pymodoro_notifications_total", "")] == 5
+
+    def test_memoire_residente(self):
+        """La mémoire résidente est mesurée et exposée."""
+        rss = memoire_residente()
+        if rss is None:
+            pytest.skip("mémoire résidente non mesurable")
+        assert rss > 1024 * 1024
+        assert ("process_resident_memory_bytes", "") in _analyser(Metriques().exposer())
+
+
+# =============================================================================
+# TESTS POUR L'EXPOSITION HTTP
+# =============================================================================
+
+@pytest.fixture
+def serveur_metriques():
+    """Des métriques exposées sur un port libre, servies par une boucle sans pilotage."""
+    metriques = Metriques()
+    with ServeurControle(pilotage=False) as boucle, \
+            ServeurMetriques(metriques, 0) as serveur:
+        serveur.brancher(boucle)
+        assert boucle.ouvrir()
+        assert boucle.ecoute is None
+        yield boucle, serveur
+
+
+def _lire_url(boucle, url):
+    """Lit une URL avec urllib pendant que la boucle sert les sockets."""
+    resultat = {}
+
+    def client():
+        try:
+            with urllib.request.urlopen(url, timeout=5) as reponse:
+                resultat["reponse"] = (reponse.status, reponse.headers["Content-Type"],
+                                       reponse.read().decode("utf-8"))
+        except urllib.error.HTTPError as erreur:
+            resultat["reponse"] = (erreur.code, None, None)
+
+    fil = threading.Thread(target=client)
+    fil.start()
+    while fil.is_alive():
+        boucle.traiter(0.05)
+    fil.join()
+    return resultat["reponse"]
+
+
+class TestServeur:
+    """Tests pour ServeurMetriques."""
+
+    def test_lecture_par_client_http(self, serveur_metriques):
+        """GET /metrics renvoie le format texte de Prometheus."""
+        boucle, serveur = serveur_metriques
+        serveur.metriques.sessions_terminees[0] = 7
+        etat, type_contenu, corps = _lire_url(
+            boucle, f"http://127.0.0.1:{serveur.port}/metrics")
+        assert etat == 200
+        assert type_contenu.startswith("text/plain; version=0.0.4")
+        assert _analyser(corps)[("pymodoro_sessions_completed_total", '{type="work"}')] == 7
+        assert serveur.requetes == 1
+
+    def test_chemin_inconnu(self, serveur_metriques):
+        """Un autre chemin renvoie 404."""
+        boucle, serveur = serveur_metriques
+        etat, _, _ = _lire_url(boucle, f"http://127.0.0.1:{serveur.port}/")
+        assert etat == 404
+
+    def test_reponse_sans_blocage(self, serveur_metriques):
+        """Une grosse réponse part au rythme du client, sans bloquer la boucle."""
+        boucle, serveur = serveur_metriques
+        corps = b"x" * (8 * 1024 * 1024)
+        client = socket.create_connection(("127.0.0.1", serveur.port))
+        client.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+        with patch.object(serveur, "repondre", return_value=corps):
+            # Le client ne lit pas encore : chaque passage rend la main aussitôt
+            debut = time.monotonic()
+            for _ in range(5):
+                boucle.traiter(0.01)
+            assert time.monotonic() - debut < 1.0
+            assert len(boucle._sources) == 2
+
+            recu = bytearray()
+
+            def lire():
+                client.settimeout(5)
+                while morceau := client.recv(65536):
+                    recu.extend(morceau)
+
+            fil = threading.Thread(target=lire)
+            fil.start()
+            while fil.is_alive():
+                boucle.traiter(0.05)
+        client.close()
+        assert recu == corps
+        assert list(boucle._sources) == [serveur.ecoute]
+
+    def test_connexion_inactive_fermee(self, serveur_metriques):
+        """Une connexion qui n'envoie pas sa requête est fermée après le délai."""
+        boucle, serveur = serveur_metriques
+        client = socket.create_connection(("127.0.0.1", serveur.port))
+        client.settimeout(5)
+        with patch("pomodoro_metriques.DELAI_INACTIVITE", 0.1):
+            limite = time.monotonic() + 5
+            while len(boucle._sources) < 2 and time.monotonic() < limite:
+                boucle.traiter(0.05)
+            debut = time.monotonic()
+            while len(boucle._sources) > 1 and time.monotonic() < limite:
+                boucle.traiter(None)
+        assert time.monotonic() - debut < 1.0
+        assert list(boucle._sources) == [serveur.ecoute]
+        assert client.recv(4096) == b""
+        client.close()
+
+    def test_port_occupe(self, serveur_metriques):
+        """Un port déjà pris est signalé par OSError."""
+        boucle, serveur = serveur_metriques
+        with pytest.raises(OSError):
+            ServeurMetriques(Metriques(), serveur.port).brancher(boucle)
+
+    def test_fermeture(self, serveur_metriques):
+        """La fermeture retire la socket de la boucle."""
+        boucle, serveur = serveur_metriques
+        ecoute = serveur.ecoute
+        serveur.fermer()
+        assert ecoute.fileno() == -1
+        assert ecoute not in boucle._sources
+
+
+# =============================================================================
+# TESTS POUR L'INTÉGRATION
+# =============================================================================
+
+class TestIntegration:
+    """Tests pour les observations du moteur et l'option --metrics-port."""
+
+    def test_observations_du_moteur(self):
+        """compte_a_rebours() observe le retard de chaque tick et le rendu de chaque trame."""
+        metriques = Metriques()
+        with temps_virtuel(resolution=1):
+            with contexte_temporaire(sortie=SortieJSON(1.0),
+                                     metriques=metriques):
+                with patch('sys.stdout', StringIO()):
+                    compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+        assert metriques.retard_ticks.total == 60
+        assert metriques.duree_rendu.total == 61
+
+    def test_sans_metriques(self):
+        """Sans métriques dans le contexte, rien n'est observé."""
+        with temps_virtuel(resolution=60):
+            with patch('sys.stdout', StringIO()):
+                ordonnanceur = compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+        assert ordonnanceur.histogramme_retard is None
+
+    def test_main(self):
+        """main() compte les sessions et sert les métriques, même sans pilotage."""
+        exposees = []
+        fermer = ServeurMetriques.fermer
+
+        def fermer_et_relever(serveur):
+            exposees.append((serveur.port, serveur.metriques.exposer()))
+            fermer(serveur)
+
+        with patch('sys.argv', ['pomodoro.py', '-w', '1', '-b', '1', '-c', '2', '-a', '-s',
+                                '--no-history', '--no-control', '--metrics-port', '0']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(ServeurMetriques, 'fermer', fermer_et_relever):
+                    with patch.object(sys, 'stdout', StringIO()) as sortie:
+                        with temps_virtuel(resolution=60):
+                            main()
+        port, texte = exposees[0]
+        assert f"http://127.0.0.1:{port}/metrics" in sortie.getvalue()
+        echantillons = _analyser(texte)
+        assert echantillons[("pymodoro_sessions_completed_total", '{type="work"}')] == 2
+        assert echantillons[("pymodoro_sessions_completed_total", '{type="break"}')] == 1
+        assert echantillons[("pymodoro_tick_lateness_seconds_count", "")] > 0
+
+    def test_port_invalide(self):
+        """Un port hors limites est refusé."""
+        with patch('sys.argv', ['pomodoro.py', '--metrics-port', '70000']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(sys, 'stderr', StringIO()):
+                    with pytest.raises(SystemExit) as sortie:
+                        main()
+        assert sortie.value.code == 2
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour la file de notifications de Pymodoro-CLI.
+==============================================================
+
+Ce module teste la distribution des notifications en arrière-plan:
+- Le dépôt sans attente et la distribution par le thread de fond
+- La fusion des doublons et le délai maximal par canal
+- Les indicateurs de supervision (profondeur, latences)
+- L'utilisation de la file par le moteur et par main()
+"""
+
+import pytest
+import sys
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+import pomodoro
+from pomodoro import compte_a_rebours, main
+from pomodoro_notifications import FileNotifications
+from pymodoro.testing import temps_virtuel
+
+
+@pytest.fixture
+def notifications():
+    """Une file de notifications fermée en fin de test."""
+    with FileNotifications(horloge=pomodoro.HorlogeSysteme()) as file:
+        yield file
+
+
+def _bloquante(evenement, appels=None):
+    """Retourne une notification qui attend `evenement` avant de rendre la main."""
+    def notifier():
+        if appels is not None:
+            appels.append(threading.current_thread().name)
+        evenement.wait(5)
+    return notifier
+
+
+# =============================================================================
+# TESTS POUR LA DISTRIBUTION
+# =============================================================================
+
+class TestDistribution:
+    """Tests pour le dépôt et la distribution des notifications."""
+
+    def test_thread_lance_au_premier_depot(self):
+        """Aucun thread n'est lancé tant que rien n'est déposé."""
+        avant = set(threading.enumerate())
+        file = FileNotifications()
+        assert set(threading.enumerate()) <= avant
+        file.fermer()
+
+    def test_depot_sans_attente(self, notifications):
+        """soumettre() rend la main pendant qu'une notification bloque."""
+        debloque = threading.Event()
+        debut = time.perf_counter()
+        assert notifications.soumettre("son", _bloquante(debloque))
+        assert time.perf_counter() - debut < 0.1
+        debloque.set()
+        assert notifications.vider(5)
+        assert notifications.distribuees == 1
+
+    def test_distribution_hors_thread_appelant(self, notifications):
+        """La notification s'exécute dans un thread de fond."""
+        appels = []
+        notifications.soumettre("son", lambda: appels.append(threading.current_thread()))
+        notifications.vider(5)
+        assert appels and appels[0] is not threading.current_thread()
+
+    def test_ordre_de_depot(self, notifications):
+        """Les canaux sont distribués dans l'ordre de dépôt."""
+        appels = []
+        for canal in ("son", "bureau", "crochet"):
+            notifications.soumettre(canal, lambda canal=canal: appels.append(canal))
+        notifications.vider(5)
+        assert appels == ["son", "bureau", "crochet"]
+
+    def test_exception_comptee(self, notifications):
+        """Une notification qui lève n'arrête pas la distribution."""
+        appels = []
+        notifications.soumettre("son", MagicMock(side_effect=OSError("pas de son")))
+        notifications.soumettre("bureau", lambda: appels.append(1))
+        notifications.vider(5)
+        assert notifications.echecs == 1
+        assert appels == [1]
+
+    def test_fermer_distribue_les_notifications_en_attente(self):
+        """fermer() attend la distribution des notifications déposées."""
+        appels = []
+        file = FileNotifications()
+        file.soumettre("son", lambda: (time.sleep(0.05), appels.append(1)))
+        file.fermer()
+        assert appels == [1]
+
+
+# =============================================================================
+# TESTS POUR LA FUSION ET LES DÉLAIS
+# =============================================================================
+
+class TestFusionEtDelais:
+    """Tests pour la fusion des doublons et le délai par canal."""
+
+    def test_doublons_fusionnes(self, notifications):
+        """Une alerte déjà en attente sur le canal absorbe les suivantes."""
+        debloque = threading.Event()
+        appels = []
+        notifications.soumettre("occupe", _bloquante(debloque))
+        time.sleep(0.05)
+        assert notifications.soumettre("son", lambda: appels.append(1))
+        assert not notifications.soumettre("son", lambda: appels.append(2))
+        assert notifications.profondeur == 1
+        debloque.set()
+        notifications.vider(5)
+        assert appels == [1]
+        assert notifications.fusionnees == 1
+
+    def test_delai_par_canal(self):
+        """Une notification trop longue est abandonnée et la file continue."""
+        debloque = threading.Event()
+        appels = []
+        with FileNotifications(delais={"son": 0.05}) as file:
+            file.soumettre("son", _bloquante(debloque))
+            file.soumettre("bureau", lambda: appels.append(1))
+            assert file.vider(2)
+            assert file.expirees == 1
+            assert appels == [1]
+            debloque.set()
+
+    def test_canal_expire_encore_actif(self):
+        """Tant que la notification expirée joue, le canal ne se relance pas."""
+        debloque = threading.Event()
+        appels = []
+        with FileNotifications(delais={"son": 0.05}) as file:
+            file.soumettre("son", _bloquante(debloque, appels))
+            file.vider(2)
+            file.soumettre("son", _bloquante(debloque, appels))
+            file.vider(2)
+            assert len(appels) == 1
+            assert file.fusionnees == 1
+            debloque.set()
+
+
+# =============================================================================
+# TESTS POUR LA SUPERVISION
+# =============================================================================
+
+class TestSupervision:
+    """Tests pour la profondeur et les latences exposées."""
+
+    def test_profondeur(self, notifications):
+        """La profondeur compte les notifications en attente."""
+        debloque = threading.Event()
+        notifications.soumettre("occupe", _bloquante(debloque))
+        time.sleep(0.05)
+        notifications.soumettre("son", lambda: None)
+        notifications.soumettre("bureau", lambda: None)
+        assert notifications.profondeur == 2
+        debloque.set()
+        notifications.vider(5)
+        assert notifications.profondeur == 0
+
+    def test_statistiques(self, notifications):
+        """Chaque distribution enregistre sa latence."""
+        for canal in ("son", "bureau"):
+            notifications.soumettre(canal, lambda: None)
+        notifications.vider(5)
+        statistiques = notifications.statistiques()
+        assert notifications.latences.nombre == 2
+        assert statistiques["distribuees"] == 2
+        assert statistiques["profondeur"] == 0
+        assert 0 <= statistiques["latence_p50"] <= statistiques["latence_max"] < 1
+        assert statistiques["latence_nombre"] == 2
+        assert statistiques["latence_max"] <= statistiques["latence_somme"] < 2
+
+
+# =============================================================================
+# TESTS POUR L'UTILISATION PAR LE MOTEUR
+# =============================================================================
+
+class TestUtilisationMoteur:
+    """Tests pour le dépôt du son de fin par le moteur."""
+
+    @patch('pomodoro.emettre_son')
+    def test_compte_a_rebours_depose_le_son(self, mock_son, horloge_virtuelle):
+        """Avec une file dans le contexte, le moteur n'appelle pas le son lui-même."""
+        file = MagicMock()
+        with pomodoro.contexte_temporaire(notifications=file):
+            with patch.object(sys, 'stdout', StringIO()):
+                compte_a_rebours(1, "TRAVAIL")
+
+        file.soumettre.assert_called_once_with("son", mock_son)
+        mock_son.assert_not_called()
+
+    def test_main_son_en_arriere_plan(self):
+        """main() distribue le son hors du thread principal, avant de rendre la main."""
+        threads = []
+        son = MagicMock(side_effect=lambda: threads.append(threading.current_thread()))
+        with patch('sys.argv', ['pomodoro.py', '-w', '1', '--no-history']):
+            with patch('pomodoro.configurer_terminal'), patch('pomodoro.emettre_son', son):
+                with patch.object(sys, 'stdout', StringIO()):
+                    with temps_virtuel(resolution=60):
+                        main()
+
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+        assert pomodoro.contexte.notifications is None
+
+    def test_main_silencieux_sans_file(self):
+        """En mode silencieux, main() ne crée pas de file."""
+        with patch('sys.argv', ['pomodoro.py', '-w', '1', '-s', '--no-history']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch('pomodoro_notifications.FileNotifications') as mock_file:
+                    with patch.object(sys, 'stdout', StringIO()):
+                        with temps_virtuel(resolution=60):
+                            main()
+        mock_file.assert_not_called()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le profil des ticks de Pymodoro-CLI.
+=========================================================
+
+Ce module teste le mode --profile:
+- Le tampon circulaire préalloué et l'écrasement des plus anciens ticks
+- Les quantiles, le rapport et l'export CSV
+- Les mesures prises par compte_a_rebours() et les options de main()
+"""
+
+import pytest
+import csv
+import sys
+from unittest.mock import patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import SortieTerminal, compte_a_rebours, contexte_temporaire, main
+from pomodoro_profil import ProfilTicks
+from pymodoro.testing import temps_virtuel
+
+
+def _profil_rempli(nombre, capacite=100):
+    """Un profil où le tick i a i ms de retard et i µs d'écriture."""
+    profil = ProfilTicks(capacite=capacite)
+    for indice in range(1, nombre + 1):
+        profil.reveil(float(indice), indice + indice / 1000)
+        profil.rendu(0.0, indice / 1e6)
+    return profil
+
+
+# =============================================================================
+# TESTS POUR L'ENREGISTREMENT
+# =============================================================================
+
+class TestEnregistrement:
+    """Tests pour le tampon circulaire de ProfilTicks."""
+
+    def test_tampon_prealloue(self):
+        """Le tampon est alloué à la création et ne grandit pas."""
+        profil = ProfilTicks(capacite=8)
+        taille = len(profil.tampon)
+        for tick in range(20):
+            profil.reveil(tick, tick)
+        assert len(profil.tampon) == taille == 32
+
+    def test_ecrasement_des_plus_anciens(self):
+        """Au-delà de la capacité, seuls les derniers ticks sont gardés, dans l'ordre."""
+        profil = _profil_rempli(10, capacite=4)
+        assert profil.gardes == 4
+        assert profil.ecrits == 10
+        assert [mesure[0] for mesure in profil.mesures()] == [7.0, 8.0, 9.0, 10.0]
+
+    def test_rendu_complete_le_tick_courant(self):
+        """rendu() remplit l'enregistrement ouvert par reveil()."""
+        profil = ProfilTicks(capacite=4)
+        profil.reveil(1.0, 1.5)
+        profil.rendu(0.25, 0.75)
+        assert profil.mesures() == [(1.0, 1.5, 0.25, 0.75)]
+
+
+# =============================================================================
+# TESTS POUR LE RAPPORT
+# =============================================================================
+
+class TestRapport:
+    """Tests pour les statistiques, le rapport et l'export."""
+
+    def test_quantiles(self):
+        """Les quantiles sont pris au rang le plus proche."""
+        statistiques = _profil_rempli(100).statistiques()
+        assert statistiques["retard"]["p50"] == pytest.approx(0.050)
+        assert statistiques["retard"]["p95"] == pytest.approx(0.095)
+        assert statistiques["retard"]["p99"] == pytest.approx(0.099)
+        assert statistiques["retard"]["max"] == pytest.approx(0.100)
+        assert statistiques["ecriture"]["max"] == pytest.approx(100e-6)
+
+    def test_rapport_en_millisecondes(self):
+        """Le rapport donne p50/p95/p99/max de chaque mesure."""
+        rapport = _profil_rempli(100).rapport()
+        assert "p50" in rapport and "p99" in rapport and "max" in rapport
+        assert "Retard" in rapport and "100.000 ms" in rapport
+
+    def test_sans_tick(self):
+        """Sans tick, le rapport le signale."""
+        assert "aucun tick" in ProfilTicks(capacite=4).rapport()
+
+    def test_export_csv(self, tmp_path):
+        """L'export écrit une ligne par tick gardé."""
+        chemin = tmp_path / "ticks.csv"
+        with ProfilTicks(capacite=4, chemin_export=str(chemin), flux=StringIO()) as profil:
+            profil.reveil(1.0, 1.002)
+            profil.rendu(0.0001, 0.0003)
+        with open(chemin, encoding="utf-8") as fichier:
+            lignes = list(csv.DictReader(fichier))
+        assert len(lignes) == 1
+        assert float(lignes[0]["retard"]) == pytest.approx(0.002)
+        assert float(lignes[0]["ecriture"]) == pytest.approx(0.0003)
+        assert "ticks.csv" in profil.flux.getvalue()
+
+
+# =============================================================================
+# TESTS POUR L'INTÉGRATION
+# =============================================================================
+
+class TestIntegration:
+    """Tests pour les mesures du moteur et les options de main()."""
+
+    def test_mesures_du_moteur(self):
+        """Chaque tick d'une session est enregistré, avec sa trame."""
+        profil = ProfilTicks(capacite=100)
+        with temps_virtuel(resolution=1):
+            with contexte_temporaire(sortie=SortieTerminal(), profil=profil):
+                with patch('sys.stdout', StringIO()):
+                    compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+        assert profil.ecrits == 61
+        assert all(reveil == echeance for echeance, reveil, _, _ in profil.mesures())
+        assert all(ecriture > 0 for _, _, _, ecriture in profil.mesures())
+
+    def test_main(self, tmp_path):
+        """main() affiche le rapport sur stderr et exporte les mesures."""
+        chemin = tmp_path / "ticks.csv"
+        with patch('sys.argv', ['pomodoro.py', '-b', '1', '-p', '-s', '--no-history',
+                                '--profile', '--profile-output', str(chemin)]):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(sys, 'stdout', StringIO()), \
+                        patch.object(sys, 'stderr', StringIO()) as erreurs:
+                    with temps_virtuel(resolution=1):
+                        main()
+        assert "Profil de" in erreurs.getvalue()
+        with open(chemin, encoding="utf-8") as fichier:
+            assert len(fichier.readlines()) > 1
+
+    def test_export_sans_profil(self):
+        """--profile-output sans --profile est refusé."""
+        with patch('sys.argv', ['pomodoro.py', '--profile-output', 'ticks.csv']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(sys, 'stderr', StringIO()):
+                    with pytest.raises(SystemExit) as sortie:
+                        main()
+        assert sortie.value.code == 2
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le rendu des trames de Pymodoro-CLI.
+=========================================================
+
+Ce module teste la classe RenduProgression:
+- Contenu des trames précalculées
+- Barre au huitième de case (--fps)
+- Écriture directe sur le descripteur d'un terminal
+- Absence d'allocation par trame
+"""
+
+import pytest
+import sys
+import os
+import tracemalloc
+from unittest.mock import patch, MagicMock
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import RenduProgression, BLOCS_HUITIEMES, LARGEUR_BARRE, formater_temps
+
+
+def _texte(trame):
+    """Décode une trame en texte."""
+    return bytes(trame).decode("utf-8")
+
+
+# =============================================================================
+# TESTS POUR LA COMPOSITION DES TRAMES
+# =============================================================================
+
+class TestComposerTrame:
+    """Tests pour le contenu des trames composées."""
+
+    def test_trame_debut_session(self):
+        """La trame initiale a une barre vide et le temps complet."""
+        rendu = RenduProgression("🍅", "\033[91m", 1500, flux=StringIO())
+        texte = _texte(rendu.composer(1500))
+        assert texte.startswith("\r    🍅 [")
+        assert "░" * LARGEUR_BARRE in texte
+        assert "\033[91m25:00\033[0m restant" in texte
+
+    def test_trame_fin_session(self):
+        """La trame finale a une barre pleine et 00:00."""
+        rendu = RenduProgression("☕", "\033[92m", 300, flux=StringIO())
+        texte = _texte(rendu.composer(0))
+        assert "█" * LARGEUR_BARRE in texte
+        assert "00:00" in texte
+
+    @pytest.mark.parametrize("restant", [1500, 1499, 1234, 750, 61, 59, 1, 0])
+    def test_trame_identique_au_rendu_historique(self, restant):
+        """Chaque trame reproduit exactement l'affichage historique."""
+        rendu = RenduProgression("🍅", "\033[91m", 1500, flux=StringIO())
+        progression = 1 - (restant / 1500)
+        rempli = int(30 * progression)
+        barre = "█" * rempli + "░" * (30 - rempli)
+        attendu = f"\r    🍅 [{barre}] \033[91m{formater_temps(restant)}\033[0m restant"
+        assert _texte(rendu.composer(restant)) == attendu
+
+    def test_trame_reutilisee(self):
+        """composer() retourne toujours le même bytearray."""
+        rendu = RenduProgression("🍅", "\033[91m", 120, flux=StringIO())
+        assert rendu.composer(120) is rendu.composer(5)
+
+    def test_taille_trame_constante(self):
+        """Toutes les trames d'une session ont la même taille en octets."""
+        rendu = RenduProgression("🍅", "\033[91m", 600, flux=StringIO())
+        tailles = {len(rendu.composer(s)) for s in range(601)}
+        assert len(tailles) == 1
+
+    def test_31_etats_de_barre(self):
+        """Les 31 états possibles de la barre sont précalculés."""
+        rendu = RenduProgression("🍅", "\033[91m", 1500, flux=StringIO())
+        assert len(rendu.barres) == LARGEUR_BARRE + 1
+        assert len(set(rendu.barre_par_restant)) == LARGEUR_BARRE + 1
+
+    def test_plus_de_100_minutes(self):
+        """Les durées de 100 minutes et plus restent alignées."""
+        rendu = RenduProgression("🍅", "\033[91m", 120 * 60, flux=StringIO())
+        assert "120:00" in _texte(rendu.composer(120 * 60))
+        assert " 05:07" in _texte(rendu.composer(307))
+
+    def test_duree_nulle(self):
+        """Une durée nulle donne une barre pleine sans erreur."""
+        rendu = RenduProgression("🍅", "\033[91m", 0, flux=StringIO())
+        assert "█" * LARGEUR_BARRE in _texte(rendu.composer(0))
+
+
+# =============================================================================
+# TESTS POUR LA BARRE AU HUITIÈME DE CASE
+# =============================================================================
+
+class TestHuitiemes:
+    """Tests pour la barre au huitième de case."""
+
+    def test_241_etats_de_meme_taille(self):
+        """Les 8 * largeur + 1 états ont tous la taille de la barre entière."""
+        rendu = RenduProgression("🍅", "\033[91m", 60, flux=StringIO(), huitiemes=True)
+        assert len(rendu.barres_fines) == 8 * LARGEUR_BARRE + 1
+        assert {len(barre) for barre in rendu.barres_fines} == {len(rendu.barres[0])}
+
+    def test_bloc_partiel(self):
+        """La case entamée est dessinée par le bloc du nombre de huitièmes écoulés."""
+        rendu = RenduProgression("🍅", "\033[91m", 240, flux=StringIO(), huitiemes=True)
+        # 240 s pour 240 huitièmes : 13 s écoulées, 1 case pleine et 5 huitièmes
+        texte = _texte(rendu.composer(227, 227.0))
+        assert "█" + BLOCS_HUITIEMES[4] + "░" * (LARGEUR_BARRE - 2) in texte
+        assert "03:47" in texte
+
+    def test_avance_entre_deux_secondes(self):
+        """Avec le temps restant exact, la barre avance sans que la seconde change."""
+        rendu = RenduProgression("☕", "\033[92m", 60, flux=StringIO(), huitiemes=True)
+        avant = _texte(rendu.composer(30, 30.0))
+        apres = _texte(rendu.composer(30, 29.6))
+        assert avant != apres
+        assert "00:30" in avant and "00:30" in apres
+
+    def test_bornes(self):
+        """La barre est vide au début, pleine à la fin, même hors bornes."""
+        rendu = RenduProgression("🍅", "\033[91m", 60, flux=StringIO(), huitiemes=True)
+        assert "░" * LARGEUR_BARRE in _texte(rendu.composer(60, 61.0))
+        assert "█" * LARGEUR_BARRE in _texte(rendu.composer(0, -0.5))
+
+    def test_seconde_entiere_sans_restant(self):
+        """Sans temps restant exact, la barre reste à la case près."""
+        rendu = RenduProgression("🍅", "\033[91m", 1500, flux=StringIO(), huitiemes=True)
+        historique = RenduProgression("🍅", "\033[91m", 1500, flux=StringIO())
+        assert bytes(rendu.composer(1234)) == bytes(historique.composer(1234))
+
+
+# =============================================================================
+# TESTS POUR L'ÉMISSION DES TRAMES
+# =============================================================================
+
+class TestAfficherTrame:
+    """Tests pour l'émission des trames."""
+
+    def test_flux_texte_recoit_trame_decodee(self):
+        """Un flux non terminal reçoit la trame sous forme de texte."""
+        flux = StringIO()
+        RenduProgression("🍅", "\033[91m", 60, flux=flux).afficher(30)
+        assert "00:30" in flux.getvalue()
+
+    def test_mock_non_considere_comme_terminal(self):
+        """Un MagicMock n'est jamais pris pour un descripteur de terminal."""
+        flux = MagicMock()
+        rendu = RenduProgression("🍅", "\033[91m", 60, flux=flux)
+        assert rendu.descripteur is None
+        rendu.afficher(10)
+        flux.write.assert_called_once()
+
+    def test_terminal_un_seul_os_write(self):
+        """Sur un terminal, chaque trame est émise en un seul os.write."""
+        flux = MagicMock()
+        flux.isatty.return_value = True
+        flux.fileno.return_value = 7
+        rendu = RenduProgression("🍅", "\033[91m", 60, flux=flux)
+
+        with patch('pomodoro.os.write', side_effect=lambda fd, b: len(b)) as mock_write:
+            rendu.afficher(42)
+
+        mock_write.assert_called_once()
+        assert mock_write.call_args[0][0] == 7
+        flux.write.assert_not_called()
+
+    def test_ecriture_partielle_completee(self):
+        """Une écriture partielle est complétée par les appels suivants."""
+        flux = MagicMock()
+        flux.isatty.return_value = True
+        flux.fileno.return_value = 7
+        rendu = RenduProgression("🍅", "\033[91m", 60, flux=flux)
+        recu = bytearray()
+
+        def ecrire(fd, donnees):
+            morceau = bytes(donnees[:10])
+            recu.extend(morceau)
+            return len(morceau)
+
+        with patch('pomodoro.os.write', side_effect=ecrire):
+            rendu.afficher(42)
+
+        assert bytes(recu) == bytes(rendu.trame)
+
+
+# =============================================================================
+# TESTS POUR L'ABSENCE D'ALLOCATION
+# =============================================================================
+
+class TestSansAllocation:
+    """Vérifie que le rendu d'une trame n'alloue aucun objet."""
+
+    def test_aucune_allocation_par_trame(self):
+        """Le pic d'allocation ne dépend pas du nombre de trames émises."""
+        descripteur = os.open(os.devnull, os.O_WRONLY)
+        try:
+            rendu = RenduProgression("🍅", "\033[91m", 1500, flux=StringIO())
+            rendu.descripteur = descripteur
+            valeurs = list(range(1500, -1, -1))
+            for secondes in valeurs:
+                rendu.afficher(secondes)
+
+            tracemalloc.start()
+            try:
+                for secondes in valeurs:
+                    rendu.afficher(secondes)
+                actuel, pic = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        finally:
+            os.close(descripteur)
+
+        # Rien n'est conservé et aucune trame n'est construite en mémoire
+        # (une trame fait à elle seule plus de 100 octets)
+        assert actuel == 0
+        assert pic < 512
+
+    def test_aucune_allocation_au_huitieme(self):
+        """La barre au huitième de case n'alloue rien non plus, à 30 trames par seconde."""
+        rendu = RenduProgression("🍅", "\033[91m", 60, flux=StringIO(), huitiemes=True)
+        rendu.descripteur = os.open(os.devnull, os.O_WRONLY)
+        try:
+            trames = [(60 - indice // 30, 60 - indice / 30) for indice in range(1801)]
+            for secondes, restant in trames:
+                rendu.afficher(secondes, restant)
+
+            tracemalloc.start()
+            try:
+                for secondes, restant in trames:
+                    rendu.afficher(secondes, restant)
+                actuel, pic = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        finally:
+            os.close(rendu.descripteur)
+
+        assert actuel == 0
+        assert pic < 512
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le point de reprise de Pymodoro-CLI.
+=========================================================
+
+Ce module teste la sauvegarde et la reprise d'un plan de cycles:
+- L'écriture atomique du fichier d'état
+- La lecture d'un état sauvegardé
+- Le calcul de la position de reprise
+- Les écritures aux seuls changements d'état (session, pause, reprise)
+- L'option --resume de main()
+"""
+
+import pytest
+import os
+import sys
+from unittest.mock import patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+import pomodoro
+from pomodoro import HorlogeVirtuelle, executer_cycle_pomodoro, main, position_reprise
+from pomodoro_clavier import Clavier
+from pomodoro_controle import ServeurControle
+from pomodoro_historique import chemin_historique_defaut, lire_historique
+from pomodoro_reprise import (
+    EtatReprise,
+    PointDeReprise,
+    chemin_reprise_defaut,
+    ecrire_atomiquement,
+    lire_reprise
+)
+from pymodoro.testing import temps_virtuel
+
+
+def _etat(cycle=2, type_session="TRAVAIL", echeance=1000.0, total_cycles=8):
+    """Construit un état de reprise de test (plan 25/5/15 en mode auto)."""
+    return EtatReprise(25, 5, 15, total_cycles, True, cycle, type_session, echeance)
+
+
+# =============================================================================
+# TESTS POUR L'ÉCRITURE ATOMIQUE
+# =============================================================================
+
+class TestEcritureAtomique:
+    """Tests pour ecrire_atomiquement()."""
+
+    def test_remplace_le_contenu(self, tmp_path):
+        """Le fichier prend le nouveau contenu et aucun temporaire ne reste."""
+        chemin = str(tmp_path / "etat.json")
+        ecrire_atomiquement(chemin, b"ancien")
+        ecrire_atomiquement(chemin, b"nouveau")
+        assert open(chemin, "rb").read() == b"nouveau"
+        assert os.listdir(tmp_path) == ["etat.json"]
+
+    def test_renommage_et_fsync(self, tmp_path):
+        """Le contenu est synchronisé, mis en place par os.replace(), puis le dossier."""
+        chemin = str(tmp_path / "etat.json")
+        with patch('pomodoro_reprise.os.fsync') as mock_fsync:
+            with patch('pomodoro_reprise.os.replace', wraps=os.replace) as mock_replace:
+                ecrire_atomiquement(chemin, b"{}")
+        assert mock_replace.call_args[0][1] == chemin
+        expected = 2 if hasattr(os, 'O_DIRECTORY') else 1
+        assert mock_fsync.call_count == expected
+
+    def test_echec_conserve_ancienne_version(self, tmp_path):
+        """Si le renommage échoue, l'ancien fichier est intact."""
+        chemin = str(tmp_path / "etat.json")
+        ecrire_atomiquement(chemin, b"ancien")
+        with patch('pomodoro_reprise.os.replace', side_effect=OSError("disque")):
+            with pytest.raises(OSError):
+                ecrire_atomiquement(chemin, b"nouveau")
+        assert open(chemin, "rb").read() == b"ancien"
+        assert os.listdir(tmp_path) == ["etat.json"]
+
+
+# =============================================================================
+# TESTS POUR LE FICHIER D'ÉTAT
+# =============================================================================
+
+class TestFichierEtat:
+    """Tests pour PointDeReprise et lire_reprise()."""
+
+    def test_aller_retour(self, tmp_path):
+        """Un état enregistré se relit à l'identique."""
+        chemin = str(tmp_path / "reprise.json")
+        PointDeReprise(chemin, 25, 5, 15, 8, True).enregistrer(3, "PAUSE", 1234.5)
+        assert lire_reprise(chemin) == EtatReprise(25, 5, 15, 8, True, 3, "PAUSE", 1234.5)
+
+    def test_aller_retour_en_pause(self, tmp_path):
+        """Une session en pause est relue avec son temps restant, sans échéance."""
+        chemin = str(tmp_path / "reprise.json")
+        PointDeReprise(chemin, 25, 5, 15, 8, True).enregistrer(3, "TRAVAIL", None, 600)
+        assert lire_reprise(chemin) == EtatReprise(25, 5, 15, 8, True, 3, "TRAVAIL", None, 600)
+
+    def test_effacer(self, tmp_path):
+        """effacer() supprime l'état, même absent."""
+        chemin = str(tmp_path / "reprise.json")
+        point = PointDeReprise(chemin, 25, 5, 15, 8, True)
+        point.enregistrer(1, "TRAVAIL", 0.0)
+        point.effacer()
+        point.effacer()
+        assert lire_reprise(chemin) is None
+
+    @pytest.mark.parametrize("contenu", [b"", b"{", b"[]", b'{"version": 1}',
+                                         b'{"version": 99, "cycle": 1}'])
+    def test_etat_illisible(self, tmp_path, contenu):
+        """Un fichier corrompu ou d'une autre version est ignoré."""
+        chemin = tmp_path / "reprise.json"
+        chemin.write_bytes(contenu)
+        assert lire_reprise(str(chemin)) is None
+
+    def test_chemin_defaut(self, dossier_donnees_isole):
+        """L'état est rangé dans le dossier de données de l'utilisateur."""
+        assert chemin_reprise_defaut().startswith(str(dossier_donnees_isole))
+
+
+# =============================================================================
+# TESTS POUR LA POSITION DE REPRISE
+# =============================================================================
+
+class TestPositionReprise:
+    """Tests pour position_reprise()."""
+
+    def test_session_en_cours(self):
+        """Une session non échue reprend avec son temps restant."""
+        assert position_reprise(_etat(echeance=1000.0), 100.5) == (2, "TRAVAIL", 900)
+
+    def test_travail_echu_passe_a_la_pause(self):
+        """Un travail échu laisse place à la pause du même cycle."""
+        assert position_reprise(_etat(cycle=2), 5000.0) == (2, "PAUSE", 300)
+
+    def test_travail_echu_pause_longue(self):
+        """Après le 4e travail, la pause est longue."""
+        assert position_reprise(_etat(cycle=4), 5000.0) == (4, "PAUSE LONGUE", 900)
+
+    def test_pause_echue_passe_au_cycle_suivant(self):
+        """Une pause échue laisse place au travail du cycle suivant."""
+        assert position_reprise(_etat(cycle=2, type_session="PAUSE"), 5000.0) == \
+            (3, "TRAVAIL", 1500)
+
+    def test_dernier_travail_echu(self):
+        """Un plan dont le dernier travail est échu est terminé."""
+        assert position_reprise(_etat(cycle=8), 5000.0) is None
+
+    def test_session_en_pause(self):
+        """Une session en pause reprend avec son temps restant, quelle que soit l'heure."""
+        etat = _etat()._replace(echeance=None, restant=700.2)
+        assert position_reprise(etat, 1e12) == (2, "TRAVAIL", 701)
+
+
+# =============================================================================
+# TESTS POUR LES ÉCRITURES DU MOTEUR
+# =============================================================================
+
+class TestSauvegardeMoteur:
+    """Tests pour les sauvegardes faites par le moteur."""
+
+    @patch('pomodoro.emettre_son')
+    def test_une_ecriture_par_session(self, mock_son, horloge_virtuelle, tmp_path):
+        """L'état est écrit une fois par session, jamais à chaque tick."""
+        point = PointDeReprise(str(tmp_path / "reprise.json"), 25, 5, 15, 4, True)
+        with patch.object(point, 'enregistrer', wraps=point.enregistrer) as mock_enregistrer:
+            with pomodoro.contexte_temporaire(point_reprise=point):
+                with patch.object(sys, 'stdout', StringIO()):
+                    executer_cycle_pomodoro(25, 5, 15, 1, 4, True, True)
+
+        assert horloge_virtuelle.nombre_attentes > 1800
+        assert [c[0][:2] for c in mock_enregistrer.call_args_list] == [
+            (1, "TRAVAIL"), (1, "PAUSE")]
+
+    @patch('pomodoro.emettre_son')
+    def test_echeance_sauvegardee(self, mock_son, horloge_virtuelle, tmp_path):
+        """L'état contient l'échéance murale de la session en cours."""
+        chemin = str(tmp_path / "reprise.json")
+        point = PointDeReprise(chemin, 25, 5, 15, 4, True)
+        etats = []
+        sortie = pomodoro.SortieNulle()
+        sortie.trame = lambda restant: etats.append(lire_reprise(chemin))
+        with pomodoro.contexte_temporaire(point_reprise=point, sortie=sortie):
+            with patch.object(sys, 'stdout', StringIO()):
+                executer_cycle_pomodoro(25, 5, 15, 3, 4, True, True)
+
+        debut = horloge_virtuelle.heure_murale_depart
+        assert etats[0] == EtatReprise(25, 5, 15, 4, True, 3, "TRAVAIL", debut + 1500)
+        assert etats[-1].type_session == "PAUSE"
+        assert etats[-1].echeance == debut + 1500 + 2 + 300
+
+    @patch('pomodoro.emettre_son')
+    def test_pause_au_clavier_sauvegardee(self, mock_son, horloge_virtuelle, tmp_path):
+        """Une pause au clavier sauvegarde le temps restant ; la reprise, l'échéance."""
+        chemin = str(tmp_path / "reprise.json")
+        point = PointDeReprise(chemin, 25, 5, 15, 4, True)
+        etats = []
+        sortie = pomodoro.SortieNulle()
+        sortie.periode_ticks = lambda duree: 60
+        with ServeurControle(pilotage=False) as boucle:
+            clavier = Clavier(boucle)
+
+            def trame(restant):
+                if restant == 1200:
+                    clavier.touche(b" ")
+                    etats.append(lire_reprise(chemin))
+                    horloge_virtuelle.avancer(3600)
+                    clavier.touche(b" ")
+                    etats.append(lire_reprise(chemin))
+
+            sortie.trame = trame
+            with pomodoro.contexte_temporaire(point_reprise=point, sortie=sortie,
+                                              controle=boucle):
+                with patch.object(sys, 'stdout', StringIO()):
+                    pomodoro.compte_a_rebours(25, "TRAVAIL", True)
+
+        en_pause, repris = etats
+        assert (en_pause.echeance, en_pause.restant) == (None, 1200)
+        assert repris.restant is None
+        assert repris.echeance == horloge_virtuelle.heure_murale_depart + 300 + 3600 + 1200
+
+    @patch('pomodoro.emettre_son')
+    def test_erreur_ecriture_desactive_reprise(self, mock_son, horloge_virtuelle, tmp_path):
+        """Une erreur d'écriture n'interrompt pas la minuterie."""
+        point = PointDeReprise(str(tmp_path / "reprise.json"), 25, 5, 15, 4, True)
+        capture = StringIO()
+        with pomodoro.contexte_temporaire(point_reprise=point):
+            with patch.object(point, 'enregistrer', side_effect=OSError("lecture seule")):
+                with patch.object(sys, 'stdout', capture):
+                    pomodoro.compte_a_rebours(1, "TRAVAIL", True)
+            assert pomodoro.contexte.point_reprise is None
+        assert "Point de reprise désactivé" in capture.getvalue()
+
+    @patch('pomodoro.emettre_son')
+    def test_session_reprise_duree_restante(self, mock_son, horloge_virtuelle):
+        """Une session reprise ne dure que le temps qu'il lui restait."""
+        restants = []
+        sortie = pomodoro.SortieNulle()
+        sortie.periode_ticks = lambda duree: 60
+        sortie.trame = restants.append
+        with pomodoro.contexte_temporaire(sortie=sortie):
+            with patch.object(sys, 'stdout', StringIO()):
+                pomodoro.compte_a_rebours(25, "TRAVAIL", True, reprise=130)
+
+        assert horloge_virtuelle.maintenant() == 130
+        assert restants == [130, 70, 10, 0]
+
+
+# =============================================================================
+# TESTS POUR L'OPTION --resume
+# =============================================================================
+
+class TestOptionResume:
+    """Tests de bout en bout de --resume."""
+
+    def _executer(self, arguments, trame=None, heure_murale=1_700_000_000.0):
+        """Exécute main() en temps virtuel et retourne la sortie et l'horloge."""
+        capture = StringIO()
+        horloge = HorlogeVirtuelle(heure_murale_depart=heure_murale)
+        with patch('sys.argv', ['pomodoro.py', '-s'] + arguments):
+            with patch('pomodoro.configurer_terminal'), patch('builtins.input', return_value=''):
+                with patch.object(sys, 'stdout', capture):
+                    with temps_virtuel(horloge, resolution=60):
+                        if trame is None:
+                            main()
+                        else:
+                            with patch.object(pomodoro.SortieJournal, 'trame',
+                                              side_effect=trame):
+                                with pytest.raises(SystemExit):
+                                    main()
+        return capture.getvalue(), horloge
+
+    def test_plan_termine_efface_etat(self):
+        """Un plan mené à son terme ne laisse rien à reprendre."""
+        self._executer(['-c', '2', '-a', '-w', '1', '-b', '1'])
+        assert not os.path.exists(chemin_reprise_defaut())
+
+    def test_resume_sans_etat(self):
+        """--resume sans plan interrompu démarre un nouveau plan."""
+        sortie, _ = self._executer(['--resume', '-w', '1'])
+        assert "Aucun plan interrompu" in sortie
+        assert len(lire_historique(chemin_historique_defaut())) == 1
+
+    def test_reprise_apres_interruption(self):
+        """Un plan interrompu au cycle 2 reprend au même endroit."""
+        appels = []
+
+        def interrompre(restant):
+            # Ticks du mode journal, toutes les 5 minutes : l'interruption
+            # tombe à mi-chemin du travail du cycle 2
+            appels.append(restant)
+            if appels == [600, 300, 0, 300, 0, 600, 300]:
+                raise KeyboardInterrupt
+
+        _, horloge = self._executer(['-c', '3', '-a', '-w', '10', '-b', '5'],
+                                    trame=interrompre)
+        etat = lire_reprise(chemin_reprise_defaut())
+        assert (etat.cycle, etat.type_session, etat.total_cycles) == (2, "TRAVAIL", 3)
+
+        # Reprise immédiate : les options de la ligne de commande sont ignorées
+        sortie, _ = self._executer(['--resume', '-c', '9'],
+                                   heure_murale=horloge.heure_murale())
+        assert "Reprise du plan au cycle 2/3 (TRAVAIL)" in sortie
+        assert not os.path.exists(chemin_reprise_defaut())
+
+        sessions = [(s.type_session, s.cycle, s.annulee, s.duree_reelle)
+                    for s in lire_historique(chemin_historique_defaut())]
+        assert sessions == [
+            ("TRAVAIL", 1, False, 600), ("PAUSE", 1, False, 300),
+            ("TRAVAIL", 2, True, 300),
+            ("TRAVAIL", 2, False, 300), ("PAUSE", 2, False, 300),
+            ("TRAVAIL", 3, False, 600),
+        ]
+
+    def test_reprise_pause_en_cours(self):
+        """Une pause en cours reprend sans refaire le travail du cycle."""
+        PointDeReprise(chemin_reprise_defaut(), 10, 5, 15, 2, False).enregistrer(
+            1, "PAUSE", 1_700_000_000.0 + 120)
+
+        self._executer(['--resume'])
+        sessions = [(s.type_session, s.cycle, s.duree_prevue, s.duree_reelle)
+                    for s in lire_historique(chemin_historique_defaut())]
+        assert sessions[0] == ("PAUSE", 1, 300, 120)
+        assert sessions[1][:2] == ("TRAVAIL", 2)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour les réveils précis de Pymodoro-CLI.
+========================================================
+
+Ce module teste pomodoro_reveil:
+- La marge des minuteries, réglée et rétablie par prctl()
+- Les attentes d'échéances absolues (select(), timerfd)
+- La minuterie attendue par la boucle des ticks
+- Les options --precise et --timer-slack
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import OrdonnanceurTicks, creer_parseur_arguments, main
+from pomodoro_controle import ServeurControle
+from pomodoro_reveil import HorlogeReveil, lire_marge_timer, regler_marge_timer
+
+linux = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux uniquement")
+timerfd = pytest.mark.skipif(not hasattr(os, "timerfd_create"), reason="Python 3.13+")
+
+
+class MinuterieTube:
+    """Minuterie de test : un tube dans lequel un thread écrit à l'échéance."""
+
+    def __init__(self):
+        self.lecture, self.ecriture = os.pipe()
+        self.echeances = []
+        self.expirations = 0
+        self._minuterie = None
+
+    def fileno(self):
+        return self.lecture
+
+    def armer(self, echeance):
+        self.echeances.append(echeance)
+        if self._minuterie is not None:
+            self._minuterie.cancel()
+        self._minuterie = threading.Timer(max(echeance - time.monotonic(), 0),
+                                          os.write, (self.ecriture, b"!"))
+        self._minuterie.start()
+
+    def lire(self, _fichier=None):
+        self.expirations += len(os.read(self.lecture, 64))
+
+    def close(self):
+        if self._minuterie is not None:
+            self._minuterie.cancel()
+        if self.lecture >= 0:
+            os.close(self.lecture)
+            os.close(self.ecriture)
+            self.lecture = self.ecriture = -1
+
+
+# =============================================================================
+# TESTS POUR LA MARGE DES MINUTERIES
+# =============================================================================
+
+class TestMarge:
+    """Tests pour PR_SET_TIMERSLACK."""
+
+    @linux
+    def test_regler_puis_retablir(self):
+        """La marge est réglée, lue, puis rétablie."""
+        precedente = regler_marge_timer(123456)
+        try:
+            assert precedente is not None
+            assert lire_marge_timer() == 123456
+        finally:
+            regler_marge_timer(precedente)
+        assert lire_marge_timer() == precedente
+
+    @linux
+    def test_horloge_retablit_la_marge(self):
+        """La sortie du bloc de l'horloge rétablit la marge d'origine."""
+        avant = lire_marge_timer()
+        with HorlogeReveil(2000, minuterie=False) as horloge:
+            assert lire_marge_timer() == 2000
+            assert "marge de 2000 ns" in horloge.description()
+        assert lire_marge_timer() == avant
+
+    def test_hors_de_linux(self):
+        """Hors de Linux, la marge n'est pas accessible et l'horloge la laisse."""
+        with patch('pomodoro_reveil.sys.platform', 'darwin'):
+            assert lire_marge_timer() is None
+            assert regler_marge_timer(1000) is None
+            with HorlogeReveil(1000, minuterie=False) as horloge:
+                assert "marge inchangée" in horloge.description()
+
+
+# =============================================================================
+# TESTS POUR LES ATTENTES
+# =============================================================================
+
+class TestAttente:
+    """Tests pour les attentes d'échéances absolues."""
+
+    @pytest.mark.parametrize("avec_minuterie", [
+        False, pytest.param(True, marks=timerfd),
+    ])
+    def test_reveil_apres_l_echeance(self, avec_minuterie):
+        """Le réveil n'a jamais lieu avant l'échéance absolue."""
+        with HorlogeReveil(minuterie=avec_minuterie) as horloge:
+            assert (horloge.minuterie is not None) == avec_minuterie
+            for _ in range(3):
+                echeance = time.monotonic() + 0.01
+                horloge.dormir_jusqua(echeance)
+                assert echeance <= time.monotonic() < echeance + 0.5
+
+    def test_echeance_passee(self):
+        """Une échéance passée rend la main aussitôt."""
+        with HorlogeReveil(minuterie=False) as horloge:
+            debut = time.monotonic()
+            horloge.dormir_jusqua(debut - 1)
+            assert time.monotonic() - debut < 0.05
+
+    @timerfd
+    def test_minuterie_fermee(self):
+        """La sortie du bloc ferme la minuterie timerfd."""
+        with HorlogeReveil() as horloge:
+            minuterie = horloge.minuterie
+        assert horloge.minuterie is None
+        assert minuterie.fileno() == -1
+
+
+# =============================================================================
+# TESTS POUR LA BOUCLE DES TICKS
+# =============================================================================
+
+class TestBoucle:
+    """Tests pour la minuterie attendue par ServeurControle."""
+
+    def test_minuterie_servie_par_la_boucle(self, dossier_execution_isole):
+        """La boucle arme la minuterie sur chaque échéance et s'y réveille."""
+        horloge = HorlogeReveil(minuterie=False)
+        horloge.minuterie = MinuterieTube()
+        chemin = os.path.join(dossier_execution_isole, "test.sock")
+        with ServeurControle(chemin) as controle:
+            ordonnanceur = OrdonnanceurTicks(3, 0.02, horloge=horloge, duree=3)
+            ordonnanceur.debut = time.monotonic()
+            for tick in (1, 2):
+                controle.attendre(ordonnanceur, tick, horloge)
+                assert time.monotonic() >= ordonnanceur.echeance(tick)
+            assert horloge.minuterie in controle._sources
+        assert horloge.minuterie.echeances == [ordonnanceur.echeance(1),
+                                               ordonnanceur.echeance(2)]
+        assert horloge.minuterie.expirations == 2
+
+
+# =============================================================================
+# TESTS POUR LES OPTIONS
+# =============================================================================
+
+class TestOptions:
+    """Tests pour --precise et --timer-slack."""
+
+    def test_options(self):
+        """Les deux options sont reconnues."""
+        args = creer_parseur_arguments().parse_args(['--precise', '--timer-slack', '5000'])
+        assert args.reveil_precis
+        assert args.marge_timer == 5000
+
+    def test_marge_nulle_refusee(self):
+        """Une marge nulle ou négative est refusée."""
+        with patch('sys.argv', ['pomodoro.py', '--timer-slack', '0']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(sys, 'stderr', StringIO()):
+                    with pytest.raises(SystemExit) as sortie:
+                        main()
+        assert sortie.value.code == 2
@@ -4,17 +4,41 @@ Tests unitaires pour les notifications sonores de Pymodoro-CLI.
 ===============================================================
 
 Ce module teste la fonction emettre_son() et son comportement
-sur différents systèmes d'exploitation.
+sur différents systèmes d'exploitation, ainsi que la tonalité synthétisée
+et le lecteur audio de pomodoro_son (avec un faux lecteur qui se contente
+de consommer son entrée standard).
 """
 
 import pytest
 import sys
+import threading
+import time
 from unittest.mock import patch, MagicMock
 from io import StringIO
 
 # Import du module à tester
 sys.path.insert(0, '..')
-from pomodoro import emettre_son
+import pomodoro
+from pomodoro import ECART_BEL, emettre_son, main
+from pomodoro_son import (
+    TAUX_ECHANTILLONNAGE,
+    LecteurAudio,
+    detecter_lecteur,
+    synthetiser_bip,
+    tonalite
+)
+from pymodoro.testing import temps_virtuel
+
+# Faux lecteur : recopie son entrée standard dans le fichier donné
+FAUX_LECTEUR = [sys.executable, "-c",
+                "import shutil, sys; shutil.copyfileobj(sys.stdin.buffer, open(sys.argv[1], 'wb'))"]
+
+
+def _attendre_minuteurs():
+    """Attend les minuteurs en cours (le second BEL)."""
+    for fil in threading.enumerate():
+        if isinstance(fil, threading.Timer):
+            fil.join(5)
 
 
 # =============================================================================
@@ -124,10 +148,22 @@ class TestEmettreSonLinux:
         """Vérifie qu'il y a deux BEL sur Linux."""
         with patch('builtins.print') as mock_print:
             emettre_son()
+            _attendre_minuteurs()
 
         # print doit être appelé 2 fois
         assert mock_print.call_count == 2
 
+    @patch('platform.system', return_value='Linux')
+    def test_linux_bel_sans_attente(self, mock_platform):
+        """Le second BEL est différé : emettre_son() rend la main aussitôt."""
+        with patch('builtins.print') as mock_print:
+            debut = time.perf_counter()
+            emettre_son()
+            assert time.perf_counter() - debut < ECART_BEL
+            assert mock_print.call_count == 1
+            _attendre_minuteurs()
+        assert mock_print.call_count == 2
+
 
 # =============================================================================
 # TESTS POUR emettre_son() - GESTION DES ERREURS
@@ -196,3 +232,122 @@ class TestEmettreSonAutreOS:
             emettre_son()
 
         mock_print.assert_called()
+
+
+# =============================================================================
+# TESTS POUR LA TONALITÉ SYNTHÉTISÉE
+# =============================================================================
+
+class TestTonalite:
+    """Tests pour la synthèse et le cache de la tonalité."""
+
+    def test_taille_bip(self):
+        """Un bip de 500 ms fait 500 ms d'échantillons 16 bits."""
+        assert len(synthetiser_bip(1000, 500)) == 2 * TAUX_ECHANTILLONNAGE // 2
+
+    def test_fondus(self):
+        """Le bip commence et finit en silence (pas de claquement)."""
+        from array import array
+        echantillons = array('h', synthetiser_bip(1000, 100))
+        assert echantillons[0] == 0
+        assert abs(echantillons[-1]) < 500
+        assert max(echantillons) > 10000
+
+    def test_deux_bips_separes(self):
+        """La tonalité enchaîne deux bips séparés d'un silence."""
+        bip = synthetiser_bip(880, 200)
+        tampon = tonalite(880, 200)
+        assert tampon.startswith(bip) and tampon.endswith(bip)
+        assert not any(tampon[len(bip):-len(bip)])
+
+    def test_cache(self):
+        """La tonalité n'est synthétisée qu'une fois par réglage."""
+        assert tonalite(1000, 500) is tonalite(1000, 500)
+        assert tonalite(1000, 500) is not tonalite(1000, 250)
+
+
+# =============================================================================
+# TESTS POUR LE LECTEUR AUDIO
+# =============================================================================
+
+class TestLecteurAudio:
+    """Tests pour le lecteur audio à processus unique."""
+
+    def test_processus_unique(self, tmp_path):
+        """Toutes les alertes passent par le même processus lecteur."""
+        recu = tmp_path / "recu.pcm"
+        with LecteurAudio(commande=FAUX_LECTEUR + [str(recu)]) as lecteur:
+            assert lecteur.jouer()
+            processus = lecteur.processus
+            assert lecteur.jouer()
+            assert lecteur.processus is processus
+        assert recu.read_bytes() == tonalite() * 2
+
+    def test_relance_apres_disparition(self, tmp_path):
+        """Un lecteur disparu est relancé à l'alerte suivante."""
+        with LecteurAudio(commande=FAUX_LECTEUR + [str(tmp_path / "recu.pcm")]) as lecteur:
+            lecteur.jouer()
+            ancien = lecteur.processus
+            ancien.kill()
+            ancien.wait()
+            assert lecteur.jouer()
+            assert lecteur.processus is not ancien
+
+    def test_sans_lecteur(self):
+        """Sans paplay ni aplay, jouer() retourne False."""
+        with patch('shutil.which', return_value=None):
+            lecteur = LecteurAudio()
+            assert lecteur.jouer() is False
+            assert lecteur.processus is None
+
+    def test_detection_prefere_paplay(self):
+        """paplay est préféré à aplay, tous deux en flux PCM brut."""
+        with patch('shutil.which', side_effect=lambda nom: f"/usr/bin/{nom}"):
+            assert detecter_lecteur()[0] == "paplay"
+        with patch('shutil.which', side_effect=lambda nom: "/usr/bin/aplay" if nom == "aplay"
+                   else None):
+            commande = detecter_lecteur()
+        assert commande[0] == "aplay"
+        assert "raw" in commande and "S16_LE" in commande
+
+    @patch('platform.system', return_value='Linux')
+    def test_emettre_son_utilise_le_lecteur(self, mock_platform):
+        """Sous Linux, emettre_son() joue la tonalité au lieu du BEL."""
+        lecteur = MagicMock()
+        lecteur.jouer.return_value = True
+        with pomodoro.contexte_temporaire(lecteur_audio=lecteur):
+            with patch('builtins.print') as mock_print:
+                emettre_son()
+        lecteur.jouer.assert_called_once()
+        mock_print.assert_not_called()
+
+    @patch('platform.system', return_value='Linux')
+    @patch('pomodoro.time.sleep')
+    def test_emettre_son_bel_si_lecteur_indisponible(self, mock_sleep, mock_platform):
+        """Si le lecteur ne peut pas jouer, emettre_son() revient au BEL."""
+        lecteur = MagicMock()
+        lecteur.jouer.return_value = False
+        with pomodoro.contexte_temporaire(lecteur_audio=lecteur):
+            with patch('builtins.print') as mock_print:
+                emettre_son()
+                _attendre_minuteurs()
+        assert mock_print.call_count == 2
+
+    def test_options_de_tonalite(self):
+        """--beep-freq et --beep-ms règlent le lecteur créé par main()."""
+        arguments = ['pomodoro.py', '-w', '1', '--no-history',
+                     '--beep-freq', '660', '--beep-ms', '250']
+        with patch('sys.argv', arguments), patch('pomodoro.configurer_terminal'):
+            with patch('pomodoro_son.LecteurAudio') as mock_lecteur:
+                with patch('pomodoro.emettre_son'), patch.object(sys, 'stdout', StringIO()):
+                    with temps_virtuel(resolution=60):
+                        main()
+        mock_lecteur.assert_called_once_with(660.0, 250)
+        mock_lecteur.return_value.__exit__.assert_called_once()
+
+    def test_option_invalide(self):
+        """Une durée de bip nulle est refusée."""
+        with patch('sys.argv', ['pomodoro.py', '--beep-ms', '0']):
+            with patch('pomodoro.configurer_terminal'), patch.object(sys, 'stderr', StringIO()):
+                with pytest.raises(SystemExit):
+                    main()
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour les modes de sortie de Pymodoro-CLI.
+=========================================================
+
+Ce module teste le choix du mode de sortie et le mode journal:
+- choisir_sortie() selon que stdout est un terminal ou non
+- SortieJournal : jalons ligne à ligne, sans ANSI ni retour chariot
+- SortieTerminal à fréquence d'affichage choisie (--fps)
+- Sélection automatique par main() et option --log-interval
+"""
+
+import pytest
+import sys
+from unittest.mock import patch, MagicMock
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import (
+    SortieJournal,
+    SortieTerminal,
+    choisir_sortie,
+    compte_a_rebours,
+    contexte,
+    contexte_temporaire,
+    creer_parseur_arguments,
+    main,
+    INTERVALLE_JOURNAL_DEFAUT
+)
+
+
+class FluxCompteur(StringIO):
+    """StringIO qui compte les écritures et les vidages."""
+
+    def __init__(self):
+        super().__init__()
+        self.ecritures = 0
+        self.vidages = 0
+
+    def write(self, texte):
+        self.ecritures += 1
+        return super().write(texte)
+
+    def flush(self):
+        self.vidages += 1
+
+
+def _session_journal(duree_minutes, intervalle=5, type_session="TRAVAIL"):
+    """Exécute une session en mode journal et retourne le flux utilisé."""
+    flux = FluxCompteur()
+    with contexte_temporaire(sortie=SortieJournal(intervalle)):
+        with patch.object(sys, 'stdout', flux):
+            with patch('pomodoro.emettre_son'):
+                compte_a_rebours(duree_minutes, type_session)
+    return flux
+
+
+def _session_fluide(fps, duree_minutes=1, cout_trame=0.0):
+    """Exécute une session à fps trames par seconde, chaque trame coûtant cout_trame."""
+    sortie = SortieTerminal(fps=fps)
+    trame = sortie.trame
+
+    def trame_lente(secondes_restantes):
+        trame(secondes_restantes)
+        contexte.horloge.instant += cout_trame
+
+    sortie.trame = trame_lente
+    flux = StringIO()
+    with contexte_temporaire(sortie=sortie):
+        with patch.object(sys, 'stdout', flux):
+            ordonnanceur = compte_a_rebours(duree_minutes, "PAUSE", mode_silencieux=True)
+    return ordonnanceur, flux.getvalue()
+
+
+# =============================================================================
+# TESTS POUR choisir_sortie()
+# =============================================================================
+
+class TestChoisirSortie:
+    """Tests pour la détection d'une sortie interactive."""
+
+    def test_terminal_mode_interactif(self):
+        """Un terminal donne le mode interactif."""
+        flux = MagicMock()
+        flux.isatty.return_value = True
+        assert isinstance(choisir_sortie(flux), SortieTerminal)
+
+    def test_fichier_mode_journal(self):
+        """Un flux non interactif donne le mode journal."""
+        assert isinstance(choisir_sortie(StringIO()), SortieJournal)
+
+    def test_flux_ferme_mode_journal(self):
+        """Un flux fermé est traité comme non interactif."""
+        flux = StringIO()
+        flux.close()
+        assert isinstance(choisir_sortie(flux), SortieJournal)
+
+    def test_intervalle_transmis(self):
+        """L'intervalle des jalons est transmis au mode journal."""
+        assert choisir_sortie(StringIO(), intervalle_minutes=10).intervalle_minutes == 10
+
+
+# =============================================================================
+# TESTS POUR SortieJournal
+# =============================================================================
+
+class TestSortieJournal:
+    """Tests pour le mode journal ligne à ligne."""
+
+    def test_aucune_sequence_ansi(self, horloge_virtuelle):
+        """Le mode journal n'écrit aucune séquence ANSI ni retour chariot."""
+        sortie = _session_journal(25).getvalue()
+        assert "\033[" not in sortie
+        assert "\r" not in sortie
+
+    def test_jalons_toutes_les_5_minutes(self, horloge_virtuelle):
+        """Une session de 25 minutes donne 4 jalons intermédiaires."""
+        sortie = _session_journal(25).getvalue()
+        for restant in ("20:00", "15:00", "10:00", "05:00"):
+            assert f"TRAVAIL : {restant} restant" in sortie
+        assert "24:59" not in sortie
+
+    def test_messages_debut_et_fin(self, horloge_virtuelle):
+        """Le démarrage et la fin de session sont journalisés."""
+        sortie = _session_journal(25).getvalue()
+        assert "Session de TRAVAIL démarrée (25 minutes)" in sortie
+        assert "SESSION DE TRAVAIL TERMINÉE" in sortie
+
+    def test_pourcentage_progression(self, horloge_virtuelle):
+        """Chaque jalon indique le pourcentage écoulé."""
+        sortie = _session_journal(20).getvalue()
+        assert "15:00 restant (25 %)" in sortie
+
+    def test_ecritures_reduites(self, horloge_virtuelle):
+        """Une session de 25 minutes produit quelques dizaines d'écritures."""
+        flux = _session_journal(25)
+        assert flux.ecritures < 50
+        assert flux.vidages < 20
+
+    def test_reveils_aux_jalons_seulement(self, horloge_virtuelle):
+        """Le moteur ne se réveille qu'aux jalons."""
+        _session_journal(25)
+        assert horloge_virtuelle.nombre_attentes == 5
+
+    def test_intervalle_non_multiple(self, horloge_virtuelle):
+        """La session se termine à l'heure même si l'intervalle ne tombe pas juste."""
+        sortie = _session_journal(7).getvalue()
+        assert horloge_virtuelle.maintenant() == 7 * 60
+        assert "TRAVAIL : 02:00 restant" in sortie
+
+    def test_session_pause(self, horloge_virtuelle):
+        """Le type de session apparaît dans chaque jalon."""
+        sortie = _session_journal(10, type_session="PAUSE").getvalue()
+        assert "PAUSE : 05:00 restant" in sortie
+
+    def test_annulation_sans_effacement(self):
+        """L'annulation n'efface pas de ligne en mode journal."""
+        flux = StringIO()
+        with contexte_temporaire(sortie=SortieJournal()):
+            with patch.object(sys, 'stdout', flux):
+                with patch('pomodoro.time.sleep', side_effect=KeyboardInterrupt):
+                    with pytest.raises(SystemExit):
+                        compte_a_rebours(25, "TRAVAIL")
+
+        assert "annulée" in flux.getvalue()
+        assert "\r" not in flux.getvalue()
+
+
+# =============================================================================
+# TESTS POUR LA FRÉQUENCE D'AFFICHAGE
+# =============================================================================
+
+class TestFrequenceAffichage:
+    """Tests pour SortieTerminal(fps=...)."""
+
+    def test_trames_a_la_frequence(self, horloge_virtuelle):
+        """Une minute à 10 trames par seconde donne 600 trames et finit à l'heure."""
+        ordonnanceur, _ = _session_fluide(10)
+        assert ordonnanceur.nombre_ticks == 600
+        assert ordonnanceur.ticks_sautes == 0
+        assert horloge_virtuelle.maintenant() == 60
+
+    def test_barre_fluide(self, horloge_virtuelle):
+        """La barre passe par ses 241 états au lieu de 31."""
+        _, texte = _session_fluide(10)
+        barres = {trame.split("[")[1].split("]")[0] for trame in texte.split("\r") if "[" in trame}
+        assert len(barres) == 8 * 30 + 1
+
+    def test_trames_sautees_si_trop_lentes(self, horloge_virtuelle):
+        """Des trames plus lentes que leur budget sont sautées, sans retarder la fin."""
+        ordonnanceur, _ = _session_fluide(30, cout_trame=0.1)
+        assert ordonnanceur.ticks_sautes > 1000
+        assert horloge_virtuelle.maintenant() < 60.2
+
+    def test_option_fps(self):
+        """--fps est transmise au mode interactif."""
+        assert creer_parseur_arguments().parse_args(['--fps', '20']).fps == 20
+        flux = StringIO()
+        flux.isatty = lambda: True
+        assert choisir_sortie(flux, fps=20).periode_ticks(60) == pytest.approx(0.05)
+
+    @pytest.mark.parametrize("options", [['--fps', '0'], ['--fps', '31'],
+                                         ['--fps', '10', '--low-power']])
+    @patch('pomodoro.configurer_terminal')
+    def test_fps_invalide(self, mock_config, options):
+        """Une fréquence hors de 1 à 30, ou combinée à --low-power, est refusée."""
+        with patch('sys.argv', ['pomodoro.py'] + options):
+            with patch.object(sys, 'stderr', StringIO()):
+                with pytest.raises(SystemExit) as sortie:
+                    main()
+        assert sortie.value.code == 2
+
+
+# =============================================================================
+# TESTS POUR LA SÉLECTION PAR main()
+# =============================================================================
+
+class TestSelectionParMain:
+    """Tests pour la sélection automatique du mode de sortie."""
+
+    def test_log_interval_defaut(self):
+        """Vérifie la valeur par défaut de --log-interval."""
+        args = creer_parseur_arguments().parse_args([])
+        assert args.intervalle_journal == INTERVALLE_JOURNAL_DEFAUT
+
+    def test_log_interval_personnalise(self):
+        """Vérifie que --log-interval est pris en compte."""
+        args = creer_parseur_arguments().parse_args(['--log-interval', '10'])
+        assert args.intervalle_journal == 10
+
+    @patch('pomodoro.configurer_terminal')
+    def test_main_hors_terminal_mode_journal(self, mock_config):
+        """Hors terminal, main() active le mode journal pendant les sessions."""
+        sorties = []
+
+        def compte(*args):
+            sorties.append(contexte.sortie)
+
+        with patch('pomodoro.compte_a_rebours', side_effect=compte):
+            with patch('sys.argv', ['pomodoro.py', '--log-interval', '10']):
+                with patch.object(sys, 'stdout', StringIO()):
+                    main()
+
+        assert isinstance(sorties[0], SortieJournal)
+        assert sorties[0].intervalle_minutes == 10
+
+    @patch('pomodoro.configurer_terminal')
+    def test_main_restaure_contexte(self, mock_config):
+        """Le mode de sortie est restauré à la fin de main()."""
+        with patch('pomodoro.compte_a_rebours'):
+            with patch('sys.argv', ['pomodoro.py']):
+                with patch.object(sys, 'stdout', StringIO()):
+                    main()
+
+        assert contexte.sortie is None
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le statut partagé de Pymodoro-CLI.
+=======================================================
+
+Ce module teste la publication du statut par projection en mémoire:
+- Le format de l'enregistrement et la lecture d'un instantané
+- La cohérence du seqlock face à un écrivain concurrent
+- La commande `pymodoro status`
+- La publication par le moteur et par main()
+"""
+
+import pytest
+import json
+import os
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+import pomodoro
+from pomodoro import OrdonnanceurTicks, PlanCycles, compte_a_rebours, main
+from pomodoro_statut import (
+    FORMAT_SEQUENCE,
+    POSITION_SEQUENCE,
+    TAILLE_STATUT,
+    PublicationStatut,
+    Statut,
+    chemin_statut_defaut,
+    commande_status,
+    formater_statut,
+    lire_statut,
+    temps_restant
+)
+from pymodoro.testing import temps_virtuel
+
+
+@pytest.fixture
+def chemin_statut(dossier_execution_isole):
+    """Le chemin d'un fichier de statut de test."""
+    return os.path.join(dossier_execution_isole, "test.status")
+
+
+@pytest.fixture
+def publication(chemin_statut):
+    """Une publication de statut fermée en fin de test."""
+    with PublicationStatut(chemin_statut, plan=PlanCycles(25, 5, 15, 4)) as statut:
+        yield statut
+
+
+def _statut(etat="en_cours", fin=1000.0, restant=600.0, total_cycles=4):
+    """Construit un statut de test (travail, cycle 2)."""
+    return Statut(etat, "TRAVAIL", 2, total_cycles, os.getpid(), fin, restant, 1500.0, 400.0)
+
+
+# =============================================================================
+# TESTS POUR LA PUBLICATION ET LA LECTURE
+# =============================================================================
+
+class TestPublicationLecture:
+    """Tests pour PublicationStatut et lire_statut()."""
+
+    def test_chemin_defaut(self, monkeypatch):
+        """Le fichier est placé dans $XDG_RUNTIME_DIR."""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        assert chemin_statut_defaut() == "/run/user/1000/pymodoro.status"
+
+    def test_aller_retour(self, publication, chemin_statut):
+        """Le statut publié est relu à l'identique."""
+        publication.publier("en_cours", "PAUSE LONGUE", 3, 900.0, 900.0, 1000.0)
+        statut = lire_statut(chemin_statut)
+        assert statut == Statut("en_cours", "PAUSE LONGUE", 3, 4, os.getpid(),
+                                1900.0, 900.0, 900.0, 1000.0)
+
+    def test_taille_fixe(self, publication, chemin_statut):
+        """Le fichier a la taille d'un enregistrement et n'est lisible que par l'utilisateur."""
+        publication.publier("inactif")
+        assert os.path.getsize(chemin_statut) == TAILLE_STATUT
+        assert os.stat(chemin_statut).st_mode & 0o777 == 0o600
+
+    def test_sequence_paire_apres_publication(self, publication):
+        """Chaque publication avance la séquence de deux."""
+        publication.publier("inactif")
+        publication.publier("en_cours", "TRAVAIL", 1, 1500.0, 1500.0, 0.0)
+        sequence, = FORMAT_SEQUENCE.unpack_from(publication.projection, POSITION_SEQUENCE)
+        assert sequence == 4
+
+    def test_fichier_absent(self, chemin_statut):
+        """Sans fichier, aucun statut."""
+        assert lire_statut(chemin_statut) is None
+
+    def test_fichier_invalide(self, chemin_statut):
+        """Un fichier tronqué ou étranger n'est pas lu."""
+        with open(chemin_statut, "wb") as fichier:
+            fichier.write(b"x" * TAILLE_STATUT)
+        assert lire_statut(chemin_statut) is None
+
+    def test_ecriture_en_cours(self, publication, chemin_statut):
+        """Une séquence impaire (écriture jamais terminée) n'est pas lue."""
+        publication.publier("inactif")
+        FORMAT_SEQUENCE.pack_into(publication.projection, POSITION_SEQUENCE, 3)
+        with patch('pomodoro_statut.TENTATIVES_LECTURE', 5):
+            assert lire_statut(chemin_statut) is None
+
+    def test_fermer_supprime_le_fichier(self, chemin_statut):
+        """La sortie du bloc supprime le fichier."""
+        with PublicationStatut(chemin_statut) as statut:
+            statut.publier("inactif")
+        assert not os.path.exists(chemin_statut)
+
+    def test_autre_processus_actif(self, publication, chemin_statut, capsys):
+        """Un second écrivain est désactivé tant que le premier vit."""
+        publication.publier("en_cours", "TRAVAIL", 1, 1500.0, 1500.0, 0.0)
+        with patch('pomodoro_statut.os.getpid', return_value=os.getpid() + 1):
+            seconde = PublicationStatut(chemin_statut)
+            seconde.publier("inactif")
+        assert seconde.projection is None
+        assert "Statut désactivé" in capsys.readouterr().out
+        assert lire_statut(chemin_statut).etat == "en_cours"
+
+
+# =============================================================================
+# TESTS POUR LE SEQLOCK
+# =============================================================================
+
+class TestSeqlock:
+    """Tests pour la cohérence des lectures concurrentes."""
+
+    def test_instantanes_coherents(self, publication, chemin_statut):
+        """Un lecteur ne voit jamais un enregistrement à moitié écrit."""
+        publication.publier("en_cours", "TRAVAIL", 0, 0.0, 0.0, 0.0)
+        arret = threading.Event()
+
+        def ecrire():
+            valeur = 0
+            while not arret.is_set():
+                valeur += 1
+                publication.publier("en_cours", "TRAVAIL", valeur % 60000,
+                                    float(valeur), float(valeur), float(valeur))
+
+        ecrivain = threading.Thread(target=ecrire)
+        ecrivain.start()
+        try:
+            for _ in range(2000):
+                statut = lire_statut(chemin_statut)
+                if statut is None:
+                    continue
+                assert statut.restant == statut.duree == statut.publication
+                assert statut.cycle == int(statut.restant) % 60000
+        finally:
+            arret.set()
+            ecrivain.join()
+
+
+# =============================================================================
+# TESTS POUR LA COMMANDE STATUS
+# =============================================================================
+
+class TestCommandeStatus:
+    """Tests pour formater_statut() et commande_status()."""
+
+    def test_temps_restant(self):
+        """Le temps restant se déduit de l'heure de fin, ou est figé en pause."""
+        assert temps_restant(_statut(), 700.0) == 300.0
+        assert temps_restant(_statut(), 2000.0) == 0.0
+        assert temps_restant(_statut("en_pause"), 2000.0) == 600.0
+        assert temps_restant(_statut("inactif"), 0.0) == 0.0
+
+    def test_format_en_cours(self):
+        """Une session en cours affiche son emoji, son type et le temps restant."""
+        assert formater_statut(_statut(), 400.5) == "🍅 TRAVAIL 10:00 (cycle 2/4)"
+
+    def test_format_en_pause(self):
+        """Une session en pause affiche le temps restant figé."""
+        assert formater_statut(_statut("en_pause"), 0.0) == "⏸️ TRAVAIL 10:00 (cycle 2/4)"
+
+    def test_format_hors_plan(self):
+        """Hors d'un plan de cycles, le cycle n'est pas affiché."""
+        assert formater_statut(_statut(total_cycles=0), 400.0) == "🍅 TRAVAIL 10:00"
+
+    def test_aucun_pymodoro(self, chemin_statut, capsys):
+        """Sans pymodoro en cours, le code de sortie vaut 1."""
+        assert commande_status([], chemin_statut) == 1
+        assert "Aucun pymodoro" in capsys.readouterr().out
+
+    def test_json(self, publication, chemin_statut, capsys):
+        """--json écrit un objet JSON."""
+        publication.publier("en_pause", "TRAVAIL", 2, 42.0, 1500.0, 0.0)
+        assert commande_status(["--json"], chemin_statut) == 0
+        objet = json.loads(capsys.readouterr().out)
+        assert objet["running"] and objet["state"] == "en_pause"
+        assert objet["remaining"] == 42.0
+        assert (objet["cycle"], objet["total"]) == (2, 4)
+
+    def test_processus_disparu(self, publication, chemin_statut):
+        """Un statut laissé par un processus disparu est ignoré."""
+        publication.publier("en_cours", "TRAVAIL", 1, 1500.0, 1500.0, 0.0)
+        with patch('pomodoro_statut._processus_actif', return_value=False):
+            assert commande_status([], chemin_statut) == 1
+
+    def test_argument_inconnu(self, capsys):
+        """Un argument inconnu est signalé."""
+        assert commande_status(["--bavard"]) == 2
+        assert "usage" in capsys.readouterr().out
+
+
+# =============================================================================
+# TESTS POUR LA PUBLICATION PAR LE MOTEUR
+# =============================================================================
+
+class TestPublicationMoteur:
+    """Tests pour la publication du statut par compte_a_rebours() et main()."""
+
+    def test_compte_a_rebours_publie(self, horloge_virtuelle):
+        """Le statut est publié au début et à la fin de la session, pas à chaque tick."""
+        statut = MagicMock()
+        with pomodoro.contexte_temporaire(statut=statut, numero_cycle=2):
+            with patch.object(sys, 'stdout', StringIO()):
+                compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+
+        debut = horloge_virtuelle.heure_murale_depart
+        assert statut.publier.call_args_list[0].args == ("en_cours", "TRAVAIL", 2,
+                                                         60, 60, debut)
+        assert statut.publier.call_args_list[-1].args[0] == "inactif"
+        assert statut.publier.call_count == 2
+
+    def test_pause_publiee(self, horloge_virtuelle):
+        """Une pause commandée à distance est publiée."""
+        statut = MagicMock()
+        controle = MagicMock()
+
+        def pause(type_session, ordonnanceur, sortie, horloge, cycle, au_changement):
+            au_changement(45, True)
+
+        controle.suivre.side_effect = pause
+        with pomodoro.contexte_temporaire(statut=statut, controle=controle):
+            with patch.object(sys, 'stdout', StringIO()):
+                with patch.object(OrdonnanceurTicks, '__iter__', return_value=iter([0])):
+                    compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+
+        assert statut.publier.call_args_list[1].args[:5] == ("en_pause", "TRAVAIL", 0, 45, 60)
+
+    def test_erreur_desactive_le_statut(self, horloge_virtuelle, capsys):
+        """Une erreur d'écriture désactive le statut sans arrêter la session."""
+        statut = MagicMock()
+        statut.publier.side_effect = OSError("lecture seule")
+        with pomodoro.contexte_temporaire(statut=statut):
+            compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+            assert pomodoro.contexte.statut is None
+        assert "Statut désactivé" in capsys.readouterr().out
+
+    def test_main_publie_et_supprime(self):
+        """main() publie le nombre de cycles et supprime le fichier en sortie."""
+        publications = []
+        publier = PublicationStatut.publier
+
+        def espionner(statut, *args):
+            publier(statut, *args)
+            publications.append(lire_statut(statut.chemin))
+
+        with patch('sys.argv', ['pomodoro.py', '-w', '1', '-b', '1', '-c', '2', '-a', '-s',
+                                '--no-history']):
+            with patch('pomodoro.configurer_terminal'):
+                with patch.object(PublicationStatut, 'publier', espionner):
+                    with patch.object(sys, 'stdout', StringIO()):
+                        with temps_virtuel(resolution=60):
+                            main()
+
+        en_cours = [(s.type_session, s.cycle, s.total_cycles) for s in publications
+                    if s.etat == "en_cours"]
+        assert en_cours == [("TRAVAIL", 1, 2), ("PAUSE", 1, 2), ("TRAVAIL", 2, 2)]
+        assert not os.path.exists(chemin_statut_defaut())
+
+    def test_main_status(self, capsys):
+        """`pymodoro status` lit le statut sans lancer de session."""
+        with patch('sys.argv', ['pomodoro.py', 'status']):
+            with patch('pomodoro.configurer_terminal'):
+                with pytest.raises(SystemExit) as sortie:
+                    main()
+        assert sortie.value.code == 1
+        assert "Aucun pymodoro" in capsys.readouterr().out
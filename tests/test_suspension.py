@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour l'arrêt (Ctrl+Z) et la mise en veille de Pymodoro-CLI.
+===========================================================================
+
+Ce module teste le décompte du temps autour d'une interruption:
+- La mise en veille du système, constatée par l'ordonnanceur
+- L'arrêt par SIGTSTP et la reprise par SIGCONT, traités par la boucle des ticks
+- Les deux politiques de --on-suspend (pause, count)
+"""
+
+import pytest
+import signal
+import sys
+from unittest.mock import MagicMock, patch
+from io import StringIO
+
+# Import du module à tester
+sys.path.insert(0, '..')
+from pomodoro import (
+    VEILLE_COMPTEE, VEILLE_PAUSE, HorlogeVirtuelle, OrdonnanceurTicks, SortieNulle,
+    SortieTerminal, compte_a_rebours, contexte_temporaire, creer_parseur_arguments,
+)
+from pomodoro_controle import ServeurControle
+from pomodoro_reprise import PointDeReprise, lire_reprise
+from pomodoro_statut import PublicationStatut, lire_statut
+from pomodoro_suspension import GestionSuspension
+from pymodoro.testing import temps_virtuel
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, "SIGTSTP"), reason="POSIX uniquement")
+
+
+def _session_demarree(politique, horloge, duree=60, ticks=10):
+    """Un ordonnanceur d'une seconde par tick, arrêté après quelques ticks."""
+    ordonnanceur = OrdonnanceurTicks(duree, 1.0, horloge=horloge, duree=duree)
+    ordonnanceur.politique_veille = politique
+    iterateur = iter(ordonnanceur)
+    for _ in range(ticks + 1):
+        next(iterateur)
+    return ordonnanceur, iterateur
+
+
+class HorlogeEndormie(HorlogeVirtuelle):
+    """Horloge virtuelle mise en veille au cours de la n-ième attente."""
+
+    def __init__(self, attente, duree_veille):
+        super().__init__()
+        self.attente = attente
+        self.duree_veille = duree_veille
+
+    def dormir(self, secondes):
+        super().dormir(secondes)
+        if self.nombre_attentes == self.attente:
+            self.mettre_en_veille(self.duree_veille)
+
+
+# =============================================================================
+# TESTS POUR LA MISE EN VEILLE DU SYSTÈME
+# =============================================================================
+
+class TestVeilleSysteme:
+    """Tests pour la veille constatée par l'ordonnanceur."""
+
+    def test_veille_hors_du_decompte(self):
+        """Par défaut, la veille ne compte pas : la session reprend où elle était."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur, iterateur = _session_demarree(VEILLE_PAUSE, horloge)
+        horloge.mettre_en_veille(30)
+        next(iterateur)
+        assert ordonnanceur.temps_veille == 30
+        assert ordonnanceur.restant(horloge.maintenant()) == 49
+
+    def test_veille_comptee(self):
+        """Avec count, la veille est comptée comme du temps écoulé."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur, iterateur = _session_demarree(VEILLE_COMPTEE, horloge)
+        horloge.mettre_en_veille(30)
+        next(iterateur)
+        assert ordonnanceur.restant(horloge.maintenant()) == 19
+
+    def test_ecart_sous_le_seuil(self):
+        """Un écart de quelques millisecondes entre les horloges est ignoré."""
+        ordonnanceur = OrdonnanceurTicks(60, 1.0, horloge=HorlogeVirtuelle(), duree=60)
+        assert ordonnanceur.constater_veille(0.01) == 0.0
+        assert ordonnanceur.temps_veille == 0.0
+
+    def test_heure_murale_avance(self):
+        """La veille fait avancer l'heure murale, pas le temps monotone."""
+        horloge = HorlogeVirtuelle()
+        horloge.mettre_en_veille(120)
+        assert horloge.maintenant() == 0.0
+        assert horloge.heure_murale() == horloge.heure_murale_depart + 120
+
+    @pytest.mark.parametrize("politique, libelle", [
+        (VEILLE_PAUSE, "hors du décompte"), (VEILLE_COMPTEE, "comptée comme écoulée"),
+    ])
+    def test_compte_a_rebours_signale_la_veille(self, politique, libelle):
+        """Le bilan de la session indique la durée de la veille et son sort."""
+        horloge = HorlogeEndormie(attente=5, duree_veille=90)
+        with temps_virtuel(horloge, resolution=1):
+            with contexte_temporaire(sortie=SortieTerminal(), politique_veille=politique):
+                with patch('sys.stdout', StringIO()) as sortie:
+                    compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+        assert f"Mise en veille de 01:30 pendant la session, {libelle}" in sortie.getvalue()
+        # La session dure toujours une minute de temps monotone, ou 90 s de moins
+        attendu = 60 if politique == VEILLE_PAUSE else 0
+        assert horloge.maintenant() == pytest.approx(attendu, abs=6)
+
+    def test_veille_republiee(self, tmp_path):
+        """Après la veille, le statut et le point de reprise ont la nouvelle fin."""
+        horloge = HorlogeEndormie(attente=5, duree_veille=90)
+        chemin_reprise = str(tmp_path / "reprise.json")
+        chemin_statut = str(tmp_path / "statut")
+        lus = []
+        sortie = SortieNulle()
+        sortie.periode_ticks = lambda duree: 1
+        sortie.trame = lambda restant: restant == 55 and lus.append(
+            (lire_statut(chemin_statut), lire_reprise(chemin_reprise)))
+        point = PointDeReprise(chemin_reprise, 1, 5, 15, 4, True)
+        with temps_virtuel(horloge, resolution=1), PublicationStatut(chemin_statut) as statut:
+            with contexte_temporaire(sortie=sortie, point_reprise=point, statut=statut):
+                with patch('sys.stdout', StringIO()):
+                    compte_a_rebours(1, "TRAVAIL", mode_silencieux=True)
+
+        # 5 s de session, 90 s de veille hors du décompte, 55 s restantes
+        (publie, reprise), = lus
+        fin = horloge.heure_murale_depart + 5 + 90 + 55
+        assert (publie.etat, publie.fin, publie.restant) == ("en_cours", fin, 55)
+        assert (reprise.echeance, reprise.restant) == (fin, None)
+
+
+# =============================================================================
+# TESTS POUR CTRL+Z
+# =============================================================================
+
+class TestArret:
+    """Tests pour l'arrêt par SIGTSTP et la reprise."""
+
+    def _arreter(self, gestion, horloge, duree_arret=120):
+        """Simule Ctrl+Z puis fg : le temps monotone avance pendant l'arrêt."""
+        def arret(pid, numero):
+            assert numero == signal.SIGTSTP
+            assert signal.getsignal(signal.SIGTSTP) == signal.SIG_DFL
+            horloge.instant += duree_arret
+
+        with patch('pomodoro_suspension.os.kill', side_effect=arret), \
+                patch('sys.stdout', StringIO()):
+            gestion.arreter()
+
+    def test_pause_pendant_l_arret(self):
+        """Par défaut, la session est en pause pendant l'arrêt, puis repart."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur, _ = _session_demarree(VEILLE_PAUSE, horloge)
+        sortie, au_changement = MagicMock(), MagicMock()
+        gestion = GestionSuspension(en_pause=True)
+        gestion.suivre(ordonnanceur, sortie, horloge, au_changement)
+        self._arreter(gestion, horloge)
+        assert ordonnanceur.pause_depuis is None
+        assert ordonnanceur.restant(horloge.maintenant()) == 50
+        sortie.reprise_session.assert_called_once_with(50)
+        assert [appel.args for appel in au_changement.call_args_list] == [(50, True),
+                                                                         (50, False)]
+        assert gestion.arrets == 1
+
+    def test_arret_compte(self):
+        """Avec count, l'arrêt est compté comme écoulé."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur, _ = _session_demarree(VEILLE_COMPTEE, horloge)
+        sortie = MagicMock()
+        gestion = GestionSuspension(en_pause=False)
+        gestion.suivre(ordonnanceur, sortie, horloge)
+        self._arreter(gestion, horloge, duree_arret=30)
+        assert ordonnanceur.restant(horloge.maintenant()) == 20
+        sortie.reprise_session.assert_called_once_with(20)
+
+    def test_terminal_rendu_puis_repris(self):
+        """Le terminal est rendu au shell pendant l'arrêt, même hors session."""
+        clavier = MagicMock()
+        gestion = GestionSuspension(clavier=clavier)
+        self._arreter(gestion, HorlogeVirtuelle())
+        clavier.liberer_terminal.assert_called_once_with()
+        clavier.reprendre_terminal.assert_called_once_with()
+
+    def test_continuation_apres_sigstop(self):
+        """Après SIGSTOP, SIGCONT seul reprend le terminal et réaffiche la session."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur, _ = _session_demarree(VEILLE_PAUSE, horloge)
+        sortie, clavier = MagicMock(), MagicMock()
+        gestion = GestionSuspension(clavier=clavier)
+        gestion.suivre(ordonnanceur, sortie, horloge)
+        horloge.instant += 5
+        gestion._sur_continuation(signal.SIGCONT, None)
+        clavier.reprendre_terminal.assert_not_called()
+        gestion.traiter_en_attente()
+        clavier.reprendre_terminal.assert_called_once_with()
+        sortie.reprise_session.assert_called_once_with(45)
+
+    def test_gestionnaire_sans_effet(self):
+        """Le gestionnaire de SIGTSTP ne fait que noter le signal : la boucle le traite."""
+        horloge = HorlogeVirtuelle()
+        ordonnanceur, _ = _session_demarree(VEILLE_PAUSE, horloge)
+        sortie, au_changement = MagicMock(), MagicMock()
+        gestion = GestionSuspension()
+        gestion.suivre(ordonnanceur, sortie, horloge, au_changement)
+        with patch('pomodoro_suspension.os.kill') as kill:
+            gestion._sur_arret(signal.SIGTSTP, None)
+            kill.assert_not_called()
+            au_changement.assert_not_called()
+            assert ordonnanceur.pause_depuis is None
+            with patch('sys.stdout', StringIO()):
+                gestion.traiter_en_attente()
+        kill.assert_called_once()
+        assert gestion.arrets == 1
+
+    def test_boucle_reveillee(self):
+        """SIGTSTP réveille la boucle des ticks, qui arrête le processus."""
+        with ServeurControle(pilotage=False) as boucle, \
+                GestionSuspension(boucle=boucle) as gestion:
+            assert boucle.ouvrir()
+            with patch('pomodoro_suspension.os.kill') as kill:
+                gestion._sur_arret(signal.SIGTSTP, None)
+                kill.assert_not_called()
+                with patch('sys.stdout', StringIO()):
+                    boucle.traiter(1.0)
+            kill.assert_called_once()
+            assert gestion.arrets == 1
+            assert gestion._reveil[0] in boucle._sources
+        assert gestion._reveil is None
+
+    def test_arret_au_repos(self):
+        """À l'invite input(), l'arrêt est traité dès le signal."""
+        clavier = MagicMock()
+        gestion = GestionSuspension(clavier=clavier)
+        gestion.au_repos = True
+        with patch('pomodoro_suspension.os.kill') as kill, patch('sys.stdout', StringIO()):
+            gestion._sur_arret(signal.SIGTSTP, None)
+        kill.assert_called_once()
+        clavier.reprendre_terminal.assert_called_once_with()
+
+    def test_gestionnaires_retablis(self):
+        """Les gestionnaires de SIGTSTP et SIGCONT sont rétablis en sortie de bloc."""
+        precedents = signal.getsignal(signal.SIGTSTP), signal.getsignal(signal.SIGCONT)
+        with GestionSuspension() as gestion:
+            assert signal.getsignal(signal.SIGTSTP) == gestion._sur_arret
+            assert signal.getsignal(signal.SIGCONT) == gestion._sur_continuation
+        assert (signal.getsignal(signal.SIGTSTP), signal.getsignal(signal.SIGCONT)) == precedents
+
+
+# =============================================================================
+# TESTS POUR L'OPTION
+# =============================================================================
+
+class TestOption:
+    """Tests pour --on-suspend."""
+
+    def test_defaut_pause(self):
+        """Sans l'option, la session est en pause pendant une interruption."""
+        assert creer_parseur_arguments().parse_args([]).politique_veille == VEILLE_PAUSE
+
+    def test_valeur_inconnue(self):
+        """Une politique inconnue est refusée."""
+        with patch.object(sys, 'stderr', StringIO()):
+            with pytest.raises(SystemExit) as sortie:
+                creer_parseur_arguments().parse_args(['--on-suspend', 'ignore'])
+        assert sortie.value.code == 2
@@ -23,9 +23,9 @@ from pomodoro import configurer_terminal
 class TestConfigurerTerminalWindows:
     """Tests pour configurer_terminal() sur Windows."""
 
-    @patch('platform.system', return_value='Windows')
+    @patch.object(sys, 'platform', 'win32')
     @patch('os.system')
-    def test_windows_change_code_page(self, mock_os_system, mock_platform):
+    def test_windows_change_code_page(self, mock_os_system):
         """Vérifie que Windows change le code page en UTF-8."""
         mock_stdout = MagicMock()
         with patch.object(sys, 'stdout', mock_stdout):
@@ -36,9 +36,9 @@ class TestConfigurerTerminalWindows:
         call_arg = mock_os_system.call_args[0][0]
         assert 'chcp 65001' in call_arg
 
-    @patch('platform.system', return_value='Windows')
+    @patch.object(sys, 'platform', 'win32')
     @patch('os.system')
-    def test_windows_reconfigure_stdout(self, mock_os_system, mock_platform):
+    def test_windows_reconfigure_stdout(self, mock_os_system):
         """Vérifie que stdout est reconfiguré en UTF-8."""
         mock_stdout = MagicMock()
         with patch.object(sys, 'stdout', mock_stdout):
@@ -58,9 +58,9 @@ class TestConfigurerTerminalWindows:
 class TestConfigurerTerminalAutreOS:
     """Tests pour configurer_terminal() sur des OS non-Windows."""
 
-    @patch('platform.system', return_value='Linux')
+    @patch.object(sys, 'platform', 'linux')
     @patch('os.system')
-    def test_linux_ne_change_pas_code_page(self, mock_os_system, mock_platform):
+    def test_linux_ne_change_pas_code_page(self, mock_os_system):
         """Vérifie que Linux ne change pas le code page."""
         mock_stdout = MagicMock()
         with patch.object(sys, 'stdout', mock_stdout):
@@ -69,8 +69,8 @@ class TestConfigurerTerminalAutreOS:
         # os.system ne doit pas être appelé sur Linux
         mock_os_system.assert_not_called()
 
-    @patch('platform.system', return_value='Linux')
-    def test_linux_ne_reconfigure_pas_stdout(self, mock_platform):
+    @patch.object(sys, 'platform', 'linux')
+    def test_linux_ne_reconfigure_pas_stdout(self):
         """Vérifie que stdout n'est pas reconfiguré sur Linux."""
         mock_stdout = MagicMock()
         with patch.object(sys, 'stdout', mock_stdout):
@@ -79,9 +79,9 @@ class TestConfigurerTerminalAutreOS:
         # reconfigure ne doit pas être appelé sur Linux
         mock_stdout.reconfigure.assert_not_called()
 
-    @patch('platform.system', return_value='Darwin')
+    @patch.object(sys, 'platform', 'darwin')
     @patch('os.system')
-    def test_macos_ne_change_pas_code_page(self, mock_os_system, mock_platform):
+    def test_macos_ne_change_pas_code_page(self, mock_os_system):
         """Vérifie que macOS ne change pas le code page."""
         mock_stdout = MagicMock()
         with patch.object(sys, 'stdout', mock_stdout):
@@ -89,8 +89,8 @@ class TestConfigurerTerminalAutreOS:
 
         mock_os_system.assert_not_called()
 
-    @patch('platform.system', return_value='Darwin')
-    def test_macos_ne_reconfigure_pas_stdout(self, mock_platform):
+    @patch.object(sys, 'platform', 'darwin')
+    def test_macos_ne_reconfigure_pas_stdout(self):
         """Vérifie que stdout n'est pas reconfiguré sur macOS."""
         mock_stdout = MagicMock()
         with patch.object(sys, 'stdout', mock_stdout):
@@ -106,9 +106,9 @@ class TestConfigurerTerminalAutreOS:
 class TestConfigurerTerminalRobustesse:
     """Tests de robustesse pour configurer_terminal()."""
 
-    @patch('platform.system', return_value='Windows')
+    @patch.object(sys, 'platform', 'win32')
     @patch('os.system')
-    def test_windows_supprime_output_chcp(self, mock_os_system, mock_platform):
+    def test_windows_supprime_output_chcp(self, mock_os_system):
         """Vérifie que la sortie de chcp est supprimée."""
         mock_stdout = MagicMock()
         with patch.object(sys, 'stdout', mock_stdout):
@@ -118,9 +118,9 @@ class TestConfigurerTerminalRobustesse:
         # Doit rediriger vers nul pour supprimer la sortie
         assert '>nul' in call_arg or '2>&1' in call_arg
 
-    @patch('platform.system', return_value='Windows')
+    @patch.object(sys, 'platform', 'win32')
     @patch('pomodoro.os.system', side_effect=Exception("Erreur système"))
-    def test_windows_gere_erreur_chcp(self, mock_os_system, mock_platform):
+    def test_windows_gere_erreur_chcp(self, mock_os_system):
         """Vérifie que les erreurs de chcp sont gérées."""
         mock_stdout = MagicMock()
         with patch.object(sys, 'stdout', mock_stdout):